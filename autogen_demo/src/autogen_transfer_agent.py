@@ -1,13 +1,20 @@
 import asyncio
+import json
 import os
+from typing import Any, List, Mapping, Optional, Sequence
 from autogen_agentchat.conditions import TextMentionTermination
 from autogen_agentchat.teams import RoundRobinGroupChat
-from autogen_agentchat.ui import Console
-from autogen_core.models import ModelFamily, ModelInfo
-from autogen_core.tools import FunctionTool
+from autogen_agentchat.base import Response
+from autogen_core.model_context import ChatCompletionContext
+from autogen_core.model_context._chat_completion_context import ChatCompletionContextState
+from autogen_core.models import (AssistantMessage, ChatCompletionClient, FunctionExecutionResult,
+                                 FunctionExecutionResultMessage, LLMMessage, ModelFamily, ModelInfo, SystemMessage,
+                                 UserMessage)
 from dotenv import load_dotenv
 from autogen_agentchat.agents import AssistantAgent
-from autogen_ext.models.openai import OpenAIChatCompletionClient
+from transfer_common import async_tools, tool_cache, llm_cache
+from transfer_common.tool_registry import autogen_adapter
+from transfer_common.llm_cache.autogen_adapter import CachedChatCompletionClient
 
 # 加载环境变量
 load_dotenv()
@@ -17,82 +24,10 @@ api_key = os.getenv("BAILIAN_API_KEY")
 model_name = os.getenv("QWEN3_MODEL")
 base_url = os.getenv("BAILIAN_API_BASE_URL")
 
-# 模拟数据库 - 使用用户名称作为键
-accounts_db = {
-    "张三": {"balance": 10000.0},
-    "李四": {"balance": 5000.0},
-    "王五": {"balance": 2000.0},
-    "赵六": {"balance": 50000.0},
-    "我": {"balance": 10000.0}
-}
-
-# 工具函数1: 查询余额
-def get_balance(user_name: str) -> str:
-    """
-    查询指定用户的余额
-    Args:
-        user_name: 用户名称，例如 '张三', '李四', '我'
-    Returns:
-        用户余额信息
-    """
-    print(f"--tool called--查询余额: {user_name}")
-    if user_name in accounts_db:
-        account_info = accounts_db[user_name]
-        return f"用户 {user_name} 的余额为: {account_info['balance']} 元"
-    else:
-        return f"用户 {user_name} 不存在"
-
-# 工具函数2: 查询账户
-def get_account(user_name: str) -> str:
-    """
-    查询指定用户
-    Args:
-        user_name: 用户名称，例如 '张三', '李四', '我'
-    Returns:
-        用户是否存在
-    """
-    print(f"--tool called--查询账户: {user_name}")
-    if user_name in accounts_db:
-        return f"用户 {user_name} 存在"
-    else:
-        return f"用户 {user_name} 不存在"
-
-# 工具函数3: 执行转账
-def execute_transfer(to_user: str, amount: float) -> str:
-    """
-    执行转账操作，从我的账户转出资金
-    Args:
-        to_user: 目标用户名称
-        amount: 转账金额
-    Returns:
-        转账结果信息
-    """
-    print(f"--tool called--执行转账: {to_user} {amount}")
-    # 检查我的余额是否足够
-    if accounts_db["我"]["balance"] < amount:
-        return f"转账失败：余额不足。当前余额: {accounts_db['我']['balance']} 元，需要: {amount} 元"
-    
-    # 执行转账
-    accounts_db["我"]["balance"] -= amount
-    accounts_db[to_user]["balance"] += amount
-    return f"转账成功！ 从我的账户转出 {amount} 元到 {to_user}"
-
-# 工具函数4: 向用户提问
-def reply_to_user(content: str) -> str:
-    """
-    向用户提问
-    Args:
-        content: 提问内容
-        state: 转账状态
-    Returns:
-        回答内容
-    """
-    print("")
-    print(f"--tool called--提问用户: {content}")
-    # 获取用户输入
-    user_input = input("reply:")
-    return user_input
-    # return "继续收集信息"
+# 工具函数1~3: 查询余额、查询账户、执行转账，统一使用共享账本
+# 工具函数4: 向用户提问，协程版本，问题和回答通过会话的问答队列传递，等待回复时不阻塞事件循环
+# 全部注册为异步工具：查询在工具线程池中并发执行，转账串行（见 transfer_common.async_tools）
+# 工具定义见 transfer_common.tool_registry，schema 只生成一次，不会在每次请求模型时重新生成
 
 # 创建ModelInfo对象，包含必需的vision字段
 model_info = ModelInfo(
@@ -104,16 +39,32 @@ model_info = ModelInfo(
     structured_output=True,  # 支持结构化输出
 )
 
-# 创建模型客户端
-model_client = OpenAIChatCompletionClient(
-    model=model_name,
-    api_key=api_key,
-    base_url=base_url,
-    #model_info必须
-    model_info=model_info,
-    #! 参数设置失败，可能需要创建自定义继承OpenAIChatCompletionClient的类，来设置参数enable_thinking
-    # extra_body={"enable_thinking": False}  # 确保每次请求都包含此参数
-)
+# 模型客户端在首次使用时才创建，导入本模块不会导入 autogen_ext 的 OpenAI 客户端（及 openai SDK）；
+# 仍然可以像以前一样访问模块的 model_client 属性
+_model_client = None
+
+def get_model_client():
+    """返回模型客户端，首次调用时创建；相同请求直接复用共享缓存中的响应"""
+    global _model_client
+    if _model_client is None:
+        from autogen_ext.models.openai import OpenAIChatCompletionClient
+
+        _model_client = CachedChatCompletionClient(OpenAIChatCompletionClient(
+            model=model_name,
+            api_key=api_key,
+            base_url=base_url,
+            #model_info必须
+            model_info=model_info,
+            #! 参数设置失败，可能需要创建自定义继承OpenAIChatCompletionClient的类，来设置参数enable_thinking
+            # extra_body={"enable_thinking": False}  # 确保每次请求都包含此参数
+        ))
+    return _model_client
+
+def __getattr__(name):
+    # 访问 model_client 属性时（PEP 562）返回当前的客户端，尚未创建时按需创建
+    if name == "model_client":
+        return get_model_client()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 system_message = """你是一个专业的银行转账助手，负责处理用户的转账请求。
 你的任务：
@@ -126,42 +77,256 @@ system_message = """你是一个专业的银行转账助手，负责处理用户
 - 所有转账都从我的账户转出
 - 确认转账信息中金额，并确保余额足够`get_balance`
 - 目标账户必须存在`get_account`
+- 同时向多个用户转账时，使用`get_accounts`、`get_balances`批量校验，并通过`execute_transfers`一次性完成全部转账
 - 请与用户进行自然对话，逐步收集信息，确保转账安全准确
 - 当转账成功后，请发送"DONE"
 """
+def needs_reflection(results: Sequence[FunctionExecutionResult]) -> bool:
+    """
+    工具输出是否需要模型再汇总一次
+    转账工具都返回可以直接展示的中文句子（"用户 张三 的余额为: ..."），不需要汇总；
+    工具出错、输出为空或是 JSON 等结构化内容时仍然汇总
+    """
+    for result in results:
+        text = result.content.strip()
+        if result.is_error or not text:
+            return True
+        if text[0] in "{[":
+            try:
+                json.loads(text)
+                return True
+            except ValueError:
+                pass
+    return False
+
+
+class AdaptiveReflectionAgent(AssistantAgent):
+    """
+    按工具输出决定是否 reflect_on_tool_use 的 AssistantAgent
+    不需要汇总时直接以工具输出作为本次回复（与 reflect_on_tool_use=False 相同的 ToolCallSummaryMessage），
+    省掉一次模型调用；校验类工具之后模型本来就要在下一轮继续调用工具，汇总的那次调用纯属多余。
+    """
+
+    @classmethod
+    async def _reflect_on_tool_use_flow(cls, system_messages, model_client, model_client_stream, model_context,
+                                        workbench, handoff_tools, agent_name, inner_messages, output_content_type,
+                                        cancellation_token):
+        messages = await model_context.get_messages()
+        # 工具调用之后，上下文末尾依次是模型的工具调用和执行结果
+        results: List[FunctionExecutionResult] = []
+        calls = []
+        if len(messages) >= 2 and isinstance(messages[-1], FunctionExecutionResultMessage) \
+                and isinstance(messages[-2], AssistantMessage) and isinstance(messages[-2].content, list):
+            results, calls = messages[-1].content, messages[-2].content
+        if output_content_type is not None or not results or needs_reflection(results):
+            async for item in super()._reflect_on_tool_use_flow(
+                system_messages=system_messages,
+                model_client=model_client,
+                model_client_stream=model_client_stream,
+                model_context=model_context,
+                workbench=workbench,
+                handoff_tools=handoff_tools,
+                agent_name=agent_name,
+                inner_messages=inner_messages,
+                output_content_type=output_content_type,
+                cancellation_token=cancellation_token,
+            ):
+                yield item
+            return
+        response: Response = cls._summarize_tool_use(
+            executed_calls_and_results=list(zip(calls, results)),
+            inner_messages=inner_messages,
+            handoffs={},
+            tool_call_summary_format="{result}",
+            tool_call_summary_formatter=None,
+            agent_name=agent_name,
+        )
+        yield response
+
+# 模型上下文的 token 预算：超过 HISTORY_TOKEN_BUDGET 时，把较早的消息总结成摘要，
+# 只保留最近不超过 HISTORY_KEEP_TOKENS 的消息（与 LangGraph 版本相同）
+HISTORY_TOKEN_BUDGET = 3000
+HISTORY_KEEP_TOKENS = 1000
+
+summary_prompt = """
+请用简洁的中文总结以下转账对话，保留已确认的目标账户、金额、校验结果以及尚未完成的事项。
+"""
+
+
+def approx_tokens(messages: Sequence[LLMMessage]) -> int:
+    """粗略估算 token 数：中文约 2 个字符一个 token，每条消息另加少量开销"""
+    return sum(len(str(message.content)) // 2 + 4 for message in messages)
+
+
+class SummarizingContextState(ChatCompletionContextState):
+    summary: str = ""
+
+
+class SummarizingChatCompletionContext(ChatCompletionContext):
+    """
+    有 token 预算的模型上下文
+    - 消息总量超过 token_budget 时，把较早的消息交给模型总结，摘要与之前的摘要合并（滚动摘要），原消息从上下文中移除
+    - 保留的部分从用户消息处切分，工具调用和对应的结果不会被拆开
+    - 固定保留：上下文中的 SystemMessage，以及最近一次工具调用和结果，即使超出 keep_tokens
+    - 摘要以 SystemMessage 的形式放在保留的消息之前，随 save_state / load_state 一起保存
+    Args:
+        model_client: 生成摘要使用的模型
+        token_budget: 超过该 token 数时压缩
+        keep_tokens: 压缩后保留的最近消息的 token 数
+    """
+
+    def __init__(self, model_client: ChatCompletionClient, token_budget: int = HISTORY_TOKEN_BUDGET,
+                 keep_tokens: int = HISTORY_KEEP_TOKENS, initial_messages: Optional[List[LLMMessage]] = None):
+        super().__init__(initial_messages)
+        self.model_client = model_client
+        self.token_budget = token_budget
+        self.keep_tokens = keep_tokens
+        self.summary = ""
+        self.summaries = 0
+
+    def _split(self) -> int:
+        """返回保留部分的起始下标：最近 keep_tokens 以内、从用户消息开始"""
+        messages = self._messages
+        starts = [i for i, m in enumerate(messages) if isinstance(m, UserMessage)]
+        # 最近一次工具调用必须保留
+        last_call = max((i for i, m in enumerate(messages)
+                         if isinstance(m, AssistantMessage) and isinstance(m.content, list)), default=len(messages))
+        split = None
+        for start in reversed(starts):
+            if split is not None and approx_tokens(messages[start:]) > self.keep_tokens:
+                break
+            split = start
+        if split is None:
+            return 0
+        # 用户消息之后才开始的工具调用，从它之前的用户消息切分
+        return min([split] + [start for start in starts if start <= last_call][-1:])
+
+    async def _compact(self) -> None:
+        split = self._split()
+        dropped = [m for m in self._messages[:split] if not isinstance(m, SystemMessage)]
+        if not dropped:
+            return
+        history = "\n".join(f"{getattr(m, 'source', type(m).__name__)}: {m.content}" for m in dropped)
+        if self.summary:
+            history = f"之前的摘要：\n{self.summary}\n\n{history}"
+        result = await self.model_client.create(
+            [SystemMessage(content=summary_prompt), UserMessage(content=history, source="user")]
+        )
+        self.summary = str(result.content)
+        self.summaries += 1
+        pinned = [m for m in self._messages[:split] if isinstance(m, SystemMessage)]
+        self._messages = pinned + self._messages[split:]
+
+    async def get_messages(self) -> List[LLMMessage]:
+        if approx_tokens(self._messages) > self.token_budget:
+            await self._compact()
+        if not self.summary:
+            return list(self._messages)
+        pinned = [m for m in self._messages if isinstance(m, SystemMessage)]
+        rest = [m for m in self._messages if not isinstance(m, SystemMessage)]
+        return pinned + [SystemMessage(content=f"之前对话的摘要：\n{self.summary}")] + rest
+
+    async def clear(self) -> None:
+        await super().clear()
+        self.summary = ""
+
+    async def save_state(self) -> Mapping[str, Any]:
+        return SummarizingContextState(messages=self._messages, summary=self.summary).model_dump()
+
+    async def load_state(self, state: Mapping[str, Any]) -> None:
+        loaded = SummarizingContextState.model_validate(state)
+        self._messages = loaded.messages
+        self.summary = loaded.summary
+
 #tools
-get_balance_tool = FunctionTool(get_balance,description="查询余额")
-get_account_tool = FunctionTool(get_account,description="查询账户")
-execute_transfer_tool = FunctionTool(execute_transfer,description="执行转账")
-reply_to_user_tool = FunctionTool(reply_to_user,description="向用户提问")
+tools = autogen_adapter.create_tools()
 
-async def main():
-    # 创建转账助手 Agent
-    transfer_agent = AssistantAgent(
+def create_transfer_team(reply_tool=None, termination_condition=None, reflection="adaptive",
+                         summarize=True, **agent_kwargs):
+    """
+    创建一个转账会话（team）
+    Args:
+        reply_tool: 向用户提问的工具，默认是问答队列版本；HTTP 服务会换成直接返回提问的版本
+        termination_condition: 终止条件，默认在回复中出现 "DONE" 时结束
+        reflection: "adaptive" 只在工具输出需要时汇总（见 AdaptiveReflectionAgent），"always" 每次工具调用后都汇总
+        summarize: 使用有 token 预算的滚动摘要上下文（见 SummarizingChatCompletionContext），False 时保留全部历史
+        agent_kwargs: 覆盖 AssistantAgent 的其他参数
+    Returns:
+        RoundRobinGroupChat，模型客户端在所有会话间共享
+    """
+    options = dict(
         name="transfer_agent",
-        model_client=model_client,
+        model_client=get_model_client(),
         system_message=system_message,
-        tools=[get_balance_tool, get_account_tool, execute_transfer_tool, reply_to_user_tool],
+        tools=[reply_tool if reply_tool is not None and tool.name == "reply_to_user" else tool for tool in tools],
         model_client_stream=True,
         # 如果工具无法以自然语言返回格式正确的字符串,让模型汇总该工具的输出
         reflect_on_tool_use=True,
     )
-    
+    if summarize:
+        options["model_context"] = SummarizingChatCompletionContext(get_model_client())
+    options.update(agent_kwargs)
+    # 创建转账助手 Agent
+    agent_class = AdaptiveReflectionAgent if reflection == "adaptive" else AssistantAgent
+    transfer_agent = agent_class(**options)
+    if termination_condition is None:
+        termination_condition = TextMentionTermination("DONE")
+    return RoundRobinGroupChat([transfer_agent], termination_condition=termination_condition)
+
+async def save_team(team: RoundRobinGroupChat, path: str) -> None:
+    """把会话（消息历史、上下文摘要、轮转状态）保存为 JSON 文件"""
+    state = await team.save_state()
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(state, f, ensure_ascii=False, default=str)
+
+
+async def load_team(path: str, **kwargs) -> RoundRobinGroupChat:
+    """从 save_team 保存的文件恢复会话，kwargs 同 create_transfer_team"""
+    team = create_transfer_team(**kwargs)
+    with open(path, encoding="utf-8") as f:
+        await team.load_state(json.load(f))
+    return team
+
+async def open_team(session_file=None) -> RoundRobinGroupChat:
+    """创建会话；session_file 存在时从该文件恢复"""
+    if session_file and os.path.exists(session_file):
+        team = await load_team(session_file)
+        print(f"已恢复会话 {session_file}")
+        return team
+    return create_transfer_team()
+
+async def main():
+    """
+    命令行对话
+    设置了 AUTOGEN_SESSION_FILE 时，从该文件恢复会话，退出时保存到该文件
+    会话（以及模型客户端）在收到第一条消息时才创建，启动后立即显示提示符
+    """
     print("输入 'quit' 退出对话")
     print("=" * 50)
-    # 创建终止条件
-    text_termination = TextMentionTermination("DONE")
-    team = RoundRobinGroupChat([transfer_agent], termination_condition=text_termination)
+    session_file = os.getenv("AUTOGEN_SESSION_FILE")
+    team, frontend = None, None
     
     while True:
         try:
-            user_input = input("\n你: ").strip()
+            user_input = (await asyncio.to_thread(input, "\n你: ")).strip()
             
             if user_input.lower() in ['quit', 'exit', '退出']:
+                if session_file and team is not None:
+                    await save_team(team, session_file)
+                print(tool_cache.format_stats())
+                print(llm_cache.format_stats())
                 print("再见！")
                 break
             if not user_input:
                 continue
+            if team is None:
+                from autogen_agentchat.ui import Console
+
+                team = await open_team(session_file)
+                # 一个 team 即一个会话，工具结果缓存和问答队列按会话隔离
+                tool_cache.set_session(str(id(team)))
+                # reply_to_user 的提问由控制台前端在后台读取回答
+                frontend = asyncio.create_task(async_tools.console_frontend())
             # 运行任务
             await Console(team.run_stream(task=user_input))  # 异步运行
             
@@ -170,6 +335,8 @@ async def main():
             break
         except Exception as e:
             print(f"错误: {str(e)}")
+    if frontend is not None:
+        frontend.cancel()
 
 if __name__ == "__main__":
     asyncio.run(main())
\ No newline at end of file
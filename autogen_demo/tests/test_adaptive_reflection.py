@@ -0,0 +1,46 @@
+"""
+AdaptiveReflectionAgent 依赖的 AssistantAgent 私有方法
+
+AdaptiveReflectionAgent 覆盖 AssistantAgent._reflect_on_tool_use_flow 并调用 _summarize_tool_use。
+autogen-agentchat 改名或改动这两个方法的参数时，覆盖的方法不再被调用（agent 退化为每次都汇总），
+或者调用时报错；这里在升级时直接失败。
+
+    PYTHONPATH=transfer_common/src:autogen_demo/src python -m unittest discover -s autogen_demo/tests
+"""
+import inspect
+import unittest
+
+from autogen_agentchat.agents import AssistantAgent
+
+from autogen_transfer_agent import AdaptiveReflectionAgent
+
+# AdaptiveReflectionAgent 调用 _summarize_tool_use 时传入的参数
+SUMMARIZE_ARGUMENTS = {
+    "executed_calls_and_results", "inner_messages", "handoffs", "tool_call_summary_format",
+    "tool_call_summary_formatter", "agent_name",
+}
+
+
+def parameter_names(fn) -> list:
+    return list(inspect.signature(fn).parameters)
+
+
+class ReflectionHookTest(unittest.TestCase):
+    def test_reflect_hook_exists(self):
+        hook = inspect.getattr_static(AssistantAgent, "_reflect_on_tool_use_flow", None)
+        self.assertIsInstance(hook, classmethod, "AssistantAgent._reflect_on_tool_use_flow 不存在或不再是 classmethod")
+        self.assertTrue(inspect.isasyncgenfunction(AssistantAgent._reflect_on_tool_use_flow))
+
+    def test_override_matches_base_signature(self):
+        self.assertEqual(
+            parameter_names(AdaptiveReflectionAgent._reflect_on_tool_use_flow),
+            parameter_names(AssistantAgent._reflect_on_tool_use_flow),
+        )
+
+    def test_summarize_tool_use_arguments(self):
+        self.assertTrue(hasattr(AssistantAgent, "_summarize_tool_use"), "AssistantAgent._summarize_tool_use 不存在")
+        self.assertEqual(set(parameter_names(AssistantAgent._summarize_tool_use)), SUMMARIZE_ARGUMENTS)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,179 @@
+"""
+autogen 与 llama-index 转账 agent 的异步 reply_to_user 基准：一个事件循环中的多个会话，其中部分会话在等待用户回复
+
+同一进程内启动模拟模型服务（benchmarks/mock_llm.py），同时运行 --sessions 个会话:
+- 前 W 个会话发送 "给张三转500元，先向我确认"，按 CONFIRM_TRAJECTORY 并行校验后通过 reply_to_user 提问，
+  用户在 --human-delay 秒后才回答 "确认"
+- 其余会话发送 "给张三转500元"，按 TRANSFER_TRAJECTORY 校验后直接转账，不需要用户参与
+两种工具:
+- blocking: 原来的注册方式，全部是同步工具，reply_to_user 像 input() 一样阻塞等待回答（在框架的默认线程池中执行）
+- async:    transfer_common.async_tools，reply_to_user 等待会话的问答队列，回答由前端任务写入
+统计不需要用户参与的会话全部完成的时间（others）和等待回复的会话完成的时间（waiting）。
+默认线程池的线程数为 min(32, CPU 数 + 4)，blocking 时等待回复的会话数达到这个数，其他会话的工具调用就要等用户回答。
+模型缓存在基准中关闭。
+
+用法:
+    python benchmarks/bench_async_reply.py --sessions 16 --waiting 1 8 --human-delay 2 --llm-latency 0.05
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import sys
+import threading
+import time
+import uuid
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from mock_llm import CONFIRM_TRAJECTORY, TRANSFER_TRAJECTORY, MockLLM, Trajectory, _text, start_mock_llm
+from transfer_common import async_tools, ledger, tool_cache
+
+CONFIRM_REQUEST = "给张三转500元，先向我确认"
+TRANSFER_REQUEST = "给张三转500元"
+
+
+class SessionPolicy:
+    """用户要求确认的会话回放 CONFIRM_TRAJECTORY，其余回放 TRANSFER_TRAJECTORY"""
+
+    def __init__(self):
+        self.confirm = Trajectory(CONFIRM_TRAJECTORY)
+        self.transfer = Trajectory(TRANSFER_TRAJECTORY)
+
+    def __call__(self, messages: list, tools: list) -> dict:
+        asks = any("先向我确认" in _text(m) for m in messages if m.get("role") == "user")
+        return (self.confirm if asks else self.transfer)(messages, tools)
+
+
+def sync_tools(reply_to_user):
+    """原来注册给框架的同步工具，名字 -> 函数"""
+    return {
+        "get_balance": tool_cache.get_balance,
+        "get_account": tool_cache.get_account,
+        "execute_transfer": ledger.execute_transfer,
+        "reply_to_user": reply_to_user,
+    }
+
+
+def autogen_runner(agent, mode: str, blocking_reply):
+    from autogen_core.tools import FunctionTool
+
+    kwargs = {}
+    if mode == "blocking":
+        tools = [FunctionTool(fn, name=name, description=name) for name, fn in sync_tools(blocking_reply).items()]
+        kwargs = {"tools": tools}
+
+    async def run(text: str):
+        team = agent.create_transfer_team(**kwargs)
+        await team.run(task=text)
+
+    return run
+
+
+def llamaindex_runner(agent, mode: str, blocking_reply):
+    from llama_index.core.agent.workflow import FunctionAgent
+    from llama_index.core.tools import FunctionTool
+
+    transfer_agent = agent.transfer_agent
+    if mode == "blocking":
+        tools = [FunctionTool.from_defaults(fn=fn, name=name, description=name)
+                 for name, fn in sync_tools(blocking_reply).items()]
+        transfer_agent = FunctionAgent(tools=tools, prompt=agent.system_message, llm=agent.llm)
+
+    async def run(text: str):
+        await transfer_agent.run(text)
+
+    return run
+
+
+async def run_sessions(runner, mode: str, sessions: int, waiting: int, human_delay: float,
+                       released: threading.Event) -> dict:
+    start = time.perf_counter()
+    finished = {}
+
+    async def answer(session_id: str):
+        channel = async_tools.get_channel(session_id)
+        await channel.next_question()
+        await asyncio.sleep(max(0.0, human_delay - (time.perf_counter() - start)))
+        channel.answer("确认")
+
+    async def session(i: int):
+        session_id = uuid.uuid4().hex
+        asks = i < waiting
+        frontend = asyncio.create_task(answer(session_id)) if asks and mode == "async" else None
+        with tool_cache.session_scope(session_id):
+            await runner(CONFIRM_REQUEST if asks else TRANSFER_REQUEST)
+        finished[i] = time.perf_counter() - start
+        if frontend is not None:
+            frontend.cancel()
+        async_tools.close_channel(session_id)
+
+    # blocking 模式下，用户在 human_delay 秒后回答所有阻塞中的提问
+    asyncio.get_running_loop().call_later(human_delay, released.set)
+    await asyncio.gather(*(session(i) for i in range(sessions)))
+    released.set()
+    others = [t for i, t in finished.items() if i >= waiting]
+    asked = [t for i, t in finished.items() if i < waiting]
+    return {"others": max(others) if others else 0.0, "waiting": max(asked) if asked else 0.0}
+
+
+async def run(args) -> dict:
+    mock = MockLLM(SessionPolicy(), latency=args.llm_latency)
+    runner, base_url = await start_mock_llm(mock)
+    os.environ["QWEN3_MODEL"] = "mock-model"
+    os.environ["BAILIAN_API_KEY"] = "sk-mock"
+    os.environ["BAILIAN_API_BASE_URL"] = base_url
+    # llama-index 的 DashScope 走 DashScope 原生协议
+    os.environ["DASHSCOPE_HTTP_BASE_URL"] = base_url.replace("/v1", "/api/v1")
+    os.environ["LLM_CACHE"] = "0"
+    sys.path.insert(0, os.path.join(ROOT, "autogen_demo", "src"))
+    sys.path.insert(0, os.path.join(ROOT, "llamaindex_demo", "src"))
+    import autogen_transfer_agent
+    import llamaindex_transfer_agent
+
+    frameworks = {
+        "autogen": (autogen_transfer_agent, autogen_runner),
+        "llamaindex": (llamaindex_transfer_agent, llamaindex_runner),
+    }
+    results = {}
+    for name, (agent, make_runner) in frameworks.items():
+        for waiting in args.waiting:
+            for mode in ("blocking", "async"):
+                released = threading.Event()
+
+                def blocking_reply(content: str) -> str:
+                    """向用户提问，阻塞等待回答"""
+                    released.wait()
+                    return "确认"
+
+                ledger.set_ledger(ledger.Ledger({"我": 1e12, "张三": 0.0}))
+                with contextlib.redirect_stdout(io.StringIO()):
+                    r = await run_sessions(make_runner(agent, mode, blocking_reply), mode, args.sessions, waiting,
+                                           args.human_delay, released)
+                released.set()
+                r["completed"] = int(ledger.get_ledger().balance_of("张三") // 500)
+                results[(name, waiting, mode)] = r
+    await runner.cleanup()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=16)
+    parser.add_argument("--waiting", type=int, nargs="+", default=[1, 8])
+    parser.add_argument("--human-delay", type=float, default=2.0)
+    parser.add_argument("--llm-latency", type=float, default=0.05)
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    print(f"sessions={args.sessions} human_delay={args.human_delay}s llm_latency={args.llm_latency}s "
+          f"default_pool={min(32, (os.cpu_count() or 1) + 4)}")
+    print(f"{'framework':>11} {'waiting':>8} {'tools':>9} {'others done':>12} {'waiting done':>13} {'done':>5}")
+    for (name, waiting, mode), r in results.items():
+        print(f"{name:>11} {waiting:>8} {mode:>9} {r['others']:>11.2f}s {r['waiting']:>12.2f}s {r['completed']:>5}")
+
+
+if __name__ == "__main__":
+    main()
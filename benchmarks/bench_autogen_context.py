@@ -0,0 +1,93 @@
+"""
+autogen 转账 agent 长会话的模型上下文基准：保留全部历史（full）与滚动摘要（summarizing）
+
+同一进程内启动模拟模型服务（benchmarks/mock_llm.py），在同一个 team 中连续运行 --turns 轮 "给张三转500元"，
+每轮按 TRANSFER_TRAJECTORY 调用 get_account -> get_balance -> execute_transfer -> DONE。
+统计每轮发送给模型的 prompt token 数（含摘要请求）和耗时，输出第 1 轮、中间一轮和最后一轮。
+summarizing 模式在中间一轮之后用 save_team / load_team 把会话保存到文件再恢复，继续运行剩下的轮次。
+模型缓存在基准中关闭。
+
+用法:
+    python benchmarks/bench_autogen_context.py --turns 100 --llm-latency 0.02
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from mock_llm import TRANSFER_TRAJECTORY, MockLLM, Trajectory, start_mock_llm
+from transfer_common import ledger
+
+USER_REQUEST = "给张三转500元"
+
+
+async def run(turns: int, llm_latency: float) -> dict:
+    mock = MockLLM(Trajectory(TRANSFER_TRAJECTORY), latency=llm_latency)
+    runner, base_url = await start_mock_llm(mock)
+    os.environ["QWEN3_MODEL"] = "mock-model"
+    os.environ["BAILIAN_API_KEY"] = "sk-mock"
+    os.environ["BAILIAN_API_BASE_URL"] = base_url
+    os.environ["LLM_CACHE"] = "0"
+    sys.path.insert(0, os.path.join(ROOT, "autogen_demo", "src"))
+    import autogen_transfer_agent as agent
+
+    middle = turns // 2
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for mode in ("full", "summarizing"):
+            summarize = mode == "summarizing"
+            ledger.set_ledger(ledger.Ledger({"我": 1e12, "张三": 0.0}))
+            team = agent.create_transfer_team(summarize=summarize)
+            per_turn = []
+            state_bytes = 0
+            with contextlib.redirect_stdout(io.StringIO()):
+                for turn in range(1, turns + 1):
+                    mock.reset()
+                    start = time.perf_counter()
+                    await team.run(task=USER_REQUEST)
+                    per_turn.append((mock.stats()["prompt_tokens"], time.perf_counter() - start))
+                    if summarize and turn == middle:
+                        path = os.path.join(tmp, "team.json")
+                        await agent.save_team(team, path)
+                        state_bytes = os.path.getsize(path)
+                        team = await agent.load_team(path, summarize=True)
+            context = team._participants[0]._model_context
+            results[mode] = {
+                "per_turn": per_turn,
+                "state_bytes": state_bytes,
+                "summaries": getattr(context, "summaries", 0),
+                "completed": int(ledger.get_ledger().balance_of("张三") // 500),
+            }
+    await runner.cleanup()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--turns", type=int, default=100)
+    parser.add_argument("--llm-latency", type=float, default=0.02)
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args.turns, args.llm_latency))
+    shown = sorted({1, args.turns // 2 + 1, args.turns})
+    print(f"turns={args.turns} llm_latency={args.llm_latency}s")
+    print(f"{'context':>12} {'turn':>5} {'prompt tokens':>14} {'latency':>9}")
+    for mode, r in results.items():
+        for turn in shown:
+            tokens, seconds = r["per_turn"][turn - 1]
+            print(f"{mode:>12} {turn:>5} {tokens:>14} {seconds * 1000:>7.0f}ms")
+    for mode, r in results.items():
+        total = sum(tokens for tokens, _ in r["per_turn"])
+        print(f"{mode}: 共 {total} prompt tokens, 完成 {r['completed']} 笔转账, 摘要 {r['summaries']} 次"
+              + (f", 保存的会话 {r['state_bytes']} 字节" if r["state_bytes"] else ""))
+
+
+if __name__ == "__main__":
+    main()
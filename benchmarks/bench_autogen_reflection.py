@@ -0,0 +1,85 @@
+"""
+autogen 转账 agent 的 reflect_on_tool_use 基准：每次工具调用后都汇总（always）与按工具输出决定（adaptive）
+
+同一进程内启动模拟模型服务（benchmarks/mock_llm.py），每笔转账新建一个 team 运行 "给张三转500元" 直到回复 DONE:
+- transfer: TRANSFER_TRAJECTORY，get_account -> get_balance -> execute_transfer -> DONE
+- confirm:  CONFIRM_TRAJECTORY，并行校验 -> reply_to_user 确认（自动回答 "确认"）-> execute_transfer -> DONE
+汇总请求不带工具，模拟服务返回对上一步的文字总结（转账完成后返回带 DONE 的结果）。
+统计每笔转账的模型调用次数和耗时；模型缓存在基准中关闭。
+
+用法:
+    python benchmarks/bench_autogen_reflection.py --transfers 5 --llm-latency 0.05
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from mock_llm import CONFIRM_TRAJECTORY, TRANSFER_TRAJECTORY, MockLLM, Trajectory, start_mock_llm
+from transfer_common import ledger
+
+USER_REQUEST = "给张三转500元"
+TRAJECTORIES = {"transfer": TRANSFER_TRAJECTORY, "confirm": CONFIRM_TRAJECTORY}
+
+
+def confirm(content: str) -> str:
+    """替代控制台的 reply_to_user，一律确认"""
+    return "确认"
+
+
+async def run(transfers: int, llm_latency: float) -> dict:
+    mock = MockLLM(latency=llm_latency)
+    runner, base_url = await start_mock_llm(mock)
+    os.environ["QWEN3_MODEL"] = "mock-model"
+    os.environ["BAILIAN_API_KEY"] = "sk-mock"
+    os.environ["BAILIAN_API_BASE_URL"] = base_url
+    os.environ["LLM_CACHE"] = "0"
+    sys.path.insert(0, os.path.join(ROOT, "autogen_demo", "src"))
+    from autogen_core.tools import FunctionTool
+
+    import autogen_transfer_agent as agent
+
+    reply_tool = FunctionTool(confirm, name="reply_to_user", description="向用户提问")
+    results = {}
+    for scenario, steps in TRAJECTORIES.items():
+        mock.policy = Trajectory(steps)
+        for mode in ("always", "adaptive"):
+            ledger.set_ledger(ledger.Ledger({"我": 1e12, "张三": 0.0}))
+            mock.reset()
+            elapsed = []
+            with contextlib.redirect_stdout(io.StringIO()):
+                for _ in range(transfers):
+                    team = agent.create_transfer_team(reply_tool=reply_tool, reflection=mode)
+                    start = time.perf_counter()
+                    await team.run(task=USER_REQUEST)
+                    elapsed.append(time.perf_counter() - start)
+            results[(scenario, mode)] = {
+                "llm_calls": mock.stats()["llm_calls"] / transfers,
+                "transfer_ms": sum(elapsed) / transfers * 1000,
+                "completed": int(ledger.get_ledger().balance_of("张三") // 500),
+            }
+    await runner.cleanup()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--transfers", type=int, default=5)
+    parser.add_argument("--llm-latency", type=float, default=0.05)
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args.transfers, args.llm_latency))
+    print(f"transfers={args.transfers} llm_latency={args.llm_latency}s")
+    print(f"{'scenario':>9} {'reflection':>11} {'llm/xfer':>9} {'transfer':>10} {'done':>5}")
+    for (scenario, mode), r in results.items():
+        print(f"{scenario:>9} {mode:>11} {r['llm_calls']:>9.1f} {r['transfer_ms']:>8.0f}ms {r['completed']:>5}")
+
+
+if __name__ == "__main__":
+    main()
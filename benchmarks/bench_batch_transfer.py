@@ -0,0 +1,153 @@
+"""
+批量转账工具的模型调用次数基准
+
+LangGraph 转账 agent 向 N 个收款人各转一笔，模型为本地模拟服务（benchmarks/mock_llm.py），统计模型实际收到的请求数:
+- 逐笔: 模拟模型对每个收款人依次调用 get_account -> get_balance -> execute_transfer，全部转完后回复 DONE
+- 批量: get_accounts -> get_balances -> execute_transfers -> DONE
+模拟模型根据账本中尚未收到转账的收款人和上一次调用的工具决定下一步，历史被总结、截断后仍能继续；
+历史超出预算时 agent 发出的总结请求同样计入模型调用次数（summary 列）。
+端到端耗时为实际耗时，每次模型调用等待 --llm-latency 秒。
+逐笔转账时一条用户消息之后的图步数随 N 增长，超过 LangGraph 默认的 recursion_limit（25，约 8 次模型调用）；
+这里直接驱动图并放宽 recursion_limit，以便统计调用次数（agent 的 run_session 使用默认值，N >= 3 时会报错）。
+
+用法:
+    python benchmarks/bench_batch_transfer.py --llm-latency 0.05
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import sys
+import time
+import uuid
+
+os.environ.setdefault("QWEN3_MODEL", "mock-model")
+os.environ.setdefault("BAILIAN_API_KEY", "sk-mock")
+os.environ["LLM_CACHE"] = "0"
+os.environ.pop("LANGGRAPH_CHECKPOINT_DB", None)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "longgraph_demo", "src"))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from langgraph.types import Command
+
+from mock_llm import MockLLM, _new_call, start_mock_llm
+from transfer_common import ledger
+from transfer_common.ledger import Ledger, SELF_ACCOUNT
+
+RECIPIENTS = [1, 2, 5, 10, 20, 50, 100]
+AMOUNT = 500.0
+
+
+def last_tool_call(messages: list):
+    """最近一次工具调用的工具名，没有时返回 None"""
+    for message in reversed(messages):
+        if message.get("role") == "assistant" and message.get("tool_calls"):
+            return message["tool_calls"][-1]["function"]["name"]
+    return None
+
+
+def make_policy(mode: str, names: list, summaries: list):
+    """
+    模拟模型
+    Args:
+        mode: "seq" 逐笔 / "batch" 批量
+        summaries: 收到的总结请求，每次追加一项
+    """
+
+    def call(name: str, **arguments) -> dict:
+        return {"tool_calls": [_new_call(name, arguments)]}
+
+    def policy(messages: list, tools: list) -> dict:
+        if not tools:
+            summaries.append(1)
+            return {"content": "已向部分收款人转账，其余尚未完成。"}
+        book = ledger.get_ledger()
+        unpaid = [name for name in names if book.balance_of(name) < AMOUNT]
+        if not unpaid:
+            return {"content": "全部转账成功！DONE"}
+        last = last_tool_call(messages)
+        if mode == "seq":
+            if last == "get_account":
+                return call("get_balance", user_name=SELF_ACCOUNT)
+            if last == "get_balance":
+                return call("execute_transfer", to_user=unpaid[0], amount=AMOUNT)
+            return call("get_account", user_name=unpaid[0])
+        if last == "get_accounts":
+            return call("get_balances", user_names=[SELF_ACCOUNT])
+        if last == "get_balances":
+            return call("execute_transfers", to_users=unpaid, amounts=[AMOUNT] * len(unpaid))
+        return call("get_accounts", user_names=unpaid)
+
+    return policy
+
+
+async def run(agent, mock: MockLLM, mode: str, names: list) -> dict:
+    """向 names 中的每个收款人转一笔，返回模型调用次数、总结次数、耗时和是否转账正确"""
+    from langgraph.checkpoint.memory import InMemorySaver
+
+    ledger.set_ledger(Ledger({SELF_ACCOUNT: 1e9, **{name: 0.0 for name in names}}))
+    summaries = []
+    mock.policy = make_policy(mode, names, summaries)
+    mock.reset()
+    agent.set_transfer_graph(agent.create_transfer_graph(checkpointer=InMemorySaver(), fast_path=False))
+    request = f"给{'、'.join(names)}各转{AMOUNT:.0f}元"
+
+    async def get_reply(interrupt):
+        return request if interrupt["type"] == "user_input" else "确认"
+
+    # 与 run_session 相同的驱动方式，放宽 recursion_limit
+    config = {"configurable": {"thread_id": f"batch-{uuid.uuid4().hex}", "stream_tokens": False},
+              "recursion_limit": 10_000}
+    graph = agent.get_transfer_graph()
+    payload = {"messages": []}
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        while True:
+            result = await graph.ainvoke(payload, config)
+            if "__interrupt__" not in result:
+                break
+            payload = Command(resume=await get_reply(result["__interrupt__"][0].value))
+    elapsed = time.perf_counter() - start
+    book = ledger.get_ledger()
+    return {
+        "llm_calls": mock.requests,
+        "summaries": len(summaries),
+        "seconds": elapsed,
+        "correct": all(book.balance_of(name) == AMOUNT for name in names),
+    }
+
+
+async def main_async(args):
+    mock = MockLLM(latency=args.llm_latency)
+    runner, base_url = await start_mock_llm(mock)
+    os.environ["BAILIAN_API_BASE_URL"] = base_url
+    import langgraph_transfer_agent as agent
+
+    try:
+        # 预热：创建模型客户端、建立连接
+        await run(agent, mock, "batch", ["收款人0"])
+        print(f"llm_latency={args.llm_latency}s")
+        print(f"{'N':>4} | {'seq calls':>9} {'summary':>7} {'seq s':>7} | "
+              f"{'batch calls':>11} {'summary':>7} {'batch s':>7} | {'correct':>7}")
+        for n in args.recipients:
+            names = [f"收款人{i}" for i in range(n)]
+            seq = await run(agent, mock, "seq", names)
+            batch = await run(agent, mock, "batch", names)
+            print(f"{n:>4} | {seq['llm_calls']:>9} {seq['summaries']:>7} {seq['seconds']:>7.2f} | "
+                  f"{batch['llm_calls']:>11} {batch['summaries']:>7} {batch['seconds']:>7.2f} | "
+                  f"{str(seq['correct'] and batch['correct']):>7}")
+    finally:
+        await runner.cleanup()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--llm-latency", type=float, default=0.05, help="每次模型调用的等待时间（秒）")
+    parser.add_argument("--recipients", type=int, nargs="+", default=RECIPIENTS)
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
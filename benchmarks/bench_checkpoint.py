@@ -0,0 +1,101 @@
+"""
+LangGraph checkpointer 基准：增量存储 vs 每步完整快照
+
+在一个只追加消息的对话图上跑 --turns 轮，统计：
+- 每轮 checkpoint 写入耗时（put 的平均耗时）
+- 恢复耗时：新建 checkpointer 打开同一个数据库文件并读取最新状态
+- 数据库文件大小：主文件和 -wal 文件分开统计
+
+用法:
+    python benchmarks/bench_checkpoint.py --turns 500
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "longgraph_demo", "src"))
+
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.graph import END, START, MessagesState, StateGraph
+
+from delta_checkpoint import DeltaSQLiteSaver
+
+USER_LINE = "我想给张三转账五百元，请帮我确认一下余额是否足够。"
+REPLY = "好的，您的余额充足，目标账户张三存在。请确认是否向张三转账 500 元？"
+CHECKPOINTS = (10, 50, 100, 200, 500, 1000)
+
+
+def build_graph(checkpointer):
+    builder = StateGraph(MessagesState)
+    builder.add_node("reply", lambda state: {"messages": [AIMessage(content=REPLY)]})
+    builder.add_edge(START, "reply")
+    builder.add_edge("reply", END)
+    return builder.compile(checkpointer=checkpointer)
+
+
+class TimedSaver(DeltaSQLiteSaver):
+    """记录 put 耗时"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.put_seconds = []
+
+    def put(self, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return super().put(*args, **kwargs)
+        finally:
+            self.put_seconds.append(time.perf_counter() - start)
+
+
+def run(path: str, turns: int, **saver_kwargs):
+    """返回 [(轮数, 平均写入 ms, 恢复 ms, 主文件 KB, WAL KB), ...]"""
+    saver = TimedSaver(path, **saver_kwargs)
+    graph = build_graph(saver)
+    config = {"configurable": {"thread_id": "bench"}}
+    rows = []
+    for turn in range(1, turns + 1):
+        saver.put_seconds.clear()
+        graph.invoke({"messages": [HumanMessage(content=USER_LINE)]}, config)
+        put_ms = sum(saver.put_seconds) / len(saver.put_seconds) * 1000
+        if turn in CHECKPOINTS:
+            start = time.perf_counter()
+            resumed = DeltaSQLiteSaver(path, **saver_kwargs)
+            state = build_graph(resumed).get_state(config)
+            resume_ms = (time.perf_counter() - start) * 1000
+            assert len(state.values["messages"]) == turn * 2
+            resumed.close()
+            db_kb, wal_kb = (
+                os.path.getsize(path + suffix) / 1024 if os.path.exists(path + suffix) else 0.0
+                for suffix in ("", "-wal")
+            )
+            rows.append((turn, put_ms, resume_ms, db_kb, wal_kb))
+    saver.close()
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--turns", type=int, default=500)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # max_checkpoints=None: 不清理，单独观察存储方式的影响
+        full = run(os.path.join(tmp, "full.db"), args.turns, snapshot_every=1, max_checkpoints=None)
+        delta = run(os.path.join(tmp, "delta.db"), args.turns, max_checkpoints=None)
+        pruned = run(os.path.join(tmp, "pruned.db"), args.turns)
+
+    columns = f"{'put ms':>7} {'resume ms':>9} {'db KB':>7} {'wal KB':>7}"
+    print(f"{'turn':>5} | {columns} | {columns} | {'db KB':>7} {'wal KB':>7}")
+    print(f"{'':>5} | {'full snapshot':^33} | {'delta':^33} | {'pruned':^15}")
+    for f, d, p in zip(full, delta, pruned):
+        print(
+            f"{f[0]:>5} | {f[1]:>7.2f} {f[2]:>9.2f} {f[3]:>7.0f} {f[4]:>7.0f} "
+            f"| {d[1]:>7.2f} {d[2]:>9.2f} {d[3]:>7.0f} {d[4]:>7.0f} | {p[3]:>7.0f} {p[4]:>7.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
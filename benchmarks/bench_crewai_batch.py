@@ -0,0 +1,102 @@
+"""
+CrewaiDemo 批量报告基准：不同并发上限下的吞吐量与模型并发度，以及失败主题的续跑
+
+同一进程内启动模拟模型服务（benchmarks/mock_llm.py），每次模型调用以 ReAct 格式直接给出 Final Answer，
+每个主题调用两次模型（researcher、reporting_analyst）。在临时目录中依次运行:
+- 每个 --concurrency 取值各跑一遍全部 --topics 个主题（每次使用新的状态文件）
+- 续跑: 前 --failures 个主题的模型调用返回错误，第一遍之后恢复正常再运行一次，第二遍应只运行这些主题
+模型缓存在基准中关闭。
+
+用法:
+    python benchmarks/bench_crewai_batch.py --topics 16 --concurrency 1 4 8 --llm-latency 0.2
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import sys
+import tempfile
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from mock_llm import MockLLM, _text, start_mock_llm
+
+
+class ReportPolicy:
+    """直接给出 Final Answer；提示词中包含 failing 里的主题时抛出异常，模拟服务返回 500"""
+
+    def __init__(self):
+        self.failing = set()
+
+    def __call__(self, messages: list, tools: list) -> dict:
+        prompt = "\n".join(_text(m) for m in messages)
+        for topic in self.failing:
+            if topic in prompt:
+                raise RuntimeError(f"模拟的模型错误: {topic}")
+        return {"content": "Thought: I now know the final answer\nFinal Answer: - 要点一\n- 要点二\n- 要点三"}
+
+
+async def run(args) -> tuple:
+    policy = ReportPolicy()
+    mock = MockLLM(policy, latency=args.llm_latency)
+    runner, base_url = await start_mock_llm(mock)
+    os.environ["QWEN3_MODEL"] = "mock-model"
+    os.environ["BAILIAN_API_KEY"] = "sk-mock"
+    os.environ["BAILIAN_API_BASE_URL"] = base_url
+    os.environ["LLM_CACHE"] = "0"
+    os.environ["CREWAI_DISABLE_TELEMETRY"] = "true"
+    os.environ["OTEL_SDK_DISABLED"] = "true"
+    sys.path.insert(0, os.path.join(ROOT, "crewai_demo", "src"))
+    from crewai_demo import batch
+
+    topics = [f"主题 {i:03d}" for i in range(args.topics)]
+    results, resume = {}, []
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        # 报告写入相对于当前目录的 crewai_demo/output
+        os.chdir(tmp)
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                for concurrency in args.concurrency:
+                    mock.reset()
+                    status_file = os.path.join(tmp, f"status-{concurrency}.json")
+                    results[concurrency] = await batch.run_batch(topics, concurrency, status_file=status_file)
+
+                policy.failing = set(topics[:args.failures])
+                status_file = os.path.join(tmp, "status-resume.json")
+                concurrency = max(args.concurrency)
+                resume.append(await batch.run_batch(topics, concurrency, status_file=status_file))
+                policy.failing = set()
+                resume.append(await batch.run_batch(topics, concurrency, status_file=status_file))
+                reports = len(os.listdir(batch.REPORT_DIR))
+        finally:
+            os.chdir(cwd)
+    await runner.cleanup()
+    return results, resume, reports
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--topics", type=int, default=16)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--failures", type=int, default=3)
+    parser.add_argument("--llm-latency", type=float, default=0.2)
+    args = parser.parse_args()
+
+    results, resume, reports = asyncio.run(run(args))
+    print(f"topics={args.topics} llm_latency={args.llm_latency}s")
+    print(f"{'concurrency':>11} {'seconds':>8} {'topics/h':>9} {'speedup':>8} {'llm calls':>10} {'llm peak':>9} "
+          f"{'llm mean':>9} {'done':>5}")
+    base = results[args.concurrency[0]]["seconds"]
+    for concurrency, r in results.items():
+        print(f"{concurrency:>11} {r['seconds']:>8.2f} {r['topics_per_hour']:>9.0f} {base / r['seconds']:>7.1f}x "
+              f"{r['llm_calls']:>10} {r['llm_concurrency_peak']:>9} {r['llm_concurrency_mean']:>9.2f} {r['done']:>5}")
+    for label, r in zip(("第一遍", "续跑"), resume):
+        print(f"{label}: 成功 {r['done']}，失败 {r['failed']}，跳过 {r['skipped']}")
+    print(f"报告文件: {reports} 个")
+
+
+if __name__ == "__main__":
+    main()
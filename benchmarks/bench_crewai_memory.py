@@ -0,0 +1,195 @@
+"""
+crewAI 短期记忆和实体记忆的存储基准：默认的 ChromaDB 存储与 NumpyVectorStorage（crewai_demo/vector_memory.py）
+
+父进程启动模拟模型服务（benchmarks/mock_llm.py，/v1/embeddings 每次请求等待 --embedding-latency 秒），
+每种存储在独立的子进程中运行两项测试:
+- memory:  直接操作 ShortTermMemory 和 EntityMemory
+    cold start: 创建两种 memory，到第一次写入并检索完成为止
+    insert:     --inserts 次写入，每次一条短期记忆和两条实体记忆（实体描述会重复出现）
+    search:     --searches 次检索，每次分别检索短期记忆和实体记忆
+- session: TransferCrewSession 连续处理 --turns 轮 "给张三转500元"，记录每轮耗时
+NumpyVectorStorage 的写入先进入队列，embedding 在攒够一批或检索前计算，因此其写入耗时偏低、
+第一次检索包含了批量计算 embedding 的耗时，对比时应同时看 insert + search 的总耗时和 embedding 请求数。
+模型缓存在基准中关闭。
+
+用法:
+    python benchmarks/bench_crewai_memory.py --inserts 200 --searches 100 --turns 20 --embedding-latency 0.02
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(BENCH_DIR)
+USER_REQUEST = "给张三转500元"
+BACKENDS = ("chroma", "numpy")
+TESTS = ("memory", "session")
+
+
+def memory_worker(backend: str, inserts: int, searches: int) -> dict:
+    from crewai.memory import EntityMemory, ShortTermMemory
+    from crewai.memory.entity.entity_memory_item import EntityMemoryItem
+
+    from crewai_demo.vector_memory import create_memory
+
+    start = time.perf_counter()
+    options = create_memory(backend)
+    # Crew(memory=True) 未指定时创建的就是默认的 ChromaDB 存储
+    short_term = options.get("short_term_memory") or ShortTermMemory()
+    entities = options.get("entity_memory") or EntityMemory()
+    short_term.save("用户要求给张三转500元", {"task": "转账"}, agent="转账助手")
+    short_term.search("张三", limit=3)
+    cold_start = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for i in range(inserts):
+        short_term.save(f"第{i}轮：用户要求给张三转{500 + i}元，已校验账户和余额并完成转账", {"task": "转账"}, agent="转账助手")
+        entities.save(EntityMemoryItem("张三", "收款人", "转账的目标账户", "我 向 张三 转账"))
+        entities.save(EntityMemoryItem("我", "付款人", "当前用户的账户", "我 向 张三 转账"))
+    insert = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for i in range(searches):
+        short_term.search(f"给张三转{500 + i}元", limit=3)
+        entities.search("张三", limit=3)
+    search = time.perf_counter() - start
+    return {
+        "cold_start_ms": cold_start * 1000,
+        "insert_ms": insert / max(inserts, 1) * 1000,
+        "search_ms": search / max(searches, 1) * 1000,
+        "total_s": insert + search,
+    }
+
+
+def session_worker(backend: str, turns: int) -> dict:
+    from transfer_common import ledger
+
+    from crewai_demo import crewai_transfer_agent as agent
+
+    ledger.set_ledger(ledger.Ledger({"我": 1e12, "张三": 0.0}))
+    start = time.perf_counter()
+    session = agent.TransferCrewSession(memory_backend=backend)
+    cold_start = time.perf_counter() - start
+    latencies = []
+    for _ in range(turns):
+        start = time.perf_counter()
+        session.send(USER_REQUEST)
+        latencies.append(time.perf_counter() - start)
+    return {
+        "cold_start_ms": cold_start * 1000,
+        "turn_ms": sum(latencies) / max(turns, 1) * 1000,
+        "first_turn_ms": latencies[0] * 1000 if latencies else 0.0,
+        "transfers_completed": int(ledger.get_ledger().balance_of("张三") // 500),
+    }
+
+
+def run_worker(backend: str, test: str, args, result_file: str):
+    sys.path.insert(0, os.path.join(ROOT, "crewai_demo", "src"))
+    with contextlib.redirect_stdout(open(os.devnull, "w")):
+        # 先完成导入，冷启动只统计创建存储和第一次读写
+        import crewai  # noqa: F401
+
+        if test == "memory":
+            result = memory_worker(backend, args.inserts, args.searches)
+        else:
+            result = session_worker(backend, args.turns)
+    with open(result_file, "w", encoding="utf-8") as f:
+        json.dump(result, f)
+
+
+async def run_case(backend: str, test: str, base_url: str, args, tmp: str) -> dict:
+    result_file = os.path.join(tmp, f"{backend}-{test}.json")
+    workdir = os.path.join(tmp, f"{backend}-{test}")
+    os.makedirs(workdir)
+    env = dict(
+        os.environ,
+        QWEN3_MODEL="mock-model",
+        BAILIAN_API_KEY="sk-mock",
+        BAILIAN_API_BASE_URL=base_url,
+        # crewAI 的 memory 默认使用 OpenAI embedding，NumpyVectorStorage 默认也是
+        OPENAI_API_KEY="sk-mock",
+        OPENAI_BASE_URL=base_url,
+        XDG_DATA_HOME=os.path.join(workdir, "data"),
+        CREWAI_DISABLE_TELEMETRY="true",
+        OTEL_SDK_DISABLED="true",
+        ANONYMIZED_TELEMETRY="False",
+        LLM_CACHE="0",
+        PYTHONPATH=os.pathsep.join(filter(None, [os.path.join(ROOT, "transfer_common", "src"), os.environ.get("PYTHONPATH")])),
+    )
+    env.pop("LEDGER_DB_PATH", None)
+    env.pop("CREWAI_MEMORY_BACKEND", None)
+    process = await asyncio.create_subprocess_exec(
+        sys.executable, os.path.abspath(__file__), "--worker", backend, "--test", test,
+        "--inserts", str(args.inserts), "--searches", str(args.searches), "--turns", str(args.turns),
+        "--result-file", result_file,
+        env=env, cwd=workdir, stderr=asyncio.subprocess.PIPE,
+    )
+    _, stderr = await process.communicate()
+    if process.returncode != 0:
+        return {"error": stderr.decode(errors="replace")[-2000:]}
+    with open(result_file, encoding="utf-8") as f:
+        return json.load(f)
+
+
+async def run_all(args) -> dict:
+    sys.path.insert(0, BENCH_DIR)
+    from mock_llm import TRANSFER_TRAJECTORY, MockLLM, Trajectory, start_mock_llm
+
+    mock = MockLLM(Trajectory(TRANSFER_TRAJECTORY), latency=args.llm_latency, embedding_latency=args.embedding_latency)
+    runner, base_url = await start_mock_llm(mock)
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for test in TESTS:
+            for backend in BACKENDS:
+                mock.reset()
+                results[(test, backend)] = await run_case(backend, test, base_url, args, tmp)
+                results[(test, backend)]["embedding_calls"] = mock.stats()["embedding_calls"]
+    await runner.cleanup()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--inserts", type=int, default=200)
+    parser.add_argument("--searches", type=int, default=100)
+    parser.add_argument("--turns", type=int, default=20)
+    parser.add_argument("--llm-latency", type=float, default=0.01)
+    parser.add_argument("--embedding-latency", type=float, default=0.02)
+    parser.add_argument("--worker", choices=BACKENDS, help=argparse.SUPPRESS)
+    parser.add_argument("--test", choices=TESTS, help=argparse.SUPPRESS)
+    parser.add_argument("--result-file", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(args.worker, args.test, args, args.result_file)
+        return
+
+    results = asyncio.run(run_all(args))
+    print(f"inserts={args.inserts} searches={args.searches} turns={args.turns} "
+          f"llm_latency={args.llm_latency}s embedding_latency={args.embedding_latency}s")
+    print(f"{'backend':>8} {'cold start':>11} {'insert':>9} {'search':>9} {'total':>8} {'embeddings':>11}")
+    for backend in BACKENDS:
+        r = results[("memory", backend)]
+        if "error" in r:
+            print(f"{backend:>8} 失败: {r['error'].strip().splitlines()[-1]}")
+            continue
+        print(f"{backend:>8} {r['cold_start_ms']:>9.1f}ms {r['insert_ms']:>7.2f}ms {r['search_ms']:>7.2f}ms "
+              f"{r['total_s']:>7.2f}s {r['embedding_calls']:>11}")
+    print()
+    print(f"{'backend':>8} {'session init':>13} {'first turn':>11} {'turn mean':>10} {'emb/turn':>9} {'done':>5}")
+    for backend in BACKENDS:
+        r = results[("session", backend)]
+        if "error" in r:
+            print(f"{backend:>8} 失败: {r['error'].strip().splitlines()[-1]}")
+            continue
+        print(f"{backend:>8} {r['cold_start_ms']:>11.0f}ms {r['first_turn_ms']:>9.0f}ms {r['turn_ms']:>8.0f}ms "
+              f"{r['embedding_calls'] / max(args.turns, 1):>9.1f} {r['transfers_completed']:>5}")
+
+
+if __name__ == "__main__":
+    main()
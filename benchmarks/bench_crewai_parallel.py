@@ -0,0 +1,125 @@
+"""
+CrewaiDemo 并行 train / test 基准：1、4、8 个 worker 的耗时与加速比，以及汇总结果是否与 worker 数无关
+
+同一进程内启动模拟模型服务（benchmarks/mock_llm.py）:
+- agent 的调用以 ReAct 格式直接给出 Final Answer，训练中根据反馈改进后的回答同样如此
+- test 的评估调用返回 {"quality": ...}，分数由被评估的任务描述决定
+- 训练数据的汇总调用返回 TrainingTaskEvaluation 格式的 JSON
+训练时的人工反馈由固定文本代替。任务输出缓存和模型缓存在基准中关闭，每次迭代都完整运行。
+每个 worker 数分别运行 --iterations 次 test 和 train，汇总结果与 1 个 worker 时相同记为 same。
+
+用法:
+    python benchmarks/bench_crewai_parallel.py --iterations 8 --workers 1 4 8 --llm-latency 0.2
+"""
+import argparse
+import asyncio
+import builtins
+import contextlib
+import hashlib
+import io
+import json
+import os
+import pickle
+import sys
+import tempfile
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from mock_llm import MockLLM, _text, start_mock_llm
+
+INPUTS = {"topic": "AI LLMs", "current_year": "2025", "report_name": "report"}
+FEEDBACK = "请补充数据来源"
+
+
+def crew_policy(messages: list, tools: list) -> dict:
+    prompt = "\n".join(_text(m) for m in messages)
+    if "Assess the quality of the training data" in prompt:
+        return {"content": json.dumps({"suggestions": [FEEDBACK], "quality": 8.0, "final_summary": FEEDBACK})}
+    if "TaskEvaluationPydanticOutput" in prompt or "Evaluation Score from 1 to 10" in prompt:
+        # 不同任务得到不同但确定的分数
+        score = 6 + int(hashlib.sha1(prompt.split("task_expected_output:")[0].encode()).hexdigest(), 16) % 4
+        return {"content": json.dumps({"quality": score})}
+    return {"content": "Thought: I now know the final answer\nFinal Answer: - 要点一\n- 要点二\n- 要点三"}
+
+
+def run_mode(parallel, crew_factory, mode: str, iterations: int, workers: int, tmp: str):
+    """返回 (耗时, 汇总结果)"""
+    start = time.perf_counter()
+    if mode == "test":
+        evaluator = parallel.parallel_test(
+            crew_factory, iterations, "openai/mock-model", inputs=INPUTS, max_workers=workers, print_result=False
+        )
+        summary = {str(i): scores for i, scores in sorted(evaluator.tasks_scores.items())}
+    else:
+        filename = os.path.join(tmp, f"trained-{workers}.pkl")
+        merged = parallel.parallel_train(crew_factory, iterations, filename, inputs=INPUTS, max_workers=workers)
+        with open(filename, "rb") as f:
+            trained = pickle.load(f)
+        summary = {"iterations": {role: sorted(data) for role, data in merged.items()}, "trained": trained}
+    return time.perf_counter() - start, summary
+
+
+async def run(args) -> dict:
+    mock = MockLLM(crew_policy, latency=args.llm_latency)
+    runner, base_url = await start_mock_llm(mock)
+    os.environ.update(
+        QWEN3_MODEL="mock-model",
+        BAILIAN_API_KEY="sk-mock",
+        BAILIAN_API_BASE_URL=base_url,
+        OPENAI_API_KEY="sk-mock",
+        OPENAI_BASE_URL=base_url,
+        OPENAI_API_BASE=base_url,
+        LLM_CACHE="0",
+        TASK_CACHE="0",
+        CREWAI_DISABLE_TELEMETRY="true",
+        OTEL_SDK_DISABLED="true",
+    )
+    results = {}
+    cwd = os.getcwd()
+    input_fn = builtins.input
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["XDG_DATA_HOME"] = os.path.join(tmp, "data")
+        # training_data.pkl 和报告写入当前目录
+        os.chdir(tmp)
+        sys.path.insert(0, os.path.join(ROOT, "crewai_demo", "src"))
+        from crewai_demo import parallel
+        from crewai_demo.crew import CrewaiDemo
+
+        builtins.input = lambda *_: FEEDBACK
+        try:
+            for mode in ("test", "train"):
+                for workers in args.workers:
+                    mock.reset()
+                    with contextlib.redirect_stdout(io.StringIO()):
+                        seconds, summary = await asyncio.to_thread(
+                            run_mode, parallel, lambda: CrewaiDemo().crew(), mode, args.iterations, workers, tmp
+                        )
+                    results[(mode, workers)] = {"seconds": seconds, "summary": summary, "llm_calls": mock.stats()["llm_calls"]}
+        finally:
+            builtins.input = input_fn
+            os.chdir(cwd)
+    await runner.cleanup()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=8)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--llm-latency", type=float, default=0.2)
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    print(f"iterations={args.iterations} llm_latency={args.llm_latency}s")
+    print(f"{'mode':>5} {'workers':>8} {'seconds':>8} {'speedup':>8} {'llm calls':>10} {'result':>7}")
+    for (mode, workers), r in results.items():
+        base = results[(mode, args.workers[0])]
+        same = "same" if r["summary"] == base["summary"] else "DIFF"
+        print(f"{mode:>5} {workers:>8} {r['seconds']:>8.2f} {base['seconds'] / r['seconds']:>7.1f}x "
+              f"{r['llm_calls']:>10} {same:>7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+crewAI 转账 agent 的会话基准：每轮新建 Task 和 Crew(memory=True) 与复用同一个 TransferCrewSession
+
+父进程启动模拟模型服务（benchmarks/mock_llm.py，ReAct 文本格式回放 get_account -> get_balance -> execute_transfer），
+每种方式在独立的子进程中连续处理 --turns 轮 "给张三转500元"，记录每轮耗时和处理完该轮后的 RSS:
+- per_turn: 原来的做法，Agent 只创建一次，每轮新建 Task 和 Crew(memory=True)，memory 存储随之重新初始化
+- session:  TransferCrewSession，Crew、memory 存储和 embedding 配置只初始化一次，附带最近的对话
+模型缓存在基准中关闭。
+
+用法:
+    python benchmarks/bench_crewai_session.py --turns 100 --llm-latency 0.01
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(BENCH_DIR)
+USER_REQUEST = "给张三转500元"
+MODES = ("per_turn", "session")
+
+
+def current_rss_mb() -> float:
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def run_worker(mode: str, turns: int, result_file: str):
+    """子进程：连续处理 turns 轮转账请求"""
+    sys.path.insert(0, os.path.join(ROOT, "crewai_demo", "src"))
+    from transfer_common import ledger
+
+    with contextlib.redirect_stdout(open(os.devnull, "w")):
+        from crewai_demo import crewai_transfer_agent as agent
+
+        ledger.set_ledger(ledger.Ledger({"我": 1e12, "张三": 0.0}))
+        if mode == "session":
+            session = agent.TransferCrewSession()
+            send = session.send
+        else:
+            transfer_agent = agent.create_transfer_agent(agent.create_llm())
+
+            def send(user_input):
+                crew = agent.create_transfer_crew(transfer_agent)
+                return str(crew.kickoff(inputs={"user_input": user_input}))
+
+        latencies, rss = [], []
+        for _ in range(turns):
+            start = time.perf_counter()
+            send(USER_REQUEST)
+            latencies.append(time.perf_counter() - start)
+            rss.append(current_rss_mb())
+    with open(result_file, "w", encoding="utf-8") as f:
+        json.dump({
+            "latencies": latencies,
+            "rss_mb": rss,
+            "transfers_completed": int(ledger.get_ledger().balance_of("张三") // 500),
+        }, f)
+
+
+async def run_mode(mode: str, base_url: str, turns: int, tmp: str) -> dict:
+    result_file = os.path.join(tmp, f"{mode}.json")
+    env = dict(
+        os.environ,
+        QWEN3_MODEL="mock-model",
+        BAILIAN_API_KEY="sk-mock",
+        BAILIAN_API_BASE_URL=base_url,
+        # crewAI 的 memory 默认使用 OpenAI embedding
+        OPENAI_API_KEY="sk-mock",
+        OPENAI_BASE_URL=base_url,
+        XDG_DATA_HOME=os.path.join(tmp, f"{mode}-data"),
+        CREWAI_DISABLE_TELEMETRY="true",
+        OTEL_SDK_DISABLED="true",
+        # ChromaDB 的匿名统计
+        ANONYMIZED_TELEMETRY="False",
+        LLM_CACHE="0",
+        PYTHONPATH=os.pathsep.join(filter(None, [os.path.join(ROOT, "transfer_common", "src"), os.environ.get("PYTHONPATH")])),
+    )
+    env.pop("LEDGER_DB_PATH", None)
+    process = await asyncio.create_subprocess_exec(
+        sys.executable, os.path.abspath(__file__), "--worker", mode, "--turns", str(turns), "--result-file", result_file,
+        env=env, cwd=tmp, stderr=asyncio.subprocess.PIPE,
+    )
+    _, stderr = await process.communicate()
+    if process.returncode != 0:
+        return {"error": stderr.decode(errors="replace")[-2000:]}
+    with open(result_file, encoding="utf-8") as f:
+        return json.load(f)
+
+
+async def run_all(turns: int, llm_latency: float) -> dict:
+    sys.path.insert(0, BENCH_DIR)
+    from mock_llm import TRANSFER_TRAJECTORY, MockLLM, Trajectory, start_mock_llm
+
+    mock = MockLLM(Trajectory(TRANSFER_TRAJECTORY), latency=llm_latency)
+    runner, base_url = await start_mock_llm(mock)
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for mode in MODES:
+            mock.reset()
+            results[mode] = await run_mode(mode, base_url, turns, tmp)
+            results[mode]["llm"] = mock.stats()
+    await runner.cleanup()
+    return results
+
+
+def mean(values):
+    return sum(values) / len(values) * 1000 if values else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--turns", type=int, default=100)
+    parser.add_argument("--llm-latency", type=float, default=0.01)
+    parser.add_argument("--worker", choices=MODES, help=argparse.SUPPRESS)
+    parser.add_argument("--result-file", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(args.worker, args.turns, args.result_file)
+        return
+
+    results = asyncio.run(run_all(args.turns, args.llm_latency))
+    print(f"turns={args.turns} llm_latency={args.llm_latency}s")
+    print(f"{'mode':>9} {'first 10':>9} {'last 10':>9} {'mean':>8} {'rss t1':>7} {'rss mid':>8} {'rss end':>8} "
+          f"{'llm/turn':>9} {'emb/turn':>9} {'done':>5}")
+    for mode, r in results.items():
+        if "error" in r:
+            print(f"{mode:>9} 失败: {r['error'].strip().splitlines()[-1]}")
+            continue
+        lat, rss = r["latencies"], r["rss_mb"]
+        print(
+            f"{mode:>9} {mean(lat[:10]):>7.0f}ms {mean(lat[-10:]):>7.0f}ms {mean(lat):>6.0f}ms {rss[0]:>7.0f} "
+            f"{rss[len(rss) // 2]:>8.0f} {rss[-1]:>8.0f} {r['llm']['llm_calls'] / len(lat):>9.1f} "
+            f"{r['llm']['embedding_calls'] / len(lat):>9.1f} {r['transfers_completed']:>5}"
+        )
+
+
+if __name__ == "__main__":
+    main()
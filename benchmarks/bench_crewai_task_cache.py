@@ -0,0 +1,122 @@
+"""
+CrewaiDemo 任务输出缓存基准：research_task 的输出缓存对 run、test、replay 的影响
+
+同一进程内启动模拟模型服务（benchmarks/mock_llm.py），每次模型调用以 ReAct 格式直接给出 Final Answer。
+每种情况使用新的缓存文件，依次执行:
+- run:    --runs 次 kickoff（同一主题和年份）
+- test:   crew.test(n_iterations=--iterations)，评估用的模型同样指向模拟服务
+- replay: 从 research_task 开始 replay 最近一次 kickoff
+分别在 TASK_CACHE=0（off）和开启缓存（on）时运行，统计模型调用次数、token 数和耗时，以及缓存报告的节省量。
+模型缓存在基准中关闭，否则相同请求会被模型缓存直接返回。
+
+用法:
+    python benchmarks/bench_crewai_task_cache.py --runs 5 --iterations 3 --llm-latency 0.2
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from mock_llm import MockLLM, start_mock_llm
+
+INPUTS = {"topic": "AI LLMs", "current_year": "2025", "report_name": "report"}
+
+
+def report_policy(messages: list, tools: list) -> dict:
+    # crew.test 的评估模型要求按 TaskEvaluationPydanticOutput 输出 JSON，给出评分即可
+    if any("quality" in str(m.get("content")) for m in messages if m.get("role") == "system"):
+        return {"content": '{"quality": 9}'}
+    return {"content": "Thought: I now know the final answer\nFinal Answer: - 要点一\n- 要点二\n- 要点三"}
+
+
+def run_steps(crew_factory, args) -> dict:
+    """返回每一步的耗时"""
+    seconds = {}
+    start = time.perf_counter()
+    for _ in range(args.runs):
+        crew = crew_factory()
+        crew.kickoff(inputs=INPUTS)
+    seconds["run"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    crew_factory().test(n_iterations=args.iterations, eval_llm="openai/mock-model", inputs=INPUTS)
+    seconds["test"] = time.perf_counter() - start
+
+    # replay 读取最近一次 kickoff 保存的任务输出，research_task 是第一个任务
+    crew = crew_factory()
+    task_id = crew._task_output_handler.load()[0]["task_id"]
+    start = time.perf_counter()
+    crew.replay(task_id=task_id)
+    seconds["replay"] = time.perf_counter() - start
+    return seconds
+
+
+async def run(args) -> dict:
+    mock = MockLLM(report_policy, latency=args.llm_latency)
+    runner, base_url = await start_mock_llm(mock)
+    os.environ.update(
+        QWEN3_MODEL="mock-model",
+        BAILIAN_API_KEY="sk-mock",
+        BAILIAN_API_BASE_URL=base_url,
+        OPENAI_API_KEY="sk-mock",
+        OPENAI_BASE_URL=base_url,
+        OPENAI_API_BASE=base_url,
+        LLM_CACHE="0",
+        CREWAI_DISABLE_TELEMETRY="true",
+        OTEL_SDK_DISABLED="true",
+    )
+    results = {}
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["XDG_DATA_HOME"] = os.path.join(tmp, "data")
+        os.chdir(tmp)
+        sys.path.insert(0, os.path.join(ROOT, "crewai_demo", "src"))
+        from crewai_demo import task_cache
+        from crewai_demo.crew import CrewaiDemo
+
+        try:
+            for mode in ("off", "on"):
+                cache = task_cache.TaskOutputCache(os.path.join(tmp, f"{mode}.db")) if mode == "on" else None
+                task_cache.set_task_cache(cache)
+                mock.reset()
+                with contextlib.redirect_stdout(io.StringIO()):
+                    seconds = await asyncio.to_thread(run_steps, lambda: CrewaiDemo().crew(), args)
+                results[mode] = {
+                    "seconds": seconds,
+                    "llm": mock.stats(),
+                    "cache": cache.stats() if cache else None,
+                }
+        finally:
+            os.chdir(cwd)
+    await runner.cleanup()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--iterations", type=int, default=3)
+    parser.add_argument("--llm-latency", type=float, default=0.2)
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    print(f"runs={args.runs} test_iterations={args.iterations} llm_latency={args.llm_latency}s")
+    print(f"{'cache':>5} {'run':>7} {'test':>7} {'replay':>7} {'llm calls':>10} {'prompt tokens':>14}")
+    for mode, r in results.items():
+        s = r["seconds"]
+        print(f"{mode:>5} {s['run']:>6.2f}s {s['test']:>6.2f}s {s['replay']:>6.2f}s "
+              f"{r['llm']['llm_calls']:>10} {r['llm']['prompt_tokens']:>14}")
+    stats = results["on"]["cache"]
+    print(f"任务缓存: 命中 {stats['hits']} 次, 未命中 {stats['misses']} 次, "
+          f"节省 {stats['saved_seconds']:.2f} 秒, {stats['saved_tokens']} tokens")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,253 @@
+"""
+跨框架离线基准：五个转账 agent 在同一个模拟模型服务上完成同样的转账
+
+父进程启动模拟模型服务（benchmarks/mock_llm.py，回放 get_account -> get_balance -> execute_transfer -> DONE），
+每个框架在独立的子进程中运行它自己的对话入口（LangGraph 的 run_session，其余框架的 input() 循环），
+用户回复由脚本给出：每笔转账发送一次 "给张三转500元"，reply_to_user 提问时回答 "确认"。
+
+每个框架统计:
+- import_seconds: 导入转账 agent 模块的耗时
+- startup_seconds: 从进程启动到第一次等待用户输入的耗时
+- first_turn_ms / turn_ms_p50 / turn_ms_mean: 每轮端到端耗时（第一轮含建立连接等一次性开销）
+- overhead_ms_per_turn: 每轮平均耗时扣除模拟模型服务耗时后的框架开销
+- llm_calls_per_transfer / prompt_tokens_per_transfer: 每笔转账的模型调用次数与发送的 token 数（按字符数估算）
+- peak_rss_mb: 子进程的峰值 RSS
+- llm_cache: 子进程中模型响应缓存的命中统计（未启用时为 null）
+结果写入 --output 指定的 JSON 文件。
+
+用法:
+    python benchmarks/bench_frameworks.py --transfers 10 --llm-latency 0.02 --output bench_frameworks.json
+"""
+import time
+
+_PROCESS_START = time.perf_counter()
+
+import argparse
+import asyncio
+import builtins
+import contextlib
+import json
+import os
+import platform
+import resource
+import sys
+import tempfile
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(BENCH_DIR)
+USER_REQUEST = "给张三转500元"
+CONFIRM = "确认"
+
+# 框架名 -> (源码目录, 模块名)
+FRAMEWORKS = {
+    "langgraph": ("longgraph_demo/src", "langgraph_transfer_agent"),
+    "autogen": ("autogen_demo/src", "autogen_transfer_agent"),
+    "llamaindex": ("llamaindex_demo/src", "llamaindex_transfer_agent"),
+    "pydantic_ai": ("pydantic_demo/src", "pydantic_transfer_agent"),
+    "crewai": ("crewai_demo/src", "crewai_demo.crewai_transfer_agent"),
+}
+
+
+class ScriptedUser:
+    """替代 input()：用户轮次依次发送转账请求，最后发送 quit；reply_to_user 的提问一律确认"""
+
+    def __init__(self, transfers: int):
+        self.remaining = transfers
+        self.first_prompt = None
+        # 每次等待用户输入的时间点，相邻两次之间即为一轮
+        self.stamps = []
+
+    def reply(self, request_type: str) -> str:
+        now = time.perf_counter()
+        if self.first_prompt is None:
+            self.first_prompt = now
+        if request_type == "reply_to_user":
+            return CONFIRM
+        self.stamps.append(now)
+        if self.remaining == 0:
+            return "quit"
+        self.remaining -= 1
+        return USER_REQUEST
+
+    def input(self, prompt: str = "") -> str:
+        return self.reply("reply_to_user" if "reply" in prompt else "user_input")
+
+    def turns(self) -> list:
+        return [b - a for a, b in zip(self.stamps, self.stamps[1:])]
+
+
+def drive_langgraph(agent, user: ScriptedUser, transfers: int):
+    async def get_reply(request):
+        return user.reply(request["type"])
+
+    async def run_all():
+        for i in range(transfers):
+            await agent.run_session(f"bench-{i}", get_reply)
+        # 最后一笔转账的结束时间点
+        user.reply("user_input")
+
+    asyncio.run(run_all())
+
+
+def drive_repl(agent, user: ScriptedUser, transfers: int):
+    main = agent.main
+    real_input = builtins.input
+    builtins.input = user.input
+    try:
+        result = main()
+        if asyncio.iscoroutine(result):
+            asyncio.run(result)
+    finally:
+        builtins.input = real_input
+
+
+def run_worker(name: str, transfers: int, result_file: str):
+    """子进程：导入并运行一个框架的转账 agent"""
+    from transfer_common import ledger, llm_cache
+
+    src, module_name = FRAMEWORKS[name]
+    sys.path.insert(0, os.path.join(ROOT, src))
+    import importlib
+
+    user = ScriptedUser(transfers)
+    with contextlib.redirect_stdout(open(os.devnull, "w")):
+        start = time.perf_counter()
+        agent = importlib.import_module(module_name)
+        import_seconds = time.perf_counter() - start
+        ledger.set_ledger(ledger.Ledger({"我": 1e12, "张三": 0.0}))
+        driver = drive_langgraph if name == "langgraph" else drive_repl
+        driver(agent, user, transfers)
+    turns = user.turns()
+    cache = llm_cache.get_cache()
+    result = {
+        "import_seconds": import_seconds,
+        "startup_seconds": user.first_prompt - _PROCESS_START,
+        "turn_seconds": turns,
+        "transfers_completed": int(ledger.get_ledger().balance_of("张三") // 500),
+        # Linux 上 ru_maxrss 的单位是 KB
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "llm_cache": cache.stats() if cache is not None else None,
+    }
+    with open(result_file, "w", encoding="utf-8") as f:
+        json.dump(result, f)
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))] if values else 0.0
+
+
+async def run_framework(name: str, mock, base_url: str, transfers: int, tmp: str, extra_env: dict = None) -> dict:
+    """
+    在子进程中运行一个框架
+    Args:
+        extra_env: 额外的环境变量，例如模型缓存的配置
+    """
+    result_file = os.path.join(tmp, f"{name}.json")
+    env = dict(
+        os.environ,
+        QWEN3_MODEL="mock-model",
+        BAILIAN_API_KEY="sk-mock",
+        BAILIAN_API_BASE_URL=base_url,
+        # llama-index 的 DashScope 走 DashScope 原生协议
+        DASHSCOPE_HTTP_BASE_URL=base_url.replace("/v1", "/api/v1"),
+        # crewAI 的 memory 默认使用 OpenAI embedding
+        OPENAI_API_KEY="sk-mock",
+        OPENAI_BASE_URL=base_url,
+        XDG_DATA_HOME=os.path.join(tmp, f"{name}-data"),
+        CREWAI_DISABLE_TELEMETRY="true",
+        OTEL_SDK_DISABLED="true",
+        PYTHONPATH=os.pathsep.join(filter(None, [os.path.join(ROOT, "transfer_common", "src"), os.environ.get("PYTHONPATH")])),
+    )
+    env.pop("LEDGER_DB_PATH", None)
+    env.pop("LANGGRAPH_CHECKPOINT_DB", None)
+    env.pop("LLM_CACHE_PATH", None)
+    # 各框架都走模型调用工具的流程，LangGraph 不走规则解析的快速通道（见 bench_nlu_fast_path.py）
+    env["LANGGRAPH_FAST_PATH"] = "0"
+    env.update(extra_env or {})
+    mock.reset()
+    process = await asyncio.create_subprocess_exec(
+        sys.executable, os.path.abspath(__file__), "--worker", name, "--transfers", str(transfers),
+        "--result-file", result_file,
+        env=env, cwd=tmp, stderr=asyncio.subprocess.PIPE,
+    )
+    _, stderr = await process.communicate()
+    if process.returncode != 0:
+        return {"error": stderr.decode(errors="replace")[-2000:]}
+    with open(result_file, encoding="utf-8") as f:
+        worker = json.load(f)
+    llm = mock.stats()
+    turns = worker.pop("turn_seconds")
+    completed = max(worker["transfers_completed"], 1)
+    return {
+        **worker,
+        "turns": len(turns),
+        # 第一轮包含建立连接、懒加载等一次性开销，单独列出
+        "first_turn_ms": turns[0] * 1000 if turns else 0.0,
+        "turn_ms_p50": percentile(turns, 0.5) * 1000,
+        "turn_ms_mean": sum(turns) / max(len(turns), 1) * 1000,
+        "overhead_ms_per_turn": (sum(turns) - llm["llm_seconds"]) / max(len(turns), 1) * 1000,
+        "llm_calls_per_transfer": llm["llm_calls"] / completed,
+        "prompt_tokens_per_transfer": llm["prompt_tokens"] / completed,
+        "embedding_calls": llm["embedding_calls"],
+    }
+
+
+async def run_all(frameworks, transfers: int, llm_latency: float) -> dict:
+    sys.path.insert(0, BENCH_DIR)
+    from mock_llm import TRANSFER_TRAJECTORY, MockLLM, Trajectory, start_mock_llm
+
+    mock = MockLLM(Trajectory(TRANSFER_TRAJECTORY), latency=llm_latency)
+    runner, base_url = await start_mock_llm(mock)
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in frameworks:
+            results[name] = await run_framework(name, mock, base_url, transfers, tmp)
+    await runner.cleanup()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--frameworks", nargs="+", choices=list(FRAMEWORKS), default=list(FRAMEWORKS))
+    parser.add_argument("--transfers", type=int, default=10)
+    parser.add_argument("--llm-latency", type=float, default=0.02)
+    parser.add_argument("--output", default="bench_frameworks.json")
+    parser.add_argument("--worker", choices=list(FRAMEWORKS), help=argparse.SUPPRESS)
+    parser.add_argument("--result-file", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(args.worker, args.transfers, args.result_file)
+        return
+
+    results = asyncio.run(run_all(args.frameworks, args.transfers, args.llm_latency))
+    report = {
+        "config": {
+            "transfers": args.transfers,
+            "llm_latency": args.llm_latency,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        },
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+    print(f"{'framework':>12} {'import s':>9} {'startup s':>10} {'1st turn':>9} {'turn p50':>9} {'overhead ms':>12} "
+          f"{'llm/xfer':>9} {'tok/xfer':>9} {'rss MB':>7} {'done':>5}")
+    for name, r in results.items():
+        if "error" in r:
+            print(f"{name:>12} 失败: {r['error'].strip().splitlines()[-1]}")
+            continue
+        print(
+            f"{name:>12} {r['import_seconds']:>9.2f} {r['startup_seconds']:>10.2f} {r['first_turn_ms']:>9.1f} {r['turn_ms_p50']:>9.1f} "
+            f"{r['overhead_ms_per_turn']:>12.1f} {r['llm_calls_per_transfer']:>9.1f} "
+            f"{r['prompt_tokens_per_transfer']:>9.0f} {r['peak_rss_mb']:>7.0f} {r['transfers_completed']:>5}"
+        )
+    print(f"结果已写入 {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+"""
+LangGraph 转账图长对话基准：每轮耗时与 prompt 大小随轮数的变化
+
+对比两种实现（模型用本地假模型替代，耗时按 prompt token 数模拟）:
+- legacy: 节点返回 {**state, "messages": state["messages"] + [...]}，每轮发送完整历史
+- current: 节点只返回增量消息，历史超出 token 预算后总结并裁剪
+
+用法:
+    python benchmarks/bench_langgraph_history.py --turns 200 --per-token-us 20
+"""
+import argparse
+import asyncio
+import builtins
+import os
+import sys
+import time
+
+# 转账 agent 在导入时创建模型客户端，这里给出占位配置
+os.environ.setdefault("QWEN3_MODEL", "mock-model")
+os.environ.setdefault("BAILIAN_API_KEY", "sk-mock")
+os.environ.setdefault("BAILIAN_API_BASE_URL", "http://127.0.0.1:9/v1")
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "longgraph_demo", "src"))
+
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+from langchain_core.messages.utils import count_tokens_approximately
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.graph import END, START, StateGraph
+
+import langgraph_transfer_agent as agent
+
+REPLY = "好的，我已记录您的信息。请问还需要确认哪些转账细节？"
+USER_LINE = "我想确认一下转账给张三的金额，之前说的是五百元，对吗？"
+
+
+class FakeModel:
+    """假模型：按 prompt token 数 sleep，模拟模型预填充耗时"""
+
+    def __init__(self, per_token_s: float, reply: str):
+        self.per_token_s = per_token_s
+        self.reply = reply
+        self.prompt_tokens = []
+
+    def bind_tools(self, tools):
+        return self
+
+    def invoke(self, messages):
+        tokens = count_tokens_approximately(messages)
+        self.prompt_tokens.append(tokens)
+        time.sleep(tokens * self.per_token_s)
+        return AIMessage(content=self.reply)
+
+    async def ainvoke(self, messages):
+        tokens = count_tokens_approximately(messages)
+        self.prompt_tokens.append(tokens)
+        await asyncio.sleep(tokens * self.per_token_s)
+        return AIMessage(content=self.reply)
+
+
+class _Finished(Exception):
+    pass
+
+
+def legacy_call_model_transfer(state):
+    full_messages = [SystemMessage(content=agent.transfer_prompt)] + state["messages"]
+    response = agent.model_with_tools.invoke(full_messages)
+    return {**state, "messages": state["messages"] + [response]}
+
+
+def legacy_user_input(state):
+    return {**state, "messages": state["messages"] + [HumanMessage(content=input("你："))]}
+
+
+def create_legacy_graph():
+    workflow = StateGraph(agent.TransferState)
+    workflow.add_node("user_input", legacy_user_input)
+    workflow.add_node("call_model_transfer", legacy_call_model_transfer)
+    workflow.add_node("tools", agent.tools)
+    workflow.add_edge(START, "user_input")
+    workflow.add_edge("user_input", "call_model_transfer")
+    workflow.add_edge("tools", "call_model_transfer")
+    workflow.add_conditional_edges(
+        "call_model_transfer",
+        agent.is_tool_call,
+        {"tools": "tools", "user_input": "user_input", END: END},
+    )
+    return workflow.compile(checkpointer=InMemorySaver())
+
+
+def install_models(per_token_s: float) -> FakeModel:
+    main_model = FakeModel(per_token_s, REPLY)
+    agent.set_model_with_tools(main_model)
+    agent.set_model(FakeModel(per_token_s, "用户想给张三转账五百元，尚未确认。"))
+    return main_model
+
+
+def run_legacy(turns: int, per_token_s: float):
+    """返回 (每轮耗时列表, 每轮主模型 prompt token 数列表)"""
+    main_model = install_models(per_token_s)
+    graph = create_legacy_graph()
+    stamps = []
+
+    def fake_input(prompt=""):
+        stamps.append(time.perf_counter())
+        if len(stamps) > turns:
+            raise _Finished
+        return USER_LINE
+
+    real_input, real_print = builtins.input, builtins.print
+    builtins.input, builtins.print = fake_input, lambda *args, **kwargs: None
+    try:
+        graph.invoke({"messages": []}, {"configurable": {"thread_id": "bench"}, "recursion_limit": turns * 4 + 10})
+    except _Finished:
+        pass
+    finally:
+        builtins.input, builtins.print = real_input, real_print
+    latencies = [b - a for a, b in zip(stamps, stamps[1:])]
+    return latencies, main_model.prompt_tokens
+
+
+def run_current(turns: int, per_token_s: float):
+    """通过中断/恢复驱动当前的转账图，返回值同 run_legacy"""
+    main_model = install_models(per_token_s)
+    agent.set_transfer_graph(agent.create_transfer_graph())
+    stamps = []
+
+    async def get_reply(request):
+        stamps.append(time.perf_counter())
+        if len(stamps) > turns:
+            raise _Finished
+        return USER_LINE
+
+    real_print = builtins.print
+    builtins.print = lambda *args, **kwargs: None
+    try:
+        asyncio.run(agent.run_session("bench", get_reply))
+    except _Finished:
+        pass
+    finally:
+        builtins.print = real_print
+    latencies = [b - a for a, b in zip(stamps, stamps[1:])]
+    return latencies, main_model.prompt_tokens
+
+
+def window(values, turn, size=10):
+    chunk = values[max(0, turn - size):turn]
+    return sum(chunk) / len(chunk)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--turns", type=int, default=200)
+    parser.add_argument("--per-token-us", type=float, default=20.0, help="模拟的每 token 预填充耗时（微秒）")
+    args = parser.parse_args()
+    per_token_s = args.per_token_us / 1e6
+
+    legacy_latency, legacy_tokens = run_legacy(args.turns, per_token_s)
+    current_latency, current_tokens = run_current(args.turns, per_token_s)
+
+    print(f"{'turn':>5} {'legacy ms':>10} {'current ms':>11} {'legacy tok':>11} {'current tok':>12}")
+    for turn in (1, 10, 50, 100, 150, args.turns):
+        if turn > args.turns:
+            continue
+        print(
+            f"{turn:>5} {window(legacy_latency, turn) * 1000:>10.2f} {window(current_latency, turn) * 1000:>11.2f} "
+            f"{legacy_tokens[turn - 1]:>11} {current_tokens[turn - 1]:>12}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+LangGraph 转账图并发会话基准：一个进程、一个事件循环同时驱动 N 个 thread_id
+
+每个模拟用户走一遍完整流程（两次人工回复）:
+    "给张三转500元" -> get_account/get_balance -> reply_to_user 确认 -> "确认" -> execute_transfer -> DONE
+模型用异步假模型替代（--llm-latency 模拟模型耗时），用户回复前等待 --think-time 秒。
+统计每轮（从恢复执行到下一次中断/结束）的 p50/p99 延迟和每秒完成的会话数。
+
+用法:
+    python benchmarks/bench_langgraph_sessions.py --sessions 1 100 1000
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import sys
+import time
+import uuid
+
+os.environ.setdefault("QWEN3_MODEL", "mock-model")
+os.environ.setdefault("BAILIAN_API_KEY", "sk-mock")
+os.environ.setdefault("BAILIAN_API_BASE_URL", "http://127.0.0.1:9/v1")
+# 测的是模型调用工具的流程，不走规则解析的快速通道（见 bench_nlu_fast_path.py）
+os.environ.setdefault("LANGGRAPH_FAST_PATH", "0")
+# 各会话发送相同的消息，关闭共享响应缓存，每个会话都真正调用模型
+os.environ["LLM_CACHE"] = "0"
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "longgraph_demo", "src"))
+
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+
+import langgraph_transfer_agent as agent
+from transfer_common import ledger
+
+
+def _call(name: str, **args) -> dict:
+    return {"name": name, "args": args, "id": f"call_{uuid.uuid4().hex[:12]}", "type": "tool_call"}
+
+
+class ScriptedTransferModel:
+    """按对话进度返回固定工具调用轨迹的异步假模型"""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.calls = 0
+
+    def bind_tools(self, tools):
+        return self
+
+    async def ainvoke(self, messages):
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        last = messages[-1]
+        if isinstance(last, HumanMessage):
+            return AIMessage(content="", tool_calls=[_call("get_account", user_name="张三"), _call("get_balance", user_name="我")])
+        if isinstance(last, ToolMessage) and last.name in ("get_account", "get_balance"):
+            return AIMessage(content="", tool_calls=[_call("reply_to_user", content="确认向张三转账 500 元吗？")])
+        if isinstance(last, ToolMessage) and last.name == "reply_to_user":
+            return AIMessage(content="", tool_calls=[_call("execute_transfer", to_user="张三", amount=500.0)])
+        return AIMessage(content="转账成功！DONE")
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+async def simulate(sessions: int, think_time: float, latencies: list):
+    replies = {"user_input": "给张三转500元", "reply_to_user": "确认"}
+
+    async def one_session(i: int):
+        stamp = [0.0]
+
+        async def get_reply(request):
+            latencies.append(time.perf_counter() - stamp[0])
+            await asyncio.sleep(think_time)
+            stamp[0] = time.perf_counter()
+            return replies[request["type"]]
+
+        stamp[0] = time.perf_counter()
+        await agent.run_session(f"bench-{sessions}-{i}", get_reply)
+        latencies.append(time.perf_counter() - stamp[0])
+
+    await asyncio.gather(*(one_session(i) for i in range(sessions)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 100, 1000])
+    parser.add_argument("--llm-latency", type=float, default=0.05)
+    parser.add_argument("--think-time", type=float, default=0.5)
+    args = parser.parse_args()
+
+    agent.set_model_with_tools(ScriptedTransferModel(args.llm_latency))
+    print(f"{'sessions':>8} {'wall s':>8} {'sessions/s':>11} {'p50 ms':>8} {'p99 ms':>8}")
+    for sessions in args.sessions:
+        ledger.set_ledger(ledger.Ledger({"我": 1e12, "张三": 0.0}))
+        latencies = []
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            asyncio.run(simulate(sessions, args.think_time, latencies))
+        wall = time.perf_counter() - start
+        assert ledger.get_ledger().balance_of("张三") == 500.0 * sessions
+        print(
+            f"{sessions:>8} {wall:>8.2f} {sessions / wall:>11.1f} "
+            f"{percentile(latencies, 0.5) * 1000:>8.1f} {percentile(latencies, 0.99) * 1000:>8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
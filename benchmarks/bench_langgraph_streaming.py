@@ -0,0 +1,120 @@
+"""
+LangGraph 转账 agent 的流式输出基准：首 token 延迟（TTFT）与整轮耗时
+
+同一进程内启动慢速流式输出的模拟模型服务（benchmarks/mock_llm.py，文本和工具调用参数都逐块输出），
+用 run_session 依次完成若干笔转账，分别以两种方式运行:
+- blocking:  不传 on_token，每条回复生成完毕后整体打印，首次可见输出即打印出非空回复的时间
+- streaming: 传入 on_token，首次可见输出即收到第一块非空文本的时间
+两种方式都从用户发出 "给张三转500元" 开始计时，到本笔转账完成为止；
+工具调用参数是分块到达的，每笔转账都成功执行说明分块被正确拼接。
+模型缓存在基准中关闭，否则从第二笔起的响应直接来自缓存。
+
+用法:
+    python benchmarks/bench_langgraph_streaming.py --transfers 5 --llm-latency 0.05 --token-delay 0.02
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from mock_llm import TRANSFER_TRAJECTORY, MockLLM, Trajectory, start_mock_llm
+from transfer_common import ledger
+
+USER_REQUEST = "给张三转500元"
+
+
+class FirstOutput(io.StringIO):
+    """替代 stdout，记录第一次打印出非空回复的时间"""
+
+    def __init__(self):
+        super().__init__()
+        self.at = None
+
+    def write(self, text):
+        if self.at is None and text.startswith("转账助手：") and text[len("转账助手："):].strip():
+            self.at = time.perf_counter()
+        return super().write(text)
+
+
+async def one_transfer(agent, thread_id: str, streaming: bool) -> tuple:
+    """返回 (首次可见输出耗时, 整轮耗时)"""
+    started = None
+    first = None
+
+    async def get_reply(request):
+        nonlocal started
+        if request["type"] == "reply_to_user":
+            return "确认"
+        started = time.perf_counter()
+        return USER_REQUEST
+
+    async def on_token(chunk):
+        nonlocal first
+        if first is None and chunk.content:
+            first = time.perf_counter()
+
+    output = FirstOutput()
+    with contextlib.redirect_stdout(output):
+        await agent.run_session(thread_id, get_reply, on_token=on_token if streaming else None)
+    end = time.perf_counter()
+    if not streaming:
+        first = output.at
+    return first - started, end - started
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+async def run(transfers: int, llm_latency: float, token_delay: float, chunk_chars: int) -> dict:
+    mock = MockLLM(Trajectory(TRANSFER_TRAJECTORY), latency=llm_latency, token_delay=token_delay, chunk_chars=chunk_chars)
+    runner, base_url = await start_mock_llm(mock)
+    os.environ["QWEN3_MODEL"] = "mock-model"
+    os.environ["BAILIAN_API_KEY"] = "sk-mock"
+    os.environ["BAILIAN_API_BASE_URL"] = base_url
+    os.environ["LLM_CACHE"] = "0"
+    os.environ.pop("LANGGRAPH_CHECKPOINT_DB", None)
+    # 测的是模型的流式输出，不走规则解析的快速通道（见 bench_nlu_fast_path.py）
+    os.environ["LANGGRAPH_FAST_PATH"] = "0"
+    sys.path.insert(0, os.path.join(ROOT, "longgraph_demo", "src"))
+    import langgraph_transfer_agent as agent
+
+    results = {}
+    for mode in ("blocking", "streaming"):
+        ledger.set_ledger(ledger.Ledger({"我": 1e12, "张三": 0.0}))
+        rows = [await one_transfer(agent, f"{mode}-{i}", mode == "streaming") for i in range(transfers)]
+        results[mode] = {
+            "ttft": [r[0] for r in rows],
+            "total": [r[1] for r in rows],
+            "completed": int(ledger.get_ledger().balance_of("张三") // 500),
+        }
+    await runner.cleanup()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--transfers", type=int, default=5)
+    parser.add_argument("--llm-latency", type=float, default=0.05)
+    parser.add_argument("--token-delay", type=float, default=0.02)
+    parser.add_argument("--chunk-chars", type=int, default=2)
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args.transfers, args.llm_latency, args.token_delay, args.chunk_chars))
+    print(f"transfers={args.transfers} llm_latency={args.llm_latency}s token_delay={args.token_delay}s "
+          f"chunk_chars={args.chunk_chars}")
+    print(f"{'mode':>10} {'ttft p50':>9} {'total p50':>10} {'ttft/total':>11} {'done':>5}")
+    for mode, r in results.items():
+        ttft, total = percentile(r["ttft"], 0.5), percentile(r["total"], 0.5)
+        print(f"{mode:>10} {ttft * 1000:>7.0f}ms {total * 1000:>8.0f}ms {ttft / total:>11.0%} {r['completed']:>5}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+账本内存与查询延迟基准：dict-of-dict (accounts_db) vs transfer_common.ledger.Ledger
+
+用法:
+    python benchmarks/bench_ledger.py --min-exp 4 --max-exp 7
+"""
+import argparse
+import gc
+import random
+import time
+import tracemalloc
+
+from transfer_common.ledger import Ledger
+
+
+def build_dict_db(n: int) -> dict:
+    return {f"user{i}": {"balance": float(i)} for i in range(n)}
+
+
+def build_ledger(n: int) -> Ledger:
+    ledger = Ledger()
+    ledger.load((f"user{i}", float(i)) for i in range(n))
+    return ledger
+
+
+def measure_memory(builder, n: int):
+    """返回 (对象, 占用字节数)"""
+    gc.collect()
+    tracemalloc.start()
+    obj = builder(n)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return obj, current
+
+
+def measure_lookup(lookup, names, rounds: int = 3) -> float:
+    """返回每次查询的平均耗时（纳秒），取多轮最小值"""
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter_ns()
+        for name in names:
+            lookup(name)
+        best = min(best, (time.perf_counter_ns() - start) / len(names))
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--min-exp", type=int, default=4)
+    parser.add_argument("--max-exp", type=int, default=7)
+    parser.add_argument("--lookups", type=int, default=100_000)
+    args = parser.parse_args()
+
+    print(f"{'accounts':>12} {'dict MB':>10} {'ledger MB':>10} {'ratio':>7} {'dict ns':>9} {'ledger ns':>10}")
+    for exp in range(args.min_exp, args.max_exp + 1):
+        n = 10 ** exp
+        rng = random.Random(exp)
+        names = [f"user{rng.randrange(n)}" for _ in range(args.lookups)]
+
+        db, dict_bytes = measure_memory(build_dict_db, n)
+        dict_ns = measure_lookup(lambda name: db[name]["balance"], names)
+        del db
+
+        ledger, ledger_bytes = measure_memory(build_ledger, n)
+        ledger_ns = measure_lookup(ledger.balance_of, names)
+        del ledger
+
+        print(
+            f"{n:>12} {dict_bytes / 2**20:>10.1f} {ledger_bytes / 2**20:>10.1f} "
+            f"{dict_bytes / ledger_bytes:>6.2f}x {dict_ns:>9.0f} {ledger_ns:>10.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
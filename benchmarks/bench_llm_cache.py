@@ -0,0 +1,69 @@
+"""
+模型响应缓存基准：同样的转账在关闭缓存、冷缓存、热缓存三种情况下的模型调用次数与耗时
+
+复用 bench_frameworks.py 的子进程驱动，每个框架依次运行:
+- off:  LLM_CACHE=0
+- cold: 新建 LLM_CACHE_PATH 指向的缓存文件，进程内第一笔转账之后的相同请求命中内存缓存
+- warm: 再次使用 cold 留下的缓存文件启动新进程，从第一轮起即可命中
+
+每笔转账都是新会话，到 execute_transfer 为止的请求与上一笔完全相同；
+包含 execute_transfer 调用的响应不缓存，转账始终真正执行。
+
+用法:
+    python benchmarks/bench_llm_cache.py --transfers 10 --llm-latency 0.05
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, BENCH_DIR)
+
+from bench_frameworks import FRAMEWORKS, run_framework
+from mock_llm import TRANSFER_TRAJECTORY, MockLLM, Trajectory, start_mock_llm
+
+
+async def run_all(frameworks, transfers: int, llm_latency: float) -> dict:
+    mock = MockLLM(Trajectory(TRANSFER_TRAJECTORY), latency=llm_latency)
+    runner, base_url = await start_mock_llm(mock)
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in frameworks:
+            cache_path = os.path.join(tmp, f"{name}-llm-cache.db")
+            modes = {
+                "off": {"LLM_CACHE": "0"},
+                "cold": {"LLM_CACHE": "1", "LLM_CACHE_PATH": cache_path},
+                "warm": {"LLM_CACHE": "1", "LLM_CACHE_PATH": cache_path},
+            }
+            for mode, env in modes.items():
+                results[(name, mode)] = await run_framework(name, mock, base_url, transfers, tmp, env)
+    await runner.cleanup()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--frameworks", nargs="+", choices=list(FRAMEWORKS), default=list(FRAMEWORKS))
+    parser.add_argument("--transfers", type=int, default=10)
+    parser.add_argument("--llm-latency", type=float, default=0.05)
+    args = parser.parse_args()
+
+    results = asyncio.run(run_all(args.frameworks, args.transfers, args.llm_latency))
+    print(f"transfers={args.transfers} llm_latency={args.llm_latency}s")
+    print(f"{'framework':>12} {'cache':>6} {'turn mean':>10} {'llm/xfer':>9} {'hits':>6} {'misses':>7} "
+          f"{'skipped':>8} {'saved s':>8} {'done':>5}")
+    for (name, mode), r in results.items():
+        if "error" in r:
+            print(f"{name:>12} {mode:>6} 失败: {r['error'].strip().splitlines()[-1]}")
+            continue
+        stats = r["llm_cache"] or {"hits": 0, "misses": 0, "skipped": 0, "saved_seconds": 0.0}
+        print(
+            f"{name:>12} {mode:>6} {r['turn_ms_mean']:>8.1f}ms {r['llm_calls_per_transfer']:>9.1f} {stats['hits']:>6} "
+            f"{stats['misses']:>7} {stats['skipped']:>8} {stats['saved_seconds']:>8.2f} {r['transfers_completed']:>5}"
+        )
+
+
+if __name__ == "__main__":
+    main()
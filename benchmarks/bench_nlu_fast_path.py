@@ -0,0 +1,200 @@
+"""
+LangGraph 转账图快速通道基准：规则解析（transfer_common.nlu）能确定收款人和金额时不调用模型
+
+对一组样例请求，分别在关闭（fast_path=False，每条请求都交给模型）和开启快速通道时各跑一遍完整会话，
+每条请求一个 thread_id，reply_to_user 的确认问题一律回答 "确认"。
+模型为本地模拟服务（benchmarks/mock_llm.py，每次请求等待 --llm-latency 秒），按样例中标注的意图回放轨迹:
+    get_account + get_balance -> reply_to_user 确认 -> execute_transfer -> "转账成功 DONE"
+不需要转账的请求（否定、方向相反等）直接回复 DONE；系统提示中已有校验子图的校验结果时（规则解析出了收款人和金额、
+但没有把握），跳过查询直接确认。
+统计:
+- 模型调用次数、每条请求的端到端耗时（平均 / p50 / p99）
+- 走快速通道的请求数，以及两种方式执行后账本余额是否与样例标注一致（快速通道不能转错）
+- 规则解析本身每条消息的耗时
+
+用法:
+    python benchmarks/bench_nlu_fast_path.py --llm-latency 0.2 --rounds 3
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import statistics
+import sys
+import time
+import uuid
+
+os.environ.setdefault("QWEN3_MODEL", "mock-model")
+os.environ.setdefault("BAILIAN_API_KEY", "sk-mock")
+os.environ["LLM_CACHE"] = "0"
+os.environ.pop("LANGGRAPH_CHECKPOINT_DB", None)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "longgraph_demo", "src"))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from mock_llm import MockLLM, Trajectory, _text, start_mock_llm, tool_call_names
+from transfer_common import ledger, nlu
+
+ACCOUNTS = ["张三", "李四", "王五", "赵六"]
+
+# (请求, 意图中的转账 [(收款人, 金额)])
+CORPUS = [
+    ("给张三转500元", [("张三", 500)]),
+    ("给李四转五百块", [("李四", 500)]),
+    ("向王五转账一千二百元", [("王五", 1200)]),
+    ("转账给赵六两千块钱", [("赵六", 2000)]),
+    ("给张三转1.5万", [("张三", 15000)]),
+    ("帮我给李四转三万五", [("李四", 35000)]),
+    ("转5千元给王五", [("王五", 5000)]),
+    ("给赵六打1,200元", [("赵六", 1200)]),
+    ("给张三转一万五千元，先向我确认", [("张三", 15000)]),
+    ("麻烦向李四转八百八十八元", [("李四", 888)]),
+    ("给王五汇两百五十块", [("王五", 250)]),
+    ("给赵六转二十元", [("赵六", 20)]),
+    ("转给张三 300 元", [("张三", 300)]),
+    ("给李四转壹仟元", [("李四", 1000)]),
+    ("给张三转0.5万元", [("张三", 5000)]),
+    ("给王五转 3千5百 元", [("王五", 3500)]),
+    ("请给赵六转十万元", [("赵六", 100000)]),
+    ("给张三转１０００元", [("张三", 1000)]),
+    ("给李四转一千零五元", [("李四", 1005)]),
+    ("给张三转账500", [("张三", 500)]),
+    ("转一笔500元给赵六", [("赵六", 500)]),
+    ("给王五转一点五万", [("王五", 15000)]),
+    ("给赵六转1万5千", [("赵六", 15000)]),
+    # 以下交给模型
+    ("给张三和李四各转500元", [("张三", 500), ("李四", 500)]),
+    ("给张三、李四转500元", [("张三", 500), ("李四", 500)]),
+    ("给张三转500元，给李四转300元", [("张三", 500), ("李四", 300)]),
+    ("张三那边转500吧", [("张三", 500)]),
+    ("张三转500", [("张三", 500)]),
+    ("给张三转500元可以吗？", [("张三", 500)]),
+    ("不要给张三转500元", []),
+    ("让张三给我转500元", []),
+]
+# 校验结果写入系统提示时的开头，见 langgraph_transfer_agent.format_validation
+VALIDATED = "系统已从用户最新的消息中解析出转账信息并完成校验"
+
+
+def corpus_policy(messages: list, tools: list) -> dict:
+    """
+    按会话中第一条用户消息在样例中标注的意图回放轨迹
+    校验结果在执行转账后从系统提示中清除，之后按会话中已调用的工具判断走的是哪条轨迹
+    """
+    request = next(_text(m) for m in messages if m.get("role") == "user")
+    transfers = dict(CORPUS)[request]
+    if not transfers:
+        steps = [{"content": "好的，这笔转账不执行。DONE"}]
+    else:
+        names = [name for name, _ in transfers]
+        steps = [
+            {"tool_calls": [{"name": "reply_to_user", "arguments": {"content": f"确认执行以下转账吗？{transfers}"}}]},
+            {"tool_calls": [{"name": "execute_transfer", "arguments": {"to_user": name, "amount": float(amount)}}
+                            for name, amount in transfers]},
+            {"content": "转账成功！DONE"},
+        ]
+        called = tool_call_names(messages)
+        validated = VALIDATED in _text(messages[0]) or (called and "get_account" not in called)
+        if not validated:
+            steps.insert(0, {"tool_calls": [{"name": "get_account", "arguments": {"user_name": name}} for name in names]
+                             + [{"name": "get_balance", "arguments": {"user_name": ledger.SELF_ACCOUNT}}]})
+    return Trajectory(steps)(messages, tools)
+
+
+def reset_ledger():
+    ledger.set_ledger(ledger.Ledger({ledger.SELF_ACCOUNT: 10_000_000.0, **{name: 0.0 for name in ACCOUNTS}}))
+
+
+def expected_balances(rounds: int) -> dict:
+    balances = {name: 0.0 for name in ACCOUNTS}
+    for _, transfers in CORPUS:
+        for name, amount in transfers:
+            balances[name] += amount * rounds
+    return balances
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+async def run_mode(agent, mock: MockLLM, fast_path: bool, rounds: int) -> dict:
+    from langgraph.checkpoint.memory import InMemorySaver
+
+    reset_ledger()
+    mock.reset()
+    agent.set_transfer_graph(agent.create_transfer_graph(checkpointer=InMemorySaver(), fast_path=fast_path))
+    latencies = []
+    calls_per_request = []
+    for r in range(rounds):
+        for i, (text, _) in enumerate(CORPUS):
+            async def get_reply(request, text=text):
+                return text if request["type"] == "user_input" else "确认"
+
+            before = mock.requests
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                await agent.run_session(f"nlu-{fast_path}-{r}-{i}-{uuid.uuid4().hex[:6]}", get_reply)
+            latencies.append(time.perf_counter() - start)
+            calls_per_request.append(mock.requests - before)
+    book = ledger.get_ledger()
+    return {
+        "llm_calls": mock.requests,
+        "no_llm": sum(1 for calls in calls_per_request if calls == 0),
+        "latencies": latencies,
+        "correct": all(abs(book.balance_of(name) - amount) < 1e-6
+                       for name, amount in expected_balances(rounds).items()),
+    }
+
+
+def nlu_cost(iterations: int) -> float:
+    reset_ledger()
+    texts = [text for text, _ in CORPUS]
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for text in texts:
+            nlu.extract_transfer(text)
+    return (time.perf_counter() - start) / (iterations * len(texts))
+
+
+async def main_async(args):
+    mock = MockLLM(corpus_policy, latency=args.llm_latency)
+    runner, base_url = await start_mock_llm(mock)
+    os.environ["BAILIAN_API_BASE_URL"] = base_url
+    import langgraph_transfer_agent as agent
+
+    async def warm_up_reply(request):
+        return "张三转500" if request["type"] == "user_input" else "确认"
+
+    try:
+        # 预热：创建模型客户端、建立连接
+        reset_ledger()
+        with contextlib.redirect_stdout(io.StringIO()):
+            await agent.run_session("nlu-warm-up", warm_up_reply)
+        total = len(CORPUS) * args.rounds
+        print(f"requests={total} ({len(CORPUS)} x {args.rounds} rounds) llm_latency={args.llm_latency}s")
+        print(f"{'fast_path':>9} {'llm_calls':>9} {'calls/req':>9} {'no_llm':>7} "
+              f"{'mean':>8} {'p50':>8} {'p99':>8} {'correct':>7}")
+        for fast_path in (False, True):
+            result = await run_mode(agent, mock, fast_path, args.rounds)
+            latencies = result["latencies"]
+            print(f"{str(fast_path):>9} {result['llm_calls']:>9} {result['llm_calls'] / total:>9.2f} "
+                  f"{result['no_llm']:>3}/{total:<3} {statistics.mean(latencies) * 1000:>6.0f}ms "
+                  f"{percentile(latencies, 0.5) * 1000:>6.0f}ms {percentile(latencies, 0.99) * 1000:>6.0f}ms "
+                  f"{str(result['correct']):>7}")
+        print(f"nlu.extract_transfer: {nlu_cost(args.iterations) * 1e6:.1f}us/message")
+    finally:
+        await runner.cleanup()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--llm-latency", type=float, default=0.2)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+llama-index 与 pydantic-ai 转账 agent 的并行工具调用基准：工具依次执行（workers=1）与并发执行
+
+同一进程内启动模拟模型服务（benchmarks/mock_llm.py），模型按 PARALLEL_TRAJECTORY 回放:
+    [get_account 张三, get_account 李四, get_balance 我] -> [execute_transfer 张三, execute_transfer 李四] -> DONE
+每一步中的多个工具调用在同一条消息中发出。账本的每次查询和转账额外等待 --tool-latency 秒，模拟数据库或远程服务。
+工具线程池分别设置为 1 个线程（依次执行）和 --workers 个线程，统计每轮（一次 run 直到 DONE）的耗时，
+以及账本中同时进行的查询数、转账数的最大值（转账应始终为 1）。模型缓存在基准中关闭。
+
+用法:
+    python benchmarks/bench_parallel_tools.py --turns 10 --tool-latency 0.05 --llm-latency 0.02
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import sys
+import threading
+import time
+import uuid
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from mock_llm import SUCCESS, MockLLM, Trajectory, start_mock_llm
+from transfer_common import ledger, tool_cache, tool_executor
+
+PARALLEL_TRAJECTORY = [
+    {"tool_calls": [
+        {"name": "get_account", "arguments": {"user_name": "张三"}},
+        {"name": "get_account", "arguments": {"user_name": "李四"}},
+        {"name": "get_balance", "arguments": {"user_name": "我"}},
+    ]},
+    {"tool_calls": [
+        {"name": "execute_transfer", "arguments": {"to_user": "张三", "amount": 500.0}},
+        {"name": "execute_transfer", "arguments": {"to_user": "李四", "amount": 500.0}},
+    ]},
+    {"content": SUCCESS},
+]
+USER_REQUEST = "给张三和李四各转500元"
+
+
+class SlowLedger(ledger.Ledger):
+    """每次查询和转账等待 latency 秒，并记录同时进行的查询数和转账数的最大值"""
+
+    def __init__(self, accounts: dict, latency: float):
+        super().__init__(accounts)
+        self.latency = latency
+        self._count_lock = threading.Lock()
+        self.active = {"read": 0, "write": 0}
+        self.peak = {"read": 0, "write": 0}
+
+    @contextlib.contextmanager
+    def _track(self, kind: str):
+        with self._count_lock:
+            self.active[kind] += 1
+            self.peak[kind] = max(self.peak[kind], self.active[kind])
+        try:
+            time.sleep(self.latency)
+            yield
+        finally:
+            with self._count_lock:
+                self.active[kind] -= 1
+
+    def exists(self, name: str) -> bool:
+        with self._track("read"):
+            return super().exists(name)
+
+    def balance_of(self, name: str) -> float:
+        with self._track("read"):
+            return super().balance_of(name)
+
+    def transfer(self, from_user: str, to_user: str, amount: float) -> float:
+        with self._track("write"):
+            return super().transfer(from_user, to_user, amount)
+
+
+async def pydantic_turn(agent) -> None:
+    await agent.TransferSession().send(USER_REQUEST, toolsets=[])
+
+
+async def llamaindex_turn(agent) -> None:
+    # 每轮使用新的会话，工具缓存不会命中
+    with tool_cache.session_scope(uuid.uuid4().hex):
+        await agent.transfer_agent.run(USER_REQUEST)
+
+
+async def run(args) -> dict:
+    mock = MockLLM(Trajectory(PARALLEL_TRAJECTORY), latency=args.llm_latency)
+    runner, base_url = await start_mock_llm(mock)
+    os.environ["QWEN3_MODEL"] = "mock-model"
+    os.environ["BAILIAN_API_KEY"] = "sk-mock"
+    os.environ["BAILIAN_API_BASE_URL"] = base_url
+    # llama-index 的 DashScope 走 DashScope 原生协议
+    os.environ["DASHSCOPE_HTTP_BASE_URL"] = base_url.replace("/v1", "/api/v1")
+    os.environ["LLM_CACHE"] = "0"
+    sys.path.insert(0, os.path.join(ROOT, "pydantic_demo", "src"))
+    sys.path.insert(0, os.path.join(ROOT, "llamaindex_demo", "src"))
+    import llamaindex_transfer_agent
+    import pydantic_transfer_agent
+
+    frameworks = {
+        "pydantic-ai": (pydantic_transfer_agent, pydantic_turn),
+        "llamaindex": (llamaindex_transfer_agent, llamaindex_turn),
+    }
+    results = {}
+    for name, (agent, turn) in frameworks.items():
+        for workers in (1, args.workers):
+            tool_executor.set_tool_workers(workers)
+            book = SlowLedger({"我": 1e12, "张三": 0.0, "李四": 0.0}, args.tool_latency)
+            ledger.set_ledger(book)
+            elapsed = []
+            with contextlib.redirect_stdout(io.StringIO()):
+                for _ in range(args.turns):
+                    start = time.perf_counter()
+                    await turn(agent)
+                    elapsed.append(time.perf_counter() - start)
+            results[(name, workers)] = {
+                "turn_ms": sum(elapsed) / len(elapsed) * 1000,
+                "peak": dict(book.peak),
+                "completed": int(book.balance_of("李四") // 500),
+            }
+    await runner.cleanup()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--turns", type=int, default=10)
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--tool-latency", type=float, default=0.05)
+    parser.add_argument("--llm-latency", type=float, default=0.02)
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    print(f"turns={args.turns} tool_latency={args.tool_latency}s llm_latency={args.llm_latency}s")
+    print(f"{'framework':>12} {'workers':>8} {'turn':>9} {'peak reads':>11} {'peak writes':>12} {'done':>5}")
+    for (name, workers), r in results.items():
+        print(f"{name:>12} {workers:>8} {r['turn_ms']:>7.0f}ms {r['peak']['read']:>11} {r['peak']['write']:>12} "
+              f"{r['completed']:>5}")
+
+
+if __name__ == "__main__":
+    main()
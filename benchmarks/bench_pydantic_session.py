@@ -0,0 +1,165 @@
+"""
+pydantic-ai 转账 agent 的会话基准：每轮冷启动的 run_sync 与携带历史的 TransferSession
+
+模拟模型按可见的对话内容决策（而不是按固定轨迹回放）:
+- 不知道转给谁时询问目标账户，不知道金额时询问金额
+- 本次对话中还没有查过目标账户和余额时，先并行调用 get_account、get_balance
+- 信息齐全且已校验后调用 execute_transfer，之后回复 "转账成功 ... DONE"
+模拟用户先说 "我要给张三转账"，被问金额时回答 "500元"，被问目标账户时重复完整的请求 "给张三转500元"。
+
+- run_sync:  原来的做法，每轮 run_sync(user_input)，新的事件循环、没有 message_history
+- session:   一个事件循环内的 TransferSession，第一轮之后 suspend() 成 bytes 再 resume()，验证挂起与恢复
+统计完成一笔转账所需的轮数、模型调用次数、工具调用次数和每轮耗时，以及会话历史压缩前后的大小。
+模型缓存在基准中关闭。
+
+用法:
+    python benchmarks/bench_pydantic_session.py --transfers 5 --llm-latency 0.05
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import re
+import sys
+import threading
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from mock_llm import SUCCESS, MockLLM, _new_call, _text, start_mock_llm
+from transfer_common import ledger
+
+FIRST_REQUEST = "我要给张三转账"
+ASK_AMOUNT = "请问要转多少钱？"
+ASK_TARGET = "请问要转给谁？"
+MAX_TURNS = 6
+
+
+class ConversationPolicy:
+    """按对话中可见的信息决策的模拟模型，同时统计发出的工具调用次数"""
+
+    def __init__(self):
+        self.tool_calls = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, messages: list, tools: list) -> dict:
+        users = " ".join(_text(m) for m in messages if m.get("role") == "user")
+        called = [call["function"]["name"] for m in messages if m.get("role") == "assistant"
+                  for call in m.get("tool_calls") or ()]
+        target = "张三" if "张三" in users else None
+        amount = re.search(r"(\d+)\s*元", users)
+        if "execute_transfer" in called:
+            return {"content": SUCCESS}
+        if target is None:
+            return {"content": ASK_TARGET}
+        if "get_account" not in called:
+            return self._calls(("get_account", {"user_name": target}), ("get_balance", {"user_name": "我"}))
+        if amount is None:
+            return {"content": ASK_AMOUNT}
+        return self._calls(("execute_transfer", {"to_user": target, "amount": float(amount.group(1))}))
+
+    def _calls(self, *calls) -> dict:
+        with self._lock:
+            self.tool_calls += len(calls)
+        return {"tool_calls": [_new_call(name, arguments) for name, arguments in calls]}
+
+
+def user_reply(output: str) -> str:
+    if ASK_AMOUNT in output:
+        return "500元"
+    return "给张三转500元"
+
+
+def run_sync_transfer(agent) -> list:
+    """原来的做法：每轮一次 run_sync，返回每轮耗时"""
+    turns, message = [], FIRST_REQUEST
+    for _ in range(MAX_TURNS):
+        start = time.perf_counter()
+        output = agent.transfer_agent.run_sync(message, toolsets=[agent.console_toolset]).output
+        turns.append(time.perf_counter() - start)
+        if "DONE" in output:
+            break
+        message = user_reply(output)
+    return turns
+
+
+async def session_transfer(agent, sizes: dict) -> list:
+    """TransferSession：携带历史，第一轮后挂起再恢复"""
+    session = agent.TransferSession()
+    turns, message = [], FIRST_REQUEST
+    for i in range(MAX_TURNS):
+        start = time.perf_counter()
+        output = (await session.send(message)).output
+        turns.append(time.perf_counter() - start)
+        if "DONE" in output:
+            break
+        if i == 0:
+            session = agent.TransferSession.resume(session.suspend())
+        message = user_reply(output)
+    raw = agent.ModelMessagesTypeAdapter.dump_json(session.messages)
+    sizes["raw"] = len(raw)
+    sizes["compact"] = session.history_size
+    return turns
+
+
+async def run(transfers: int, llm_latency: float) -> dict:
+    policy = ConversationPolicy()
+    mock = MockLLM(policy, latency=llm_latency)
+    runner, base_url = await start_mock_llm(mock)
+    os.environ["QWEN3_MODEL"] = "mock-model"
+    os.environ["BAILIAN_API_KEY"] = "sk-mock"
+    os.environ["BAILIAN_API_BASE_URL"] = base_url
+    os.environ["LLM_CACHE"] = "0"
+    sys.path.insert(0, os.path.join(ROOT, "pydantic_demo", "src"))
+    import pydantic_transfer_agent as agent
+
+    results = {}
+    sizes = {}
+    # 先运行 session：run_sync 每轮新建事件循环，之后共享的 HTTP 客户端中会残留绑定在已关闭事件循环上的连接，
+    # 请求失败后由 openai 客户端重试（这也是原来逐轮 run_sync 的额外开销，计入 run_sync 的模型调用次数）
+    for mode in ("session", "run_sync"):
+        ledger.set_ledger(ledger.Ledger({"我": 1e12, "张三": 0.0}))
+        mock.reset()
+        policy.tool_calls = 0
+        turns = []
+        with contextlib.redirect_stdout(io.StringIO()):
+            for _ in range(transfers):
+                if mode == "run_sync":
+                    # run_sync 会自己创建事件循环，放到线程中运行，模拟服务所在的事件循环继续服务
+                    turns.append(await asyncio.to_thread(run_sync_transfer, agent))
+                else:
+                    turns.append(await session_transfer(agent, sizes))
+        flat = [t for transfer in turns for t in transfer]
+        completed = int(ledger.get_ledger().balance_of("张三") // 500)
+        results[mode] = {
+            "completed": completed,
+            "turns_per_transfer": len(flat) / transfers,
+            "llm_calls_per_transfer": mock.stats()["llm_calls"] / transfers,
+            "tool_calls_per_transfer": policy.tool_calls / transfers,
+            "turn_ms_mean": sum(flat) / len(flat) * 1000,
+            "transfer_ms_mean": sum(map(sum, turns)) / transfers * 1000,
+        }
+    await runner.cleanup()
+    return results, sizes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--transfers", type=int, default=5)
+    parser.add_argument("--llm-latency", type=float, default=0.05)
+    args = parser.parse_args()
+
+    results, sizes = asyncio.run(run(args.transfers, args.llm_latency))
+    print(f"transfers={args.transfers} llm_latency={args.llm_latency}s")
+    print(f"{'mode':>9} {'turns':>6} {'llm calls':>10} {'tool calls':>11} {'turn mean':>10} {'transfer':>9} {'done':>5}")
+    for mode, r in results.items():
+        print(f"{mode:>9} {r['turns_per_transfer']:>6.1f} {r['llm_calls_per_transfer']:>10.1f} "
+              f"{r['tool_calls_per_transfer']:>11.1f} {r['turn_ms_mean']:>8.1f}ms {r['transfer_ms_mean']:>7.0f}ms "
+              f"{r['completed']:>5}")
+    print(f"会话历史: JSON {sizes['raw']} 字节，压缩后 {sizes['compact']} 字节")
+
+
+if __name__ == "__main__":
+    main()
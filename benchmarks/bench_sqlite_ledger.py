@@ -0,0 +1,68 @@
+"""
+转账吞吐基准：内存账本 vs SQLite 逐笔提交 vs SQLite 组提交
+
+每个并发会话一个线程，循环执行 execute_transfer 等价的 ledger.transfer。
+
+用法:
+    python benchmarks/bench_sqlite_ledger.py --transfers 200
+"""
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+from transfer_common.ledger import Ledger
+from transfer_common.sqlite_ledger import SQLiteLedger
+
+ACCOUNTS = 1000
+SESSIONS = [1, 2, 4, 8, 16, 32, 64]
+
+
+def seed(ledger) -> None:
+    ledger.load((f"user{i}", 1e12) for i in range(ACCOUNTS))
+
+
+def run_sessions(ledger, sessions: int, transfers: int) -> float:
+    """返回 transfers/sec"""
+    barrier = threading.Barrier(sessions + 1)
+
+    def session(sid: int):
+        barrier.wait()
+        for i in range(transfers):
+            ledger.transfer(f"user{sid % ACCOUNTS}", f"user{(sid + i + 1) % ACCOUNTS}", 1.0)
+
+    threads = [threading.Thread(target=session, args=(sid,)) for sid in range(sessions)]
+    for t in threads:
+        t.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for t in threads:
+        t.join()
+    return sessions * transfers / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--transfers", type=int, default=200, help="每个会话执行的转账笔数")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        memory = Ledger()
+        seed(memory)
+        naive = SQLiteLedger(os.path.join(tmp, "naive.db"), max_batch=1, max_wait=0)
+        seed(naive)
+        grouped = SQLiteLedger(os.path.join(tmp, "grouped.db"))
+        seed(grouped)
+
+        print(f"{'sessions':>8} {'memory/s':>12} {'sqlite/s':>12} {'group/s':>12}")
+        for sessions in SESSIONS:
+            rates = [run_sessions(ledger, sessions, args.transfers) for ledger in (memory, naive, grouped)]
+            print(f"{sessions:>8} " + " ".join(f"{rate:>12.0f}" for rate in rates))
+
+        naive.close()
+        grouped.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+各框架转账 agent 的启动基准：导入耗时（-X importtime）和冷启动到第一个提示符的耗时
+
+每个 demo 分别在新的子进程中:
+- import: python -X importtime -c "import <模块>"，统计导入总耗时，以及按顶层包汇总的自身耗时（前 --top 个）
+- prompt: 以脚本方式运行 demo（python -u <脚本>），标准输入为管道，从启动到标准输出中出现提示符的耗时
+均取 --runs 次的中位数。模型服务地址指向一个不存在的本地端口，启动过程中如果访问网络会失败或超时（记为 fail）。
+
+用法:
+    python benchmarks/bench_startup.py --runs 3 --top 5
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+# demo 名 -> (源码目录, 模块名, 运行参数, 提示符)
+DEMOS = {
+    "langgraph": ("longgraph_demo/src", "langgraph_transfer_agent", ["longgraph_demo/src/langgraph_transfer_agent.py"], "你："),
+    "autogen": ("autogen_demo/src", "autogen_transfer_agent", ["autogen_demo/src/autogen_transfer_agent.py"], "你: "),
+    "llamaindex": ("llamaindex_demo/src", "llamaindex_transfer_agent", ["llamaindex_demo/src/llamaindex_transfer_agent.py"], "用户: "),
+    "pydantic_ai": ("pydantic_demo/src", "pydantic_transfer_agent", ["pydantic_demo/src/pydantic_transfer_agent.py"], "用户: "),
+    "crewai": ("crewai_demo/src", "crewai_demo.crewai_transfer_agent", ["-m", "crewai_demo.crewai_transfer_agent"], "你: "),
+}
+
+_IMPORT_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def demo_env(src: str, tmp: str) -> dict:
+    return dict(
+        os.environ,
+        PYTHONPATH=os.pathsep.join([os.path.join(ROOT, "transfer_common", "src"), os.path.join(ROOT, src)]),
+        QWEN3_MODEL="mock-model",
+        BAILIAN_API_KEY="sk-mock",
+        BAILIAN_API_BASE_URL="http://127.0.0.1:9/v1",
+        LLM_CACHE="0",
+        DIAGRAM_CACHE_DIR=os.path.join(tmp, "diagrams"),
+        ANONYMIZED_TELEMETRY="False",
+        CREWAI_DISABLE_TELEMETRY="true",
+        OTEL_SDK_DISABLED="true",
+    )
+
+
+def import_time(module: str, env: dict) -> tuple:
+    """返回 (导入总耗时秒, 顶层包 -> 自身耗时秒)"""
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                          env=env, cwd=ROOT, capture_output=True, text=True)
+    total, packages = 0.0, defaultdict(float)
+    for line in proc.stderr.splitlines():
+        match = _IMPORT_LINE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, name = match.groups()
+        packages[name.split(".")[0]] += int(self_us) / 1e6
+        if not indent.strip(" ") and len(indent) == 1 and name == module:
+            total = int(cumulative_us) / 1e6
+    return total, packages
+
+
+def time_to_prompt(args: list, prompt: str, env: dict, timeout: float) -> float:
+    """启动 demo 直到标准输出中出现提示符，返回耗时秒；超时或提前退出返回 None"""
+    start = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, "-u"] + args, env=env, cwd=ROOT,
+                            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    output = b""
+    try:
+        os.set_blocking(proc.stdout.fileno(), False)
+        while time.perf_counter() - start < timeout:
+            chunk = proc.stdout.read()
+            if chunk:
+                output += chunk
+                if prompt.encode() in output:
+                    return time.perf_counter() - start
+            elif proc.poll() is not None:
+                return None
+            time.sleep(0.005)
+        return None
+    finally:
+        proc.kill()
+        proc.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--top", type=int, default=5)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--demos", nargs="+", default=list(DEMOS))
+    args = parser.parse_args()
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in args.demos:
+            src, module, run_args, prompt = DEMOS[name]
+            env = demo_env(src, tmp)
+            imports = [import_time(module, env) for _ in range(args.runs)]
+            prompts = [time_to_prompt(run_args, prompt, env, args.timeout) for _ in range(args.runs)]
+            packages = defaultdict(list)
+            for _, breakdown in imports:
+                for package, seconds in breakdown.items():
+                    packages[package].append(seconds)
+            top = sorted(((statistics.median(v), k) for k, v in packages.items()), reverse=True)[:args.top]
+            results[name] = {
+                "import": statistics.median(total for total, _ in imports),
+                "prompt": None if None in prompts else statistics.median(prompts),
+                "top": top,
+            }
+
+    print(f"runs={args.runs}")
+    print(f"{'demo':>12} {'import':>8} {'to prompt':>10}  top packages (self time)")
+    for name, r in results.items():
+        prompt = f"{r['prompt']:>9.2f}s" if r["prompt"] is not None else f"{'fail':>10}"
+        top = ", ".join(f"{package} {seconds:.2f}s" for seconds, package in r["top"])
+        print(f"{name:>12} {r['import']:>7.2f}s {prompt}  {top}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,262 @@
+"""
+工具注册表基准：各框架创建转账工具的耗时，以及每次请求模型时生成工具 schema 的耗时
+
+两种方式:
+- legacy:   原来的注册方式，各框架由函数签名和文档生成 schema（LangGraph 的普通函数、autogen 的 FunctionTool、
+            llama-index 的 FunctionTool.from_defaults、pydantic-ai 的 Tool、crewAI 手写的 BaseTool 子类）
+- registry: transfer_common.tool_registry 中的定义和 *_adapter
+每个 (框架, 方式) 在新的子进程中运行 --runs 次，取中位数:
+- build: 框架和账本模块导入之后，创建全部工具所需的时间（registry 含导入注册表、生成 schema；
+  legacy 的 crewAI 含定义 BaseTool 子类，原来在模块导入时定义）。LangGraph 含 bind_tools 转换成 OpenAI 格式
+- schema: 框架每次请求模型时由工具对象生成 schema 的耗时（--iterations 次的平均值）:
+  autogen 为 [tool.schema ...]，llama-index 为 DashScope 转换工具格式，pydantic-ai 为 [tool.tool_def ...]，
+  crewAI 为每次 kickoff 的 [tool.to_structured_tool() ...]；LangGraph 在 bind_tools 时转换一次，每次请求没有开销（记为 -）
+
+用法:
+    python benchmarks/bench_tool_registry.py --runs 5 --iterations 200
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+FRAMEWORKS = ["langgraph", "autogen", "llamaindex", "pydantic_ai", "crewai"]
+MODES = ["legacy", "registry"]
+
+# 各框架需要预先导入的模块，不计入 build
+FRAMEWORK_IMPORTS = {
+    "langgraph": ["langgraph.prebuilt", "langchain_core.tools", "langchain_core.utils.function_calling"],
+    "autogen": ["autogen_core.tools"],
+    "llamaindex": ["llama_index.core.tools", "llama_index.llms.dashscope"],
+    "pydantic_ai": ["pydantic_ai", "pydantic_ai.toolsets"],
+    "crewai": ["crewai.tools"],
+}
+
+
+def reply_to_user(content: str) -> str:
+    """
+    向用户提问
+    Args:
+        content: 提问内容
+    Returns:
+        回答内容
+    """
+    return content
+
+
+def legacy_tools(framework: str):
+    """原来各框架的工具声明"""
+    from typing import List
+
+    from transfer_common import async_tools, ledger, tool_cache
+
+    if framework == "langgraph":
+        from langchain_core.utils.function_calling import convert_to_openai_tool
+        from langgraph.prebuilt import ToolNode
+
+        functions = [tool_cache.get_balance, tool_cache.get_account, reply_to_user, ledger.execute_transfer,
+                     tool_cache.get_balances, tool_cache.get_accounts, ledger.execute_transfers]
+        node = ToolNode(tools=functions)
+        [convert_to_openai_tool(fn) for fn in functions]
+        return list(node.tools_by_name.values())
+    if framework == "autogen":
+        from autogen_core.tools import FunctionTool
+
+        return [
+            FunctionTool(async_tools.get_balance, description="查询余额"),
+            FunctionTool(async_tools.get_account, description="查询账户"),
+            FunctionTool(async_tools.execute_transfer, description="执行转账"),
+            FunctionTool(async_tools.reply_to_user, description="向用户提问"),
+            FunctionTool(async_tools.get_balances, description="批量查询余额"),
+            FunctionTool(async_tools.get_accounts, description="批量查询账户"),
+            FunctionTool(async_tools.execute_transfers, description="批量执行转账，全部校验通过后一次性执行"),
+        ]
+    if framework == "llamaindex":
+        from llama_index.core.tools import FunctionTool
+
+        specs = [
+            ("get_account", tool_cache.get_account, async_tools.get_account, "获取指定用户的账户信息"),
+            ("get_balance", tool_cache.get_balance, async_tools.get_balance, "获取指定用户的余额信息"),
+            ("execute_transfer", ledger.execute_transfer, async_tools.execute_transfer, "执行转账操作"),
+            ("reply_to_user", None, async_tools.reply_to_user, "向用户提问"),
+            ("get_accounts", tool_cache.get_accounts, async_tools.get_accounts, "批量获取多个用户的账户信息"),
+            ("get_balances", tool_cache.get_balances, async_tools.get_balances, "批量获取多个用户的余额信息"),
+            ("execute_transfers", ledger.execute_transfers, async_tools.execute_transfers, "批量执行转账操作"),
+        ]
+        return [FunctionTool.from_defaults(fn=fn, async_fn=async_fn, name=name, description=description)
+                for name, fn, async_fn, description in specs]
+    if framework == "pydantic_ai":
+        from pydantic_ai import Tool
+
+        # @agent.tool_plain 即 Tool(fn, takes_ctx=False)
+        return [Tool(fn, takes_ctx=False) for fn in (
+            async_tools.get_balance, async_tools.get_account, async_tools.execute_transfer,
+            async_tools.get_accounts, async_tools.get_balances, async_tools.execute_transfers, reply_to_user,
+        )]
+    if framework == "crewai":
+        from crewai.tools import BaseTool
+
+        class GetAccountTool(BaseTool):
+            name: str = "get_account"
+            description: str = "获取指定用户是否存在"
+
+            def _run(self, user_name: str) -> str:
+                return tool_cache.get_account(user_name)
+
+        class GetBalanceTool(BaseTool):
+            name: str = "get_balance"
+            description: str = "获取指定用户余额"
+
+            def _run(self, user_name: str) -> str:
+                return tool_cache.get_balance(user_name)
+
+        class ExecuteTransferTool(BaseTool):
+            name: str = "execute_transfer"
+            description: str = "执行转账"
+
+            def _run(self, to_user: str, amount: float) -> str:
+                return ledger.execute_transfer(to_user, amount)
+
+        class GetAccountsTool(BaseTool):
+            name: str = "get_accounts"
+            description: str = "批量获取多个用户是否存在"
+
+            def _run(self, user_names: List[str]) -> str:
+                return tool_cache.get_accounts(user_names)
+
+        class GetBalancesTool(BaseTool):
+            name: str = "get_balances"
+            description: str = "批量获取多个用户余额"
+
+            def _run(self, user_names: List[str]) -> str:
+                return tool_cache.get_balances(user_names)
+
+        class ExecuteTransfersTool(BaseTool):
+            name: str = "execute_transfers"
+            description: str = "批量执行转账，to_users 与 amounts 一一对应，全部校验通过后一次性执行"
+
+            def _run(self, to_users: List[str], amounts: List[float]) -> str:
+                return ledger.execute_transfers(to_users, amounts)
+
+        class ReplyToUserTool(BaseTool):
+            name: str = "reply_to_user"
+            description: str = "向用户提问获取信息"
+
+            def _run(self, question: str) -> str:
+                return "用户即将回答"
+
+        return [GetAccountTool(), GetBalanceTool(), ExecuteTransferTool(), ReplyToUserTool(),
+                GetAccountsTool(), GetBalancesTool(), ExecuteTransfersTool()]
+    raise ValueError(framework)
+
+
+def registry_tools(framework: str):
+    """注册表的声明，与各 demo 中的用法相同"""
+    if framework == "langgraph":
+        from langchain_core.utils.function_calling import convert_to_openai_tool
+        from langgraph.prebuilt import ToolNode
+        from transfer_common.tool_registry import langchain_adapter
+
+        tools = langchain_adapter.create_tools({"reply_to_user": reply_to_user})
+        ToolNode(tools=tools)
+        [convert_to_openai_tool(tool) for tool in tools]
+        return tools
+    if framework == "autogen":
+        from transfer_common.tool_registry import autogen_adapter
+
+        return autogen_adapter.create_tools()
+    if framework == "llamaindex":
+        from transfer_common.tool_registry import llamaindex_adapter
+
+        return llamaindex_adapter.create_tools()
+    if framework == "pydantic_ai":
+        from transfer_common.tool_registry import get_spec, pydantic_ai_adapter
+
+        return pydantic_ai_adapter.create_tools(exclude=["reply_to_user"]) + [
+            pydantic_ai_adapter.create_tool(get_spec("reply_to_user"), reply_to_user)]
+    if framework == "crewai":
+        from transfer_common.tool_registry import crewai_adapter
+
+        return crewai_adapter.create_tools({"reply_to_user": lambda content: "用户即将回答"})
+    raise ValueError(framework)
+
+
+def per_request_schema(framework: str):
+    """返回框架每次请求模型时由工具生成 schema 的函数；没有这一步时返回 None"""
+    if framework == "autogen":
+        return lambda tools: [tool.schema for tool in tools]
+    if framework == "llamaindex":
+        from llama_index.llms.dashscope import DashScope
+
+        return lambda tools: [DashScope._convert_tool_to_dashscope_format(None, tool) for tool in tools]
+    if framework == "pydantic_ai":
+        return lambda tools: [tool.tool_def for tool in tools]
+    if framework == "crewai":
+        return lambda tools: [tool.to_structured_tool() for tool in tools]
+    return None
+
+
+def child(framework: str, mode: str, iterations: int) -> dict:
+    import importlib
+
+    for module in FRAMEWORK_IMPORTS[framework] + ["transfer_common.async_tools"]:
+        importlib.import_module(module)
+    start = time.perf_counter()
+    tools = (legacy_tools if mode == "legacy" else registry_tools)(framework)
+    build = time.perf_counter() - start
+
+    schema = per_request_schema(framework)
+    per_turn = None
+    if schema is not None:
+        schema(tools)
+        start = time.perf_counter()
+        for _ in range(iterations):
+            schema(tools)
+        per_turn = (time.perf_counter() - start) / iterations
+    return {"build": build, "schema": per_turn, "tools": len(tools)}
+
+
+def run_child(framework: str, mode: str, iterations: int) -> dict:
+    env = dict(
+        os.environ,
+        PYTHONPATH=os.path.join(ROOT, "transfer_common", "src"),
+        ANONYMIZED_TELEMETRY="False",
+        CREWAI_DISABLE_TELEMETRY="true",
+        OTEL_SDK_DISABLED="true",
+    )
+    proc = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--child", framework, mode, "--iterations", str(iterations)],
+        env=env, cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--frameworks", nargs="+", default=FRAMEWORKS)
+    parser.add_argument("--child", nargs=2, metavar=("FRAMEWORK", "MODE"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(child(*args.child, args.iterations)))
+        return
+
+    print(f"runs={args.runs} iterations={args.iterations}")
+    print(f"{'framework':>12} {'mode':>9} {'build':>9} {'schema/turn':>12}")
+    for framework in args.frameworks:
+        for mode in MODES:
+            results = [run_child(framework, mode, args.iterations) for _ in range(args.runs)]
+            build = statistics.median(r["build"] for r in results) * 1000
+            schema = [r["schema"] for r in results if r["schema"] is not None]
+            per_turn = f"{statistics.median(schema) * 1e6:>10.1f}us" if schema else f"{'-':>12}"
+            print(f"{framework:>12} {mode:>9} {build:>7.2f}ms {per_turn}")
+
+
+if __name__ == "__main__":
+    main()
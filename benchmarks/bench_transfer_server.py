@@ -0,0 +1,131 @@
+"""
+转账 HTTP 服务基准：请求吞吐（requests/s）与首 token 延迟（TTFT）
+
+同一进程内启动模拟 LLM（benchmarks/mock_llm.py）和转账服务，N 个模拟用户并发：
+创建会话 -> 通过 /stream 发送 "给张三转500元"、"确认" ... 直到本笔转账完成。
+TTFT 为发出请求到收到第一个 SSE 事件（token 或本轮只有提问时的 end 事件）的时间。
+
+用法:
+    python benchmarks/bench_transfer_server.py --backend langgraph --users 1 50 200
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+sys.path.insert(0, os.path.dirname(__file__))
+sys.path.insert(0, os.path.join(ROOT, "transfer_server", "src"))
+
+from aiohttp import ClientSession, TCPConnector, web
+
+from mock_llm import MockLLM, start_mock_llm
+from transfer_common import ledger
+
+MESSAGES = ["给张三转500元", "确认", "确认", "确认"]
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+async def stream_turn(client, url, content):
+    """返回 (ttft, 总耗时, end 事件)"""
+    start = time.perf_counter()
+    ttft, end = None, None
+    async with client.post(url, json={"content": content}) as response:
+        response.raise_for_status()
+        event = None
+        async for raw in response.content:
+            line = raw.decode().strip()
+            if line.startswith("event:"):
+                event = line[len("event:"):].strip()
+            elif line.startswith("data:"):
+                if ttft is None:
+                    ttft = time.perf_counter() - start
+                if event == "end":
+                    end = json.loads(line[len("data:"):])
+    return ttft, time.perf_counter() - start, end
+
+
+async def one_user(client, base, stats):
+    async with client.post(f"{base}/sessions") as response:
+        session_id = (await response.json())["session_id"]
+    for content in MESSAGES:
+        ttft, total, end = await stream_turn(client, f"{base}/sessions/{session_id}/stream", content)
+        stats["ttft"].append(ttft)
+        stats["latency"].append(total)
+        if end["status"] == "done":
+            stats["completed"] += 1
+            break
+    await client.delete(f"{base}/sessions/{session_id}")
+
+
+async def run(backend: str, users_list, llm_latency: float, token_delay: float, max_concurrent_turns: int):
+    mock = MockLLM(latency=llm_latency, token_delay=token_delay)
+    mock_runner, base_url = await start_mock_llm(mock)
+    # 转账 agent 在导入时读取模型配置，这里指向模拟服务
+    os.environ["QWEN3_MODEL"] = "mock-model"
+    os.environ["BAILIAN_API_KEY"] = "sk-mock"
+    os.environ["BAILIAN_API_BASE_URL"] = base_url
+    # llama-index 的 DashScope 走 DashScope 原生协议
+    os.environ["DASHSCOPE_HTTP_BASE_URL"] = base_url.replace("/v1", "/api/v1")
+    # 各后端都走模型调用工具的流程，LangGraph 不走规则解析的快速通道（见 bench_nlu_fast_path.py）
+    os.environ.setdefault("LANGGRAPH_FAST_PATH", "0")
+    # 模拟用户发送相同的消息，共享响应缓存会让后面的用户直接命中，不再请求模型
+    os.environ["LLM_CACHE"] = "0"
+    from transfer_server.app import create_app
+
+    app = create_app(backend, max_sessions=max(users_list) * 2, max_concurrent_turns=max_concurrent_turns,
+                     max_pending_turns=max(users_list) * 2)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    base = f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}"
+
+    rows = []
+    async with ClientSession(connector=TCPConnector(limit=0)) as client:
+        for users in users_list:
+            ledger.set_ledger(ledger.Ledger({"我": 1e12, "张三": 0.0}))
+            mock.reset()
+            stats = {"ttft": [], "latency": [], "completed": 0}
+            start = time.perf_counter()
+            await asyncio.gather(*(one_user(client, base, stats) for _ in range(users)))
+            wall = time.perf_counter() - start
+            assert stats["completed"] == users, stats["completed"]
+            assert ledger.get_ledger().balance_of("张三") == 500.0 * users
+            rows.append((users, len(stats["latency"]) / wall, percentile(stats["ttft"], 0.5),
+                         percentile(stats["ttft"], 0.99), percentile(stats["latency"], 0.5),
+                         mock.requests / users))
+    await runner.cleanup()
+    await mock_runner.cleanup()
+    return rows
+
+
+def main():
+    from transfer_server.backends import BACKENDS
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backend", choices=list(BACKENDS), default="langgraph")
+    parser.add_argument("--users", type=int, nargs="+", default=[1, 50, 200])
+    parser.add_argument("--llm-latency", type=float, default=0.05)
+    parser.add_argument("--token-delay", type=float, default=0.005)
+    parser.add_argument("--max-concurrent-turns", type=int, default=64)
+    args = parser.parse_args()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        rows = asyncio.run(run(args.backend, args.users, args.llm_latency, args.token_delay, args.max_concurrent_turns))
+    print(f"backend={args.backend} llm_latency={args.llm_latency}s max_concurrent_turns={args.max_concurrent_turns}")
+    print(f"{'users':>6} {'req/s':>8} {'ttft p50':>9} {'ttft p99':>9} {'turn p50':>9} {'llm calls/user':>15}")
+    for users, rps, ttft50, ttft99, lat50, calls in rows:
+        print(f"{users:>6} {rps:>8.1f} {ttft50 * 1000:>7.1f}ms {ttft99 * 1000:>7.1f}ms {lat50 * 1000:>7.1f}ms {calls:>15.1f}")
+
+
+if __name__ == "__main__":
+    main()
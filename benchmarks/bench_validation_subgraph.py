@@ -0,0 +1,182 @@
+"""
+LangGraph 转账图校验子图基准：每笔转账的模型调用次数和耗时
+
+三种流程，每笔转账一个 thread_id，reply_to_user 的确认问题一律回答 "确认":
+- model:    关闭快速通道（LANGGRAPH_FAST_PATH=0），模型逐个决定查询，每次查询后再调用一次模型
+            get_account -> get_balance -> reply_to_user 确认 -> execute_transfer -> DONE（5 次模型调用）
+- subgraph: 规则能解析出收款人和金额、但没有把握的请求（例如 "张三转500"）。校验子图并行查询账户和余额，
+            结果写入状态和系统提示，模型只需措辞确认: reply_to_user -> execute_transfer -> DONE（3 次）
+- fast:     规则有把握的请求（例如 "给张三转500元"），校验、确认、执行都不调用模型（0 次）
+模型为本地模拟服务（benchmarks/mock_llm.py，每次请求等待 --llm-latency 秒）。
+另外统计校验本身的耗时：校验子图（并行）与依次查询账户、余额（串行），--ledger sqlite 时查询走 SQLite 账本。
+
+用法:
+    python benchmarks/bench_validation_subgraph.py --llm-latency 0.2 --transfers 20 --ledger sqlite
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+
+os.environ.setdefault("QWEN3_MODEL", "mock-model")
+os.environ.setdefault("BAILIAN_API_KEY", "sk-mock")
+os.environ["LLM_CACHE"] = "0"
+os.environ.pop("LANGGRAPH_CHECKPOINT_DB", None)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "longgraph_demo", "src"))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from mock_llm import MockLLM, Trajectory, _text, start_mock_llm, tool_call_names
+from transfer_common import ledger
+
+ACCOUNTS = ["张三", "李四", "王五", "赵六"]
+# 规则解析不出把握的请求，(请求, 收款人, 金额)
+UNSURE_REQUESTS = [
+    ("张三转500", "张三", 500.0),
+    ("李四那边转八百块吧", "李四", 800.0),
+    ("给王五转1000元可以吗？", "王五", 1000.0),
+    ("帮赵六转账两千", "赵六", 2000.0),
+]
+# 规则有把握的请求
+SURE_REQUESTS = [
+    ("给张三转500元", "张三", 500.0),
+    ("给李四转八百块", "李四", 800.0),
+    ("向王五转账1000元", "王五", 1000.0),
+    ("转账给赵六两千元", "赵六", 2000.0),
+]
+INTENTS = {text: (name, amount) for text, name, amount in UNSURE_REQUESTS + SURE_REQUESTS}
+# 校验结果写入系统提示时的开头，见 langgraph_transfer_agent.format_validation
+VALIDATED = "系统已从用户最新的消息中解析出转账信息并完成校验"
+
+
+def transfer_policy(messages: list, tools: list) -> dict:
+    """
+    系统提示中已有校验结果时直接确认，否则逐个查询账户和余额
+    校验结果在执行转账后从系统提示中清除，之后按会话中已调用的工具判断走的是哪条轨迹
+    """
+    request = next(_text(m) for m in messages if m.get("role") == "user")
+    name, amount = INTENTS[request]
+    steps = [
+        {"tool_calls": [{"name": "reply_to_user", "arguments": {"content": f"确认向{name}转账 {amount} 元吗？"}}]},
+        {"tool_calls": [{"name": "execute_transfer", "arguments": {"to_user": name, "amount": amount}}]},
+        {"content": "转账成功！DONE"},
+    ]
+    called = tool_call_names(messages)
+    validated = VALIDATED in _text(messages[0]) or (called and "get_account" not in called)
+    if not validated:
+        steps = [
+            {"tool_calls": [{"name": "get_account", "arguments": {"user_name": name}}]},
+            {"tool_calls": [{"name": "get_balance", "arguments": {"user_name": ledger.SELF_ACCOUNT}}]},
+        ] + steps
+    return Trajectory(steps)(messages, tools)
+
+
+def create_ledger(kind: str, tmp: str):
+    accounts = {ledger.SELF_ACCOUNT: 10_000_000.0, **{name: 0.0 for name in ACCOUNTS}}
+    if kind == "memory":
+        return ledger.Ledger(accounts)
+    from transfer_common.sqlite_ledger import SQLiteLedger
+
+    book = SQLiteLedger(os.path.join(tmp, f"ledger-{uuid.uuid4().hex[:8]}.db"))
+    book.load(accounts.items())
+    return book
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+async def run_flow(agent, mock: MockLLM, requests: list, fast_path: bool, transfers: int) -> dict:
+    from langgraph.checkpoint.memory import InMemorySaver
+
+    mock.reset()
+    agent.set_transfer_graph(agent.create_transfer_graph(checkpointer=InMemorySaver(), fast_path=fast_path))
+    latencies = []
+    expected = {name: ledger.get_ledger().balance_of(name) for name in ACCOUNTS}
+    for i in range(transfers):
+        text, name, amount = requests[i % len(requests)]
+        expected[name] += amount
+
+        async def get_reply(request, text=text):
+            return text if request["type"] == "user_input" else "确认"
+
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            await agent.run_session(f"validation-{uuid.uuid4().hex}", get_reply)
+        latencies.append(time.perf_counter() - start)
+    book = ledger.get_ledger()
+    return {
+        "llm_calls": mock.requests / transfers,
+        "latencies": latencies,
+        "correct": all(abs(book.balance_of(name) - amount) < 1e-6 for name, amount in expected.items()),
+    }
+
+
+async def validation_cost(agent, iterations: int) -> tuple:
+    """校验子图与依次查询账户、余额的平均耗时"""
+    subgraph = agent.create_validation_graph()
+    state = {"to_account": "张三", "amount": 500.0, "confident": True}
+    book = ledger.get_ledger()
+
+    def sequential():
+        exists = book.exists("张三")
+        balance = book.balance_of(ledger.SELF_ACCOUNT)
+        return exists and balance >= 500.0
+
+    await subgraph.ainvoke(state)
+    start = time.perf_counter()
+    for _ in range(iterations):
+        await subgraph.ainvoke(state)
+    parallel = (time.perf_counter() - start) / iterations
+    start = time.perf_counter()
+    for _ in range(iterations):
+        await asyncio.to_thread(sequential)
+    serial = (time.perf_counter() - start) / iterations
+    return parallel, serial
+
+
+async def main_async(args):
+    mock = MockLLM(transfer_policy, latency=args.llm_latency)
+    runner, base_url = await start_mock_llm(mock)
+    os.environ["BAILIAN_API_BASE_URL"] = base_url
+    import langgraph_transfer_agent as agent
+
+    with tempfile.TemporaryDirectory() as tmp:
+        ledger.set_ledger(create_ledger(args.ledger, tmp))
+        try:
+            # 预热：创建模型客户端、建立连接
+            await run_flow(agent, mock, UNSURE_REQUESTS, False, 1)
+            print(f"transfers={args.transfers} llm_latency={args.llm_latency}s ledger={args.ledger}")
+            print(f"{'flow':>9} {'llm/xfer':>9} {'mean':>8} {'p50':>8} {'p99':>8} {'correct':>7}")
+            for flow, requests, fast_path in (("model", UNSURE_REQUESTS, False),
+                                              ("subgraph", UNSURE_REQUESTS, True),
+                                              ("fast", SURE_REQUESTS, True)):
+                result = await run_flow(agent, mock, requests, fast_path, args.transfers)
+                latencies = result["latencies"]
+                print(f"{flow:>9} {result['llm_calls']:>9.2f} {statistics.mean(latencies) * 1000:>6.0f}ms "
+                      f"{percentile(latencies, 0.5) * 1000:>6.0f}ms {percentile(latencies, 0.99) * 1000:>6.0f}ms "
+                      f"{str(result['correct']):>7}")
+            parallel, serial = await validation_cost(agent, args.iterations)
+            print(f"validation: subgraph {parallel * 1e6:.0f}us, sequential lookups {serial * 1e6:.0f}us")
+        finally:
+            await runner.cleanup()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--llm-latency", type=float, default=0.2)
+    parser.add_argument("--transfers", type=int, default=20)
+    parser.add_argument("--ledger", choices=["memory", "sqlite"], default="memory")
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
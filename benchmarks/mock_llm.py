@@ -0,0 +1,401 @@
+"""
+本地模拟的大模型服务，供基准测试使用
+
+按对话进度回放固定的工具调用轨迹（不看用户说了什么），例如默认的 TRANSFER_TRAJECTORY:
+    get_account -> get_balance -> execute_transfer -> "转账成功！...DONE"
+进度 = 上一次出现 "DONE" 之后模型已经发出的工具调用轮数，因此同一个会话可以连续完成多笔转账。
+
+支持三种调用方式:
+- OpenAI 兼容的 /v1/chat/completions（LangGraph、autogen、pydantic-ai、crewAI 使用），含 stream=true
+- DashScope 原生的 /api/v1/services/aigc/text-generation/generation（llama-index 的 DashScope 使用）
+- 请求中没有 tools、但提示词要求 "Action:/Action Input:" 文本格式时（crewAI 的 ReAct），按文本格式输出工具调用
+请求中没有 tools 的其他调用（autogen 的 reflect_on_tool_use 汇总、历史摘要等）返回一段文本。
+另外提供 /v1/embeddings，返回由文本哈希生成的固定向量（crewAI 的 memory 使用）。
+
+每个请求先等待 latency 秒再输出第一块，流式输出时文本按 chunk_chars 个字符一块、每块间隔 token_delay 秒；
+OpenAI 兼容接口的流式输出中，工具调用参数也同样分块；非流式请求等待同样的生成时间后一次性返回。
+
+用法:
+    python benchmarks/mock_llm.py --port 8765 --latency 0.05 [--trajectory steps.json]
+
+轨迹文件是一个 JSON 列表，每一步是 {"tool_calls": [{"name": ..., "arguments": {...}}]} 或 {"content": ...}。
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import struct
+import time
+import uuid
+
+from aiohttp import web
+
+CONFIRM_QUESTION = "目标账户张三存在，余额充足。确认向张三转账 500 元吗？"
+SUCCESS = "转账成功！已从您的账户向张三转账 500 元。DONE"
+PROGRESS_REPLY = "已完成查询，继续处理转账。"
+EMBEDDING_DIMENSIONS = 64
+
+# 逐步校验后转账
+TRANSFER_TRAJECTORY = [
+    {"tool_calls": [{"name": "get_account", "arguments": {"user_name": "张三"}}]},
+    {"tool_calls": [{"name": "get_balance", "arguments": {"user_name": "我"}}]},
+    {"tool_calls": [{"name": "execute_transfer", "arguments": {"to_user": "张三", "amount": 500.0}}]},
+    {"content": SUCCESS},
+]
+
+# 并行校验 -> 通过 reply_to_user 向用户确认 -> 转账
+CONFIRM_TRAJECTORY = [
+    {"tool_calls": [
+        {"name": "get_account", "arguments": {"user_name": "张三"}},
+        {"name": "get_balance", "arguments": {"user_name": "我"}},
+    ]},
+    {"tool_calls": [{"name": "reply_to_user", "arguments": {"content": CONFIRM_QUESTION}}]},
+    {"tool_calls": [{"name": "execute_transfer", "arguments": {"to_user": "张三", "amount": 500.0}}]},
+    {"content": SUCCESS},
+]
+
+
+def _new_call(name: str, arguments: dict) -> dict:
+    return {
+        "id": f"call_{uuid.uuid4().hex[:12]}",
+        "type": "function",
+        "function": {"name": name, "arguments": json.dumps(arguments, ensure_ascii=False)},
+    }
+
+
+def _text(message: dict) -> str:
+    content = message.get("content")
+    if isinstance(content, list):
+        return "".join(part.get("text", "") for part in content if isinstance(part, dict))
+    return content or ""
+
+
+def tool_call_names(messages: list) -> list:
+    """会话中助手已调用过的工具名，按调用顺序"""
+    return [call["function"]["name"] for m in messages if m.get("role") == "assistant"
+            for call in m.get("tool_calls") or ()]
+
+
+class Trajectory:
+    """
+    按进度回放的工具调用轨迹，作为 MockLLM 的 policy 使用
+    Args:
+        steps: 轨迹，见模块说明；最后一步应为 {"content": ...}
+    """
+
+    def __init__(self, steps: list):
+        self.steps = steps
+        # ReAct 文本格式一次只能调用一个工具，把并行调用拆成多步
+        self.react_steps = [
+            {"tool_calls": [call]} for step in steps for call in step.get("tool_calls", ())
+        ] + [step for step in steps if "content" in step]
+
+    @classmethod
+    def from_file(cls, path: str) -> "Trajectory":
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def __call__(self, messages: list, tools: list) -> dict:
+        """
+        Returns:
+            {"content": str} 或 {"tool_calls": [...]}（OpenAI 格式）
+        """
+        if not tools and any("Action Input:" in _text(m) for m in messages if m.get("role") == "system"):
+            return self._react(messages)
+        done = 0
+        for i, message in enumerate(messages):
+            if message.get("role") == "assistant" and "DONE" in _text(message):
+                done = i + 1
+        history = messages[done:]
+        progress = sum(1 for m in history if m.get("role") == "assistant" and m.get("tool_calls"))
+        step = self.steps[min(progress, len(self.steps) - 1)]
+        if not tools:
+            return {"content": self._summary(history, progress)}
+        if "content" in step:
+            return {"content": step["content"]}
+        return {"tool_calls": [_new_call(call["name"], call["arguments"]) for call in step["tool_calls"]]}
+
+    def _summary(self, history: list, progress: int) -> str:
+        """没有 tools 的请求：对上一步工具结果的文字总结"""
+        if progress >= len(self.steps) - 1:
+            return self.steps[-1]["content"]
+        for message in reversed(history):
+            calls = message.get("tool_calls")
+            if not calls:
+                continue
+            for call in calls:
+                if call["function"]["name"] == "reply_to_user":
+                    return json.loads(call["function"]["arguments"]).get("content", CONFIRM_QUESTION)
+            break
+        return PROGRESS_REPLY
+
+    def _react(self, messages: list) -> dict:
+        progress = sum(_text(m).count("Observation:") for m in messages if m.get("role") == "assistant")
+        step = self.react_steps[min(progress, len(self.react_steps) - 1)]
+        if "content" in step:
+            return {"content": f"Thought: I now know the final answer\nFinal Answer: {step['content']}"}
+        call = step["tool_calls"][0]
+        return {"content": (
+            f"Thought: 需要调用 {call['name']}\nAction: {call['name']}\n"
+            f"Action Input: {json.dumps(call['arguments'], ensure_ascii=False)}"
+        )}
+
+
+transfer_policy = Trajectory(CONFIRM_TRAJECTORY)
+
+
+class MockLLM:
+    """
+    Args:
+        policy: (messages, tools) -> {"content": ...} 或 {"tool_calls": [...]}
+        latency: 首块输出前的等待时间（秒），模拟排队与预填充
+        token_delay: 流式输出时每块之间的间隔（秒）
+        chunk_chars: 流式输出时每块的字符数
+        embedding_latency: 每次 embeddings 请求的等待时间（秒），与一次请求中的文本条数无关
+    """
+
+    def __init__(self, policy=transfer_policy, latency: float = 0.05, token_delay: float = 0.0, chunk_chars: int = 4,
+                 embedding_latency: float = 0.0):
+        self.policy = policy
+        self.latency = latency
+        self.token_delay = token_delay
+        self.chunk_chars = chunk_chars
+        self.embedding_latency = embedding_latency
+        self.reset()
+
+    def reset(self):
+        self.requests = 0
+        self.prompt_chars = 0
+        self.embedding_requests = 0
+        # 所有请求从收到到响应完成的耗时之和，用于从端到端耗时中扣除模型耗时
+        self.busy_seconds = 0.0
+
+    def stats(self) -> dict:
+        return {
+            "llm_calls": self.requests,
+            "prompt_chars": self.prompt_chars,
+            # 粗略估算：中文约 2 个字符一个 token
+            "prompt_tokens": self.prompt_chars // 2,
+            "embedding_calls": self.embedding_requests,
+            "llm_seconds": self.busy_seconds,
+        }
+
+    def create_app(self) -> web.Application:
+        app = web.Application(client_max_size=64 * 1024 * 1024)
+        app.router.add_post("/v1/chat/completions", self.chat_completions)
+        app.router.add_post("/chat/completions", self.chat_completions)
+        app.router.add_post("/v1/embeddings", self.embeddings)
+        app.router.add_post("/embeddings", self.embeddings)
+        app.router.add_post("/api/v1/services/aigc/text-generation/generation", self.dashscope_generation)
+        app.router.add_get("/stats", self.stats_handler)
+        app.router.add_post("/reset", self.reset_handler)
+        return app
+
+    async def stats_handler(self, request):
+        return web.json_response(self.stats())
+
+    async def reset_handler(self, request):
+        self.reset()
+        return web.json_response(self.stats())
+
+    def _record(self, messages: list, tools: list):
+        prompt_chars = len(json.dumps(messages, ensure_ascii=False)) + len(json.dumps(tools, ensure_ascii=False))
+        self.requests += 1
+        self.prompt_chars += prompt_chars
+        result = self.policy(messages, tools)
+        usage = {"prompt_tokens": prompt_chars // 2, "completion_tokens": len(result.get("content") or "") // 2 + 1}
+        usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+        return result, usage
+
+    def _chunks(self, content: str):
+        return [content[i:i + self.chunk_chars] for i in range(0, len(content), self.chunk_chars)]
+
+    async def _generate(self, result: dict):
+        """非流式请求：等待与流式输出相同的生成时间后一次性返回"""
+        if not self.token_delay:
+            return
+        pieces = len(self._chunks(result.get("content") or ""))
+        for call in result.get("tool_calls") or ():
+            pieces += len(self._chunks(call["function"]["arguments"]))
+        await asyncio.sleep(self.token_delay * max(pieces - 1, 0))
+
+    async def chat_completions(self, request):
+        start = time.perf_counter()
+        try:
+            body = await request.json()
+            result, usage = self._record(body.get("messages", []), body.get("tools") or [])
+            await asyncio.sleep(self.latency)
+            if body.get("stream"):
+                return await self._openai_stream(request, body, result, usage)
+            await self._generate(result)
+            message = {"role": "assistant", "content": result.get("content")}
+            if result.get("tool_calls"):
+                message["tool_calls"] = result["tool_calls"]
+            return web.json_response({
+                "id": f"chatcmpl-{uuid.uuid4().hex[:12]}",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": body.get("model", "mock-model"),
+                "choices": [{
+                    "index": 0,
+                    "message": message,
+                    "finish_reason": "tool_calls" if result.get("tool_calls") else "stop",
+                }],
+                "usage": usage,
+            })
+        finally:
+            self.busy_seconds += time.perf_counter() - start
+
+    async def _openai_stream(self, request, body, result, usage):
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+        await response.prepare(request)
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+
+        async def send(choices, **extra):
+            chunk = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": body.get("model", "mock-model"),
+                "choices": choices,
+                **extra,
+            }
+            await response.write(f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n".encode())
+
+        def choice(delta, finish_reason=None):
+            return [{"index": 0, "delta": delta, "finish_reason": finish_reason}]
+
+        await send(choice({"role": "assistant", "content": ""}))
+        for i, piece in enumerate(self._chunks(result.get("content") or "")):
+            if i and self.token_delay:
+                await asyncio.sleep(self.token_delay)
+            await send(choice({"content": piece}))
+        # 与真实服务一样，工具调用先发 id 和函数名，参数再按 chunk_chars 分块发送，由客户端拼接
+        for index, call in enumerate(result.get("tool_calls") or ()):
+            function = call["function"]
+            await send(choice({"tool_calls": [
+                {"index": index, "id": call["id"], "type": "function", "function": {"name": function["name"], "arguments": ""}},
+            ]}))
+            for piece in self._chunks(function["arguments"]):
+                if self.token_delay:
+                    await asyncio.sleep(self.token_delay)
+                await send(choice({"tool_calls": [{"index": index, "function": {"arguments": piece}}]}))
+        await send(choice({}, "tool_calls" if result.get("tool_calls") else "stop"))
+        if (body.get("stream_options") or {}).get("include_usage"):
+            await send([], usage=usage)
+        await response.write(b"data: [DONE]\n\n")
+        await response.write_eof()
+        return response
+
+    async def dashscope_generation(self, request):
+        """DashScope 原生协议（result_format=message）"""
+        start = time.perf_counter()
+        try:
+            body = await request.json()
+            parameters = body.get("parameters") or {}
+            result, usage = self._record(body.get("input", {}).get("messages", []), parameters.get("tools") or [])
+            usage = {"input_tokens": usage["prompt_tokens"], "output_tokens": usage["completion_tokens"],
+                     "total_tokens": usage["total_tokens"]}
+            request_id = uuid.uuid4().hex
+            await asyncio.sleep(self.latency)
+            tool_calls = [{"index": i, **call} for i, call in enumerate(result.get("tool_calls") or ())]
+            if request.headers.get("X-DashScope-SSE") != "enable" and not parameters.get("stream"):
+                await self._generate(result)
+                message = {"role": "assistant", "content": result.get("content") or ""}
+                if tool_calls:
+                    message["tool_calls"] = tool_calls
+                finish = "tool_calls" if tool_calls else "stop"
+                return web.json_response({
+                    "output": {"choices": [{"message": message, "finish_reason": finish}]},
+                    "usage": usage,
+                    "request_id": request_id,
+                })
+            response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+            await response.prepare(request)
+            count = 0
+
+            async def send(message, finish_reason="null"):
+                nonlocal count
+                count += 1
+                data = {
+                    "output": {"choices": [{"message": {"role": "assistant", **message}, "finish_reason": finish_reason}]},
+                    "usage": usage,
+                    "request_id": request_id,
+                }
+                await response.write(
+                    f"id:{count}\nevent:result\n:HTTP_STATUS/200\ndata:{json.dumps(data, ensure_ascii=False)}\n\n".encode()
+                )
+
+            for i, piece in enumerate(self._chunks(result.get("content") or "")):
+                if i and self.token_delay:
+                    await asyncio.sleep(self.token_delay)
+                await send({"content": piece})
+            for call in tool_calls:
+                await send({"content": "", "tool_calls": [call]})
+            await send({"content": ""}, "tool_calls" if tool_calls else "stop")
+            await response.write_eof()
+            return response
+        finally:
+            self.busy_seconds += time.perf_counter() - start
+
+    async def embeddings(self, request):
+        start = time.perf_counter()
+        try:
+            body = await request.json()
+            inputs = body.get("input")
+            if isinstance(inputs, str):
+                inputs = [inputs]
+            self.embedding_requests += 1
+            if self.embedding_latency:
+                await asyncio.sleep(self.embedding_latency)
+            data = [
+                {"object": "embedding", "index": i, "embedding": _hash_embedding(str(text))}
+                for i, text in enumerate(inputs)
+            ]
+            return web.json_response({
+                "object": "list",
+                "data": data,
+                "model": body.get("model", "mock-embedding"),
+                "usage": {"prompt_tokens": 0, "total_tokens": 0},
+            })
+        finally:
+            self.busy_seconds += time.perf_counter() - start
+
+
+def _hash_embedding(text: str) -> list:
+    """由文本哈希生成的单位向量，相同文本得到相同向量"""
+    digest = b""
+    seed = text.encode()
+    while len(digest) < EMBEDDING_DIMENSIONS * 4:
+        seed = hashlib.sha256(seed).digest()
+        digest += seed
+    values = [v / 2 ** 31 - 1.0 for v in struct.unpack(f"<{EMBEDDING_DIMENSIONS}I", digest[:EMBEDDING_DIMENSIONS * 4])]
+    norm = sum(v * v for v in values) ** 0.5 or 1.0
+    return [v / norm for v in values]
+
+
+async def start_mock_llm(mock: MockLLM, port: int = 0):
+    """在当前事件循环中启动模拟服务，返回 (runner, base_url)"""
+    runner = web.AppRunner(mock.create_app())
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", port)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}/v1"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--token-delay", type=float, default=0.0)
+    parser.add_argument("--chunk-chars", type=int, default=4)
+    parser.add_argument("--trajectory", help="轨迹 JSON 文件，默认为带 reply_to_user 确认的转账轨迹")
+    args = parser.parse_args()
+    policy = Trajectory.from_file(args.trajectory) if args.trajectory else transfer_policy
+    mock = MockLLM(policy, latency=args.latency, token_delay=args.token_delay, chunk_chars=args.chunk_chars)
+    web.run_app(mock.create_app(), host="127.0.0.1", port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+"""
+批量生成报告：从主题文件读取主题，有上限地并发运行 CrewaiDemo
+
+- 每个主题使用独立的 Crew 实例（Crew 和 Task 在执行过程中保存状态，不能在并发的 kickoff 之间共享），
+  在大小为 concurrency 的线程池中运行（Crew.kickoff_async 使用默认线程池，其大小随 CPU 数而定，
+  少核机器上会把并发压到 CPU 数 + 4 以下），报告写入 crewai_demo/output/<主题文件名>.md
+- 每个主题完成或失败后立即更新 output/batch_status.json，
+  重新运行时跳过已成功且报告文件仍在的主题，只重跑失败和尚未运行的主题
+- 通过 crewAI 的事件总线统计同时进行中的模型调用数，结束时输出吞吐量（主题/小时）和模型并发度
+
+用法:
+    batch topics.txt [concurrency]
+主题文件每行一个主题，空行和 # 开头的行被忽略。
+"""
+import asyncio
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from crewai.utilities.events import LLMCallCompletedEvent, LLMCallFailedEvent, LLMCallStartedEvent
+from crewai.utilities.events.crewai_event_bus import crewai_event_bus
+
+from crewai_demo.crew import REPORT_DIR, CrewaiDemo
+
+STATUS_FILE = os.path.join(REPORT_DIR, "batch_status.json")
+
+
+def read_topics(path: str) -> List[str]:
+    """读取主题文件，去掉空行、注释和重复的主题，保持原有顺序"""
+    with open(path, encoding="utf-8") as f:
+        lines = (line.strip() for line in f)
+        return list(dict.fromkeys(line for line in lines if line and not line.startswith("#")))
+
+
+def report_name(topic: str) -> str:
+    """主题对应的报告文件名（不含扩展名）：可读的前缀加上主题哈希，避免不同主题清洗后重名"""
+    slug = re.sub(r"[^\w-]+", "-", topic).strip("-")[:60] or "topic"
+    return f"{slug}-{hashlib.sha1(topic.encode()).hexdigest()[:8]}"
+
+
+class LLMConcurrency:
+    """统计同时进行中的模型调用：峰值和按时间加权的平均值"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.in_flight = 0
+            self.peak = 0
+            self.calls = 0
+            self._weighted = 0.0
+            self._started = self._last = time.perf_counter()
+
+    def _update(self, delta: int):
+        with self._lock:
+            now = time.perf_counter()
+            self._weighted += self.in_flight * (now - self._last)
+            self._last = now
+            # reset 之前已经开始的调用在结束时不再扣减
+            self.in_flight = max(self.in_flight + delta, 0)
+            if delta > 0:
+                self.calls += 1
+                self.peak = max(self.peak, self.in_flight)
+
+    def on_started(self, source, event):
+        self._update(1)
+
+    def on_finished(self, source, event):
+        self._update(-1)
+
+    def mean(self) -> float:
+        with self._lock:
+            now = time.perf_counter()
+            weighted = self._weighted + self.in_flight * (now - self._last)
+            return weighted / max(now - self._started, 1e-9)
+
+
+_llm_concurrency: Optional[LLMConcurrency] = None
+
+
+def get_llm_concurrency() -> LLMConcurrency:
+    """进程内唯一的统计对象，第一次使用时注册到事件总线（事件总线没有注销接口）"""
+    global _llm_concurrency
+    if _llm_concurrency is None:
+        _llm_concurrency = LLMConcurrency()
+        crewai_event_bus.register_handler(LLMCallStartedEvent, _llm_concurrency.on_started)
+        crewai_event_bus.register_handler(LLMCallCompletedEvent, _llm_concurrency.on_finished)
+        crewai_event_bus.register_handler(LLMCallFailedEvent, _llm_concurrency.on_finished)
+    return _llm_concurrency
+
+
+def load_status(path: str = STATUS_FILE) -> Dict[str, dict]:
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_status(status: Dict[str, dict], path: str = STATUS_FILE):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(status, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, path)
+
+
+def pending_topics(topics: List[str], status: Dict[str, dict]) -> List[str]:
+    """需要运行的主题：没有成功记录，或者报告文件已经不在了"""
+    return [
+        topic for topic in topics
+        if status.get(topic, {}).get("status") != "done" or not os.path.exists(status[topic]["file"])
+    ]
+
+
+async def run_batch(
+    topics: List[str],
+    concurrency: int = 4,
+    current_year: Optional[str] = None,
+    status_file: str = STATUS_FILE,
+    verbose: bool = False,
+) -> dict:
+    """
+    并发运行多个主题，返回本次运行的汇总
+    Args:
+        topics: 主题列表，已成功的主题会被跳过
+        concurrency: 同时运行的 Crew 数上限
+        current_year: 传给任务的年份，默认今年
+        status_file: 记录每个主题状态的文件
+        verbose: 是否输出每个 Crew 的执行过程，并发时各主题的输出会交错
+    """
+    current_year = current_year or str(datetime.now().year)
+    status = load_status(status_file)
+    todo = pending_topics(topics, status)
+    semaphore = asyncio.Semaphore(concurrency)
+    executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="crew")
+    loop = asyncio.get_running_loop()
+    # 状态文件在事件循环线程中更新，不需要额外加锁
+    llm = get_llm_concurrency()
+    llm.reset()
+    start = time.perf_counter()
+
+    async def run_topic(topic: str):
+        async with semaphore:
+            name = report_name(topic)
+            crew = CrewaiDemo().crew()
+            if not verbose:
+                crew.verbose = False
+                for agent in crew.agents:
+                    agent.verbose = False
+            topic_start = time.perf_counter()
+            try:
+                inputs = {"topic": topic, "current_year": current_year, "report_name": name}
+                await loop.run_in_executor(executor, lambda: crew.kickoff(inputs=inputs))
+                status[topic] = {"status": "done", "file": os.path.join(REPORT_DIR, f"{name}.md")}
+            except Exception as e:
+                status[topic] = {"status": "failed", "file": os.path.join(REPORT_DIR, f"{name}.md"), "error": str(e)}
+            status[topic]["seconds"] = round(time.perf_counter() - topic_start, 2)
+            save_status(status, status_file)
+            print(f"[{status[topic]['status']}] {topic} ({status[topic]['seconds']}s)")
+
+    try:
+        await asyncio.gather(*(run_topic(topic) for topic in todo))
+    finally:
+        executor.shutdown(wait=False)
+    elapsed = time.perf_counter() - start
+    done = sum(status[topic]["status"] == "done" for topic in todo)
+    return {
+        "topics": len(topics),
+        "skipped": len(topics) - len(todo),
+        "done": done,
+        "failed": len(todo) - done,
+        "seconds": elapsed,
+        "topics_per_hour": done / elapsed * 3600 if elapsed else 0.0,
+        "llm_calls": llm.calls,
+        "llm_concurrency_peak": llm.peak,
+        "llm_concurrency_mean": llm.mean(),
+    }
+
+
+def format_summary(summary: dict) -> str:
+    return (
+        f"主题 {summary['topics']} 个: 成功 {summary['done']}，失败 {summary['failed']}，跳过 {summary['skipped']}；"
+        f"耗时 {summary['seconds']:.1f}s，吞吐量 {summary['topics_per_hour']:.0f} 主题/小时；"
+        f"模型调用 {summary['llm_calls']} 次，并发峰值 {summary['llm_concurrency_peak']}，"
+        f"平均 {summary['llm_concurrency_mean']:.2f}"
+    )
@@ -6,7 +6,8 @@ from typing import List
 # you can use the @before_kickoff and @after_kickoff decorators
 # https://docs.crewai.com/concepts/crews#example-crew-class-with-decorators
 
-from crewai import LLM
+from transfer_common.llm_cache.crewai_adapter import CachedLLM
+from crewai_demo.task_cache import CachedTask
 
 import os
 # from pathlib import Path
@@ -22,12 +23,28 @@ model_name = os.getenv("QWEN3_MODEL")
 api_key = os.getenv("BAILIAN_API_KEY")
 base_url = os.getenv("BAILIAN_API_BASE_URL")
 
-llm = LLM(
-    model="openai/"+model_name,
-    api_key=api_key,
-    base_url=base_url,
-    enable_thinking=False
-)
+_llm = None
+
+def get_llm():
+    """返回模型，首次调用（创建 Agent）时才创建；相同请求直接复用共享缓存中的响应"""
+    global _llm
+    if _llm is None:
+        _llm = CachedLLM(
+            model="openai/"+model_name,
+            api_key=api_key,
+            base_url=base_url,
+            enable_thinking=False
+        )
+    return _llm
+
+def __getattr__(name):
+    # 访问 llm 属性时（PEP 562）返回当前的模型，尚未创建时按需创建
+    if name == "llm":
+        return get_llm()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+# 报告输出目录，reporting_task 的 output_file 由 kickoff 的 report_name 参数决定文件名
+REPORT_DIR = "crewai_demo/output"
 
 @CrewBase
 class CrewaiDemo():
@@ -47,7 +64,7 @@ class CrewaiDemo():
         return Agent(
             config=self.agents_config['researcher'], # type: ignore[index]
             verbose=True,
-            llm=llm,
+            llm=get_llm(),
         )
 
     @agent
@@ -55,7 +72,7 @@ class CrewaiDemo():
         return Agent(
             config=self.agents_config['reporting_analyst'], # type: ignore[index]
             verbose=True,
-            llm=llm,
+            llm=get_llm(),
         )
 
     # To learn more about structured task outputs,
@@ -63,7 +80,8 @@ class CrewaiDemo():
     # https://docs.crewai.com/concepts/tasks#overview-of-a-task
     @task
     def research_task(self) -> Task:
-        return Task(
+        # 只依赖 topic 和 current_year，输出按任务内容缓存在磁盘上，见 task_cache
+        return CachedTask(
             config=self.tasks_config['research_task'], # type: ignore[index]
         )
 
@@ -71,7 +89,7 @@ class CrewaiDemo():
     def reporting_task(self) -> Task:
         return Task(
             config=self.tasks_config['reporting_task'], # type: ignore[index]
-            output_file='crewai_demo/output/report.md'
+            output_file=REPORT_DIR + '/{report_name}.md'
         )
 
     @crew
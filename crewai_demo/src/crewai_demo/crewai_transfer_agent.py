@@ -1,72 +1,28 @@
 from crewai import Agent, Task, Crew, Process
 from crewai.llm import LLM
-from crewai.tools import BaseTool
-from pydantic import BaseModel, Field
-from typing import Type
+from typing import Optional
 import os
+import json
 from dotenv import load_dotenv
+from transfer_common import tool_cache, llm_cache
+from transfer_common.tool_registry import crewai_adapter
+from transfer_common.llm_cache.crewai_adapter import CachedLLM
+from crewai_demo.vector_memory import create_memory
 
 # 加载环境变量
 load_dotenv()
 
-# 模拟数据库
-# 模拟数据库 - 使用用户名称作为键
-accounts_db = {
-    "张三": {"balance": 10000.0},
-    "李四": {"balance": 5000.0},
-    "王五": {"balance": 2000.0},
-    "赵六": {"balance": 50000.0},
-    "我": {"balance": 10000.0}
-}
+# 工具定义见 transfer_common.tool_registry，与其他框架共用同一份描述和参数 schema；
+# 只读工具使用带会话缓存的版本
+def reply_to_user(content: str) -> str:
+    """向用户提问：crewAI 的每轮是一次 kickoff，提问作为本轮的输出，用户的下一条消息即回答"""
+    print(f"--toolcall--向用户提问: {content}")
+    return f"用户即将回答"
 
-# 工具类定义
-class GetAccountTool(BaseTool):
-    name: str = "get_account"
-    description: str = "获取指定用户是否存在"
-    
-    def _run(self, user_name: str) -> str:
-        print(f"--toolcall--查询用户: {user_name}")
-        if user_name in accounts_db:
-            info = accounts_db[user_name]
-            return f"用户 {user_name} 存在"
-        else:
-            return f"用户 {user_name} 不存在"
-
-class GetBalanceTool(BaseTool):
-    name: str = "get_balance"
-    description: str = "获取指定用户余额"
-    
-    def _run(self, user_name: str) -> str:
-        print(f"--toolcall--查询余额: {user_name}")
-        if user_name in accounts_db:
-            return f"用户 {user_name} 的余额：{accounts_db[user_name]['balance']}"
-        else:
-            return f"用户 {user_name} 不存在"
-
-class ExecuteTransferTool(BaseTool):
-    name: str = "execute_transfer"
-    description: str = "执行转账"
-    
-    def _run(self, to_user: str, amount: float) -> str:
-        print(f"--toolcall--执行转账: {to_user} {amount}")
-        if to_user in accounts_db:
-            accounts_db[to_user]['balance'] += amount
-            return f"转账成功，转账金额：{amount}，转账后余额：{accounts_db[to_user]['balance']}"
-        else:
-            return f"转账失败，目标账户 {to_user} 不存在"
-
-class ReplyToUserTool(BaseTool):
-    name: str = "reply_to_user"
-    description: str = "向用户提问获取信息"
-    
-    def _run(self, question: str) -> str:
-        print(f"--toolcall--向用户提问: {question}")
-        return f"用户即将回答"
-
-def main():
-    """主函数 - 创建并运行聊天 Agent"""
+def create_llm():
+    """创建模型，相同请求直接复用共享缓存中的响应"""
     #百炼模型
-    llm = LLM(
+    return CachedLLM(
         model="openai/"+os.getenv("QWEN3_MODEL"),
         api_key=os.getenv("BAILIAN_API_KEY"),
         base_url=os.getenv("BAILIAN_API_BASE_URL"),
@@ -77,9 +33,10 @@ def main():
     #     model=os.getenv("OLLAMA_MODEL"),
     #     base_url=os.getenv("OLLAMA_API_BASE_URL"),
     # )
-    # 直接创建 Agent（所有配置都在这里）
-    
-    transfer_agent = Agent(
+
+def create_transfer_agent(llm) -> Agent:
+    """直接创建 Agent（所有配置都在这里）"""
+    return Agent(
         name="transfer_agent",
         role="银行转账助手",
         goal="""
@@ -95,6 +52,7 @@ def main():
         - 所有转账都从我的账户转出
         - 确认转账信息中金额，并确保余额足够`get_balance`
         - 目标账户必须存在`get_account`
+        - 同时向多个用户转账时，使用`get_accounts`、`get_balances`批量校验，并通过`execute_transfers`一次性完成全部转账
         - 请与用户进行自然对话，逐步收集信息，确保转账安全准确
         - 确认信息后通过`execute_transfer`执行转账
         - 当转账成功后，请发送"DONE"
@@ -102,9 +60,80 @@ def main():
         verbose=True,
         # 是否允许 Agent 将任务委托给其他 Agent。设置为 False 表示不允许委托，所有任务都由当前 Agent 处理。
         allow_delegation=False,
-        tools=[GetAccountTool(), GetBalanceTool(), ExecuteTransferTool(), ReplyToUserTool()],
+        # 关闭 crewAI 自带的工具结果缓存：它不区分读写，同一会话中再次发起相同的转账会直接返回上次的结果而不执行，
+        # 余额查询也不会在转账后失效；只读工具的缓存由 tool_cache 负责
+        cache=False,
+        tools=crewai_adapter.create_tools({"reply_to_user": reply_to_user}),
         llm=llm
     )
+
+# 任务描述模板，{user_input} 在每次 kickoff 时由 inputs 填入
+TASK_DESCRIPTION = """处理用户请求：{user_input}
+                注意事项：
+                - 所有转账都从我的账户转出
+                - 确认转账信息中金额，并确保余额足够`get_balance`
+                - 目标账户必须存在`get_account`
+                - 同时向多个用户转账时，使用`get_accounts`、`get_balances`批量校验，并通过`execute_transfers`一次性完成全部转账
+                - 请与用户进行自然对话，逐步收集信息，确保转账安全准确
+                - 确认信息后通过`execute_transfer`执行转账
+                - 当转账成功后，请发送"DONE"
+                """
+
+def create_transfer_crew(agent: Agent, memory_backend: Optional[str] = None) -> Crew:
+    """
+    创建带 memory 的单任务 Crew，任务描述中的 {user_input} 由 kickoff 的 inputs 填入
+    Args:
+        memory_backend: 短期记忆和实体记忆的存储，"chroma"（crewAI 默认）或 "numpy"，
+            默认读取环境变量 CREWAI_MEMORY_BACKEND，见 crewai_demo.vector_memory
+    """
+    task = Task(
+        description=TASK_DESCRIPTION,
+        expected_output="对用户请求的友好回复",
+        agent=agent
+    )
+    return Crew(
+        agents=[agent],
+        tasks=[task],
+        process=Process.sequential,
+        verbose=True,
+        **create_memory(memory_backend)
+    )
+
+class TransferCrewSession:
+    """
+    持久的转账会话：模型、Agent、Crew 及其 memory（ChromaDB 存储和 embedding 配置）只创建一次，
+    每条用户消息作为同一个任务的一次增量执行，通过 kickoff 的 inputs 填入本轮请求，
+    并以 crewAI 的 crew_chat_messages 附上最近的对话，让 Agent 知道之前已经收集和校验过的信息
+    Args:
+        history_messages: 附带的最近对话消息条数
+        memory_backend: 见 create_transfer_crew
+    """
+
+    def __init__(self, history_messages: int = 10, memory_backend: Optional[str] = None):
+        self.history_messages = history_messages
+        self.messages = []
+        self.agent = create_transfer_agent(create_llm())
+        self.crew = create_transfer_crew(self.agent, memory_backend)
+
+    def send(self, user_input: str) -> str:
+        """处理一条用户消息，返回助手的回复"""
+        inputs = {"user_input": user_input}
+        history = self.messages[-self.history_messages:]
+        if history:
+            inputs["crew_chat_messages"] = json.dumps(history, ensure_ascii=False)
+        # 一个会话即一个 tool_cache 会话
+        with tool_cache.session_scope(str(id(self))):
+            reply = str(self.crew.kickoff(inputs=inputs))
+        self.messages.append({"role": "user", "content": user_input})
+        self.messages.append({"role": "assistant", "content": reply})
+        return reply
+
+def main():
+    """
+    主函数 - 创建并运行聊天 Agent，所有轮次共用同一个会话
+    会话（模型、Agent、Crew 和 memory）在收到第一条消息时才创建，启动后立即显示提示符
+    """
+    session = None
     
     print("智能助手已启动！输入 'quit' 退出对话")
     print("=" * 50)
@@ -113,36 +142,19 @@ def main():
         # 获取用户输入
         user_input = input("\n你: ").strip()
         if user_input.lower() in ['quit', 'exit', '退出']:
+            print(tool_cache.format_stats())
+            print(llm_cache.format_stats())
             break
         if not user_input:
             continue
         try:
-            task = Task(
-                description=f"""处理用户请求：{user_input}
-                注意事项：
-                - 所有转账都从我的账户转出
-                - 确认转账信息中金额，并确保余额足够`get_balance`
-                - 目标账户必须存在`get_account`
-                - 请与用户进行自然对话，逐步收集信息，确保转账安全准确
-                - 确认信息后通过`execute_transfer`执行转账
-                - 当转账成功后，请发送"DONE"
-                """,
-                expected_output="对用户请求的友好回复",
-                agent=transfer_agent
-            )
-            # 创建 Crew 并执行
-            crew = Crew(
-                agents=[transfer_agent],
-                tasks=[task],
-                process=Process.sequential,
-                memory=True,
-                verbose=True
-            )
-            result = crew.kickoff()
+            if session is None:
+                session = TransferCrewSession()
+            result = session.send(user_input)
             print(f"\n助手: {result}")
             
         except Exception as e:
             print(f"错误: {str(e)}")
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
@@ -1,10 +1,13 @@
 #!/usr/bin/env python
+import asyncio
 import sys
 import warnings
 
 from datetime import datetime
 
 from crewai_demo.crew import CrewaiDemo
+from crewai_demo import task_cache
+from crewai_demo.parallel import parallel_test, parallel_train
 
 warnings.filterwarnings("ignore", category=SyntaxWarning, module="pysbd")
 
@@ -19,28 +22,37 @@ def run():
     """
     inputs = {
         'topic': 'AI LLMs',
-        'current_year': str(datetime.now().year)
+        'current_year': str(datetime.now().year),
+        'report_name': 'report'
     }
     
     try:
         CrewaiDemo().crew().kickoff(inputs=inputs)
     except Exception as e:
         raise Exception(f"An error occurred while running the crew: {e}")
+    print(task_cache.format_stats())
 
 
 def train():
     """
     Train the crew for a given number of iterations.
+    Usage: train <n_iterations> <filename> [workers]
     """
     inputs = {
         "topic": "AI LLMs",
-        'current_year': str(datetime.now().year)
+        'current_year': str(datetime.now().year),
+        'report_name': 'report'
     }
+    workers = int(sys.argv[3]) if len(sys.argv) > 3 else 1
     try:
-        CrewaiDemo().crew().train(n_iterations=int(sys.argv[1]), filename=sys.argv[2], inputs=inputs)
+        if workers > 1:
+            parallel_train(lambda: CrewaiDemo().crew(), int(sys.argv[1]), sys.argv[2], inputs=inputs, max_workers=workers)
+        else:
+            CrewaiDemo().crew().train(n_iterations=int(sys.argv[1]), filename=sys.argv[2], inputs=inputs)
 
     except Exception as e:
         raise Exception(f"An error occurred while training the crew: {e}")
+    print(task_cache.format_stats())
 
 def replay():
     """
@@ -51,18 +63,42 @@ def replay():
 
     except Exception as e:
         raise Exception(f"An error occurred while replaying the crew: {e}")
+    print(task_cache.format_stats())
 
 def test():
     """
     Test the crew execution and returns the results.
+    Usage: test <n_iterations> <eval_llm> [workers]
     """
     inputs = {
         "topic": "AI LLMs",
-        "current_year": str(datetime.now().year)
+        "current_year": str(datetime.now().year),
+        "report_name": "report"
     }
     
+    workers = int(sys.argv[3]) if len(sys.argv) > 3 else 1
     try:
-        CrewaiDemo().crew().test(n_iterations=int(sys.argv[1]), eval_llm=sys.argv[2], inputs=inputs)
+        if workers > 1:
+            parallel_test(lambda: CrewaiDemo().crew(), int(sys.argv[1]), sys.argv[2], inputs=inputs, max_workers=workers)
+        else:
+            CrewaiDemo().crew().test(n_iterations=int(sys.argv[1]), eval_llm=sys.argv[2], inputs=inputs)
 
     except Exception as e:
         raise Exception(f"An error occurred while testing the crew: {e}")
+    print(task_cache.format_stats())
+
+
+def batch():
+    """
+    Run the crew for every topic in a file, a few at a time.
+    Usage: batch <topics_file> [concurrency]
+    """
+    from crewai_demo.batch import format_summary, read_topics, run_batch
+
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    try:
+        summary = asyncio.run(run_batch(read_topics(sys.argv[1]), concurrency=concurrency))
+    except Exception as e:
+        raise Exception(f"An error occurred while running the batch: {e}")
+    print(format_summary(summary))
+    print(task_cache.format_stats())
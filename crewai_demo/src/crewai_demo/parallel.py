@@ -0,0 +1,151 @@
+"""
+并行的 train / test 迭代
+
+Crew.train 和 Crew.test 依次运行 n_iterations 次完整的 crew，各次迭代之间互不依赖，耗时基本都在等待模型。
+这里每次迭代使用独立的 Crew 实例，在最多 max_workers 个线程中并发运行，全部完成后按迭代序号汇总，
+结果与完成顺序无关:
+- parallel_test:  每次迭代使用独立的 CrewEvaluator（CrewEvaluator 的评分表是类属性，多个实例会共用），
+                  汇总后按 Run 1..n 输出与 Crew.test 相同的评分表
+- parallel_train: 各次迭代的训练数据写入同一个 training_data.pkl，按 agent role 和迭代序号合并后，
+                  与 Crew.train 一样逐个 agent 汇总并保存到 filename
+
+crewAI 的训练数据文件是不加锁的读改写，人工反馈通过 input() 读取，
+并行训练时用同一把锁串行化这两步（见 _serialize_training_io），模型调用仍然并发。
+"""
+import functools
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Union
+
+from crewai import Crew
+from crewai.agents.crew_agent_executor import CrewAgentExecutor
+from crewai.llm import BaseLLM
+from crewai.utilities.constants import TRAINING_DATA_FILE
+from crewai.utilities.evaluators.crew_evaluator_handler import CrewEvaluator
+from crewai.utilities.evaluators.task_evaluator import TaskEvaluator
+from crewai.utilities.llm_utils import create_llm
+from crewai.utilities.training_handler import CrewTrainingHandler
+
+CrewFactory = Callable[[], Crew]
+
+_training_io_lock = threading.RLock()
+_training_io_serialized = False
+
+
+def _serialize_training_io():
+    """让 CrewAgentExecutor 的人工反馈和训练数据读写在进程内串行执行，只安装一次"""
+    global _training_io_serialized
+    if _training_io_serialized:
+        return
+    for name in ("_ask_human_input", "_handle_crew_training_output"):
+        method = getattr(CrewAgentExecutor, name)
+
+        @functools.wraps(method)
+        def locked(self, *args, _method=method, **kwargs):
+            with _training_io_lock:
+                return _method(self, *args, **kwargs)
+
+        setattr(CrewAgentExecutor, name, locked)
+    _training_io_serialized = True
+
+
+def _run_iterations(run: Callable[[int], Any], n_iterations: int, max_workers: int) -> List[Any]:
+    """并发运行 run(1..n_iterations)，按迭代序号返回结果；任何一次迭代失败都会抛出"""
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, n_iterations)), thread_name_prefix="crew-iter") as pool:
+        futures = [pool.submit(run, i) for i in range(1, n_iterations + 1)]
+        return [future.result() for future in futures]
+
+
+def parallel_test(
+    crew_factory: CrewFactory,
+    n_iterations: int,
+    eval_llm: Union[str, BaseLLM],
+    inputs: Optional[Dict[str, Any]] = None,
+    max_workers: int = 4,
+    print_result: bool = True,
+) -> CrewEvaluator:
+    """
+    并发运行 n_iterations 次测试
+    Args:
+        crew_factory: 每次调用返回一个新的 Crew
+        eval_llm: 评估用的模型，同 Crew.test
+        max_workers: 同时运行的迭代数上限
+        print_result: 是否输出评分表
+    Returns:
+        汇总了所有迭代评分的 CrewEvaluator，tasks_scores / run_execution_times 以迭代序号为键
+    """
+    llm = create_llm(eval_llm)
+    if not llm:
+        raise ValueError("Failed to create LLM instance.")
+
+    def run(iteration: int):
+        crew = crew_factory()
+        evaluator = CrewEvaluator(crew, llm)
+        evaluator.tasks_scores = defaultdict(list)
+        evaluator.run_execution_times = defaultdict(list)
+        evaluator.set_iteration(iteration)
+        crew.kickoff(inputs=inputs)
+        return evaluator
+
+    evaluators = _run_iterations(run, n_iterations, max_workers)
+    # 汇总到第一次迭代的 evaluator 上，评分表中的 agent 列取自它的 crew
+    tasks_scores, run_execution_times = defaultdict(list), defaultdict(list)
+    for iteration, evaluator in enumerate(evaluators, start=1):
+        tasks_scores[iteration] = evaluator.tasks_scores[iteration]
+        run_execution_times[iteration] = evaluator.run_execution_times[iteration]
+    result = evaluators[0]
+    result.tasks_scores, result.run_execution_times = tasks_scores, run_execution_times
+    if print_result:
+        result.print_crew_evaluation_result()
+    return result
+
+
+def parallel_train(
+    crew_factory: CrewFactory,
+    n_iterations: int,
+    filename: str,
+    inputs: Optional[Dict[str, Any]] = None,
+    max_workers: int = 4,
+) -> Dict[str, dict]:
+    """
+    并发运行 n_iterations 次训练，训练结果按 agent role 保存到 filename
+    Args:
+        crew_factory: 每次调用返回一个新的 Crew
+        max_workers: 同时运行的迭代数上限
+    Returns:
+        agent role -> 该 agent 的训练数据（迭代序号从 0 开始，与 Crew.train 相同）
+    """
+    _serialize_training_io()
+    CrewTrainingHandler(TRAINING_DATA_FILE).initialize_file()
+    CrewTrainingHandler(filename).initialize_file()
+
+    def run(iteration: int) -> Crew:
+        crew = crew_factory()
+        # 与 Crew._setup_for_training 相同，但不重新初始化训练数据文件
+        crew._train = True
+        for task in crew.tasks:
+            task.human_input = True
+        for agent in crew.agents:
+            agent.allow_delegation = False
+        crew._train_iteration = iteration - 1
+        crew.kickoff(inputs=inputs)
+        return crew
+
+    crews = _run_iterations(run, n_iterations, max_workers)
+
+    # 各次迭代的 agent id 不同，按 role 合并，迭代按序号排序
+    raw = CrewTrainingHandler(TRAINING_DATA_FILE).load()
+    merged: Dict[str, dict] = {}
+    for crew in crews:
+        for agent in crew.agents:
+            merged.setdefault(agent.role, {}).update(raw.get(str(agent.id), {}))
+    merged = {role: dict(sorted(data.items())) for role, data in merged.items()}
+
+    for agent in crews[0].agents:
+        if merged.get(agent.role):
+            result = TaskEvaluator(agent).evaluate_training_data(
+                training_data={str(agent.id): merged[agent.role]}, agent_id=str(agent.id)
+            )
+            CrewTrainingHandler(filename).save_trained_data(agent_id=str(agent.role), trained_data=result.model_dump())
+    return merged
@@ -1,3 +1,5 @@
+import sys
+
 from crewai.flow.flow import Flow, listen, start
 
 class OutputExampleFlow(Flow):
@@ -10,9 +12,21 @@ class OutputExampleFlow(Flow):
         return f"Second method received: {first_output}"
 
 
-flow = OutputExampleFlow()
-flow.plot("src/crewai_demo/my_flow_plot.html")
-final_output = flow.kickoff()
+def main():
+    """
+    运行示例 Flow；导入本模块不会运行 Flow，也不会生成流程图
+    加 --plot 时离线输出流程图 HTML，Flow 结构不变时复用已生成的文件
+    """
+    flow = OutputExampleFlow()
+    if "--plot" in sys.argv[1:]:
+        from transfer_common.diagrams import render_crewai_flow
+
+        print(f"流程图: {render_crewai_flow(flow)}")
+    final_output = flow.kickoff()
+
+    print("---- Final Output ----")
+    print(final_output)
+
 
-print("---- Final Output ----")
-print(final_output)
\ No newline at end of file
+if __name__ == "__main__":
+    main()
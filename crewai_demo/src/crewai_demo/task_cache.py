@@ -0,0 +1,205 @@
+"""
+任务输出缓存
+
+research_task 只依赖 {topic} 和 {current_year}，但每次 run、train、test、replay 都会重新生成一遍研究结果。
+CachedTask 在执行前按以下内容计算缓存键，命中时直接使用上次的输出，跳过整个任务（所有模型调用和工具调用）:
+- 插值后的任务描述、期望输出和上游任务的上下文
+- 执行任务的 agent 的 role、goal、backstory、工具名
+- agent 使用的模型名
+输出保存在 SQLite 文件中，超过 TTL 视为过期；同时记录生成时的耗时和 token 数，命中时累计为节省的时间和 token。
+命中时仍然触发任务的 callback、Crew 的 task_callback、写 output_file 和任务事件，train/test 的评估照常进行。
+
+环境变量:
+    TASK_CACHE=0        关闭缓存
+    TASK_CACHE_PATH     缓存文件路径，默认 crewai_demo/output/task_cache.db
+    TASK_CACHE_TTL      有效期（秒），默认 86400
+"""
+import datetime
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, List, Optional
+
+from crewai import Task
+from crewai.agents.agent_builder.base_agent import BaseAgent
+from crewai.tasks.task_output import TaskOutput
+from crewai.utilities.events import TaskCompletedEvent, TaskStartedEvent
+from crewai.utilities.events.crewai_event_bus import crewai_event_bus
+
+from transfer_common.llm_cache import request_key
+
+DEFAULT_PATH = "crewai_demo/output/task_cache.db"
+
+_CREATE_TABLE = (
+    "CREATE TABLE IF NOT EXISTS task_cache ("
+    " key TEXT PRIMARY KEY,"
+    " raw TEXT NOT NULL,"
+    " created REAL NOT NULL,"
+    " elapsed REAL NOT NULL,"
+    " tokens INTEGER NOT NULL)"
+)
+
+
+class TaskOutputCache:
+    """
+    以 SQLite 文件保存的任务输出缓存
+    Args:
+        path: 缓存文件路径
+        ttl: 有效期（秒）
+    """
+
+    def __init__(self, path: str = DEFAULT_PATH, ttl: float = 86400.0):
+        self.ttl = ttl
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(_CREATE_TABLE)
+        self.hits = 0
+        self.misses = 0
+        self.saved_seconds = 0.0
+        self.saved_tokens = 0
+
+    def get(self, key: str) -> Optional[str]:
+        """返回缓存的任务原始输出，未命中或已过期时返回 None"""
+        with self._lock:
+            row = self._db.execute("SELECT raw, created, elapsed, tokens FROM task_cache WHERE key = ?", (key,)).fetchone()
+            if row is not None and time.time() - row[1] <= self.ttl:
+                self.hits += 1
+                self.saved_seconds += row[2]
+                self.saved_tokens += row[3]
+                return row[0]
+            if row is not None:
+                self._db.execute("DELETE FROM task_cache WHERE key = ?", (key,))
+            self.misses += 1
+            return None
+
+    def put(self, key: str, raw: str, elapsed: float, tokens: int) -> None:
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO task_cache (key, raw, created, elapsed, tokens) VALUES (?, ?, ?, ?, ?)",
+                (key, raw, time.time(), elapsed, tokens),
+            )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM task_cache")
+
+    def close(self) -> None:
+        self._db.close()
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "saved_seconds": self.saved_seconds,
+            "saved_tokens": self.saved_tokens,
+        }
+
+
+_cache: Optional[TaskOutputCache] = None
+_configured = False
+
+
+def get_task_cache() -> Optional[TaskOutputCache]:
+    """获取当前使用的任务输出缓存；关闭缓存时返回 None"""
+    global _cache, _configured
+    if not _configured:
+        if os.getenv("TASK_CACHE", "1") != "0":
+            _cache = TaskOutputCache(
+                path=os.getenv("TASK_CACHE_PATH") or DEFAULT_PATH,
+                ttl=float(os.getenv("TASK_CACHE_TTL", "86400")),
+            )
+        _configured = True
+    return _cache
+
+
+def set_task_cache(cache: Optional[TaskOutputCache]) -> None:
+    """替换当前使用的任务输出缓存，传入 None 关闭缓存"""
+    global _cache, _configured
+    _cache = cache
+    _configured = True
+
+
+def format_stats() -> str:
+    cache = get_task_cache()
+    if cache is None:
+        return "任务缓存: 未启用"
+    stats = cache.stats()
+    return (
+        f"任务缓存: 命中 {stats['hits']} 次, 未命中 {stats['misses']} 次, "
+        f"节省 {stats['saved_seconds']:.2f} 秒, {stats['saved_tokens']} tokens"
+    )
+
+
+def task_key(task: Task, agent: BaseAgent, context: Optional[str], tools: List[Any]) -> str:
+    """任务缓存键：插值后的任务内容、上下文、agent 配置和模型"""
+    llm = getattr(agent, "llm", None)
+    return request_key(
+        "crewai_task",
+        description=task.description,
+        expected_output=task.expected_output,
+        context=context,
+        agent={"role": agent.role, "goal": agent.goal, "backstory": agent.backstory},
+        tools=sorted(tool.name for tool in tools),
+        model=getattr(llm, "model", str(llm)),
+    )
+
+
+def _total_tokens(agent: BaseAgent) -> int:
+    return agent._token_process.get_summary().total_tokens
+
+
+class CachedTask(Task):
+    """执行结果写入任务输出缓存的 Task，缓存命中时跳过执行"""
+
+    def _execute_core(self, agent: Optional[BaseAgent], context: Optional[str], tools: Optional[List[Any]]) -> TaskOutput:
+        cache = get_task_cache()
+        agent = agent or self.agent
+        # guardrail 重试时 context 中带有上一次的校验错误，不走缓存
+        if cache is None or agent is None or self.retry_count:
+            return super()._execute_core(agent, context, tools)
+
+        tools = tools or self.tools or []
+        key = task_key(self, agent, context, tools)
+        raw = cache.get(key)
+        if raw is None:
+            tokens_before = _total_tokens(agent)
+            start = time.perf_counter()
+            output = super()._execute_core(agent, context, tools)
+            cache.put(key, output.raw, time.perf_counter() - start, _total_tokens(agent) - tokens_before)
+            return output
+        return self._replay_output(agent, context, raw)
+
+    def _replay_output(self, agent: BaseAgent, context: Optional[str], raw: str) -> TaskOutput:
+        """按 Task._execute_core 的顺序完成执行之后的步骤：回调、写文件、事件"""
+        self.agent = agent
+        self.start_time = datetime.datetime.now()
+        self.prompt_context = context
+        self.processed_by_agents.add(agent.role)
+        crewai_event_bus.emit(self, TaskStartedEvent(context=context, task=self))
+
+        pydantic_output, json_output = self._export_output(raw)
+        self.output = TaskOutput(
+            name=self.name,
+            description=self.description,
+            expected_output=self.expected_output,
+            raw=raw,
+            pydantic=pydantic_output,
+            json_dict=json_output,
+            agent=agent.role,
+            output_format=self._get_output_format(),
+        )
+        self.end_time = datetime.datetime.now()
+
+        if self.callback:
+            self.callback(self.output)
+        crew = agent.crew
+        if crew and crew.task_callback and crew.task_callback != self.callback:
+            crew.task_callback(self.output)
+        if self.output_file:
+            self._save_file(json_output if json_output else (pydantic_output.model_dump_json() if pydantic_output else raw))
+        crewai_event_bus.emit(self, TaskCompletedEvent(output=self.output, task=self))
+        return self.output
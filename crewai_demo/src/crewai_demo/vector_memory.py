@@ -0,0 +1,238 @@
+"""
+进程内的轻量向量存储，替代 crewAI 短期记忆和实体记忆默认的 ChromaDB 存储
+
+转账对话很短，memory=True 默认为每个 Crew 创建 ChromaDB 持久化客户端（及当前目录下的锁文件），
+每次写入都单独调用一次 embedding。这里改为:
+- 向量保存在 NumPy 矩阵中（预先归一化），检索为一次矩阵乘法的余弦相似度 top-k
+- 容量有上限，写满后覆盖最早写入的条目
+- embedding 按文本的 sha256 缓存，同样的文本只请求一次
+- 写入先进入待处理队列，攒够 batch_size 条或检索前一次性批量请求 embedding
+- 检索的 filter 与 ChromaDB 的 where 写法相同（{"key": 值}、$eq/$ne/$in/$nin、$and/$or），先按元数据过滤再排序
+
+用法:
+    Crew(..., memory=True,
+         short_term_memory=ShortTermMemory(storage=NumpyVectorStorage("short_term")),
+         entity_memory=EntityMemory(storage=NumpyVectorStorage("entities")))
+或者用 create_memory() 生成 Crew 的 memory 参数，见 crewai_transfer_agent.create_transfer_crew。
+"""
+import hashlib
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+from crewai.memory import EntityMemory, ShortTermMemory
+from crewai.memory.storage.interface import Storage
+
+# 默认的 embedding 模型，与 crewAI memory 默认使用的 OpenAI embedding 一致
+DEFAULT_EMBEDDING_MODEL = "text-embedding-3-small"
+
+Embedder = Callable[[List[str]], List[List[float]]]
+
+
+def openai_embedder(model: str = DEFAULT_EMBEDDING_MODEL) -> Embedder:
+    """
+    使用 OpenAI 兼容的 embeddings 接口，一次请求处理一批文本
+    API key 与地址读取 OPENAI_API_KEY / OPENAI_BASE_URL，与 crewAI memory 的默认配置相同
+    """
+    client = None
+
+    def embed(texts: List[str]) -> List[List[float]]:
+        nonlocal client
+        if client is None:
+            from openai import OpenAI
+
+            client = OpenAI()
+        response = client.embeddings.create(model=model, input=texts)
+        return [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
+
+    return embed
+
+
+# 元数据中没有该字段
+_MISSING = object()
+# filter 中支持的比较运算
+_OPERATORS = {
+    "$eq": lambda value, target: value == target,
+    "$ne": lambda value, target: value != target,
+    "$in": lambda value, target: value in target,
+    "$nin": lambda value, target: value not in target,
+}
+
+
+def matches_filter(metadata: Dict[str, Any], filter: Dict[str, Any]) -> bool:
+    """
+    元数据是否满足 filter（ChromaDB where 的写法）
+    例如 {"agent": "transfer"}、{"agent": {"$in": ["a", "b"]}}、{"$and": [{...}, {...}]}
+    不支持的运算抛出 NotImplementedError，不会忽略条件返回未过滤的结果
+    """
+    for key, condition in filter.items():
+        if key == "$and":
+            if not all(matches_filter(metadata, item) for item in condition):
+                return False
+        elif key == "$or":
+            if not any(matches_filter(metadata, item) for item in condition):
+                return False
+        elif key.startswith("$"):
+            raise NotImplementedError(f"不支持的 filter 运算: {key}")
+        elif isinstance(condition, dict):
+            for op, target in condition.items():
+                if op not in _OPERATORS:
+                    raise NotImplementedError(f"不支持的 filter 运算: {op}")
+                if key not in metadata or not _OPERATORS[op](metadata[key], target):
+                    return False
+        elif metadata.get(key, _MISSING) != condition:
+            return False
+    return True
+
+
+class NumpyVectorStorage(Storage):
+    """
+    crewAI Storage 接口的 NumPy 实现
+    Args:
+        type: 存储名称，仅用于区分短期记忆和实体记忆
+        max_items: 最多保存的条目数，超出时覆盖最早写入的条目
+        embedder: 批量计算 embedding 的函数，默认为 openai_embedder()
+        batch_size: 待写入的条目攒够多少条时批量请求 embedding
+        embedding_cache_size: 按文本哈希缓存的 embedding 数
+    """
+
+    def __init__(
+        self,
+        type: str,
+        max_items: int = 1000,
+        embedder: Optional[Embedder] = None,
+        batch_size: int = 16,
+        embedding_cache_size: int = 4096,
+    ):
+        self.type = type
+        self.max_items = max_items
+        self.embedder = embedder or openai_embedder()
+        self.batch_size = batch_size
+        self.embedding_cache_size = embedding_cache_size
+        self._lock = threading.Lock()
+        self._embedding_cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._pending = []
+        self.embedding_calls = 0
+        self._clear()
+
+    def _clear(self):
+        # 第一次写入时按 embedding 维度分配矩阵
+        self._vectors: Optional[np.ndarray] = None
+        self._records: List[Optional[Dict[str, Any]]] = [None] * self.max_items
+        # 下一条写入的位置，以及已保存的条目数
+        self._next = 0
+        self._count = 0
+
+    # 不定义 __len__：crewAI 用 `storage if storage else RAGStorage(...)` 判断是否传入了存储，空存储不能为假
+    @property
+    def size(self) -> int:
+        """已保存和待写入的条目数"""
+        return self._count + len(self._pending)
+
+    def _embed(self, texts: List[str]) -> List[np.ndarray]:
+        """返回每段文本归一化后的向量，缓存未命中的文本合并为一次请求"""
+        keys = [hashlib.sha256(text.encode()).hexdigest() for text in texts]
+        missing = list(dict.fromkeys(text for text, key in zip(texts, keys) if key not in self._embedding_cache))
+        if missing:
+            self.embedding_calls += 1
+            vectors = np.asarray(self.embedder(missing), dtype=np.float32)
+            vectors /= np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+            for text, vector in zip(missing, vectors):
+                self._embedding_cache[hashlib.sha256(text.encode()).hexdigest()] = vector
+        result = []
+        for key in keys:
+            self._embedding_cache.move_to_end(key)
+            result.append(self._embedding_cache[key])
+        while len(self._embedding_cache) > self.embedding_cache_size:
+            self._embedding_cache.popitem(last=False)
+        return result
+
+    def _flush(self) -> None:
+        """把待写入的条目批量计算 embedding 后写入矩阵"""
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, []
+        vectors = self._embed([record["context"] for record in pending])
+        if self._vectors is None:
+            self._vectors = np.zeros((self.max_items, len(vectors[0])), dtype=np.float32)
+        for record, vector in zip(pending, vectors):
+            self._vectors[self._next] = vector
+            self._records[self._next] = record
+            self._next = (self._next + 1) % self.max_items
+            self._count = min(self._count + 1, self.max_items)
+
+    def save(self, value: Any, metadata: Dict[str, Any]) -> None:
+        with self._lock:
+            self._pending.append({"id": str(uuid.uuid4()), "metadata": metadata or {}, "context": str(value)})
+            if len(self._pending) >= self.batch_size:
+                self._flush()
+
+    def search(
+        self,
+        query: str,
+        limit: int = 3,
+        score_threshold: float = 0.35,
+        filter: Optional[dict] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        返回余弦相似度不低于 score_threshold 的前 limit 条，score 越大越相似
+        filter 不为空时只在元数据满足 filter 的条目中检索，见 matches_filter
+        """
+        with self._lock:
+            self._flush()
+            if not self._count:
+                return []
+            if filter:
+                candidates = np.fromiter(
+                    (matches_filter(self._records[i]["metadata"], filter) for i in range(self._count)),
+                    dtype=bool, count=self._count,
+                )
+                if not candidates.any():
+                    return []
+            query_vector = self._embed([query])[0]
+            scores = self._vectors[:self._count] @ query_vector
+            k = min(limit, self._count)
+            if filter:
+                scores = np.where(candidates, scores, -np.inf)
+                k = min(k, int(candidates.sum()))
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+            return [
+                {**self._records[i], "score": float(scores[i])}
+                for i in top
+                if scores[i] >= score_threshold
+            ]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._pending = []
+            self._clear()
+
+
+# 可选的 memory 后端
+MEMORY_BACKENDS = ("chroma", "numpy")
+
+
+def create_memory(backend: Optional[str] = None, **storage_options) -> Dict[str, Any]:
+    """
+    生成 Crew 的 memory 相关构造参数
+    Args:
+        backend: "chroma" 为 crewAI 默认的 ChromaDB 存储，"numpy" 为 NumpyVectorStorage；
+            默认读取环境变量 CREWAI_MEMORY_BACKEND，未设置时为 "chroma"
+        storage_options: 传给 NumpyVectorStorage 的参数
+    Returns:
+        可以直接展开传给 Crew(...) 的参数
+    """
+    backend = backend or os.getenv("CREWAI_MEMORY_BACKEND", "chroma")
+    if backend not in MEMORY_BACKENDS:
+        raise ValueError(f"未知的 memory 后端 {backend}，可选: {', '.join(MEMORY_BACKENDS)}")
+    if backend == "chroma":
+        return {"memory": True}
+    return {
+        "memory": True,
+        "short_term_memory": ShortTermMemory(storage=NumpyVectorStorage("short_term", **storage_options)),
+        "entity_memory": EntityMemory(storage=NumpyVectorStorage("entities", **storage_options)),
+    }
@@ -0,0 +1,56 @@
+"""
+crewai_demo.vector_memory 的测试
+
+    PYTHONPATH=transfer_common/src:crewai_demo/src python -m unittest discover -s crewai_demo/tests
+"""
+import unittest
+
+from crewai_demo.vector_memory import NumpyVectorStorage, matches_filter
+
+# 按关键词生成的 embedding：同一关键词的文本向量相同
+KEYWORDS = ["张三", "李四", "余额"]
+
+
+def keyword_embedder(texts):
+    return [[1.0 if word in text else 0.0 for word in KEYWORDS] + [0.01] for text in texts]
+
+
+class NumpyVectorStorageTest(unittest.TestCase):
+    def setUp(self):
+        self.storage = NumpyVectorStorage("test", embedder=keyword_embedder, batch_size=1)
+        self.storage.save("给张三转账 500 元", {"agent": "transfer", "session": "a"})
+        self.storage.save("张三的账户存在", {"agent": "checker", "session": "a"})
+        self.storage.save("给张三转账 800 元", {"agent": "transfer", "session": "b"})
+        self.storage.save("李四的余额", {"agent": "transfer", "session": "a"})
+
+    def contexts(self, **kwargs):
+        return [item["context"] for item in self.storage.search("张三", **kwargs)]
+
+    def test_search_without_filter(self):
+        self.assertEqual(len(self.contexts(limit=10)), 3)
+
+    def test_filter_scopes_results_by_metadata(self):
+        self.assertEqual(self.contexts(limit=10, filter={"session": "b"}), ["给张三转账 800 元"])
+        self.assertEqual(
+            sorted(self.contexts(limit=10, filter={"agent": "transfer", "session": "a"})), ["给张三转账 500 元"]
+        )
+        self.assertEqual(self.contexts(filter={"session": "c"}), [])
+
+    def test_filter_applies_before_limit(self):
+        # 过滤掉的条目不占用 limit 名额
+        self.assertEqual(self.contexts(limit=1, filter={"agent": "checker"}), ["张三的账户存在"])
+
+    def test_filter_operators(self):
+        metadata = {"agent": "transfer", "session": "a"}
+        self.assertTrue(matches_filter(metadata, {"agent": {"$in": ["transfer", "checker"]}}))
+        self.assertTrue(matches_filter(metadata, {"$or": [{"session": "b"}, {"agent": "transfer"}]}))
+        self.assertFalse(matches_filter(metadata, {"$and": [{"session": "a"}, {"agent": {"$ne": "transfer"}}]}))
+        self.assertFalse(matches_filter(metadata, {"missing": {"$nin": ["x"]}}))
+
+    def test_unsupported_operator_raises(self):
+        with self.assertRaises(NotImplementedError):
+            self.storage.search("张三", filter={"score": {"$gt": 1}})
+
+
+if __name__ == "__main__":
+    unittest.main()
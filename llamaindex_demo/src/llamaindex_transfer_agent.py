@@ -1,11 +1,8 @@
 import os
 from dotenv import load_dotenv
 
-from llama_index.llms.dashscope import DashScope
-from llama_index.core.tools import FunctionTool
-from llama_index.core.agent.workflow import FunctionAgent
-from llama_index.core.workflow import Context
 import asyncio
+from transfer_common import async_tools, tool_cache, llm_cache
 
 # 加载环境变量
 load_dotenv()
@@ -15,82 +12,8 @@ api_key = os.getenv("BAILIAN_API_KEY")
 model_name = os.getenv("QWEN3_MODEL")
 base_url = os.getenv("BAILIAN_API_BASE_URL")
 
-# 模拟数据库 - 使用用户名称作为键
-accounts_db = {
-    "张三": {"balance": 10000.0},
-    "李四": {"balance": 5000.0},
-    "王五": {"balance": 2000.0},
-    "赵六": {"balance": 50000.0},
-    "我": {"balance": 10000.0}
-}
-
-# 工具函数1: 查询余额
-def get_balance(user_name: str) -> str:
-    """
-    查询指定用户的余额
-    Args:
-        user_name: 用户名称，例如 '张三', '李四', '我'
-    Returns:
-        用户余额信息
-    """
-    print(f"--tool called--查询余额: {user_name}")
-    if user_name in accounts_db:
-        account_info = accounts_db[user_name]
-        return f"用户 {user_name} 的余额为: {account_info['balance']} 元"
-    else:
-        return f"用户 {user_name} 不存在"
-
-# 工具函数2: 查询账户
-def get_account(user_name: str) -> str:
-    """
-    查询指定用户
-    Args:
-        user_name: 用户名称，例如 '张三', '李四', '我'
-    Returns:
-        用户是否存在
-    """
-    print(f"--tool called--查询账户: {user_name}")
-    if user_name in accounts_db:
-        return f"用户 {user_name} 存在"
-    else:
-        return f"用户 {user_name} 不存在"
-
-# 工具函数3: 执行转账
-def execute_transfer(to_user: str, amount: float) -> str:
-    """
-    执行转账操作，从我的账户转出资金
-    Args:
-        to_user: 目标用户名称
-        amount: 转账金额
-    Returns:
-        转账结果信息
-    """
-    print(f"--tool called--执行转账: {to_user} {amount}")
-    # 检查我的余额是否足够
-    if accounts_db["我"]["balance"] < amount:
-        return f"转账失败：余额不足。当前余额: {accounts_db['我']['balance']} 元，需要: {amount} 元"
-    
-    # 执行转账
-    accounts_db["我"]["balance"] -= amount
-    accounts_db[to_user]["balance"] += amount
-    return f"转账成功！ 从我的账户转出 {amount} 元到 {to_user}"
-
-# 工具函数4: 向用户提问
-def reply_to_user(content: str) -> str:
-    """
-    向用户提问
-    Args:
-        content: 提问内容
-        state: 转账状态
-    Returns:
-        回答内容
-    """
-    print("")
-    print(f"--tool called--提问用户: {content}")
-    # 获取用户输入
-    user_input = input("reply:")
-    return user_input
-    # return "继续收集信息"
+# 工具函数1~3: 查询余额、查询账户、执行转账，统一使用共享账本
+# 工具函数4: 向用户提问，协程版本，问题和回答通过会话的问答队列传递，等待回复时不阻塞事件循环
 system_message = """
 你是一个专业的银行转账助手，负责处理用户的转账请求。
 你的任务：
@@ -103,73 +26,144 @@ system_message = """
 - 所有转账都从我的账户转出
 - 确认转账信息中金额，并确保余额足够`get_balance`
 - 目标账户必须存在`get_account`
+- 同时向多个用户转账时，使用`get_accounts`、`get_balances`批量校验，并通过`execute_transfers`一次性完成全部转账
 - 请与用户进行自然对话，逐步收集信息，确保转账安全准确
 - 当转账成功后，请发送"DONE"
 """
-# 创建工具
-get_account_tool = FunctionTool.from_defaults(
-    fn=get_account,
-    name="get_account",
-    description="获取指定用户的账户信息"
-)
-get_balance_tool = FunctionTool.from_defaults(
-    fn=get_balance,
-    name="get_balance",
-    description="获取指定用户的余额信息"
-)
-execute_transfer_tool = FunctionTool.from_defaults(
-    fn=execute_transfer,
-    name="execute_transfer",
-    description="执行转账操作"
-)
-reply_to_user_tool = FunctionTool.from_defaults(
-    fn=reply_to_user,
-    name="reply_to_user",
-    description="向用户提问"
-)
-# 创建工具列表
-tools = [get_account_tool, get_balance_tool, execute_transfer_tool, reply_to_user_tool]
-
-# 创建 LLM
-llm = DashScope(
-    model=model_name,
-    api_key=api_key,
-    base_url=base_url,
-    extra_body={"enable_thinking": False}
-)
-
-# 创建 FunctionAgent
-transfer_agent = FunctionAgent(
-    tools=tools, 
-    prompt=system_message,
-    llm=llm
-)
+# llama-index 的导入需要数秒：工具、LLM 和默认的 FunctionAgent 都在首次使用时才创建（见 get_tools 等），
+# 导入本模块、显示提示符都不需要等待；仍然可以像以前一样访问模块的 tools / llm / transfer_agent 属性
+_tools = None
+_llm = None
+_transfer_agent = None
+
+# 工具定义见 transfer_common.tool_registry，schema 只生成一次，不会在每次请求模型时重新生成。
+# 同一条消息中的多个工具调用由 FunctionAgent 并发调度，调用的是异步函数：只读工具在工具线程池中并发执行，
+# 转账按发出顺序串行（见 transfer_common.tool_executor）
+def get_tools():
+    """返回工具列表，首次调用时创建"""
+    global _tools
+    if _tools is None:
+        from transfer_common.tool_registry import llamaindex_adapter
+
+        _tools = llamaindex_adapter.create_tools()
+    return _tools
+
+def _dashscope_class():
+    """带响应缓存、兼容流式输出的 DashScope 类"""
+    from llama_index.llms.dashscope import DashScope
+    from transfer_common.llm_cache.llamaindex_adapter import CachedChatMixin
+
+    class StreamCompatibleDashScope(DashScope):
+        """
+        dashscope 的响应对象访问不存在的属性时抛出 KeyError 而不是 AttributeError，
+        FunctionAgent 对流式响应的 raw 做 isinstance(raw, BaseModel) 检查时会因此报错；这里把 raw 转成普通 dict
+        """
+
+        async def astream_chat(self, messages, **kwargs):
+            responses = await super().astream_chat(messages, **kwargs)
+
+            async def gen():
+                async for response in responses:
+                    if response.raw is not None:
+                        response.raw = dict(response.raw)
+                    yield response
+
+            return gen()
+
+    class CachedDashScope(CachedChatMixin, StreamCompatibleDashScope):
+        """相同请求直接复用共享缓存中的响应"""
+
+    return CachedDashScope
+
+def get_llm():
+    """返回 LLM，首次调用时创建"""
+    global _llm
+    if _llm is None:
+        _llm = _dashscope_class()(
+            model=model_name,
+            api_key=api_key,
+            base_url=base_url,
+            extra_body={"enable_thinking": False}
+        )
+    return _llm
+
+def create_transfer_agent(reply_tool=None):
+    """
+    创建转账 FunctionAgent
+    Args:
+        reply_tool: 向用户提问的工具，默认是问答队列版本；HTTP 服务会换成直接结束本轮的版本
+    """
+    from llama_index.core.agent.workflow import FunctionAgent
+
+    agent_tools = get_tools()
+    if reply_tool is not None:
+        agent_tools = [reply_tool if t.metadata.name == "reply_to_user" else t for t in agent_tools]
+    return FunctionAgent(
+        tools=agent_tools,
+        prompt=system_message,
+        llm=get_llm()
+    )
+
+def get_transfer_agent():
+    """返回默认的转账 FunctionAgent，首次调用时创建"""
+    global _transfer_agent
+    if _transfer_agent is None:
+        _transfer_agent = create_transfer_agent()
+    return _transfer_agent
+
+_LAZY_ATTRIBUTES = {
+    "tools": get_tools,
+    "llm": get_llm,
+    "transfer_agent": get_transfer_agent,
+}
+
+def __getattr__(name):
+    # 访问这些模块属性时（PEP 562）返回当前的实例，尚未创建时按需创建
+    if name in _LAZY_ATTRIBUTES:
+        return _LAZY_ATTRIBUTES[name]()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 async def chat_with_transfer_agent():
+    """
+    命令行对话
+    agent 和会话上下文在收到第一条消息时才创建（同时导入 llama-index），启动后立即显示提示符
+    """
     print("输入 'quit' 退出对话")
     print("-" * 50)
-    # 创建上下文
-    ctx = Context(transfer_agent)
+    ctx, frontend = None, None
     
     while True:
         try:
-            # 获取用户输入
-            user_input = input("用户: ").strip()
+            # 获取用户输入，在线程中读取避免阻塞事件循环
+            user_input = (await asyncio.to_thread(input, "用户: ")).strip()
             
             # 检查退出条件
             if user_input.lower() in ['exit', 'quit', '退出', 'q']:
+                print(tool_cache.format_stats())
+                print(llm_cache.format_stats())
                 print("再见！")
                 break
             if not user_input:
                 continue
+            if ctx is None:
+                from llama_index.core.workflow import Context
+
+                # 创建上下文
+                ctx = Context(get_transfer_agent())
+                # 一个 Context 即一个会话，工具结果缓存和问答队列按会话隔离
+                tool_cache.set_session(str(id(ctx)))
+                # reply_to_user 的提问由控制台前端在后台读取回答
+                frontend = asyncio.create_task(async_tools.console_frontend())
             # 运行 agent
-            response = await transfer_agent.run(user_input, ctx=ctx)
+            response = await get_transfer_agent().run(user_input, ctx=ctx)
             print(f"助手: {response}")
             
         except Exception as e:
             print(f"发生错误: {e}")
             print("请重试或输入 'quit' 退出")
             continue
+    if frontend is not None:
+        frontend.cancel()
 
 def main():
     """
@@ -0,0 +1,460 @@
+"""
+持久化、紧凑的 LangGraph checkpointer
+
+DeltaSQLiteSaver 可直接替换 InMemorySaver: workflow.compile(checkpointer=DeltaSQLiteSaver("checkpoints.db"))
+- 存储在 SQLite (WAL) 中，进程重启或多个 worker 之间都能恢复同一个 thread_id 的会话
+- 列表类型的通道（messages）只保存相对上一版本新增的元素（增量），每 snapshot_every 步保存一次完整快照，
+  避免每一步都把整个消息历史重新写一遍
+- 使用 langgraph 自带的 msgpack 序列化，较大的数据再用 zlib 压缩
+- 每个 thread_id 只保留最近 max_checkpoints 个 checkpoint，更早的 checkpoint、writes 和不再引用的数据会被清理
+"""
+import asyncio
+import random
+import sqlite3
+import threading
+import zlib
+from collections import defaultdict
+from typing import Any, AsyncIterator, Dict, Iterator, Optional, Sequence, Tuple
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    get_checkpoint_id,
+    get_checkpoint_metadata,
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS checkpoints (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL,
+    checkpoint_id TEXT NOT NULL,
+    parent_checkpoint_id TEXT,
+    type TEXT NOT NULL,
+    checkpoint BLOB NOT NULL,
+    metadata_type TEXT NOT NULL,
+    metadata BLOB NOT NULL,
+    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id)
+);
+CREATE TABLE IF NOT EXISTS blobs (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL,
+    channel TEXT NOT NULL,
+    version TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    base_version TEXT,
+    type TEXT,
+    blob BLOB,
+    PRIMARY KEY (thread_id, checkpoint_ns, channel, version)
+);
+CREATE TABLE IF NOT EXISTS writes (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL,
+    checkpoint_id TEXT NOT NULL,
+    task_id TEXT NOT NULL,
+    idx INTEGER NOT NULL,
+    channel TEXT NOT NULL,
+    type TEXT NOT NULL,
+    blob BLOB NOT NULL,
+    task_path TEXT NOT NULL,
+    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id, task_id, idx)
+);
+"""
+
+# blobs.kind
+_FULL = "full"
+_APPEND = "append"
+_EMPTY = "empty"
+
+# 超过该大小的序列化结果使用 zlib 压缩
+_COMPRESS_MIN_BYTES = 512
+_ZLIB_SUFFIX = "+zlib"
+
+_MISSING = object()
+
+
+class DeltaSQLiteSaver(BaseCheckpointSaver[str]):
+    """
+    基于 SQLite 的增量 checkpointer
+    Args:
+        path: 数据库文件路径
+        max_checkpoints: 每个 thread_id 保留的 checkpoint 数量，None 表示不清理
+        snapshot_every: 每多少步保存一次完整快照（其余步骤保存增量），为 1 时每一步都保存完整快照
+        prune_every: 每个 thread_id 写入多少个 checkpoint 后执行一次清理
+    """
+
+    def __init__(
+        self,
+        path: str,
+        *,
+        max_checkpoints: Optional[int] = 50,
+        snapshot_every: int = 50,
+        prune_every: int = 10,
+        serde=None,
+    ):
+        super().__init__(serde=serde)
+        self.path = path
+        self.max_checkpoints = max_checkpoints
+        self.snapshot_every = snapshot_every
+        self.prune_every = prune_every
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+        # (thread_id, ns, channel) -> (最近写入/读取的版本, 该版本的列表内容, 增量链长度)
+        self._last: Dict[Tuple[str, str, str], Tuple[str, list, int]] = {}
+        # (thread_id, ns) -> 距上次清理写入的 checkpoint 数
+        self._puts_since_prune: Dict[Tuple[str, str], int] = defaultdict(int)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> "DeltaSQLiteSaver":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    # ---- 序列化 ----
+    def _dump(self, value: Any) -> Tuple[str, bytes]:
+        type_, data = self.serde.dumps_typed(value)
+        if len(data) >= _COMPRESS_MIN_BYTES:
+            return type_ + _ZLIB_SUFFIX, zlib.compress(data)
+        return type_, data
+
+    def _load(self, type_: str, data: bytes) -> Any:
+        if type_.endswith(_ZLIB_SUFFIX):
+            return self.serde.loads_typed((type_[: -len(_ZLIB_SUFFIX)], zlib.decompress(data)))
+        return self.serde.loads_typed((type_, data))
+
+    # ---- 通道数据 ----
+    def _encode_channel(self, thread_id: str, ns: str, channel: str, version: str, value: Any):
+        """返回 blobs 表的一行 (kind, base_version, type, blob)"""
+        key = (thread_id, ns, channel)
+        if not isinstance(value, list):
+            self._last.pop(key, None)
+            return (_FULL, None, *self._dump(value))
+        last = self._last.get(key)
+        if last is not None:
+            base_version, base_items, chain = last
+            n = len(base_items)
+            # 新列表以上一版本的全部元素（同一对象）开头时，只保存新增部分
+            # chain 为当前增量链上已有的增量数，加上快照本身不超过 snapshot_every 步
+            if chain + 1 < self.snapshot_every and len(value) >= n and all(a is b for a, b in zip(base_items, value)):
+                self._last[key] = (version, list(value), chain + 1)
+                return (_APPEND, base_version, *self._dump(value[n:]))
+        self._last[key] = (version, list(value), 0)
+        return (_FULL, None, *self._dump(value))
+
+    def _chain(self, cur: sqlite3.Cursor, thread_id: str, ns: str, channel: str, version: str):
+        """返回从 version 到完整快照的所有行 [(version, kind, type, blob), ...]"""
+        rows = []
+        while version is not None:
+            row = cur.execute(
+                "SELECT kind, base_version, type, blob FROM blobs "
+                "WHERE thread_id = ? AND checkpoint_ns = ? AND channel = ? AND version = ?",
+                (thread_id, ns, channel, version),
+            ).fetchone()
+            if row is None:
+                break
+            kind, base_version, type_, blob = row
+            rows.append((version, kind, type_, blob))
+            version = base_version if kind == _APPEND else None
+        return rows
+
+    def _load_channel(self, cur: sqlite3.Cursor, thread_id: str, ns: str, channel: str, version: str, remember: bool):
+        rows = self._chain(cur, thread_id, ns, channel, version)
+        if not rows or rows[0][1] == _EMPTY or rows[-1][1] != _FULL:
+            return _MISSING
+        value = self._load(rows[-1][2], rows[-1][3])
+        if len(rows) > 1:
+            value = list(value)
+            for _, _, type_, blob in reversed(rows[:-1]):
+                value.extend(self._load(type_, blob))
+        if remember and isinstance(value, list):
+            # 记住最近读取的版本，恢复会话后的下一次写入可以直接保存增量
+            self._last[(thread_id, ns, channel)] = (str(version), list(value), len(rows) - 1)
+        return value
+
+    def _load_channel_values(self, cur: sqlite3.Cursor, thread_id: str, ns: str, versions: ChannelVersions, remember: bool):
+        values = {}
+        for channel, version in versions.items():
+            value = self._load_channel(cur, thread_id, ns, channel, str(version), remember)
+            if value is not _MISSING:
+                values[channel] = value
+        return values
+
+    # ---- 读取 ----
+    def _to_tuple(self, cur: sqlite3.Cursor, thread_id: str, ns: str, row, remember: bool = False) -> CheckpointTuple:
+        checkpoint_id, parent_checkpoint_id, type_, checkpoint_blob, metadata_type, metadata_blob = row
+        checkpoint: Checkpoint = self._load(type_, checkpoint_blob)
+        writes = cur.execute(
+            "SELECT task_id, channel, type, blob FROM writes "
+            "WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ? ORDER BY task_id, idx",
+            (thread_id, ns, checkpoint_id),
+        ).fetchall()
+        return CheckpointTuple(
+            config={
+                "configurable": {
+                    "thread_id": thread_id,
+                    "checkpoint_ns": ns,
+                    "checkpoint_id": checkpoint_id,
+                }
+            },
+            checkpoint={
+                **checkpoint,
+                "channel_values": self._load_channel_values(
+                    cur, thread_id, ns, checkpoint["channel_versions"], remember
+                ),
+            },
+            metadata=self._load(metadata_type, metadata_blob),
+            parent_config=(
+                {
+                    "configurable": {
+                        "thread_id": thread_id,
+                        "checkpoint_ns": ns,
+                        "checkpoint_id": parent_checkpoint_id,
+                    }
+                }
+                if parent_checkpoint_id
+                else None
+            ),
+            pending_writes=[(task_id, channel, self._load(t, b)) for task_id, channel, t, b in writes],
+        )
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        thread_id = config["configurable"]["thread_id"]
+        ns = config["configurable"].get("checkpoint_ns", "")
+        select = (
+            "SELECT checkpoint_id, parent_checkpoint_id, type, checkpoint, metadata_type, metadata "
+            "FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ?"
+        )
+        with self._lock:
+            cur = self.conn.cursor()
+            if checkpoint_id := get_checkpoint_id(config):
+                row = cur.execute(select + " AND checkpoint_id = ?", (thread_id, ns, checkpoint_id)).fetchone()
+            else:
+                row = cur.execute(select + " ORDER BY checkpoint_id DESC LIMIT 1", (thread_id, ns)).fetchone()
+            if row is None:
+                return None
+            return self._to_tuple(cur, thread_id, ns, row, remember=True)
+
+    def list(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[CheckpointTuple]:
+        query = (
+            "SELECT thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id, type, checkpoint, "
+            "metadata_type, metadata FROM checkpoints"
+        )
+        clauses, params = [], []
+        if config:
+            clauses.append("thread_id = ?")
+            params.append(config["configurable"]["thread_id"])
+            if (ns := config["configurable"].get("checkpoint_ns")) is not None:
+                clauses.append("checkpoint_ns = ?")
+                params.append(ns)
+            if checkpoint_id := get_checkpoint_id(config):
+                clauses.append("checkpoint_id = ?")
+                params.append(checkpoint_id)
+        if before and (before_id := get_checkpoint_id(before)):
+            clauses.append("checkpoint_id < ?")
+            params.append(before_id)
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        query += " ORDER BY thread_id, checkpoint_ns, checkpoint_id DESC"
+        results = []
+        with self._lock:
+            cur = self.conn.cursor()
+            for thread_id, ns, *row in cur.execute(query, params).fetchall():
+                if filter:
+                    metadata = self._load(row[4], row[5])
+                    if not all(metadata.get(k) == v for k, v in filter.items()):
+                        continue
+                if limit is not None and len(results) >= limit:
+                    break
+                results.append(self._to_tuple(cur, thread_id, ns, row))
+        yield from results
+
+    # ---- 写入 ----
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        c = checkpoint.copy()
+        thread_id = config["configurable"]["thread_id"]
+        ns = config["configurable"]["checkpoint_ns"]
+        values: Dict[str, Any] = c.pop("channel_values")
+        with self._lock:
+            blob_rows = []
+            for channel, version in new_versions.items():
+                version = str(version)
+                if channel in values:
+                    row = self._encode_channel(thread_id, ns, channel, version, values[channel])
+                else:
+                    self._last.pop((thread_id, ns, channel), None)
+                    row = (_EMPTY, None, None, None)
+                blob_rows.append((thread_id, ns, channel, version, *row))
+            with self.conn:
+                self.conn.executemany("INSERT OR REPLACE INTO blobs VALUES (?, ?, ?, ?, ?, ?, ?, ?)", blob_rows)
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO checkpoints VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        thread_id,
+                        ns,
+                        checkpoint["id"],
+                        config["configurable"].get("checkpoint_id"),
+                        *self._dump(c),
+                        *self._dump(get_checkpoint_metadata(config, metadata)),
+                    ),
+                )
+            self._puts_since_prune[(thread_id, ns)] += 1
+            if self.max_checkpoints and self._puts_since_prune[(thread_id, ns)] >= self.prune_every:
+                self._puts_since_prune[(thread_id, ns)] = 0
+                self._prune(thread_id, ns)
+        return {
+            "configurable": {
+                "thread_id": thread_id,
+                "checkpoint_ns": ns,
+                "checkpoint_id": checkpoint["id"],
+            }
+        }
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        thread_id = config["configurable"]["thread_id"]
+        ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint_id = config["configurable"]["checkpoint_id"]
+        rows = {"replace": [], "ignore": []}
+        for idx, (channel, value) in enumerate(writes):
+            idx = WRITES_IDX_MAP.get(channel, idx)
+            # 特殊写入（错误、中断等）覆盖旧值，普通写入只保留第一次
+            rows["replace" if idx < 0 else "ignore"].append(
+                (thread_id, ns, checkpoint_id, task_id, idx, channel, *self._dump(value), task_path)
+            )
+        with self._lock, self.conn:
+            for conflict, batch in rows.items():
+                if batch:
+                    self.conn.executemany(
+                        f"INSERT OR {conflict.upper()} INTO writes VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", batch
+                    )
+
+    def delete_thread(self, thread_id: str) -> None:
+        with self._lock, self.conn:
+            for table in ("checkpoints", "blobs", "writes"):
+                self.conn.execute(f"DELETE FROM {table} WHERE thread_id = ?", (thread_id,))
+            for key in [key for key in self._last if key[0] == thread_id]:
+                del self._last[key]
+
+    def _prune(self, thread_id: str, ns: str) -> None:
+        """只保留最近 max_checkpoints 个 checkpoint，并删除它们不再引用的数据"""
+        cur = self.conn.cursor()
+        row = cur.execute(
+            "SELECT checkpoint_id FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ? "
+            "ORDER BY checkpoint_id DESC LIMIT 1 OFFSET ?",
+            (thread_id, ns, self.max_checkpoints - 1),
+        ).fetchone()
+        if row is None:
+            return
+        oldest_kept = row[0]
+        with self.conn:
+            for table in ("checkpoints", "writes"):
+                self.conn.execute(
+                    f"DELETE FROM {table} WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id < ?",
+                    (thread_id, ns, oldest_kept),
+                )
+            # 每个通道找出保留的 checkpoint 所引用版本的增量链起点，更早的版本都可以删除
+            referenced = defaultdict(set)
+            for type_, blob in cur.execute(
+                "SELECT type, checkpoint FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ?",
+                (thread_id, ns),
+            ).fetchall():
+                for channel, version in self._load(type_, blob)["channel_versions"].items():
+                    referenced[channel].add(str(version))
+            channels = [r[0] for r in cur.execute(
+                "SELECT DISTINCT channel FROM blobs WHERE thread_id = ? AND checkpoint_ns = ?", (thread_id, ns)
+            ).fetchall()]
+            for channel in channels:
+                versions = referenced.get(channel)
+                if not versions:
+                    self.conn.execute(
+                        "DELETE FROM blobs WHERE thread_id = ? AND checkpoint_ns = ? AND channel = ?",
+                        (thread_id, ns, channel),
+                    )
+                    self._last.pop((thread_id, ns, channel), None)
+                    continue
+                cutoff = min(
+                    chain[-1][0] if (chain := self._chain(cur, thread_id, ns, channel, v)) else v
+                    for v in versions
+                )
+                self.conn.execute(
+                    "DELETE FROM blobs WHERE thread_id = ? AND checkpoint_ns = ? AND channel = ? AND version < ?",
+                    (thread_id, ns, channel, cutoff),
+                )
+                last = self._last.get((thread_id, ns, channel))
+                if last is not None and last[0] < cutoff:
+                    del self._last[(thread_id, ns, channel)]
+
+    # ---- 异步接口：放到线程中执行，避免阻塞事件循环 ----
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def alist(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        items = await asyncio.to_thread(lambda: list(self.list(config, filter=filter, before=before, limit=limit)))
+        for item in items:
+            yield item
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        return await asyncio.to_thread(self.put, config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        await asyncio.to_thread(self.put_writes, config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        await asyncio.to_thread(self.delete_thread, thread_id)
+
+    def get_next_version(self, current: Optional[str], channel: None) -> str:
+        # 与 InMemorySaver 相同的版本格式：补零的序号保证字符串顺序与先后顺序一致
+        if current is None:
+            current_v = 0
+        elif isinstance(current, int):
+            current_v = current
+        else:
+            current_v = int(current.split(".")[0])
+        return f"{current_v + 1:032}.{random.random():016}"
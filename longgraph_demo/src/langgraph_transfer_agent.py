@@ -1,103 +1,72 @@
 from typing import Dict, Annotated, List
 from typing_extensions import TypedDict
 from langgraph.graph import StateGraph, END, START,MessagesState
-from langchain.chat_models import init_chat_model
-from langgraph.prebuilt import ToolNode, create_react_agent
-from langchain_core.messages import HumanMessage, SystemMessage, AIMessage
+from langchain_core.messages import HumanMessage, SystemMessage, AIMessage, ToolMessage, RemoveMessage, get_buffer_string, trim_messages
+from langchain_core.messages.utils import count_tokens_approximately
 from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.types import Command, interrupt
 from langchain_core.tools import tool
+from langchain_core.runnables import RunnableConfig
 from pydantic import BaseModel
+import asyncio
 import uuid
 import os
+import sys
 import json
 from dotenv import load_dotenv
+from transfer_common import tool_cache, llm_cache
+from transfer_common.ledger import SELF_ACCOUNT, get_ledger
+from transfer_common.nlu import extract_transfer, is_affirmative
+from transfer_common.tool_registry import langchain_adapter
+from transfer_common.llm_cache.langchain_adapter import LangChainLLMCache
+from delta_checkpoint import DeltaSQLiteSaver
 
 # 加载环境变量
 load_dotenv()
 
-# 模拟数据库 - 使用用户名称作为键
-accounts_db = {
-    "张三": {"balance": 10000.0},
-    "李四": {"balance": 5000.0},
-    "王五": {"balance": 2000.0},
-    "赵六": {"balance": 50000.0},
-    "我": {"balance": 10000.0}
-}
-
-# 工具函数1: 查询余额
-def get_balance(user_name: str) -> str:
-    """
-    查询指定用户的余额
-    Args:
-        user_name: 用户名称，例如 '张三', '李四', '我'
-    Returns:
-        用户余额信息
-    """
-    print(f"--tool called--查询余额: {user_name}")
-    if user_name in accounts_db:
-        account_info = accounts_db[user_name]
-        return f"用户 {user_name} 的余额为: {account_info['balance']} 元"
-    else:
-        return f"用户 {user_name} 不存在"
-
-# 工具函数2: 查询账户
-def get_account(user_name: str) -> str:
-    """
-    查询指定用户
-    Args:
-        user_name: 用户名称，例如 '张三', '李四', '我'
-    Returns:
-        用户是否存在
-    """
-    print(f"--tool called--查询账户: {user_name}")
-    if user_name in accounts_db:
-        return f"用户 {user_name} 存在"
-    else:
-        return f"用户 {user_name} 不存在"
-
-# 工具函数3: 执行转账
-def execute_transfer(to_user: str, amount: float) -> str:
-    """
-    执行转账操作，从我的账户转出资金
-    Args:
-        to_user: 目标用户名称
-        amount: 转账金额
-    Returns:
-        转账结果信息
-    """
-    print(f"--tool called--执行转账: {to_user} {amount}")
-    # 检查我的余额是否足够
-    if accounts_db["我"]["balance"] < amount:
-        return f"转账失败：余额不足。当前余额: {accounts_db['我']['balance']} 元，需要: {amount} 元"
-    
-    # 执行转账
-    accounts_db["我"]["balance"] -= amount
-    accounts_db[to_user]["balance"] += amount
-    return f"转账成功！ 从我的账户转出 {amount} 元到 {to_user}"
-
+# 工具函数1~3: 查询余额、查询账户、执行转账，统一使用共享账本，定义见 transfer_common.tool_registry
 # 工具函数4: 向用户提问
 def reply_to_user(content: str) -> str:
     """
     向用户提问
     Args:
         content: 提问内容
-        state: 转账状态
     Returns:
         回答内容
     """
-    print(f"--tool called--提问用户: {content}")
-    # 获取用户输入
-    user_input = input("reply:")
-    return user_input
-
-# 初始化 LLM
-model = init_chat_model(
-    model=os.getenv("QWEN3_MODEL"),
-    model_provider="openai",  # 指定为openai兼容的API
-    api_key=os.getenv("BAILIAN_API_KEY"),
-    base_url=os.getenv("BAILIAN_API_BASE_URL"),
-    extra_body={"enable_thinking": False}
-)
+    # 中断图的执行，等待该会话的用户回复后通过 Command(resume=...) 恢复；
+    # 恢复时该函数会重新执行，提问内容由前端在收到中断时展示
+    return interrupt({"type": "reply_to_user", "question": content})
+
+# LLM、绑定工具的 LLM、工具节点和编译后的图都在首次使用时才创建（见 get_model 等），
+# 导入本模块不会导入 langchain_openai、不会建立客户端，也不会编译图。
+# 仍然可以像以前一样访问模块的 model / model_with_tools / tools / transfer_graph 属性，替换时使用 set_model 等
+_model = None
+_model_with_tools = None
+_tools = None
+_transfer_graph = None
+
+def get_model():
+    """返回 LLM，首次调用时创建"""
+    global _model
+    if _model is None:
+        from langchain.chat_models import init_chat_model
+
+        _model = init_chat_model(
+            model=os.getenv("QWEN3_MODEL"),
+            model_provider="openai",  # 指定为openai兼容的API
+            api_key=os.getenv("BAILIAN_API_KEY"),
+            base_url=os.getenv("BAILIAN_API_BASE_URL"),
+            extra_body={"enable_thinking": False},
+            # 相同请求直接复用共享缓存中的响应
+            cache=LangChainLLMCache(),
+        )
+    return _model
+
+def set_model(model) -> None:
+    """替换 LLM（例如基准中的模拟模型），用于总结历史"""
+    global _model
+    _model = model
 
 # 构建系统提示
 transfer_prompt = """
@@ -114,41 +83,259 @@ transfer_prompt = """
 - 所有转账都从我的账户转出
 - 确认转账信息中金额，并确保余额足够`get_balance`
 - 目标账户必须存在`get_account`
+- 同时向多个用户转账时，使用`get_accounts`、`get_balances`批量校验，并通过`execute_transfers`一次性完成全部转账
 - 请与用户进行自然对话，逐步收集信息，确保转账安全准确
 - 当转账成功后，请发送"DONE"
 """
+# 系统提示只构建一次，避免每轮重新创建
+system_message = SystemMessage(content=transfer_prompt)
+
+# 历史消息的 token 预算：超过 HISTORY_TOKEN_BUDGET 时，把较早的消息总结成摘要，
+# 只保留最近不超过 HISTORY_KEEP_TOKENS 的消息
+HISTORY_TOKEN_BUDGET = 3000
+HISTORY_KEEP_TOKENS = 1000
+
+summary_prompt = """
+请用简洁的中文总结以下转账对话，保留已确认的目标账户、金额、校验结果以及尚未完成的事项。
+"""
 # 关键的状态类
 class TransferState(MessagesState):
     """
     转账状态，包含整个转账流程中需要追踪和传递的关键信息。
     字段说明：
-    - to_account: 转入账户的标识
+    - to_account: 转入账户的标识，由规则从最新的用户消息中解析，解析不出时为空
     - amount: 转账金额
+    - confident: 解析结果可以直接使用（走快速通道），校验失败、用户没有确认时置为 False
+    - validation: 校验子图写入的校验结果，见 create_validation_graph；用户没有确认、转账执行后清空
+    - summary: 已从历史中移除的较早对话的摘要
     """
     to_account: str
     amount: float
-#toolnode
-tools = ToolNode(tools=[get_balance,get_account,reply_to_user,execute_transfer])
-# 绑定工具
-model_with_tools = model.bind_tools([get_balance,get_account,reply_to_user,execute_transfer])
+    confident: bool
+    validation: dict
+    summary: str
+# 工具的 schema 取自注册表，不再由函数签名生成
+TOOLS = langchain_adapter.create_tools({"reply_to_user": reply_to_user})
+
+def get_tools():
+    """返回工具节点，首次调用时创建"""
+    global _tools
+    if _tools is None:
+        from langgraph.prebuilt import ToolNode
+
+        _tools = ToolNode(tools=TOOLS)
+    return _tools
+
+def get_model_with_tools():
+    """返回绑定了工具的 LLM，首次调用时创建"""
+    global _model_with_tools
+    if _model_with_tools is None:
+        _model_with_tools = get_model().bind_tools(TOOLS)
+    return _model_with_tools
+
+def set_model_with_tools(model) -> None:
+    """替换绑定了工具的 LLM（例如基准中的模拟模型）"""
+    global _model_with_tools
+    _model_with_tools = model
 
-def call_model_transfer(state: TransferState):
+async def call_model_transfer(state: TransferState, config: RunnableConfig):
     """调用模型转账"""
-    # 构建完整消息列表，包含系统提示
-    full_messages = [SystemMessage(content=transfer_prompt)] + state["messages"]
-    response = model_with_tools.invoke(full_messages)
-    print("转账助手：" + response.content)
-    return {
-        **state,
-        "messages": state["messages"] + [response]
-    } 
+    # 构建完整消息列表，包含系统提示（以及较早对话的摘要）
+    summary = state.get("summary")
+    validation = state.get("validation")
+    if summary or validation:
+        content = transfer_prompt
+        if summary:
+            content += f"\n之前对话的摘要：\n{summary}"
+        if validation:
+            content += "\n" + format_validation(validation)
+        prompt = SystemMessage(content=content)
+    else:
+        prompt = system_message
+    # 以 stream_mode="messages" 驱动图时，模型会以流式方式生成，token 随生成逐块发出，
+    # 工具调用的分块由模型层拼接，这里拿到的始终是完整的消息
+    response = await get_model_with_tools().ainvoke([prompt] + state["messages"])
+    # 流式模式下文本已由 run_session 的 on_token 逐块输出
+    if not config["configurable"].get("stream_tokens"):
+        print("转账助手：" + response.content)
+    # 只返回新增的消息，由 MessagesState 的 add_messages 追加
+    return {"messages": [response]}
 
 def user_input(state: TransferState):
-    user_input_text = input("你：")
+    # 中断图的执行，等待该会话的下一条用户消息
+    user_input_text = interrupt({"type": "user_input"})
+    return {"messages": [HumanMessage(content=user_input_text)]}
+
+async def call_tools(state: TransferState):
+    """
+    执行工具调用
+    先处理 reply_to_user（会中断等待用户回复），拿到全部回复后再执行其余工具；
+    恢复执行时节点会从头重跑，这样可以避免转账等写操作被重复执行
+    """
+    last_message = state["messages"][-1]
+    questions = [call for call in last_message.tool_calls if call["name"] == "reply_to_user"]
+    others = [call for call in last_message.tool_calls if call["name"] != "reply_to_user"]
+    messages = [
+        ToolMessage(content=reply_to_user(**call["args"]), name=call["name"], tool_call_id=call["id"])
+        for call in questions
+    ]
+    if others:
+        result = await get_tools().ainvoke({"messages": [last_message.model_copy(update={"tool_calls": others})]})
+        messages.extend(result["messages"])
+    # 模型已经执行过转账，校验结果不再适用，不再写入之后的系统提示
+    if any(call["name"].startswith("execute_transfer") for call in others):
+        return {"messages": messages, "validation": {}}
+    return {"messages": messages}
+
+async def summarize_history(state: TransferState):
+    """历史超出 token 预算时，把较早的消息总结为摘要并从状态中移除"""
+    messages = state["messages"]
+    if count_tokens_approximately(messages) <= HISTORY_TOKEN_BUDGET:
+        return {}
+    # 保留最近的消息，从用户消息处切分，避免拆开工具调用和工具结果
+    kept = trim_messages(
+        messages,
+        max_tokens=HISTORY_KEEP_TOKENS,
+        token_counter=count_tokens_approximately,
+        strategy="last",
+        start_on="human",
+    )
+    if not kept:
+        last_human = max(i for i, m in enumerate(messages) if isinstance(m, HumanMessage))
+        kept = messages[last_human:]
+    kept_ids = {m.id for m in kept}
+    dropped = [m for m in messages if m.id not in kept_ids]
+    if not dropped:
+        return {}
+    history = get_buffer_string(dropped)
+    if state.get("summary"):
+        history = f"之前的摘要：\n{state['summary']}\n\n{history}"
+    summary = await get_model().ainvoke([SystemMessage(content=summary_prompt), HumanMessage(content=history)])
     return {
-        **state,
-        "messages": state["messages"] + [HumanMessage(content=user_input_text)]
+        "summary": summary.content,
+        "messages": [RemoveMessage(id=m.id) for m in dropped],
+    }
+
+# 快速通道：用户消息中的收款人和金额能由规则确定时（见 transfer_common.nlu），
+# 校验、确认和执行都按固定流程完成，不调用模型；其余情况以及校验失败、用户没有确认时交给模型。
+# 快速通道中的工具调用和结果与模型调用工具时一样记录在消息中，交给模型时上下文是完整的
+def _format_amount(amount: float) -> str:
+    return f"{amount:.2f}".rstrip("0").rstrip(".")
+
+def _tool_call_message(*calls) -> AIMessage:
+    """构造一条调用工具的助手消息，calls 为 (工具名, 参数)"""
+    return AIMessage(
+        content="",
+        id=str(uuid.uuid4()),
+        tool_calls=[{"name": name, "args": args, "id": f"call_{uuid.uuid4().hex}"} for name, args in calls],
+    )
+
+def extract_transfer_slots(state: TransferState):
+    """用规则解析最新的用户消息，收款人和金额都解析出来时写入状态，否则清空"""
+    slots = extract_transfer(state["messages"][-1].content)
+    if slots.to_account is None or slots.amount is None:
+        return {"to_account": "", "amount": 0.0, "confident": False, "validation": {}}
+    return {"to_account": slots.to_account, "amount": slots.amount, "confident": slots.confident, "validation": {}}
+
+def has_transfer_slots(state: TransferState):
+    return "validate_transfer" if state.get("to_account") else "summarize_history"
+
+# 校验子图：收款人和金额已知时，由代码并行查询目标账户和余额，合并后写入状态的 validation，
+# 不需要模型逐个决定调用 get_account、get_balance 再等待结果
+class ValidationState(TypedDict):
+    to_account: str
+    amount: float
+    confident: bool
+    account_exists: bool
+    balance: float
+    validation: dict
+
+class ValidationOutput(TypedDict):
+    confident: bool
+    validation: dict
+
+def check_account(state: ValidationState):
+    return {"account_exists": get_ledger().exists(state["to_account"])}
+
+def check_balance(state: ValidationState):
+    return {"balance": get_ledger().balance_of(SELF_ACCOUNT)}
+
+def merge_validation(state: ValidationState):
+    """合并两项查询的结果，校验不通过时不再走快速通道"""
+    validation = {
+        "to_account": state["to_account"],
+        "amount": state["amount"],
+        "account_exists": state["account_exists"],
+        "balance": state["balance"],
+        "sufficient": state["balance"] >= state["amount"],
     }
+    passed = validation["account_exists"] and validation["sufficient"]
+    return {"validation": validation, "confident": state["confident"] and passed}
+
+def create_validation_graph():
+    """两项查询从 START 同时开始（同一个超步内并行执行），都完成后再合并"""
+    workflow = StateGraph(ValidationState, output_schema=ValidationOutput)
+    workflow.add_node("check_account", check_account)
+    workflow.add_node("check_balance", check_balance)
+    workflow.add_node("merge_validation", merge_validation)
+    workflow.add_edge(START, "check_account")
+    workflow.add_edge(START, "check_balance")
+    workflow.add_edge(["check_account", "check_balance"], "merge_validation")
+    workflow.add_edge("merge_validation", END)
+    return workflow.compile()
+
+def format_validation(validation: dict) -> str:
+    """校验结果写入模型的系统提示：模型不需要再查询，只需要措辞向用户确认（或说明校验不通过）"""
+    to_account, amount = validation["to_account"], _format_amount(validation["amount"])
+    account = "存在" if validation["account_exists"] else "不存在"
+    balance = "足够" if validation["sufficient"] else "不足"
+    return (
+        f"系统已从用户最新的消息中解析出转账信息并完成校验：向 {to_account} 转账 {amount} 元，"
+        f"目标账户{account}，我的余额为 {_format_amount(validation['balance'])} 元，{balance}。\n"
+        "解析结果可能与用户的原意不符，以用户的原话为准；与原意一致时不需要再调用 get_account、get_balance，"
+        "校验通过则直接通过 reply_to_user 向用户确认，校验不通过则告知用户原因。"
+    )
+
+def confirm_transfer(state: TransferState):
+    """向用户确认转账信息，用户没有确认时交给模型处理用户的回答"""
+    question = f"请确认转账信息：从我的账户向 {state['to_account']} 转账 {_format_amount(state['amount'])} 元，是否确认执行？"
+    request = _tool_call_message(("reply_to_user", {"content": question}))
+    # 中断等待用户回复；恢复时节点从头重跑，拿到回复
+    answer = reply_to_user(question)
+    update = {"messages": [request, ToolMessage(content=answer, name="reply_to_user",
+                                                tool_call_id=request.tool_calls[0]["id"])]}
+    if not is_affirmative(answer):
+        # 用户拒绝或修改了转账信息，校验结果不再适用
+        update["confident"] = False
+        update["validation"] = {}
+    return update
+
+async def finish_transfer(state: TransferState, config: RunnableConfig):
+    """执行转账并回复结果，转账失败时交给模型"""
+    request = _tool_call_message(("execute_transfer", {"to_user": state["to_account"], "amount": state["amount"]}))
+    result = await get_tools().ainvoke({"messages": [request]})
+    messages = [request] + result["messages"]
+    content = result["messages"][-1].content
+    if not content.startswith("转账成功"):
+        # 校验结果已经过时，由模型根据转账结果处理
+        return {"messages": messages, "confident": False, "validation": {}}
+    reply = AIMessage(content=f"{content}\nDONE", id=str(uuid.uuid4()),
+                      response_metadata={"finish_reason": "stop"})
+    if not config["configurable"].get("stream_tokens"):
+        print("转账助手：" + reply.content)
+    return {"messages": messages + [reply], "confident": False, "validation": {}}
+
+def route_fast_path(state: TransferState):
+    """快速通道的下一步：上一步成功时继续，否则交给模型"""
+    return "continue" if state.get("confident") else "summarize_history"
+
+def is_transfer_done(state: TransferState):
+    """转账成功后结束，失败时交给模型"""
+    last_message = state["messages"][-1]
+    return END if isinstance(last_message, AIMessage) and "DONE" in last_message.content else "summarize_history"
+
+# 回复用户的节点：流式输出和服务端只转发这些节点中助手的消息
+REPLY_NODES = ("call_model_transfer", "finish_transfer")
 
 def is_tool_call(state: TransferState):
     last_message = state["messages"][-1]
@@ -160,16 +347,40 @@ def is_tool_call(state: TransferState):
     return "user_input"
 
 # 创建 LangGraph
-def create_transfer_graph():
-    """创建支持多轮聊天的转账流程图"""
+def create_transfer_graph(checkpointer=None, fast_path=None):
+    """
+    创建支持多轮聊天的转账流程图
+    Args:
+        checkpointer: 会话状态存储；默认在设置了 LANGGRAPH_CHECKPOINT_DB 时持久化到该 SQLite 文件，否则保存在内存中
+        fast_path: 是否启用快速通道，关闭时每条用户消息都交给模型；默认启用，LANGGRAPH_FAST_PATH=0 时关闭
+    """
+    if fast_path is None:
+        fast_path = os.getenv("LANGGRAPH_FAST_PATH", "1") != "0"
     workflow = StateGraph(TransferState)
     # 添加节点
     workflow.add_node("user_input", user_input)
+    workflow.add_node("summarize_history", summarize_history)
     workflow.add_node("call_model_transfer", call_model_transfer)
-    workflow.add_node("tools", tools)
+    workflow.add_node("tools", call_tools)
     # 设置入口点
     workflow.add_edge(START, "user_input")
-    workflow.add_edge("user_input", "call_model_transfer")
+    if fast_path:
+        workflow.add_node("extract_transfer", extract_transfer_slots)
+        workflow.add_node("validate_transfer", create_validation_graph())
+        workflow.add_node("confirm_transfer", confirm_transfer)
+        workflow.add_node("finish_transfer", finish_transfer)
+        workflow.add_edge("user_input", "extract_transfer")
+        # 解析出收款人和金额时先校验；没有把握的解析结果校验后交给模型，模型只需措辞确认
+        workflow.add_conditional_edges("extract_transfer", has_transfer_slots,
+                                       ["validate_transfer", "summarize_history"])
+        workflow.add_conditional_edges("validate_transfer", route_fast_path,
+                                       {"continue": "confirm_transfer", "summarize_history": "summarize_history"})
+        workflow.add_conditional_edges("confirm_transfer", route_fast_path,
+                                       {"continue": "finish_transfer", "summarize_history": "summarize_history"})
+        workflow.add_conditional_edges("finish_transfer", is_transfer_done, [END, "summarize_history"])
+    else:
+        workflow.add_edge("user_input", "summarize_history")
+    workflow.add_edge("summarize_history", "call_model_transfer")
     # 工具执行后回到模型调用
     workflow.add_edge("tools", "call_model_transfer")
     # 添加条件边 - 检查是否有工具调用
@@ -182,7 +393,9 @@ def create_transfer_graph():
             END: END,
         }
     )
-    checkpointer = InMemorySaver()
+    if checkpointer is None:
+        db_path = os.getenv("LANGGRAPH_CHECKPOINT_DB")
+        checkpointer = DeltaSQLiteSaver(db_path) if db_path else InMemorySaver()
     return workflow.compile(checkpointer=checkpointer)
     # 添加条件边 - 完成转账后退出
     # workflow.add_conditional_edges(
@@ -195,12 +408,107 @@ def create_transfer_graph():
     # )
 
 
-transfer_graph = create_transfer_graph()
-transfer_graph.get_graph().draw_mermaid_png()
-result = transfer_graph.invoke(
-    {"messages": []},
-    {"configurable": {"thread_id": "1"}}
-)
+def get_transfer_graph():
+    """返回默认的转账图，首次调用时编译"""
+    global _transfer_graph
+    if _transfer_graph is None:
+        _transfer_graph = create_transfer_graph()
+    return _transfer_graph
+
+def set_transfer_graph(graph) -> None:
+    """替换默认的转账图（例如换用其他 checkpointer 或关闭快速通道）"""
+    global _transfer_graph
+    _transfer_graph = graph
+
+_LAZY_ATTRIBUTES = {
+    "model": get_model,
+    "model_with_tools": get_model_with_tools,
+    "tools": get_tools,
+    "transfer_graph": get_transfer_graph,
+}
+
+def __getattr__(name):
+    # 访问这些模块属性时（PEP 562）返回当前的实例，尚未创建时按需创建
+    if name in _LAZY_ATTRIBUTES:
+        return _LAZY_ATTRIBUTES[name]()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def draw_transfer_graph(cache_dir=None) -> str:
+    """离线输出转账图的 Mermaid 源码，图结构不变时复用已生成的文件，返回文件路径"""
+    from transfer_common.diagrams import render_langgraph
+
+    return render_langgraph(get_transfer_graph(), "transfer_graph", cache_dir)
+
+async def _stream_until_interrupt(payload, config, on_token):
+    """以 token 流驱动图直到中断或结束，返回中断列表（结束时为空）"""
+    interrupts = ()
+    async for mode, chunk in get_transfer_graph().astream(payload, config, stream_mode=["messages", "updates"]):
+        if mode == "messages":
+            message, metadata = chunk
+            # 只转发转账助手的回复，历史摘要、快速通道中的工具调用等不展示
+            if metadata.get("langgraph_node") in REPLY_NODES and isinstance(message, AIMessage):
+                await on_token(message)
+        elif "__interrupt__" in chunk:
+            interrupts = chunk["__interrupt__"]
+    return interrupts
+
+async def run_session(thread_id: str, get_reply, on_token=None):
+    """
+    驱动一个会话直到转账完成
+    每次图在用户输入或 reply_to_user 处中断时，await get_reply(中断内容) 获取该会话用户的回复后恢复执行；
+    等待回复期间不占用事件循环，同一个进程可以同时驱动大量 thread_id
+    Args:
+        on_token: 流式模式。传入时模型每生成一块就 await on_token(消息分块)，分块为 AIMessageChunk，
+            同一条消息的分块 id 相同，最后一块的 response_metadata 中带有 finish_reason；
+            命中模型缓存时整条消息作为一块发出。不传入时每条回复生成完毕后整体打印
+    """
+    config = {"configurable": {"thread_id": thread_id, "stream_tokens": on_token is not None}}
+    transfer_graph = get_transfer_graph()
+    payload = {"messages": []}
+    # 工具结果缓存按 thread_id 隔离
+    with tool_cache.session_scope(thread_id):
+        while True:
+            if on_token is None:
+                result = await transfer_graph.ainvoke(payload, config)
+                if "__interrupt__" not in result:
+                    return result
+                interrupts = result["__interrupt__"]
+            else:
+                interrupts = await _stream_until_interrupt(payload, config, on_token)
+                if not interrupts:
+                    return (await transfer_graph.aget_state(config)).values
+            payload = Command(resume=await get_reply(interrupts[0].value))
+
+class ConsoleTokenPrinter:
+    """控制台前端：逐块打印转账助手的回复"""
+
+    def __init__(self):
+        self.message_id = None
+
+    async def __call__(self, chunk):
+        if chunk.content:
+            if chunk.id != self.message_id:
+                self.message_id = chunk.id
+                print("转账助手：", end="")
+            print(chunk.content, end="", flush=True)
+        # 一条回复结束后换行
+        if chunk.response_metadata.get("finish_reason") and self.message_id == chunk.id:
+            print()
+
+async def console_reply(request: dict) -> str:
+    """控制台前端：在线程中读取输入，避免阻塞事件循环"""
+    if request["type"] == "reply_to_user":
+        print(f"--tool called--提问用户: {request['question']}")
+        return await asyncio.to_thread(input, "reply:")
+    return await asyncio.to_thread(input, "你：")
+
+if __name__ == "__main__":
+    # 只在需要时输出流程图：python langgraph_transfer_agent.py --draw
+    if "--draw" in sys.argv[1:]:
+        print(f"流程图: {draw_transfer_graph()}")
+    asyncio.run(run_session("1", console_reply, on_token=ConsoleTokenPrinter()))
+    print(tool_cache.format_stats())
+    print(llm_cache.format_stats())
 # initial_state = {
 #     "to_account": "",
 #     "amount": 0.0,
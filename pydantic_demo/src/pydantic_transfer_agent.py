@@ -1,25 +1,26 @@
 import string
 from pydantic_ai import Agent, RunContext
-from pydantic_ai.models.openai import OpenAIModel
-from pydantic_ai.providers.openai import OpenAIProvider
-from pydantic_ai.models.openai import OpenAIModelSettings
+from pydantic_ai.models import Model
+from pydantic_ai.models.wrapper import WrapperModel
+from pydantic_ai.profiles.openai import openai_model_profile
+from pydantic_ai.toolsets import FunctionToolset
+from pydantic_ai.messages import ModelMessage, ModelMessagesTypeAdapter
 from dotenv import load_dotenv
 import os
+import asyncio
+import json
+import uuid
+import zlib
+from typing import List, Optional
+from transfer_common import tool_cache, llm_cache
+from transfer_common.llm_cache.pydantic_ai_adapter import CachedModel, dump_messages
+from transfer_common.tool_registry import get_spec, pydantic_ai_adapter
 load_dotenv()
 
 api_key = os.getenv("BAILIAN_API_KEY")
 base_url = os.getenv("BAILIAN_API_BASE_URL")
 model_name = os.getenv("QWEN3_MODEL")
 
-# 模拟数据库 - 使用用户名称作为键
-accounts_db = {
-    "张三": {"balance": 10000.0},
-    "李四": {"balance": 5000.0},
-    "王五": {"balance": 2000.0},
-    "赵六": {"balance": 50000.0},
-    "我": {"balance": 10000.0}
-}
-
 transfer_prompt = """
 你是一个专业的银行转账助手，负责处理用户的转账请求。
 
@@ -34,90 +35,70 @@ transfer_prompt = """
 - 所有转账都从我的账户转出
 - 确认转账信息中金额，并确保余额足够`get_balance`
 - 目标账户必须存在`get_account`
+- 同时向多个用户转账时，使用`get_accounts`、`get_balances`批量校验，并通过`execute_transfers`一次性完成全部转账
 - 请与用户进行自然对话，逐步收集信息，确保转账安全准确
 - 当转账成功后，请发送"DONE"
 """
 
-model=OpenAIModel(
-    model_name,
-    provider=OpenAIProvider(
-        api_key=api_key,
-        base_url=base_url,
-    ),
-    settings=OpenAIModelSettings(
-        extra_body={"enable_thinking": False}
+class LazyModel(WrapperModel):
+    """
+    首次发起请求时才调用 factory 创建被包装的模型
+    导入本模块时不需要导入 OpenAI 模型（及 openai SDK）、建立客户端；
+    Agent 创建时就要读取模型的 profile，由 profile 参数直接给出，不触发创建
+    """
+
+    profile = Model.profile
+
+    def __init__(self, factory, profile):
+        Model.__init__(self, profile=profile)
+        self._factory = factory
+        self._model = None
+
+    @property
+    def wrapped(self) -> Model:
+        if self._model is None:
+            self._model = self._factory()
+        return self._model
+
+def create_openai_model() -> Model:
+    from pydantic_ai.models.openai import OpenAIModel, OpenAIModelSettings
+    from pydantic_ai.providers.openai import OpenAIProvider
+
+    return OpenAIModel(
+        model_name,
+        provider=OpenAIProvider(
+            api_key=api_key,
+            base_url=base_url,
+        ),
+        settings=OpenAIModelSettings(
+            extra_body={"enable_thinking": False}
+        )
     )
-)
 
+# 相同请求直接复用共享缓存中的响应
+model=CachedModel(LazyModel(create_openai_model, openai_model_profile(model_name)))
+
+# 工具函数1~3: 查询余额、查询账户、执行转账，以及对应的批量版本，定义见 transfer_common.tool_registry，
+# 直接使用注册表中的 JSON schema，不再由函数签名和文档生成。
+# 工具函数均为异步：pydantic-ai 为同一条消息中的每个工具调用创建一个 task，
+# 只读工具在工具线程池中并发执行，转账按发出顺序串行（见 transfer_common.tool_executor）
 transfer_agent = Agent(  
     model,
     # 这项配置指定了依赖项的类型为int，通常用于agent在处理工具函数参数时进行类型校验或推断，确保传递给工具的参数类型正确。
     # deps_type=int,
     # output_type=bool,
     system_prompt=transfer_prompt,
+    tools=pydantic_ai_adapter.create_tools(exclude=["reply_to_user"]),
 )
 
-# 工具函数1: 查询余额
-@transfer_agent.tool
-def get_balance(user_name: str) -> str:
-    """
-    查询指定用户的余额
-    Args:
-        user_name: 用户名称，例如 '张三', '李四', '我'
-    Returns:
-        用户余额信息
-    """
-    print(f"--tool called--查询余额: {user_name}")
-    if user_name in accounts_db:
-        account_info = accounts_db[user_name]
-        return f"用户 {user_name} 的余额为: {account_info['balance']} 元"
-    else:
-        return f"用户 {user_name} 不存在"
-
-# 工具函数2: 查询账户
-@transfer_agent.tool
-def get_account(user_name: str) -> str:
-    """
-    查询指定用户
-    Args:
-        user_name: 用户名称，例如 '张三', '李四', '我'
-    Returns:
-        用户是否存在
-    """
-    print(f"--tool called--查询账户: {user_name}")
-    if user_name in accounts_db:
-        return f"用户 {user_name} 存在"
-    else:
-        return f"用户 {user_name} 不存在"
-
-# 工具函数3: 执行转账
-@transfer_agent.tool
-def execute_transfer(to_user: str, amount: float) -> str:
-    """
-    执行转账操作，从我的账户转出资金
-    Args:
-        to_user: 目标用户名称
-        amount: 转账金额
-    Returns:
-        转账结果信息
-    """
-    print(f"--tool called--执行转账: {to_user} {amount}")
-    # 检查我的余额是否足够
-    if accounts_db["我"]["balance"] < amount:
-        return f"转账失败：余额不足。当前余额: {accounts_db['我']['balance']} 元，需要: {amount} 元"
-    # 执行转账
-    accounts_db["我"]["balance"] -= amount
-    accounts_db[to_user]["balance"] += amount
-    return f"转账成功！ 从我的账户转出 {amount} 元到 {to_user}"
-
 # 工具函数4: 向用户提问
-@transfer_agent.tool
+# 控制台版本通过 input() 阻塞等待回复，单独放在 console_toolset 中，只在命令行对话时注册；
+# HTTP 服务改为使用延迟工具（DeferredToolset），见 transfer_server.backends
 def reply_to_user(content: str) -> str:
     """
     向用户提问
     Args:
         content: 提问内容
-        state: 转账状态
     Returns:
         回答内容
     """
@@ -126,24 +107,99 @@ def reply_to_user(content: str) -> str:
     user_input = input("reply:")
     return user_input
 
-def chat_with_transfer_agent():
+console_toolset = FunctionToolset([pydantic_ai_adapter.create_tool(get_spec("reply_to_user"), reply_to_user)])
+
+def _pack_messages(messages: List[ModelMessage]) -> bytes:
+    """把消息历史压缩成紧凑的 bytes，响应中只用于统计的字段不保存（见 dump_messages）"""
+    return zlib.compress(json.dumps(dump_messages(messages), ensure_ascii=False, separators=(",", ":")).encode())
+
+def _unpack_messages(data: bytes) -> List[ModelMessage]:
+    if not data:
+        return []
+    return ModelMessagesTypeAdapter.validate_json(zlib.decompress(data))
+
+class TransferSession:
+    """
+    长期存在的异步转账会话
+    每轮把之前的全部消息作为 message_history 交给 agent，模型能看到已经收集的信息和已经做过的查询，
+    不会重复提问、重复查询；历史在两轮之间以压缩后的 JSON 保存，可以 suspend() 成 bytes 后再 resume()
+    Args:
+        session_id: 会话 id，同时用于隔离工具结果缓存；默认随机生成
+        history: _pack_messages 压缩后的消息历史
+    """
+
+    def __init__(self, session_id: Optional[str] = None, history: bytes = b""):
+        self.session_id = session_id or uuid.uuid4().hex
+        self._history = history
+
+    @property
+    def messages(self) -> List[ModelMessage]:
+        return _unpack_messages(self._history)
+
+    @property
+    def history_size(self) -> int:
+        """压缩后的历史大小（字节）"""
+        return len(self._history)
+
+    async def send(self, user_input: str, toolsets=None):
+        """
+        发送一条用户消息，返回本轮的运行结果
+        Args:
+            toolsets: 额外注册的工具集，默认为控制台版本的 reply_to_user
+        """
+        with tool_cache.session_scope(self.session_id):
+            result = await transfer_agent.run(
+                user_input,
+                message_history=self.messages,
+                toolsets=[console_toolset] if toolsets is None else toolsets,
+            )
+        self._history = _pack_messages(result.all_messages())
+        return result
+
+    def suspend(self) -> bytes:
+        """挂起会话，返回可以保存到任意位置的 bytes"""
+        return json.dumps({"session_id": self.session_id}).encode() + b"\n" + self._history
+
+    @classmethod
+    def resume(cls, data: bytes) -> "TransferSession":
+        """从 suspend() 的结果恢复会话"""
+        header, _, history = data.partition(b"\n")
+        return cls(json.loads(header)["session_id"], history)
+
+async def chat_with_transfer_agent(session: Optional[TransferSession] = None):
+    """
+    命令行对话：整个对话使用同一个事件循环和同一个会话
+    设置了 PYDANTIC_SESSION_FILE 时，启动时从该文件恢复会话，退出时挂起到该文件
+    """
+    session_file = os.getenv("PYDANTIC_SESSION_FILE")
+    if session is None:
+        if session_file and os.path.exists(session_file):
+            with open(session_file, "rb") as f:
+                session = TransferSession.resume(f.read())
+            print(f"已恢复会话 {session.session_id}")
+        else:
+            session = TransferSession()
     print("输入 'quit' 退出对话")
     print("-" * 50)
-    # 创建上下文
     
     while True:
         try:
-            # 获取用户输入
-            user_input = input("用户: ").strip()
+            # 获取用户输入，在线程中读取避免阻塞事件循环
+            user_input = (await asyncio.to_thread(input, "用户: ")).strip()
             
             # 检查退出条件
             if user_input.lower() in ['exit', 'quit', '退出', 'q']:
+                if session_file:
+                    with open(session_file, "wb") as f:
+                        f.write(session.suspend())
+                print(tool_cache.format_stats())
+                print(llm_cache.format_stats())
                 print("再见！")
                 break
             if not user_input:
                 continue
             # 运行 agent
-            response =  transfer_agent.run_sync(user_input)
+            response = await session.send(user_input)
             print(response)
             print(f"助手: {response.output}")
             
@@ -157,7 +213,7 @@ def main():
     主函数
     """
     # 运行对话
-    chat_with_transfer_agent()
+    asyncio.run(chat_with_transfer_agent())
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,3 @@
+"""
+各转账 agent 共享的公共模块（账本、工具原语等）
+"""
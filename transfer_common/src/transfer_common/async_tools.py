@@ -0,0 +1,96 @@
+"""
+异步版本的转账工具
+
+控制台版本的 reply_to_user 调用 input() 阻塞等待回复：在事件循环中直接调用会卡住整个事件循环，
+交给框架的默认线程池执行时，每个等待回复的会话都占住一个线程，等待的会话一多，其他会话的工具调用也无法执行。
+这里的 reply_to_user 是协程，问题和回答通过每个会话各自的 ReplyChannel（一对 asyncio 队列）传递:
+- agent 调用 reply_to_user 时，问题放入该会话的 questions 队列，然后等待 answers 队列中的回答
+- 前端（控制台、HTTP、测试）通过 get_channel(session_id) 取到同一个 ReplyChannel，读取问题并写入回答
+会话 id 取自 tool_cache 的当前会话（session_scope() / set_session()）。
+
+查询和转账工具是 tool_executor.async_tool 包装的版本：在工具线程池中执行，只读工具并发，转账串行。
+签名和文档与 ledger 中的同名函数一致，可直接注册给各框架的异步工具。
+"""
+import asyncio
+from typing import Dict, Optional
+
+from transfer_common import ledger, tool_cache
+from transfer_common.tool_executor import async_tool
+
+
+class ReplyChannel:
+    """一个会话中 agent 与用户之间的问答队列"""
+
+    def __init__(self):
+        self.questions: asyncio.Queue = asyncio.Queue()
+        self.answers: asyncio.Queue = asyncio.Queue()
+        # 正在等待回答的提问数
+        self.waiting = 0
+
+    async def ask(self, content: str) -> str:
+        """提出问题并等待回答"""
+        self.waiting += 1
+        try:
+            await self.questions.put(content)
+            return await self.answers.get()
+        finally:
+            self.waiting -= 1
+
+    async def next_question(self) -> str:
+        """前端调用：等待 agent 的下一个问题"""
+        return await self.questions.get()
+
+    def answer(self, text: str) -> None:
+        """前端调用：回答最早的一个问题"""
+        self.answers.put_nowait(text)
+
+
+_channels: Dict[str, ReplyChannel] = {}
+
+
+def get_channel(session_id: Optional[str] = None) -> ReplyChannel:
+    """返回会话的问答队列，不存在时创建；默认为当前会话"""
+    session_id = session_id or tool_cache.current_session()
+    channel = _channels.get(session_id)
+    if channel is None:
+        channel = _channels[session_id] = ReplyChannel()
+    return channel
+
+
+def close_channel(session_id: str) -> None:
+    """会话结束时释放问答队列"""
+    _channels.pop(session_id, None)
+
+
+# 工具函数1~3: 查询余额、查询账户、执行转账，以及对应的批量版本
+get_balance = async_tool(tool_cache.get_balance)
+get_account = async_tool(tool_cache.get_account)
+execute_transfer = async_tool(ledger.execute_transfer, write=True)
+get_balances = async_tool(tool_cache.get_balances)
+get_accounts = async_tool(tool_cache.get_accounts)
+execute_transfers = async_tool(ledger.execute_transfers, write=True)
+
+
+# 工具函数4: 向用户提问
+async def reply_to_user(content: str) -> str:
+    """
+    向用户提问
+    Args:
+        content: 提问内容
+    Returns:
+        回答内容
+    """
+    return await get_channel().ask(content)
+
+
+async def console_frontend(session_id: Optional[str] = None) -> None:
+    """
+    控制台前端：在控制台显示会话中 agent 的提问，读取回答写回问答队列，直到被取消
+    input() 在线程中执行，不阻塞事件循环
+    """
+    channel = get_channel(session_id)
+    while True:
+        question = await channel.next_question()
+        print("")
+        print(f"--tool called--提问用户: {question}")
+        channel.answer(await asyncio.to_thread(input, "reply:"))
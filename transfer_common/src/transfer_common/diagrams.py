@@ -0,0 +1,87 @@
+"""
+按需、离线生成流程图，按结构哈希缓存
+
+LangGraph 的 draw_mermaid_png() 默认把 Mermaid 源码发到 mermaid.ink 渲染，离线时会卡住或失败；
+crewAI 的 flow.plot() 每次都重新生成 HTML。这里只在调用时生成，且不访问网络:
+- LangGraph 图输出 Mermaid 源码（.mmd），可以用任意 Mermaid 工具查看
+- crewAI Flow 输出 flow.plot() 生成的 HTML
+文件名为图结构（节点和边）的哈希，结构不变时直接返回已有文件，不重新生成。
+
+环境变量:
+    DIAGRAM_CACHE_DIR    输出目录，默认 .diagrams
+"""
+import hashlib
+import json
+import os
+import shutil
+from typing import Any, Callable, Optional
+
+DEFAULT_DIR = ".diagrams"
+
+
+def structure_hash(structure: Any) -> str:
+    """图结构的哈希，structure 为可 JSON 序列化的节点和边"""
+    data = json.dumps(structure, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(data.encode()).hexdigest()[:16]
+
+
+def cached_render(name: str, structure: Any, suffix: str, render: Callable[[str], None],
+                  cache_dir: Optional[str] = None) -> str:
+    """
+    结构对应的文件不存在时调用 render(path) 生成，返回文件路径
+    Args:
+        name: 文件名前缀
+        structure: 图结构，见 structure_hash
+        suffix: 文件扩展名，例如 ".mmd"
+        render: 把图写入给定路径的函数
+    """
+    cache_dir = cache_dir or os.getenv("DIAGRAM_CACHE_DIR") or DEFAULT_DIR
+    path = os.path.join(cache_dir, f"{name}-{structure_hash(structure)}{suffix}")
+    if not os.path.exists(path):
+        os.makedirs(cache_dir, exist_ok=True)
+        # 先写临时文件再改名，中途失败不会留下不完整的缓存
+        tmp = f"{path}.tmp"
+        render(tmp)
+        os.replace(tmp, path)
+    return path
+
+
+def render_langgraph(graph, name: str = "graph", cache_dir: Optional[str] = None) -> str:
+    """
+    把编译后的 LangGraph 图输出为 Mermaid 源码，返回文件路径
+    Args:
+        graph: CompiledStateGraph
+    """
+    drawable = graph.get_graph()
+    structure = {
+        "nodes": sorted(drawable.nodes),
+        "edges": sorted([edge.source, edge.target, edge.conditional, str(edge.data)] for edge in drawable.edges),
+    }
+
+    def render(path: str) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(drawable.draw_mermaid())
+
+    return cached_render(name, structure, ".mmd", render, cache_dir)
+
+
+def render_crewai_flow(flow, name: Optional[str] = None, cache_dir: Optional[str] = None) -> str:
+    """
+    用 flow.plot() 把 crewAI Flow 输出为 HTML，返回文件路径
+    Args:
+        flow: Flow 实例
+    """
+    name = name or type(flow).__name__
+    structure = {
+        "methods": sorted(flow._methods),
+        "start": sorted(flow._start_methods),
+        "listeners": {method: [str(part) for part in condition] for method, condition in flow._listeners.items()},
+        "routers": sorted(flow._routers),
+    }
+
+    def render(path: str) -> None:
+        # flow.plot() 会在文件名后追加 .html
+        flow.plot(path)
+        shutil.move(path + ".html", path)
+
+    return cached_render(name, structure, ".html", render, cache_dir)
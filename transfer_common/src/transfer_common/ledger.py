@@ -0,0 +1,382 @@
+"""
+共享账本模块
+
+所有转账 agent（LangGraph / autogen / llama-index / pydantic-ai / crewAI）共用同一本账：
+- 用户名 -> 槽位号 的索引 (dict[str, int])
+- 余额存放在连续的 array('d') 中，不再为每个账户创建一个 dict
+- 对外提供 get_balance / get_account / execute_transfer 三个工具原语，
+  以及批量版本 get_balances / get_accounts / execute_transfers
+- 设置环境变量 LEDGER_DB_PATH 后改用持久化的 SQLite 账本（见 sqlite_ledger）
+"""
+import atexit
+import math
+import os
+import threading
+from array import array
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Protocol, Tuple
+
+# 所有转账都从该账户转出
+SELF_ACCOUNT = "我"
+
+# 演示用的初始账户
+DEFAULT_ACCOUNTS = {
+    "张三": 10000.0,
+    "李四": 5000.0,
+    "王五": 2000.0,
+    "赵六": 50000.0,
+    "我": 10000.0,
+}
+
+
+class LedgerError(Exception):
+    """账本操作失败"""
+
+
+class AccountNotFoundError(LedgerError):
+    """账户不存在"""
+
+    def __init__(self, user_name: str):
+        super().__init__(f"用户 {user_name} 不存在")
+        self.user_name = user_name
+
+
+class InsufficientBalanceError(LedgerError):
+    """余额不足"""
+
+    def __init__(self, user_name: str, balance: float, amount: float):
+        super().__init__(f"余额不足。当前余额: {balance} 元，需要: {amount} 元")
+        self.user_name = user_name
+        self.balance = balance
+        self.amount = amount
+
+
+class InvalidTransferError(LedgerError):
+    """转账参数不合法：金额不是正数，或收款账户就是转出账户"""
+
+
+def check_transfers(from_user: str, transfers: Iterable[Tuple[str, float]]) -> None:
+    """
+    校验每一笔转账的参数，在校验余额之前调用
+    批量转账只校验总金额时，负数金额会抵消其他金额，实际从收款人账户中扣款
+    """
+    for to_user, amount in transfers:
+        if to_user == from_user:
+            raise InvalidTransferError(f"不能向自己的账户 {to_user} 转账")
+        if not (isinstance(amount, (int, float)) and math.isfinite(amount) and amount > 0):
+            raise InvalidTransferError(f"转账金额必须大于 0，收到: {amount}")
+
+
+class Account:
+    """账户记录（只读快照），使用 __slots__ 避免每个实例携带 __dict__"""
+
+    __slots__ = ("name", "slot", "balance")
+
+    def __init__(self, name: str, slot: int, balance: float):
+        self.name = name
+        self.slot = slot
+        self.balance = balance
+
+    def __repr__(self) -> str:
+        return f"Account(name={self.name!r}, slot={self.slot}, balance={self.balance})"
+
+
+class LedgerLike(Protocol):
+    """
+    账本接口：内存账本 Ledger 和持久化账本 SQLiteLedger 都实现这些方法，工具函数只通过它们访问账本
+    账户不存在抛出 AccountNotFoundError，转账失败抛出 LedgerError 的子类
+    """
+
+    def __len__(self) -> int: ...
+
+    def __contains__(self, name: str) -> bool: ...
+
+    def __iter__(self) -> Iterator[str]: ...
+
+    def exists(self, name: str) -> bool: ...
+
+    def slot_of(self, name: str) -> int: ...
+
+    def balance_of(self, name: str) -> float: ...
+
+    def account(self, name: str) -> Account: ...
+
+    def load(self, items: Iterable[Tuple[str, float]]) -> None: ...
+
+    def add_account(self, name: str, balance: float = 0.0) -> int: ...
+
+    def transfer(self, from_user: str, to_user: str, amount: float) -> float: ...
+
+    def transfer_many(self, from_user: str, transfers: List[Tuple[str, float]]) -> float: ...
+
+
+class Ledger:
+    """
+    基于索引和数组的内存账本
+    - _index: 用户名 -> 槽位号
+    - _names: 槽位号 -> 用户名
+    - _balances: 槽位号 -> 余额（连续的 double 数组）
+    """
+
+    def __init__(self, accounts: Optional[Dict[str, float]] = None):
+        self._index: Dict[str, int] = {}
+        self._names: List[str] = []
+        self._balances = array("d")
+        self._lock = threading.Lock()
+        if accounts:
+            self.load(accounts.items())
+
+    @classmethod
+    def from_dict(cls, accounts: Dict[str, float]) -> "Ledger":
+        return cls(accounts)
+
+    def load(self, items: Iterable[Tuple[str, float]]) -> None:
+        """批量加载账户，已存在的账户直接覆盖余额"""
+        index = self._index
+        names = self._names
+        balances = self._balances
+        with self._lock:
+            for name, balance in items:
+                slot = index.get(name)
+                if slot is None:
+                    index[name] = len(names)
+                    names.append(name)
+                    balances.append(balance)
+                else:
+                    balances[slot] = balance
+
+    def add_account(self, name: str, balance: float = 0.0) -> int:
+        """新增账户，返回槽位号"""
+        self.load(((name, balance),))
+        return self._index[name]
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._index
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._names)
+
+    def exists(self, name: str) -> bool:
+        return name in self._index
+
+    def slot_of(self, name: str) -> int:
+        slot = self._index.get(name)
+        if slot is None:
+            raise AccountNotFoundError(name)
+        return slot
+
+    def balance_of(self, name: str) -> float:
+        return self._balances[self.slot_of(name)]
+
+    def account(self, name: str) -> Account:
+        slot = self.slot_of(name)
+        return Account(name, slot, self._balances[slot])
+
+    def transfer(self, from_user: str, to_user: str, amount: float) -> float:
+        """
+        转账，返回转出账户的剩余余额
+        账户不存在抛出 AccountNotFoundError，余额不足抛出 InsufficientBalanceError，
+        金额不合法或转给自己抛出 InvalidTransferError
+        """
+        check_transfers(from_user, ((to_user, amount),))
+        src = self.slot_of(from_user)
+        dst = self.slot_of(to_user)
+        balances = self._balances
+        with self._lock:
+            if balances[src] < amount:
+                raise InsufficientBalanceError(from_user, balances[src], amount)
+            balances[src] -= amount
+            balances[dst] += amount
+            return balances[src]
+
+    def transfer_many(self, from_user: str, transfers: List[Tuple[str, float]]) -> float:
+        """
+        批量转账：先校验每一笔的金额、全部收款账户和总金额，再一次性原子地执行
+        返回转出账户的剩余余额
+        """
+        check_transfers(from_user, transfers)
+        src = self.slot_of(from_user)
+        slots = [(self.slot_of(to_user), amount) for to_user, amount in transfers]
+        total = sum(amount for _, amount in slots)
+        balances = self._balances
+        with self._lock:
+            if balances[src] < total:
+                raise InsufficientBalanceError(from_user, balances[src], total)
+            balances[src] -= total
+            for dst, amount in slots:
+                balances[dst] += amount
+            return balances[src]
+
+
+# 进程内共享的账本，首次使用时创建
+_ledger: Optional[LedgerLike] = None
+
+
+def _create_default_ledger() -> LedgerLike:
+    db_path = os.getenv("LEDGER_DB_PATH")
+    if not db_path:
+        return Ledger.from_dict(DEFAULT_ACCOUNTS)
+    from transfer_common.sqlite_ledger import SQLiteLedger
+    ledger = SQLiteLedger(db_path)
+    atexit.register(ledger.close)
+    if len(ledger) == 0:
+        ledger.load(DEFAULT_ACCOUNTS.items())
+    return ledger
+
+
+def get_ledger() -> LedgerLike:
+    """获取当前使用的账本"""
+    global _ledger
+    if _ledger is None:
+        _ledger = _create_default_ledger()
+    return _ledger
+
+
+def set_ledger(ledger: LedgerLike) -> None:
+    """替换当前使用的账本（例如加载百万级账户后）"""
+    global _ledger
+    _ledger = ledger
+
+
+# 转账成功后的回调（例如让工具结果缓存失效），参数为余额发生变化的账户
+_write_listeners: List[Callable[[List[str]], None]] = []
+
+
+def add_write_listener(listener: Callable[[List[str]], None]) -> None:
+    """注册转账成功后的回调"""
+    _write_listeners.append(listener)
+
+
+def _notify_write(user_names: List[str]) -> None:
+    for listener in _write_listeners:
+        listener(user_names)
+
+
+# 工具函数1: 查询余额
+def get_balance(user_name: str) -> str:
+    """
+    查询指定用户的余额
+    Args:
+        user_name: 用户名称，例如 '张三', '李四', '我'
+    Returns:
+        用户余额信息
+    """
+    print(f"--tool called--查询余额: {user_name}")
+    try:
+        balance = get_ledger().balance_of(user_name)
+    except AccountNotFoundError:
+        return f"用户 {user_name} 不存在"
+    return f"用户 {user_name} 的余额为: {balance} 元"
+
+
+# 工具函数2: 查询账户
+def get_account(user_name: str) -> str:
+    """
+    查询指定用户是否存在
+    Args:
+        user_name: 用户名称，例如 '张三', '李四', '我'
+    Returns:
+        用户是否存在
+    """
+    print(f"--tool called--查询账户: {user_name}")
+    if get_ledger().exists(user_name):
+        return f"用户 {user_name} 存在"
+    else:
+        return f"用户 {user_name} 不存在"
+
+
+# 工具函数3: 执行转账
+def execute_transfer(to_user: str, amount: float) -> str:
+    """
+    执行转账操作，从我的账户转出资金
+    Args:
+        to_user: 目标用户名称
+        amount: 转账金额
+    Returns:
+        转账结果信息
+    """
+    print(f"--tool called--执行转账: {to_user} {amount}")
+    try:
+        get_ledger().transfer(SELF_ACCOUNT, to_user, amount)
+    except AccountNotFoundError as e:
+        return f"转账失败：目标账户 {e.user_name} 不存在"
+    except InsufficientBalanceError as e:
+        return f"转账失败：余额不足。当前余额: {e.balance} 元，需要: {amount} 元"
+    except InvalidTransferError as e:
+        return f"转账失败：{e}"
+    _notify_write([SELF_ACCOUNT, to_user])
+    return f"转账成功！ 从我的账户转出 {amount} 元到 {to_user}"
+
+
+# 批量工具函数1: 批量查询账户
+def get_accounts(user_names: List[str]) -> str:
+    """
+    批量查询多个用户是否存在
+    Args:
+        user_names: 用户名称列表，例如 ['张三', '李四']
+    Returns:
+        每个用户是否存在，一行一个
+    """
+    print(f"--tool called--批量查询账户: {user_names}")
+    ledger = get_ledger()
+    return "\n".join(
+        f"用户 {name} 存在" if ledger.exists(name) else f"用户 {name} 不存在"
+        for name in user_names
+    )
+
+
+# 批量工具函数2: 批量查询余额
+def get_balances(user_names: List[str]) -> str:
+    """
+    批量查询多个用户的余额
+    Args:
+        user_names: 用户名称列表，例如 ['张三', '李四', '我']
+    Returns:
+        每个用户的余额信息，一行一个
+    """
+    print(f"--tool called--批量查询余额: {user_names}")
+    ledger = get_ledger()
+    lines = []
+    for name in user_names:
+        try:
+            lines.append(f"用户 {name} 的余额为: {ledger.balance_of(name)} 元")
+        except AccountNotFoundError:
+            lines.append(f"用户 {name} 不存在")
+    return "\n".join(lines)
+
+
+# 批量工具函数3: 批量执行转账
+def execute_transfers(to_users: List[str], amounts: List[float]) -> str:
+    """
+    批量执行转账，从我的账户分别转给多个用户；全部校验通过才会执行，任何一笔不满足则全部不执行
+    Args:
+        to_users: 目标用户名称列表，例如 ['张三', '李四']
+        amounts: 与 to_users 一一对应的转账金额列表，例如 [500, 500]
+    Returns:
+        转账结果信息
+    """
+    print(f"--tool called--批量执行转账: {to_users} {amounts}")
+    if len(to_users) != len(amounts):
+        return f"转账失败：目标用户数量({len(to_users)})与金额数量({len(amounts)})不一致"
+    try:
+        check_transfers(SELF_ACCOUNT, zip(to_users, amounts))
+    except InvalidTransferError as e:
+        return f"转账失败：{e}"
+    ledger = get_ledger()
+    missing = [name for name in to_users if not ledger.exists(name)]
+    if missing:
+        return f"转账失败：目标账户 {'、'.join(missing)} 不存在"
+    total = sum(amounts)
+    try:
+        ledger.transfer_many(SELF_ACCOUNT, list(zip(to_users, amounts)))
+    except AccountNotFoundError as e:
+        return f"转账失败：目标账户 {e.user_name} 不存在"
+    except InsufficientBalanceError as e:
+        return f"转账失败：余额不足。当前余额: {e.balance} 元，需要: {total} 元"
+    except InvalidTransferError as e:
+        return f"转账失败：{e}"
+    _notify_write([SELF_ACCOUNT, *to_users])
+    details = "，".join(f"{name} {amount} 元" for name, amount in zip(to_users, amounts))
+    return f"转账成功！ 从我的账户共转出 {total} 元：{details}"
@@ -0,0 +1,234 @@
+"""
+模型响应缓存
+
+各转账 agent 和 crewAI 研究 crew 都向同一个模型发送同样的长系统提示和几乎相同的开场对话。
+这里按请求内容缓存模型响应，完全相同的请求（消息、工具 schema、模型参数都相同）直接返回上次的响应：
+- 缓存键: 请求的规范化 JSON（键排序、去掉消息 id 和时间戳等每次都不同的字段）的 sha256
+- 内存 LRU 在前，设置了 LLM_CACHE_PATH 时以 SQLite 文件持久化，进程重启后仍可命中
+- 超过 TTL 的响应视为过期
+- 不缓存非幂等的轮次：响应中包含转账等写操作的工具调用时不写入缓存，no_cache() 块内的请求不读也不写缓存
+- stats() 返回命中/未命中次数与节省的模型耗时
+
+各框架的接入方式见同目录下的 *_adapter 模块，都通过 get_cache() 使用进程内共享的缓存。
+
+环境变量:
+    LLM_CACHE=0        关闭缓存
+    LLM_CACHE_PATH     持久化文件路径，不设置时只缓存在内存中
+    LLM_CACHE_TTL      有效期（秒），默认 86400
+    LLM_CACHE_SIZE     内存中最多缓存的响应数，默认 512
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterable, Iterator, Optional, Tuple
+
+# 会改变账本的工具；模型决定调用它们的响应不缓存
+WRITE_TOOLS = frozenset({"execute_transfer", "execute_transfers"})
+
+# 规范化时去掉的字段：每次请求都会重新生成，不影响模型输出
+VOLATILE_FIELDS = frozenset({"id", "timestamp"})
+
+_bypass: ContextVar[bool] = ContextVar("llm_cache_bypass", default=False)
+
+_CREATE_TABLE = (
+    "CREATE TABLE IF NOT EXISTS llm_cache ("
+    " key TEXT PRIMARY KEY,"
+    " value TEXT NOT NULL,"
+    " created REAL NOT NULL,"
+    " elapsed REAL NOT NULL)"
+)
+
+
+def _strip_volatile(value):
+    if isinstance(value, dict):
+        return {k: _strip_volatile(v) for k, v in value.items() if k not in VOLATILE_FIELDS}
+    if isinstance(value, (list, tuple)):
+        return [_strip_volatile(v) for v in value]
+    return value
+
+
+def request_key(namespace: str, **parts) -> str:
+    """
+    计算请求的缓存键
+    Args:
+        namespace: 框架名，不同框架的响应格式不同，互不共用
+        parts: 消息、工具 schema、模型名与参数等，需可转成 JSON
+    """
+    canonical = json.dumps(
+        {"namespace": namespace, **_strip_volatile(parts)},
+        sort_keys=True,
+        ensure_ascii=False,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def is_idempotent(tool_names: Iterable[str]) -> bool:
+    """响应中的工具调用都不是写操作时才可以缓存"""
+    return not WRITE_TOOLS.intersection(tool_names)
+
+
+@contextmanager
+def no_cache() -> Iterator[None]:
+    """块内的模型请求不读也不写缓存"""
+    token = _bypass.set(True)
+    try:
+        yield
+    finally:
+        _bypass.reset(token)
+
+
+class LLMResponseCache:
+    """
+    内存 LRU + 可选 SQLite 持久化的响应缓存，值为各框架适配层序列化后的字符串
+    Args:
+        maxsize: 内存中最多缓存的响应数
+        ttl: 响应有效期（秒）
+        path: 持久化文件路径，为 None 时只缓存在内存中
+    """
+
+    def __init__(self, maxsize: int = 512, ttl: float = 86400.0, path: Optional[str] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        # key -> (写入时间, 响应, 当时的模型耗时)
+        self._memory: "OrderedDict[str, Tuple[float, str, float]]" = OrderedDict()
+        # 未命中的 key -> 开始请求模型的时间，写入时据此记录模型耗时
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._db = None
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(_CREATE_TABLE)
+        self.hits = 0
+        self.misses = 0
+        self.skipped = 0
+        self.saved_seconds = 0.0
+
+    def get(self, key: str) -> Optional[str]:
+        """返回缓存的响应；未命中时返回 None，并开始计时直到 put()"""
+        if _bypass.get():
+            return None
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is None and self._db is not None:
+                row = self._db.execute("SELECT created, value, elapsed FROM llm_cache WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    entry = tuple(row)
+                    self._remember(key, entry)
+            if entry is not None and now - entry[0] <= self.ttl:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                self.saved_seconds += entry[2]
+                return entry[1]
+            if entry is not None:
+                self._forget(key)
+            self.misses += 1
+            self._pending[key] = time.perf_counter()
+            # 请求失败时不会 put()，丢弃最早的计时避免无限增长
+            while len(self._pending) > self.maxsize:
+                self._pending.pop(next(iter(self._pending)))
+            return None
+
+    def put(self, key: str, value: str, cacheable: bool = True) -> None:
+        """
+        写入模型响应
+        Args:
+            cacheable: 为 False 时（例如响应中包含写操作）不写入
+        """
+        with self._lock:
+            started = self._pending.pop(key, None)
+            if _bypass.get() or not cacheable:
+                self.skipped += 1
+                return
+            elapsed = time.perf_counter() - started if started is not None else 0.0
+            created = time.time()
+            self._remember(key, (created, value, elapsed))
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO llm_cache (key, value, created, elapsed) VALUES (?, ?, ?, ?)",
+                    (key, value, created, elapsed),
+                )
+
+    def _remember(self, key: str, entry: Tuple[float, str, float]) -> None:
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.maxsize:
+            self._memory.popitem(last=False)
+
+    def _forget(self, key: str) -> None:
+        self._memory.pop(key, None)
+        if self._db is not None:
+            self._db.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            self._pending.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM llm_cache")
+
+    def close(self) -> None:
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "skipped": self.skipped,
+            "size": len(self._memory),
+            "hit_rate": self.hits / total if total else 0.0,
+            "saved_seconds": self.saved_seconds,
+        }
+
+
+_cache: Optional[LLMResponseCache] = None
+_configured = False
+
+
+def _create_default_cache() -> Optional[LLMResponseCache]:
+    if os.getenv("LLM_CACHE", "1") == "0":
+        return None
+    return LLMResponseCache(
+        maxsize=int(os.getenv("LLM_CACHE_SIZE", "512")),
+        ttl=float(os.getenv("LLM_CACHE_TTL", "86400")),
+        path=os.getenv("LLM_CACHE_PATH") or None,
+    )
+
+
+def get_cache() -> Optional[LLMResponseCache]:
+    """获取当前使用的响应缓存；关闭缓存时返回 None"""
+    global _cache, _configured
+    if not _configured:
+        _cache = _create_default_cache()
+        _configured = True
+    return _cache
+
+
+def set_cache(cache: Optional[LLMResponseCache]) -> None:
+    """替换当前使用的响应缓存，传入 None 关闭缓存"""
+    global _cache, _configured
+    _cache = cache
+    _configured = True
+
+
+def format_stats() -> str:
+    cache = get_cache()
+    if cache is None:
+        return "模型缓存: 未启用"
+    stats = cache.stats()
+    return (
+        f"模型缓存: 命中 {stats['hits']} 次, 未命中 {stats['misses']} 次, "
+        f"命中率 {stats['hit_rate']:.1%}, 节省模型耗时 {stats['saved_seconds']:.2f} 秒"
+    )
@@ -0,0 +1,142 @@
+"""
+autogen 接入：包装 ChatCompletionClient
+
+    model_client = CachedChatCompletionClient(OpenAIChatCompletionClient(...))
+
+autogen_ext 自带的 ChatCompletionCache 在流式请求时先把空列表写入缓存再逐块追加，
+只适用于内存中的字典存储，这里改为流结束后写入最终的 CreateResult。
+"""
+from typing import Any, AsyncGenerator, Literal, Mapping, Optional, Sequence, Union
+
+from autogen_core import CancellationToken
+from autogen_core.models import ChatCompletionClient, CreateResult, LLMMessage, ModelInfo, RequestUsage
+from autogen_core.tools import Tool, ToolSchema
+from pydantic import BaseModel
+
+from transfer_common.llm_cache import LLMResponseCache, get_cache, is_idempotent, request_key
+
+
+def _tool_names(result: CreateResult):
+    if isinstance(result.content, str):
+        return []
+    return [call.name for call in result.content]
+
+
+class CachedChatCompletionClient(ChatCompletionClient):
+    """
+    带响应缓存的模型客户端，其余接口转发给被包装的客户端
+    Args:
+        client: 被包装的模型客户端
+        cache: 使用的缓存，默认为 get_cache()
+    """
+
+    def __init__(self, client: ChatCompletionClient, cache: Optional[LLMResponseCache] = None):
+        self.client = client
+        self._cache = cache
+
+    @property
+    def cache(self) -> Optional[LLMResponseCache]:
+        return self._cache if self._cache is not None else get_cache()
+
+    def _key(self, messages, tools, tool_choice, json_output, extra_create_args) -> str:
+        if isinstance(json_output, type):
+            json_output = json_output.model_json_schema()
+        return request_key(
+            "autogen",
+            # 模型名及客户端级别的请求参数
+            create_args=getattr(self.client, "_create_args", None),
+            messages=[message.model_dump() for message in messages],
+            tools=[tool.schema if isinstance(tool, Tool) else tool for tool in tools],
+            tool_choice=tool_choice.name if isinstance(tool_choice, Tool) else tool_choice,
+            json_output=json_output,
+            extra_create_args=dict(extra_create_args),
+        )
+
+    async def create(
+        self,
+        messages: Sequence[LLMMessage],
+        *,
+        tools: Sequence[Tool | ToolSchema] = [],
+        tool_choice: Tool | Literal["auto", "required", "none"] = "auto",
+        json_output: Optional[bool | type[BaseModel]] = None,
+        extra_create_args: Mapping[str, Any] = {},
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> CreateResult:
+        cache = self.cache
+        key = None
+        if cache is not None:
+            key = self._key(messages, tools, tool_choice, json_output, extra_create_args)
+            cached = cache.get(key)
+            if cached is not None:
+                result = CreateResult.model_validate_json(cached)
+                result.cached = True
+                return result
+        result = await self.client.create(
+            messages,
+            tools=tools,
+            tool_choice=tool_choice,
+            json_output=json_output,
+            extra_create_args=extra_create_args,
+            cancellation_token=cancellation_token,
+        )
+        if key is not None:
+            cache.put(key, result.model_dump_json(), cacheable=is_idempotent(_tool_names(result)))
+        return result
+
+    async def create_stream(
+        self,
+        messages: Sequence[LLMMessage],
+        *,
+        tools: Sequence[Tool | ToolSchema] = [],
+        tool_choice: Tool | Literal["auto", "required", "none"] = "auto",
+        json_output: Optional[bool | type[BaseModel]] = None,
+        extra_create_args: Mapping[str, Any] = {},
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> AsyncGenerator[Union[str, CreateResult], None]:
+        cache = self.cache
+        key = None
+        if cache is not None:
+            key = self._key(messages, tools, tool_choice, json_output, extra_create_args)
+            cached = cache.get(key)
+            if cached is not None:
+                result = CreateResult.model_validate_json(cached)
+                result.cached = True
+                # 命中时整段文本作为一个分块返回
+                if isinstance(result.content, str) and result.content:
+                    yield result.content
+                yield result
+                return
+        async for chunk in self.client.create_stream(
+            messages,
+            tools=tools,
+            tool_choice=tool_choice,
+            json_output=json_output,
+            extra_create_args=extra_create_args,
+            cancellation_token=cancellation_token,
+        ):
+            if key is not None and isinstance(chunk, CreateResult):
+                cache.put(key, chunk.model_dump_json(), cacheable=is_idempotent(_tool_names(chunk)))
+            yield chunk
+
+    async def close(self) -> None:
+        await self.client.close()
+
+    def actual_usage(self) -> RequestUsage:
+        return self.client.actual_usage()
+
+    def total_usage(self) -> RequestUsage:
+        return self.client.total_usage()
+
+    def count_tokens(self, messages: Sequence[LLMMessage], *, tools: Sequence[Tool | ToolSchema] = []) -> int:
+        return self.client.count_tokens(messages, tools=tools)
+
+    def remaining_tokens(self, messages: Sequence[LLMMessage], *, tools: Sequence[Tool | ToolSchema] = []) -> int:
+        return self.client.remaining_tokens(messages, tools=tools)
+
+    @property
+    def capabilities(self):  # type: ignore
+        return self.client.capabilities
+
+    @property
+    def model_info(self) -> ModelInfo:
+        return self.client.model_info
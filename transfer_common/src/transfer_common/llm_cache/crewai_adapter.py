@@ -0,0 +1,63 @@
+"""
+crewAI 接入：LLM 子类
+
+    llm = CachedLLM(model="openai/" + model_name, api_key=..., base_url=...)
+
+crewAI 的 agent 使用 ReAct 文本格式（Action: / Action Input: / Final Answer:），
+由 agent 执行器解析响应中的 Action 再调用工具，因此以文本中的 Action 判断是否为写操作。
+传入 tools 或 available_functions 的原生函数调用会在 LLM.call 内部直接执行工具，不缓存。
+"""
+import re
+from typing import Any, Dict, List, Optional, Union
+
+from crewai.llm import LLM
+
+from transfer_common.llm_cache import LLMResponseCache, get_cache, is_idempotent, request_key
+
+_ACTION = re.compile(r"^\s*Action\s*:\s*([\w-]+)", re.MULTILINE)
+
+
+class CachedLLM(LLM):
+    """
+    带响应缓存的 crewAI LLM
+    Args:
+        response_cache: 使用的缓存，默认为 get_cache()
+        其余参数同 crewai.LLM
+    """
+
+    def __init__(self, *args, response_cache: Optional[LLMResponseCache] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.response_cache = response_cache
+
+    def _key(self, messages) -> str:
+        return request_key(
+            "crewai",
+            model=self.model,
+            base_url=self.base_url or self.api_base,
+            temperature=self.temperature,
+            top_p=self.top_p,
+            stop=self.stop,
+            params=self.additional_params,
+            messages=messages,
+        )
+
+    def call(
+        self,
+        messages: Union[str, List[Dict[str, str]]],
+        tools: Optional[List[dict]] = None,
+        callbacks: Optional[List[Any]] = None,
+        available_functions: Optional[Dict[str, Any]] = None,
+        from_task: Optional[Any] = None,
+        from_agent: Optional[Any] = None,
+    ) -> Union[str, Any]:
+        cache = self.response_cache if self.response_cache is not None else get_cache()
+        if cache is None or tools or available_functions:
+            return super().call(messages, tools, callbacks, available_functions, from_task, from_agent)
+        key = self._key(messages)
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+        response = super().call(messages, tools, callbacks, available_functions, from_task, from_agent)
+        if isinstance(response, str) and response:
+            cache.put(key, response, cacheable=is_idempotent(_ACTION.findall(response)))
+        return response
@@ -0,0 +1,59 @@
+"""
+LangChain 接入：作为 init_chat_model(cache=...) 的缓存
+
+    model = init_chat_model(..., cache=LangChainLLMCache())
+"""
+import json
+from typing import Any, Optional
+
+from langchain_core.caches import RETURN_VAL_TYPE, BaseCache
+from langchain_core.load import dumps, loads
+
+from transfer_common.llm_cache import LLMResponseCache, get_cache, is_idempotent, request_key
+
+
+class LangChainLLMCache(BaseCache):
+    """
+    LangChain 的 BaseCache 实现，读写共享的 LLMResponseCache
+    Args:
+        cache: 使用的缓存，默认为 get_cache()
+    """
+
+    def __init__(self, cache: Optional[LLMResponseCache] = None):
+        self._cache = cache
+
+    @property
+    def cache(self) -> Optional[LLMResponseCache]:
+        return self._cache if self._cache is not None else get_cache()
+
+    @staticmethod
+    def _key(prompt: str, llm_string: str) -> str:
+        # prompt 是序列化后的消息列表，llm_string 包含模型参数和绑定的工具
+        return request_key("langchain", messages=json.loads(prompt), llm=llm_string)
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        cache = self.cache
+        if cache is None:
+            return None
+        value = cache.get(self._key(prompt, llm_string))
+        if value is None:
+            return None
+        generations = loads(value)
+        # 去掉缓存时的消息 id，由图重新分配，避免不同会话中的消息 id 相同
+        for generation in generations:
+            generation.message.id = None
+        return generations
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        cache = self.cache
+        if cache is None:
+            return
+        tool_names = [
+            call["name"] for generation in return_val for call in getattr(generation.message, "tool_calls", [])
+        ]
+        cache.put(self._key(prompt, llm_string), dumps(return_val), cacheable=is_idempotent(tool_names))
+
+    def clear(self, **kwargs: Any) -> None:
+        cache = self.cache
+        if cache is not None:
+            cache.clear()
@@ -0,0 +1,90 @@
+"""
+llama-index 接入：混入到 LLM 子类中，缓存 achat / astream_chat
+
+    class CachedDashScope(CachedChatMixin, DashScope): ...
+
+缓存值只保留最终消息（role、content、additional_kwargs 中的 tool_calls），
+流式请求命中时整段内容作为一个分块返回。
+"""
+import json
+from typing import Any, Optional, Sequence
+
+from llama_index.core.base.llms.types import ChatMessage, ChatResponse
+
+from transfer_common.llm_cache import LLMResponseCache, get_cache, is_idempotent, request_key
+
+
+def _dump_message(message: ChatMessage) -> str:
+    return json.dumps(
+        {"role": message.role.value, "content": message.content, "additional_kwargs": message.additional_kwargs},
+        ensure_ascii=False,
+        default=str,
+    )
+
+
+def _load_response(value: str) -> ChatResponse:
+    data = json.loads(value)
+    message = ChatMessage(role=data["role"], content=data["content"], additional_kwargs=data["additional_kwargs"])
+    return ChatResponse(message=message, delta=message.content)
+
+
+def _cacheable(message: ChatMessage) -> bool:
+    tool_calls = message.additional_kwargs.get("tool_calls") or []
+    return is_idempotent(call["function"]["name"] for call in tool_calls)
+
+
+class CachedChatMixin:
+    """为 llama-index 的 LLM 增加响应缓存，需放在 LLM 类之前继承"""
+
+    # 使用的缓存，为 None 时使用 get_cache()
+    response_cache: Optional[LLMResponseCache] = None
+
+    def _response_cache(self) -> Optional[LLMResponseCache]:
+        return self.response_cache if self.response_cache is not None else get_cache()
+
+    def _response_key(self, messages: Sequence[ChatMessage], kwargs: dict) -> str:
+        return request_key(
+            "llamaindex",
+            llm=self.class_name(),
+            model=self.metadata.model_name,
+            params=self._get_default_parameters() if hasattr(self, "_get_default_parameters") else None,
+            messages=[message.model_dump() for message in messages],
+            kwargs=kwargs,
+        )
+
+    async def achat(self, messages: Sequence[ChatMessage], **kwargs: Any) -> ChatResponse:
+        cache = self._response_cache()
+        if cache is None:
+            return await super().achat(messages, **kwargs)
+        key = self._response_key(messages, kwargs)
+        cached = cache.get(key)
+        if cached is not None:
+            return _load_response(cached)
+        response = await super().achat(messages, **kwargs)
+        cache.put(key, _dump_message(response.message), cacheable=_cacheable(response.message))
+        return response
+
+    async def astream_chat(self, messages: Sequence[ChatMessage], **kwargs: Any):
+        cache = self._response_cache()
+        if cache is None:
+            return await super().astream_chat(messages, **kwargs)
+        key = self._response_key(messages, kwargs)
+        cached = cache.get(key)
+        if cached is not None:
+
+            async def replay():
+                yield _load_response(cached)
+
+            return replay()
+        responses = await super().astream_chat(messages, **kwargs)
+
+        async def gen():
+            last = None
+            async for response in responses:
+                last = response
+                yield response
+            # 流式响应中每个分块的 message 都是截至当前的完整内容；请求出错时最后的 message 为空，不缓存
+            if last is not None and (last.message.content or last.message.additional_kwargs.get("tool_calls")):
+                cache.put(key, _dump_message(last.message), cacheable=_cacheable(last.message))
+
+        return gen()
@@ -0,0 +1,81 @@
+"""
+pydantic-ai 接入：包装 Model
+
+    transfer_agent = Agent(CachedModel(OpenAIModel(...)), ...)
+
+只缓存非流式的 request()，流式请求（run_stream / iter 中的 node.stream）直接转发给被包装的模型。
+dump_messages() 也用于保存会话历史（pydantic_demo 的 TransferSession）。
+"""
+import dataclasses
+from datetime import datetime, timezone
+from typing import Optional
+
+from pydantic_ai.messages import ModelMessage, ModelMessagesTypeAdapter, ModelResponse, ToolCallPart
+from pydantic_ai.models import Model, ModelRequestParameters
+from pydantic_ai.models.wrapper import WrapperModel
+from pydantic_ai.settings import ModelSettings
+
+from transfer_common.llm_cache import LLMResponseCache, get_cache, is_idempotent, request_key
+
+
+# 历史响应中每次都不同、且不会发给模型的字段
+_RESPONSE_METADATA = ("usage", "vendor_id", "vendor_details")
+
+
+def dump_messages(messages: list[ModelMessage]) -> list:
+    """
+    消息历史转成 JSON 兼容的列表，去掉响应中只用于统计的字段
+    结果可以由 ModelMessagesTypeAdapter.validate_python / validate_json 还原
+    """
+    dumped = ModelMessagesTypeAdapter.dump_python(messages, mode="json")
+    for message in dumped:
+        for field in _RESPONSE_METADATA:
+            message.pop(field, None)
+    return dumped
+
+
+class CachedModel(WrapperModel):
+    """
+    带响应缓存的模型
+    Args:
+        wrapped: 被包装的模型
+        cache: 使用的缓存，默认为 get_cache()
+    """
+
+    def __init__(self, wrapped: Model, cache: Optional[LLMResponseCache] = None):
+        super().__init__(wrapped)
+        self._cache = cache
+
+    @property
+    def cache(self) -> Optional[LLMResponseCache]:
+        return self._cache if self._cache is not None else get_cache()
+
+    def _key(self, messages, model_settings, model_request_parameters) -> str:
+        return request_key(
+            "pydantic_ai",
+            model=self.model_name,
+            system=self.system,
+            settings={**(self.settings or {}), **(model_settings or {})},
+            parameters=dataclasses.asdict(model_request_parameters),
+            messages=dump_messages(messages),
+        )
+
+    async def request(
+        self,
+        messages: list[ModelMessage],
+        model_settings: ModelSettings | None,
+        model_request_parameters: ModelRequestParameters,
+    ) -> ModelResponse:
+        cache = self.cache
+        if cache is None:
+            return await self.wrapped.request(messages, model_settings, model_request_parameters)
+        key = self._key(messages, model_settings, model_request_parameters)
+        cached = cache.get(key)
+        if cached is not None:
+            response = ModelMessagesTypeAdapter.validate_json(cached)[0]
+            response.timestamp = datetime.now(tz=timezone.utc)
+            return response
+        response = await self.wrapped.request(messages, model_settings, model_request_parameters)
+        tool_names = [part.tool_name for part in response.parts if isinstance(part, ToolCallPart)]
+        cache.put(key, ModelMessagesTypeAdapter.dump_json([response]).decode(), cacheable=is_idempotent(tool_names))
+        return response
@@ -0,0 +1,220 @@
+"""
+基于规则的转账意图解析
+
+"给张三转500元" 这样信息完整的请求不需要模型：收款人和金额可以直接从文本中取出，校验和确认也是固定的流程。
+这里用规则解析收款人和金额，只有在两项都能确定时才给出结果（confident=True），其他情况交给模型:
+- 金额: 阿拉伯数字（含千分位、小数、全角数字）、中文数字（含大写、"两"、"三万五" 这类口语省略），
+  以及与 万/千/百 单位的组合（"1.5万"、"5千"、"1万5千"）
+- 收款人: 在账本索引中查找文本中出现的账户名（ledger.exists，不遍历账户），
+  且账户名前面必须是 给/向/转给 等表示收款方的词
+- 以下情况不给出结果: 没有转账动词、收款人或金额不止一个、账户不存在、否定或疑问（"不要"、"吗"）、
+  "各"、"分别"、"一半" 这类需要计算的说法、"给我" 这类方向相反的说法、人民币以外的币种（"美元"、"$"）、
+  负数金额（"-500"、"负五百"）、角/毛/分和 "50块5" 这类元以下的金额（规则只按元解析，会少算或按元多算）、
+  "转了"、"已经" 这类已经发生的转账、"两次" 这类重复次数
+
+各转账 agent 都可以在调用模型之前使用 extract_transfer()，is_affirmative() 用于判断用户对确认问题的回答。
+"""
+import re
+import unicodedata
+from typing import List, Optional, Tuple
+
+from transfer_common.ledger import SELF_ACCOUNT, get_ledger
+
+_DIGITS = {
+    "零": 0, "〇": 0, "一": 1, "壹": 1, "二": 2, "两": 2, "贰": 2, "三": 3, "叁": 3, "四": 4, "肆": 4,
+    "五": 5, "伍": 5, "六": 6, "陆": 6, "七": 7, "柒": 7, "八": 8, "捌": 8, "九": 9, "玖": 9,
+}
+_UNITS = {"十": 10, "拾": 10, "百": 100, "佰": 100, "千": 1000, "仟": 1000}
+_BIG_UNITS = {"万": 10_000, "萬": 10_000, "亿": 100_000_000}
+_ARABIC_TO_CHINESE = str.maketrans("0123456789", "零一二三四五六七八九")
+
+_NUMBER_CHARS = "".join(_DIGITS) + "".join(_UNITS) + "".join(_BIG_UNITS) + "点"
+# 金额: 数字和单位组成的串，后面可以跟货币单位
+_AMOUNT = re.compile(rf"(?P<number>[0-9.{_NUMBER_CHARS}]+)\s*(?P<currency>块钱|元钱|元|块|圆|人民币|rmb)?", re.I)
+# 千分位: 1,200 -> 1200
+_THOUSANDS = re.compile(r"(?<=\d),(?=\d{3}(?!\d))")
+# 数字后面跟量词时不是金额，例如 "转一笔"、"看一下"
+_MEASURE_WORDS = "笔下次个些遍"
+_NAME_MASK = "\x00"
+
+_TRANSFER_VERBS = re.compile(r"转|汇|打|付款")
+# 紧跟在收款人前面的词
+_RECIPIENT_MARKERS = ("转账给", "转给", "转到", "汇给", "打给", "付给", "给", "向")
+# 紧跟在金额前面、可以省略货币单位的词，例如 "给张三转500"
+_AMOUNT_PREFIXES = ("转账", "转", "汇", "打")
+# 出现这些说法时交给模型
+_AMBIGUOUS = re.compile(
+    r"不要|不用|别|取消|算了|撤销|不转|"            # 否定
+    r"吗|\?|多少|几|什么|怎么|能不能|是否|"           # 疑问
+    r"各|每|分别|平分|一半|全部|所有|剩下|剩余|再|还有|"  # 多笔或需要计算
+    r"给我|转我|向我转|让|叫|如果|的话|"              # 方向相反或有条件
+    r"美元|美金|欧元|英镑|日元|港币|港元|澳元|韩元|卢布|外币|[$€£]|(?<![a-z])(?:usd|eur|gbp|jpy|hkd)(?![a-z])|\d\s*刀|"  # 其他币种
+    rf"负\s*[0-9{_NUMBER_CHARS}]|[-−]\s*[0-9{_NUMBER_CHARS}]|"  # 负数
+    rf"[0-9{_NUMBER_CHARS}]\s*[角毛分]|(?:块|元)\s*[0-9{_NUMBER_CHARS}]|"  # 元以下的金额: 5毛、500分、50块5
+    r"(?:转|汇|打|付)(?:账|款)?\s*[了过]|已经|"  # 已经发生的转账
+    rf"[0-9{_NUMBER_CHARS}]\s*[次遍趟回]|多次|重复",  # 重复转账
+    re.I,
+)
+MAX_NAME_LENGTH = 8
+
+_AFFIRMATIVE = {
+    "确认", "确定", "是", "是的", "对", "对的", "好", "好的", "可以", "行", "嗯", "没问题", "同意",
+    "确认转账", "确认执行", "执行", "转吧", "ok", "okay", "yes", "y",
+}
+
+
+class TransferSlots:
+    """
+    解析结果
+    - to_account: 收款人，无法确定时为 None
+    - amount: 金额（元），无法确定时为 None
+    - confident: 两项都已确定、且没有需要模型处理的说法
+    """
+
+    __slots__ = ("to_account", "amount", "confident")
+
+    def __init__(self, to_account: Optional[str], amount: Optional[float], confident: bool):
+        self.to_account = to_account
+        self.amount = amount
+        self.confident = confident
+
+    def __repr__(self) -> str:
+        return f"TransferSlots(to_account={self.to_account!r}, amount={self.amount}, confident={self.confident})"
+
+
+def _parse_integer(text: str) -> Optional[int]:
+    """中文整数，例如 一万五千、三万五（=35000）、两百五（=250）、一千零五"""
+    if not text:
+        return None
+    # 只有数字没有单位时按位读，例如 五零零
+    if all(ch in _DIGITS for ch in text):
+        return int("".join(str(_DIGITS[ch]) for ch in text))
+    total = section = number = 0
+    for ch in text:
+        if ch in _DIGITS:
+            number = _DIGITS[ch]
+        elif ch in _UNITS:
+            # "十" 前面没有数字时为 1，例如 十五
+            section += (number or 1) * _UNITS[ch]
+            number = 0
+        elif ch in _BIG_UNITS:
+            total = (total + section + number) * _BIG_UNITS[ch] if total < _BIG_UNITS[ch] \
+                else total + (section + number) * _BIG_UNITS[ch]
+            section = number = 0
+        else:
+            return None
+    # 口语中省略末位单位: 三万五 = 三万五千，一千五 = 一千五百
+    if number and text[-1] in _DIGITS and len(text) > 1:
+        unit = _UNITS.get(text[-2]) or _BIG_UNITS.get(text[-2])
+        if unit:
+            number *= unit // 10
+    return total + section + number
+
+
+def parse_amount(text: str) -> Optional[float]:
+    """
+    解析金额，无法解析时返回 None
+    例如 500、1,200、1.5万、5千、1万5千、五百、壹仟、三万五、一点五万
+    """
+    text = _THOUSANDS.sub("", unicodedata.normalize("NFKC", text).strip())
+    if not text:
+        return None
+    if re.fullmatch(r"\d+(\.\d+)?", text):
+        return float(text)
+    match = re.fullmatch(rf"(\d+(?:\.\d+)?)([{''.join(_UNITS)}{''.join(_BIG_UNITS)}]+)", text)
+    if match:
+        value = float(match.group(1))
+        for ch in match.group(2):
+            value *= _UNITS.get(ch) or _BIG_UNITS[ch]
+        return value
+    # "一点钱" 不是金额
+    if "." in text or text.endswith("点"):
+        return None
+    text = text.translate(_ARABIC_TO_CHINESE)
+    integer, _, fraction = text.partition("点")
+    # 一点五万: 小数点后面的数字之后可以跟单位
+    multiplier = 1
+    while fraction and fraction[-1] in _BIG_UNITS or fraction and fraction[-1] in _UNITS:
+        multiplier *= _BIG_UNITS.get(fraction[-1]) or _UNITS[fraction[-1]]
+        fraction = fraction[:-1]
+    value = _parse_integer(integer)
+    if value is None:
+        return None
+    if fraction:
+        if not all(ch in _DIGITS for ch in fraction):
+            return None
+        value += float("0." + "".join(str(_DIGITS[ch]) for ch in fraction))
+    return float(value * multiplier)
+
+
+def find_accounts(text: str) -> List[Tuple[str, int, int]]:
+    """
+    文本中出现的账户名（不含 "我"），返回 [(账户名, 开始位置, 结束位置)]
+    每个位置取账本中存在的最长的名字，按位置在账本索引中查找，不遍历账户
+    """
+    ledger = get_ledger()
+    found = []
+    i = 0
+    while i < len(text):
+        match = None
+        for length in range(min(MAX_NAME_LENGTH, len(text) - i), 0, -1):
+            name = text[i:i + length]
+            if name != SELF_ACCOUNT and not name.isspace() and ledger.exists(name):
+                match = name
+                break
+        if match:
+            found.append((match, i, i + len(match)))
+            i += len(match)
+        else:
+            i += 1
+    return found
+
+
+def _amounts(text: str, name_spans: List[Tuple[int, int]]) -> List[float]:
+    """文本中的金额：带货币单位，或紧跟在转账动词、收款人之后"""
+    # 先把账户名替换掉，账户名中的数字（王五、赵六两千）不能算进金额
+    for start, end in name_spans:
+        text = text[:start] + _NAME_MASK * (end - start) + text[end:]
+    amounts = []
+    for match in _AMOUNT.finditer(text):
+        start, end = match.span("number")
+        if end < len(text) and text[end] in _MEASURE_WORDS:
+            continue
+        before = text[:start].rstrip()
+        if not (match.group("currency") or before.endswith(_AMOUNT_PREFIXES) or before.endswith(_NAME_MASK)):
+            continue
+        value = parse_amount(match.group("number"))
+        if value is not None and value > 0:
+            amounts.append(value)
+    return amounts
+
+
+def extract_transfer(text: str) -> TransferSlots:
+    """从一条用户消息中解析收款人和金额，见模块说明"""
+    text = unicodedata.normalize("NFKC", text).strip()
+    text = _THOUSANDS.sub("", text)
+    accounts = find_accounts(text)
+    names = {name for name, _, _ in accounts}
+    spans = [(start, end) for _, start, end in accounts]
+    amounts = _amounts(text, spans)
+    to_account = next(iter(names)) if len(names) == 1 else None
+    amount = amounts[0] if len(set(amounts)) == 1 else None
+    confident = (
+        to_account is not None
+        and amount is not None
+        and len(amounts) == 1
+        and bool(_TRANSFER_VERBS.search(text))
+        and not _AMBIGUOUS.search(text)
+        # 收款人前面必须是 给/向/转给 等
+        and all(text[:start].endswith(_RECIPIENT_MARKERS) for start, _ in spans)
+    )
+    return TransferSlots(to_account, amount, confident)
+
+
+def is_affirmative(text: str) -> bool:
+    """用户对确认问题的回答是否为肯定，例如 确认、好的、是"""
+    text = unicodedata.normalize("NFKC", text).strip().lower()
+    text = re.sub(r"[\s,.!~。，！]+$", "", text)
+    if _AMBIGUOUS.search(text):
+        return False
+    return text in _AFFIRMATIVE
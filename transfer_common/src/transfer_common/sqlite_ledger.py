@@ -0,0 +1,277 @@
+"""
+基于 SQLite (WAL) 的持久化账本
+
+- WAL 模式：读写互不阻塞，读请求从连接池取连接并发执行
+- 连接池：固定数量的只读连接，复用 sqlite3 的语句缓存（prepared statement）
+- 组提交：所有转账交给单个写线程，写线程把同一时刻到达的转账合并到一个事务里，
+  一次 COMMIT（一次 fsync）后再逐个唤醒调用方
+
+实现 transfer_common.ledger.LedgerLike 接口（与内存账本 Ledger 相同），可通过 set_ledger() 或环境变量
+LEDGER_DB_PATH 接入各转账 agent 的工具函数。
+"""
+import queue
+import sqlite3
+import threading
+from concurrent.futures import Future
+from contextlib import contextmanager
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from transfer_common.ledger import (Account, AccountNotFoundError, InsufficientBalanceError, LedgerError,
+                                    check_transfers)
+
+_CREATE_TABLE = (
+    "CREATE TABLE IF NOT EXISTS accounts ("
+    " slot INTEGER PRIMARY KEY,"
+    " name TEXT NOT NULL UNIQUE,"
+    " balance REAL NOT NULL)"
+)
+_SELECT_ACCOUNT = "SELECT slot, balance FROM accounts WHERE name = ?"
+_SELECT_COUNT = "SELECT COUNT(*) FROM accounts"
+_SELECT_NAMES = "SELECT name FROM accounts ORDER BY slot"
+_UPSERT = (
+    "INSERT INTO accounts (name, balance) VALUES (?, ?) "
+    "ON CONFLICT(name) DO UPDATE SET balance = excluded.balance"
+)
+_UPDATE_BALANCE = "UPDATE accounts SET balance = balance + ? WHERE slot = ?"
+
+# 写线程退出标记
+_STOP = object()
+
+
+def _connect(path: str) -> sqlite3.Connection:
+    # isolation_level=None: 由我们自己控制 BEGIN / COMMIT
+    conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, cached_statements=64)
+    conn.execute("PRAGMA journal_mode=WAL")
+    # WAL 下 FULL 保证每次 COMMIT 都落盘
+    conn.execute("PRAGMA synchronous=FULL")
+    conn.execute("PRAGMA busy_timeout=5000")
+    return conn
+
+
+class ConnectionPool:
+    """固定大小的 sqlite3 连接池"""
+
+    def __init__(self, path: str, size: int = 8):
+        self._pool: "queue.Queue[sqlite3.Connection]" = queue.Queue()
+        self._conns = [_connect(path) for _ in range(size)]
+        for conn in self._conns:
+            self._pool.put(conn)
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        conn = self._pool.get()
+        try:
+            yield conn
+        finally:
+            self._pool.put(conn)
+
+    def close(self) -> None:
+        for conn in self._conns:
+            conn.close()
+
+
+class SQLiteLedger:
+    """
+    持久化账本
+    Args:
+        path: 数据库文件路径
+        pool_size: 读连接池大小
+        max_batch: 一次组提交最多合并的转账数，为 1 时退化为逐笔提交
+        max_wait: 写线程拿到第一笔转账后，最多再等待多少秒收集同批转账
+    """
+
+    def __init__(self, path: str, pool_size: int = 8, max_batch: int = 256, max_wait: float = 0.001):
+        self.path = path
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self._writer_conn = _connect(path)
+        self._writer_conn.execute(_CREATE_TABLE)
+        self._pool = ConnectionPool(path, pool_size)
+        self._pending: "queue.Queue" = queue.Queue()
+        # close() 之后不再接受写请求；与入队放在同一把锁下，保证 _STOP 之后不会再有请求入队
+        self._closed = False
+        self._submit_lock = threading.Lock()
+        self._last_batch_size = 0
+        self._writer = threading.Thread(target=self._write_loop, name="sqlite-ledger-writer", daemon=True)
+        self._writer.start()
+
+    # ---- 读接口 ----
+    def _lookup(self, name: str) -> Optional[Tuple[int, float]]:
+        with self._pool.connection() as conn:
+            return conn.execute(_SELECT_ACCOUNT, (name,)).fetchone()
+
+    def __len__(self) -> int:
+        with self._pool.connection() as conn:
+            return conn.execute(_SELECT_COUNT).fetchone()[0]
+
+    def __contains__(self, name: str) -> bool:
+        return self._lookup(name) is not None
+
+    def __iter__(self) -> Iterator[str]:
+        with self._pool.connection() as conn:
+            names = [row[0] for row in conn.execute(_SELECT_NAMES)]
+        return iter(names)
+
+    def exists(self, name: str) -> bool:
+        return self._lookup(name) is not None
+
+    def slot_of(self, name: str) -> int:
+        row = self._lookup(name)
+        if row is None:
+            raise AccountNotFoundError(name)
+        return row[0]
+
+    def balance_of(self, name: str) -> float:
+        row = self._lookup(name)
+        if row is None:
+            raise AccountNotFoundError(name)
+        return row[1]
+
+    def account(self, name: str) -> Account:
+        row = self._lookup(name)
+        if row is None:
+            raise AccountNotFoundError(name)
+        return Account(name, row[0], row[1])
+
+    # ---- 写接口 ----
+    def _submit(self, apply, *args):
+        """把写请求交给写线程，阻塞直到所在批次提交完成；账本已关闭时抛出 LedgerError"""
+        future: Future = Future()
+        with self._submit_lock:
+            if self._closed:
+                raise LedgerError("账本已关闭")
+            self._pending.put((apply, args, future))
+        return future.result()
+
+    def load(self, items: Iterable[Tuple[str, float]]) -> None:
+        """批量加载账户，已存在的账户直接覆盖余额"""
+        self._submit(self._apply_load, list(items))
+
+    def add_account(self, name: str, balance: float = 0.0) -> int:
+        self.load(((name, balance),))
+        return self.slot_of(name)
+
+    def transfer(self, from_user: str, to_user: str, amount: float) -> float:
+        """
+        转账，返回转出账户的剩余余额
+        调用方阻塞直到所在批次提交完成
+        """
+        return self._submit(self._apply_transfer, from_user, to_user, amount)
+
+    def transfer_many(self, from_user: str, transfers: List[Tuple[str, float]]) -> float:
+        """批量转账，整批在同一个 savepoint 中原子执行"""
+        return self._submit(self._apply_transfer_many, from_user, list(transfers))
+
+    def close(self) -> None:
+        with self._submit_lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._pending.put(_STOP)
+        self._writer.join()
+        self._writer_conn.close()
+        self._pool.close()
+
+    # ---- 写线程 ----
+    def _apply_load(self, conn: sqlite3.Connection, items) -> None:
+        conn.executemany(_UPSERT, items)
+
+    def _apply_transfer(self, conn: sqlite3.Connection, from_user: str, to_user: str, amount: float) -> float:
+        check_transfers(from_user, ((to_user, amount),))
+        src = conn.execute(_SELECT_ACCOUNT, (from_user,)).fetchone()
+        if src is None:
+            raise AccountNotFoundError(from_user)
+        dst = conn.execute(_SELECT_ACCOUNT, (to_user,)).fetchone()
+        if dst is None:
+            raise AccountNotFoundError(to_user)
+        if src[1] < amount:
+            raise InsufficientBalanceError(from_user, src[1], amount)
+        conn.execute(_UPDATE_BALANCE, (-amount, src[0]))
+        conn.execute(_UPDATE_BALANCE, (amount, dst[0]))
+        return src[1] - amount
+
+    def _apply_transfer_many(self, conn: sqlite3.Connection, from_user: str, transfers) -> float:
+        check_transfers(from_user, transfers)
+        src = conn.execute(_SELECT_ACCOUNT, (from_user,)).fetchone()
+        if src is None:
+            raise AccountNotFoundError(from_user)
+        updates = []
+        for to_user, amount in transfers:
+            dst = conn.execute(_SELECT_ACCOUNT, (to_user,)).fetchone()
+            if dst is None:
+                raise AccountNotFoundError(to_user)
+            updates.append((amount, dst[0]))
+        total = sum(amount for _, amount in transfers)
+        if src[1] < total:
+            raise InsufficientBalanceError(from_user, src[1], total)
+        conn.execute(_UPDATE_BALANCE, (-total, src[0]))
+        conn.executemany(_UPDATE_BALANCE, updates)
+        return src[1] - total
+
+    def _collect_batch(self, first) -> list:
+        """以 first 为首，收集同一批次的写请求"""
+        batch = [first]
+        waited = False
+        while len(batch) < self.max_batch:
+            try:
+                item = self._pending.get_nowait()
+            except queue.Empty:
+                # 上一批只有一笔说明没有并发写入，不必等待
+                if waited or self.max_wait <= 0 or self._last_batch_size <= 1:
+                    break
+                # 队列暂时为空，给并发的调用方一个很短的窗口赶上本批次
+                waited = True
+                try:
+                    item = self._pending.get(timeout=self.max_wait)
+                except queue.Empty:
+                    break
+            batch.append(item)
+            if item is _STOP:
+                break
+        return batch
+
+    def _write_loop(self) -> None:
+        conn = self._writer_conn
+        while True:
+            first = self._pending.get()
+            if first is _STOP:
+                return
+            batch = self._collect_batch(first)
+            stop = batch[-1] is _STOP
+            if stop:
+                batch.pop()
+            self._last_batch_size = len(batch)
+            try:
+                results = self._run_batch(conn, batch)
+            except Exception as e:
+                # BEGIN / COMMIT / ROLLBACK 本身失败（数据库忙、I/O 错误等）：整批失败，写线程继续处理后续请求
+                results = [(future, None, e) for _, _, future in batch]
+            for future, value, error in results:
+                if error is None:
+                    future.set_result(value)
+                else:
+                    future.set_exception(error)
+            if stop:
+                return
+
+    def _run_batch(self, conn: sqlite3.Connection, batch: list) -> list:
+        """在一个事务中执行一批写请求，返回 [(future, 结果, 异常)]"""
+        results = []
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for apply, args, future in batch:
+                # 每笔操作一个 savepoint，失败的操作回滚自身，不影响同批次其他转账
+                conn.execute("SAVEPOINT op")
+                try:
+                    results.append((future, apply(conn, *args), None))
+                    conn.execute("RELEASE op")
+                except Exception as e:
+                    conn.execute("ROLLBACK TO op")
+                    conn.execute("RELEASE op")
+                    results.append((future, None, e))
+            conn.execute("COMMIT")
+        except Exception:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        return results
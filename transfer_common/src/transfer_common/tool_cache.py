@@ -0,0 +1,205 @@
+"""
+只读工具的结果缓存
+
+模型经常在同一会话中用相同参数反复调用 get_account / get_balance。
+这里按会话缓存这些只读工具的结果：
+- 缓存键: (会话 id, 工具名, 参数)，会话 id 取自 session_scope() / set_session() 设置的上下文
+- 按 LRU 淘汰，超过 TTL 的结果视为过期
+- execute_transfer / execute_transfers 成功后，涉及账户的缓存在所有会话中失效；
+  每个账户有一个版本号，查询期间账户发生了转账时，查到的结果不写入缓存
+- 账户不存在的结果不缓存：load / add_account 新增账户时不会通知缓存
+- stats() 返回命中率等计数
+
+本模块导出的 get_balance / get_account / get_balances / get_accounts 与 ledger 中的同名函数
+签名和文档一致，可直接替换给各框架注册工具。
+"""
+import functools
+import inspect
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterable, Iterator, Optional, Set, Tuple
+
+from transfer_common import ledger
+
+DEFAULT_SESSION = "default"
+# 查询结果中表示账户不存在的文字，见 ledger.get_account 等
+_MISSING = "不存在"
+
+# 当前会话 id（LangGraph 的 thread_id、autogen 的 team 等）
+_current_session: ContextVar[str] = ContextVar("tool_cache_session", default=DEFAULT_SESSION)
+
+
+def current_session() -> str:
+    return _current_session.get()
+
+
+def set_session(session_id: str) -> None:
+    """设置当前上下文的会话 id"""
+    _current_session.set(session_id)
+
+
+@contextmanager
+def session_scope(session_id: str) -> Iterator[None]:
+    """在 with 块内使用指定的会话 id"""
+    token = _current_session.set(session_id)
+    try:
+        yield
+    finally:
+        _current_session.reset(token)
+
+
+def _freeze(value):
+    """把列表等不可哈希的参数转成可哈希的形式"""
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    return value
+
+
+class ToolResultCache:
+    """
+    按会话隔离的 LRU + TTL 缓存
+    Args:
+        maxsize: 最多缓存的结果数（所有会话合计）
+        ttl: 结果有效期（秒）
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 30.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        # key -> (过期时间, 结果, 涉及的账户)
+        self._entries: "OrderedDict[Tuple, Tuple[float, str, Tuple[str, ...]]]" = OrderedDict()
+        # 账户 -> 涉及该账户的 key，用于写操作后失效
+        self._by_account: Dict[str, Set[Tuple]] = {}
+        # 账户 -> 版本号，每次失效加 1
+        self._generations: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def _drop(self, key: Tuple) -> None:
+        _, _, accounts = self._entries.pop(key)
+        for name in accounts:
+            keys = self._by_account.get(name)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_account[name]
+
+    def get(self, key: Tuple):
+        """返回 (是否命中, 结果)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return True, entry[1]
+                self._drop(key)
+            self.misses += 1
+            return False, None
+
+    def generations(self, accounts: Iterable[str]) -> Tuple[int, ...]:
+        """账户当前的版本号，查询前取得，写入时交给 put"""
+        with self._lock:
+            return tuple(self._generations.get(name, 0) for name in accounts)
+
+    def put(self, key: Tuple, value: str, accounts: Iterable[str],
+            generations: Optional[Tuple[int, ...]] = None) -> None:
+        """
+        写入结果
+        Args:
+            generations: 查询前 generations(accounts) 的返回值；之后账户已失效过时丢弃结果，
+                避免把转账之前查到的余额写入已经失效过的缓存
+        """
+        accounts = tuple(accounts)
+        with self._lock:
+            if generations is not None and generations != tuple(self._generations.get(n, 0) for n in accounts):
+                return
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (time.monotonic() + self.ttl, value, accounts)
+            for name in accounts:
+                self._by_account.setdefault(name, set()).add(key)
+            while len(self._entries) > self.maxsize:
+                self._drop(next(iter(self._entries)))
+
+    def invalidate_accounts(self, user_names: Iterable[str]) -> None:
+        """账户余额发生变化，清除所有会话中涉及这些账户的结果"""
+        with self._lock:
+            for name in user_names:
+                self._generations[name] = self._generations.get(name, 0) + 1
+                for key in list(self._by_account.get(name, ())):
+                    self._drop(key)
+                    self.invalidations += 1
+
+    def clear_session(self, session_id: str) -> None:
+        """会话结束时释放该会话的缓存"""
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == session_id]:
+                self._drop(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._by_account.clear()
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "size": len(self._entries),
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+    def wrap(self, fn: Callable[..., str], accounts_of: Callable[..., Iterable[str]]) -> Callable[..., str]:
+        """
+        包装只读工具函数，保留原函数的名字、签名和文档供各框架生成工具 schema
+        Args:
+            fn: 只读工具函数
+            accounts_of: 以相同参数调用，返回结果涉及的账户
+        """
+        signature = inspect.signature(fn)
+        name = fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            key = (current_session(), name, _freeze(tuple(bound.arguments.values())))
+            found, value = self.get(key)
+            if found:
+                return value
+            accounts = tuple(accounts_of(*args, **kwargs))
+            generations = self.generations(accounts)
+            value = fn(*args, **kwargs)
+            if _MISSING not in value:
+                self.put(key, value, accounts, generations)
+            return value
+
+        return wrapper
+
+
+# 进程内共享的工具结果缓存
+default_cache = ToolResultCache()
+ledger.add_write_listener(default_cache.invalidate_accounts)
+
+get_balance = default_cache.wrap(ledger.get_balance, lambda user_name: (user_name,))
+# 账户是否存在不受转账影响，不需要按账户失效（不存在的结果不缓存）
+get_account = default_cache.wrap(ledger.get_account, lambda user_name: ())
+get_balances = default_cache.wrap(ledger.get_balances, lambda user_names: user_names)
+get_accounts = default_cache.wrap(ledger.get_accounts, lambda user_names: ())
+
+
+def format_stats() -> str:
+    stats = default_cache.stats()
+    return (
+        f"工具缓存: 命中 {stats['hits']} 次, 未命中 {stats['misses']} 次, "
+        f"失效 {stats['invalidations']} 次, 命中率 {stats['hit_rate']:.1%}"
+    )
@@ -0,0 +1,130 @@
+"""
+并发执行同一条模型消息中的多个工具调用
+
+模型经常在一条消息里同时发出 get_account("张三") 和 get_balance("我")，这些查询互不依赖；
+账本换成数据库或远程服务后，应当让它们同时进行。这里把同步工具函数包装成异步版本:
+- 同步函数在专用的线程池中执行（线程数由 TOOL_WORKERS 指定，默认 16），不占用事件循环，
+  也不与框架共用默认线程池；执行时带上调用方的 contextvars（tool_cache 的会话 id）
+- 只读工具之间并发执行
+- 写操作（execute_transfer / execute_transfers）按发出顺序串行：同一会话中，写操作等待在它之前发出的
+  所有工具调用完成后才开始，在它之后发出的调用等它完成后才开始；不同会话的写操作不互相等待，
+  由账本自己保证线程安全（SQLiteLedger 的写线程会把并发的转账合并成一次组提交）
+- 调用方被取消时，已经在线程中执行的工具不会中断；同一会话之后的调用仍等它真正结束后才开始
+
+各框架本身会把一条消息中的工具调用并发调度（pydantic-ai 为每个调用创建 task，
+llama-index 的 FunctionAgent 把每个调用作为一个 ToolCall 事件分发），注册异步版本的工具即可。
+
+环境变量:
+    TOOL_WORKERS    工具线程池的线程数，默认 16；设为 1 时所有工具依次执行
+"""
+import asyncio
+import contextvars
+import functools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Awaitable, Callable, Dict, Optional, Set, Tuple
+
+from transfer_common.tool_cache import current_session
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_tool_executor() -> ThreadPoolExecutor:
+    """进程内共享的工具线程池，首次使用时创建"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=int(os.getenv("TOOL_WORKERS", "16")), thread_name_prefix="tool"
+            )
+        return _executor
+
+
+def set_tool_workers(max_workers: int) -> None:
+    """替换工具线程池，之后的工具调用使用新的线程数"""
+    global _executor
+    with _executor_lock:
+        old, _executor = _executor, ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="tool")
+    if old is not None:
+        old.shutdown(wait=False)
+
+
+class _SessionOrder:
+    """一个会话中尚未完成的工具调用：最近一次写操作，以及它之后发出的只读调用"""
+
+    def __init__(self):
+        self.last_write: Optional[asyncio.Future] = None
+        self.reads: Set[asyncio.Future] = set()
+
+
+# (事件循环, 会话 id) -> 该会话尚未完成的调用，全部完成后删除
+_orders: Dict[Tuple[int, str], _SessionOrder] = {}
+
+
+def _call_soon(loop: asyncio.AbstractEventLoop, callback: Callable[[], None]) -> None:
+    """从工具线程回到事件循环执行 callback，事件循环已关闭时忽略"""
+    try:
+        loop.call_soon_threadsafe(callback)
+    except RuntimeError:
+        pass
+
+
+async def run_tool(fn: Callable[..., str], *args, write: bool = False, **kwargs) -> str:
+    """
+    在工具线程池中执行同步工具函数
+    Args:
+        fn: 工具函数
+        write: 是否为写操作；写操作与同一会话中的其他调用按发出顺序串行
+    """
+    loop = asyncio.get_running_loop()
+    key = (id(loop), current_session())
+    order = _orders.setdefault(key, _SessionOrder())
+    done = loop.create_future()
+    if write:
+        waits = [f for f in (order.last_write, *order.reads) if f is not None]
+        order.last_write, order.reads = done, set()
+    else:
+        waits = [order.last_write] if order.last_write is not None else []
+        order.reads.add(done)
+
+    def release():
+        if done.done():
+            return
+        done.set_result(None)
+        order.reads.discard(done)
+        if order.last_write is done:
+            order.last_write = None
+        if order.last_write is None and not order.reads and _orders.get(key) is order:
+            del _orders[key]
+
+    submitted = False
+    try:
+        if waits:
+            await asyncio.wait(waits)
+        call = functools.partial(fn, *args, **kwargs)
+        # 复制 contextvars：工具缓存需要调用方的会话 id
+        future = get_tool_executor().submit(contextvars.copy_context().run, call)
+        submitted = True
+        # 调用方被取消时线程中的工具仍在执行，等它真正结束后才放行同一会话中之后的调用
+        future.add_done_callback(lambda _: _call_soon(loop, release))
+        return await asyncio.wrap_future(future)
+    finally:
+        if not submitted:
+            release()
+
+
+def async_tool(fn: Callable[..., str], write: bool = False) -> Callable[..., Awaitable[str]]:
+    """
+    把同步工具函数包装成异步版本，保留原函数的名字、签名和文档供各框架生成工具 schema
+    Args:
+        fn: 同步工具函数
+        write: 是否为写操作，见 run_tool
+    """
+
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        return await run_tool(fn, *args, write=write, **kwargs)
+
+    return wrapper
@@ -0,0 +1,175 @@
+"""
+转账工具注册表
+
+同样的工具原来在五个框架中各声明一遍（LangGraph 的普通函数、autogen 的 FunctionTool、llama-index 的
+FunctionTool.from_defaults、pydantic-ai 的 @tool_plain、crewAI 手写的 BaseTool 子类），描述和参数名各不相同；
+各框架在启动时（autogen、llama-index 在每次请求模型时）内省函数签名和文档，用 pydantic 生成 JSON schema。
+这里每个工具只定义一次:
+- ToolSpec: 名称、描述、参数的 JSON schema、同步函数、异步函数、是否为写操作
+- 参数 schema 在导入时由 ledger 中函数的签名和文档（Args: 段）生成一次，各框架直接使用，不再内省
+- 需要校验参数时使用 args_model（pydantic 模型），首次使用时生成并缓存
+
+各框架的适配见同目录下的 *_adapter 模块，每个模块提供 create_tool(spec, fn) 和 create_tools(overrides, exclude)，
+overrides 为 工具名 -> 函数，用于替换某个工具在该框架中的实现（例如各框架各自的 reply_to_user）。
+"""
+import functools
+import inspect
+import typing
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from transfer_common import async_tools, ledger, tool_cache
+
+# Python 类型 -> JSON schema 类型
+_JSON_TYPES = {str: "string", float: "number", int: "integer", bool: "boolean"}
+
+
+def _json_type(annotation) -> dict:
+    if typing.get_origin(annotation) is list:
+        (item,) = typing.get_args(annotation)
+        return {"type": "array", "items": _json_type(item)}
+    return {"type": _JSON_TYPES[annotation]}
+
+
+def _parse_doc(doc: str):
+    """返回 (描述, 参数名 -> 说明)，文档格式同 ledger 中的工具函数"""
+    description, args, section = [], {}, None
+    for line in doc.splitlines():
+        line = line.strip()
+        if line in ("Args:", "Returns:"):
+            section = line
+        elif section is None and line:
+            description.append(line)
+        elif section == "Args:" and ":" in line:
+            name, text = line.split(":", 1)
+            args[name.strip()] = text.strip()
+    return "".join(description), args
+
+
+class ToolSpec:
+    """
+    一个工具的定义
+    Args:
+        name: 工具名
+        description: 给模型看的工具描述
+        parameters: 参数的 JSON schema（type 为 object）
+        annotations: 参数名 -> Python 类型，用于生成 args_model
+        fn: 同步实现，没有通用实现时为 None
+        async_fn: 异步实现，在工具线程池中执行（见 tool_executor）
+        write: 是否为写操作
+    """
+
+    def __init__(self, name: str, description: str, parameters: dict, annotations: Dict[str, Any],
+                 fn: Optional[Callable[..., str]], async_fn: Optional[Callable[..., Any]], write: bool = False):
+        self.name = name
+        self.description = description
+        self.parameters = parameters
+        self.annotations = annotations
+        self.fn = fn
+        self.async_fn = async_fn
+        self.write = write
+        # OpenAI 格式的工具定义，可直接传给 bind_tools 等
+        self.openai_tool = {
+            "type": "function",
+            "function": {"name": name, "description": description, "parameters": parameters},
+        }
+
+    @classmethod
+    def from_function(cls, source: Callable, fn: Optional[Callable[..., str]],
+                      async_fn: Optional[Callable[..., Any]], write: bool = False) -> "ToolSpec":
+        """
+        由函数的签名和文档生成工具定义
+        Args:
+            source: 提供名称、参数和文档的函数
+        """
+        source = inspect.unwrap(source)
+        hints = typing.get_type_hints(source)
+        description, arg_docs = _parse_doc(inspect.getdoc(source) or "")
+        properties, required, annotations = {}, [], {}
+        for name, param in inspect.signature(source).parameters.items():
+            annotations[name] = hints[name]
+            prop = _json_type(hints[name])
+            if name in arg_docs:
+                prop["description"] = arg_docs[name]
+            if param.default is inspect.Parameter.empty:
+                required.append(name)
+            else:
+                prop["default"] = param.default
+            properties[name] = prop
+        parameters = {"type": "object", "properties": properties, "required": required,
+                      "additionalProperties": False}
+        return cls(source.__name__, description, parameters, annotations, fn, async_fn, write)
+
+    @functools.cached_property
+    def args_model(self):
+        """参数的 pydantic 模型，首次使用时生成"""
+        from pydantic import Field, create_model
+
+        fields = {}
+        for name, annotation in self.annotations.items():
+            prop = self.parameters["properties"][name]
+            fields[name] = (annotation, Field(prop.get("default", ...), description=prop.get("description")))
+        class_name = "".join(part.title() for part in self.name.split("_")) + "Args"
+        return create_model(class_name, **fields)
+
+    def implementation(self, prefer_async: bool) -> Callable:
+        """返回首选的实现（异步或同步），没有时返回另一种"""
+        if prefer_async:
+            return self.async_fn or self.fn
+        return self.fn or self.async_fn
+
+    def validate(self, args: dict) -> dict:
+        """按参数类型校验并转换模型给出的参数（例如整数金额转为 float），参数不合法时抛出 ValidationError"""
+        return dict(self.args_model.model_validate(args))
+
+    def bind(self, fn: Callable) -> Callable:
+        """返回先用 validate 校验参数再调用 fn 的函数（只接受关键字参数），fn 为协程函数时同样返回协程函数"""
+        if inspect.iscoroutinefunction(fn):
+            async def call(**kwargs):
+                return await fn(**self.validate(kwargs))
+        else:
+            def call(**kwargs):
+                return fn(**self.validate(kwargs))
+        call.__name__ = call.__qualname__ = self.name
+        call.__doc__ = self.description
+        return call
+
+    def __repr__(self) -> str:
+        return f"ToolSpec(name={self.name!r}, write={self.write})"
+
+
+# 注册的工具，顺序即注册给各框架的顺序；只读工具使用带会话缓存的版本
+TOOLS: List[ToolSpec] = [
+    ToolSpec.from_function(ledger.get_balance, tool_cache.get_balance, async_tools.get_balance),
+    ToolSpec.from_function(ledger.get_account, tool_cache.get_account, async_tools.get_account),
+    ToolSpec.from_function(ledger.execute_transfer, ledger.execute_transfer, async_tools.execute_transfer,
+                           write=True),
+    # 向用户提问只有问答队列版本（见 async_tools），各框架可以通过 overrides 换成自己的实现
+    ToolSpec.from_function(async_tools.reply_to_user, None, async_tools.reply_to_user),
+    ToolSpec.from_function(ledger.get_balances, tool_cache.get_balances, async_tools.get_balances),
+    ToolSpec.from_function(ledger.get_accounts, tool_cache.get_accounts, async_tools.get_accounts),
+    ToolSpec.from_function(ledger.execute_transfers, ledger.execute_transfers, async_tools.execute_transfers,
+                           write=True),
+]
+
+TOOLS_BY_NAME: Dict[str, ToolSpec] = {spec.name: spec for spec in TOOLS}
+
+
+def get_spec(name: str) -> ToolSpec:
+    return TOOLS_BY_NAME[name]
+
+
+def select(overrides: Optional[Dict[str, Callable]] = None, exclude: Iterable[str] = ()) \
+        -> Iterator[Tuple[ToolSpec, Optional[Callable]]]:
+    """
+    依次返回注册给框架的 (ToolSpec, 替换的实现)，没有替换时实现为 None
+    Args:
+        overrides: 工具名 -> 该框架中的实现
+        exclude: 不注册的工具名
+    """
+    overrides = overrides or {}
+    unknown = (set(overrides) | set(exclude)) - set(TOOLS_BY_NAME)
+    if unknown:
+        raise ValueError(f"未注册的工具: {', '.join(sorted(unknown))}")
+    for spec in TOOLS:
+        if spec.name not in exclude:
+            yield spec, overrides.get(spec.name)
@@ -0,0 +1,63 @@
+"""
+autogen 接入：BaseTool
+
+    tools = create_tools()
+    AssistantAgent(..., tools=tools)
+
+autogen 的 FunctionTool 在创建时由函数签名生成 pydantic 模型，且每次请求模型时都对每个工具
+调用 model_json_schema() 重新生成 schema；这里的 schema 直接返回注册表中的 JSON schema。
+默认使用异步实现（见 transfer_common.async_tools），同步实现在线程中执行。
+"""
+import asyncio
+import inspect
+from typing import Callable, Dict, Iterable, List, Optional
+
+from autogen_core import CancellationToken
+from autogen_core.tools import BaseTool, ToolSchema
+from pydantic import BaseModel, ConfigDict
+
+from transfer_common.tool_registry import ToolSpec, select
+
+
+class RawArguments(BaseModel):
+    """模型给出的原始参数，调用时再由 ToolSpec.validate 校验，创建工具时不需要生成参数模型"""
+
+    model_config = ConfigDict(extra="allow")
+
+
+class RegistryTool(BaseTool[RawArguments, str]):
+    """
+    注册表中一个工具的 autogen 版本
+    Args:
+        spec: 工具定义
+        fn: 工具实现，同步函数或协程函数
+    """
+
+    def __init__(self, spec: ToolSpec, fn: Callable):
+        super().__init__(RawArguments, str, spec.name, spec.description)
+        self._fn = spec.bind(fn)
+        self._schema = ToolSchema(name=spec.name, description=spec.description, parameters=spec.parameters,
+                                  strict=False)
+
+    @property
+    def schema(self) -> ToolSchema:
+        return self._schema
+
+    async def run(self, args: RawArguments, cancellation_token: CancellationToken) -> str:
+        kwargs = args.model_extra
+        if inspect.iscoroutinefunction(self._fn):
+            return await self._fn(**kwargs)
+        # to_thread 带上调用方的 contextvars（tool_cache 的会话 id）
+        return await asyncio.to_thread(self._fn, **kwargs)
+
+
+def create_tool(spec: ToolSpec, fn: Optional[Callable] = None) -> RegistryTool:
+    """
+    Args:
+        fn: 工具实现，默认为 spec 的异步实现
+    """
+    return RegistryTool(spec, fn or spec.implementation(prefer_async=True))
+
+
+def create_tools(overrides: Optional[Dict[str, Callable]] = None, exclude: Iterable[str] = ()) -> List[RegistryTool]:
+    return [create_tool(spec, fn) for spec, fn in select(overrides, exclude)]
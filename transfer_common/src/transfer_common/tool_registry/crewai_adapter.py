@@ -0,0 +1,39 @@
+"""
+crewAI 接入：BaseTool
+
+    tools = create_tools({"reply_to_user": reply_to_user})
+    Agent(..., tools=tools)
+
+原来每个工具是一个手写的 BaseTool 子类，描述、参数名与其他框架不一致，且每创建一个实例都由 _run 的注解
+重新生成一个 args_schema 模型；这里所有工具共用 RegistryTool，args_schema 为注册表中缓存的 args_model。
+默认使用同步实现，crewAI 在自己的线程中同步调用工具。
+"""
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from crewai.tools import BaseTool
+from pydantic import PrivateAttr
+
+from transfer_common.tool_registry import ToolSpec, select
+
+
+class RegistryTool(BaseTool):
+    """注册表中一个工具的 crewAI 版本，实现为 ToolSpec.bind 包装后的函数"""
+
+    _fn: Callable[..., Any] = PrivateAttr()
+
+    def _run(self, **kwargs: Any) -> Any:
+        return self._fn(**kwargs)
+
+
+def create_tool(spec: ToolSpec, fn: Optional[Callable] = None) -> RegistryTool:
+    """
+    Args:
+        fn: 工具实现，默认为 spec 的同步实现
+    """
+    tool = RegistryTool(name=spec.name, description=spec.description, args_schema=spec.args_model)
+    tool._fn = spec.bind(fn or spec.implementation(prefer_async=False))
+    return tool
+
+
+def create_tools(overrides: Optional[Dict[str, Callable]] = None, exclude: Iterable[str] = ()) -> List[RegistryTool]:
+    return [create_tool(spec, fn) for spec, fn in select(overrides, exclude)]
@@ -0,0 +1,31 @@
+"""
+LangChain / LangGraph 接入：StructuredTool
+
+    tools = create_tools({"reply_to_user": reply_to_user})
+    ToolNode(tools=tools)
+    model.bind_tools(tools)
+
+args_schema 直接使用注册表中的 JSON schema（dict），不从函数签名生成 pydantic 模型；参数由 ToolSpec.validate 校验。
+默认使用同步实现，ToolNode 在线程池中执行。
+"""
+import inspect
+from typing import Callable, Dict, Iterable, List, Optional
+
+from langchain_core.tools import StructuredTool
+
+from transfer_common.tool_registry import ToolSpec, select
+
+
+def create_tool(spec: ToolSpec, fn: Optional[Callable] = None) -> StructuredTool:
+    """
+    Args:
+        fn: 工具实现，同步函数或协程函数，默认为 spec 的同步实现
+    """
+    call = spec.bind(fn or spec.implementation(prefer_async=False))
+    implementation = {"coroutine": call} if inspect.iscoroutinefunction(call) else {"func": call}
+    return StructuredTool(name=spec.name, description=spec.description, args_schema=spec.parameters,
+                          **implementation)
+
+
+def create_tools(overrides: Optional[Dict[str, Callable]] = None, exclude: Iterable[str] = ()) -> List[StructuredTool]:
+    return [create_tool(spec, fn) for spec, fn in select(overrides, exclude)]
@@ -0,0 +1,69 @@
+"""
+llama-index 接入：FunctionTool
+
+    tools = create_tools()
+    FunctionAgent(tools=tools, ...)
+
+FunctionTool.from_defaults 在创建时由函数签名生成 pydantic 模型（fn_schema），每次请求模型时
+LLM 都通过 metadata.get_parameters_dict() 调用 fn_schema.model_json_schema() 重新生成 schema；
+这里的 metadata 直接返回注册表中的 JSON schema。
+同时注册同步和异步实现：FunctionAgent 调用异步实现，只读工具在工具线程池中并发执行，转账串行。
+只有同步实现时用 asyncio.to_thread 包装成异步版本：FunctionTool 默认的包装用 run_in_executor 执行，
+不会带上调用方的 contextvars，所有会话都会读写 tool_cache 中 "default" 会话的缓存。
+"""
+import asyncio
+import functools
+import inspect
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from llama_index.core.tools import FunctionTool, ToolMetadata
+
+from transfer_common.tool_registry import ToolSpec, select
+
+
+@dataclass
+class RegistryToolMetadata(ToolMetadata):
+    """参数 schema 取自注册表的 ToolMetadata"""
+
+    parameters: dict = field(default_factory=dict)
+
+    def get_parameters_dict(self) -> dict:
+        return self.parameters
+
+
+def _to_thread(fn: Callable[..., str]) -> Callable[..., Any]:
+    """在线程中执行同步工具函数，带上调用方的 contextvars（tool_cache 的会话 id）"""
+
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        return await asyncio.to_thread(fn, *args, **kwargs)
+
+    return wrapper
+
+
+def create_tool(spec: ToolSpec, fn: Optional[Callable] = None, return_direct: bool = False) -> FunctionTool:
+    """
+    Args:
+        fn: 工具实现，同步函数或协程函数；默认同时使用 spec 的同步和异步实现
+        return_direct: 调用该工具后直接结束本轮，以工具输出作为回复
+    """
+    if fn is None:
+        sync_fn, async_fn = spec.fn, spec.async_fn
+    elif inspect.iscoroutinefunction(fn):
+        sync_fn, async_fn = None, fn
+    else:
+        sync_fn, async_fn = fn, None
+    if async_fn is None:
+        async_fn = _to_thread(sync_fn)
+    metadata = RegistryToolMetadata(description=spec.description, name=spec.name, fn_schema=None,
+                                    return_direct=return_direct, parameters=spec.parameters)
+    return FunctionTool(
+        fn=spec.bind(sync_fn) if sync_fn else None,
+        async_fn=spec.bind(async_fn) if async_fn else None,
+        metadata=metadata,
+    )
+
+
+def create_tools(overrides: Optional[Dict[str, Callable]] = None, exclude: Iterable[str] = ()) -> List[FunctionTool]:
+    return [create_tool(spec, fn) for spec, fn in select(overrides, exclude)]
@@ -0,0 +1,34 @@
+"""
+pydantic-ai 接入：Tool.from_schema
+
+    transfer_agent = Agent(model, tools=create_tools(exclude=["reply_to_user"]))
+    console_toolset = FunctionToolset([create_tool(get_spec("reply_to_user"), reply_to_user)])
+
+@agent.tool_plain 在注册时由函数签名和文档生成 schema 和校验器；这里直接使用注册表中的 JSON schema，
+参数由 ToolSpec.validate 校验，校验失败时与框架自带的校验一样让模型重试。
+默认使用异步实现：同一条消息中的多个工具调用并发执行，转账串行（见 transfer_common.tool_executor）。
+"""
+from typing import Callable, Dict, Iterable, List, Optional
+
+from pydantic_ai import Tool
+from pydantic_ai.tools import ToolDefinition
+
+from transfer_common.tool_registry import ToolSpec, select
+
+
+def create_tool(spec: ToolSpec, fn: Optional[Callable] = None) -> Tool:
+    """
+    Args:
+        fn: 工具实现，同步函数或协程函数，默认为 spec 的异步实现
+    """
+    call = spec.bind(fn or spec.implementation(prefer_async=True))
+    return Tool.from_schema(call, name=spec.name, description=spec.description, json_schema=spec.parameters)
+
+
+def create_tools(overrides: Optional[Dict[str, Callable]] = None, exclude: Iterable[str] = ()) -> List[Tool]:
+    return [create_tool(spec, fn) for spec, fn in select(overrides, exclude)]
+
+
+def tool_definition(spec: ToolSpec) -> ToolDefinition:
+    """只有定义、没有实现的工具，用于 DeferredToolset"""
+    return ToolDefinition(name=spec.name, description=spec.description, parameters_json_schema=spec.parameters)
@@ -0,0 +1,157 @@
+"""
+transfer_common.nlu 的表驱动测试
+
+    PYTHONPATH=transfer_common/src python -m unittest discover -s transfer_common/tests
+"""
+import unittest
+
+from transfer_common import ledger, nlu
+
+ACCOUNTS = {ledger.SELF_ACCOUNT: 1_000_000.0, "张三": 0.0, "李四": 0.0, "王五": 0.0, "赵六": 0.0}
+
+# (金额文本, 期望值)
+AMOUNTS = [
+    ("500", 500.0),
+    ("1,200", 1200.0),
+    ("0.5", 0.5),
+    ("１０００", 1000.0),
+    ("1.5万", 15000.0),
+    ("5千", 5000.0),
+    ("0.5万", 5000.0),
+    ("1万5千", 15000.0),
+    ("3千5百", 3500.0),
+    ("五百", 500.0),
+    ("五零零", 500.0),
+    ("十五", 15.0),
+    ("二十", 20.0),
+    ("两千", 2000.0),
+    ("两百五", 250.0),
+    ("一千五", 1500.0),
+    ("三万五", 35000.0),
+    ("一千零五", 1005.0),
+    ("八百八十八", 888.0),
+    ("一万五千", 15000.0),
+    ("十万", 100000.0),
+    ("一亿五千万", 150000000.0),
+    ("一点五万", 15000.0),
+    ("壹仟", 1000.0),
+    ("贰佰伍拾", 250.0),
+    ("一点", None),
+    ("", None),
+    ("1.2.3", None),
+    ("50块5", None),                    # 元以下的部分不按元解析
+    ("五块五毛", None),
+]
+
+# (请求, 收款人, 金额)，规则有把握、可以走快速通道
+CONFIDENT = [
+    ("给张三转500元", "张三", 500.0),
+    ("给李四转五百块", "李四", 500.0),
+    ("向王五转账一千二百元", "王五", 1200.0),
+    ("转账给赵六两千块钱", "赵六", 2000.0),
+    ("给张三转1.5万", "张三", 15000.0),
+    ("帮我给李四转三万五", "李四", 35000.0),
+    ("转5千元给王五", "王五", 5000.0),
+    ("给赵六打1,200元", "赵六", 1200.0),
+    ("给张三转一万五千元，先向我确认", "张三", 15000.0),
+    ("给王五汇两百五十块", "王五", 250.0),
+    ("转给张三 300 元", "张三", 300.0),
+    ("给李四转壹仟元", "李四", 1000.0),
+    ("给王五转 3千5百 元", "王五", 3500.0),
+    ("给张三转１０００元", "张三", 1000.0),
+    ("给张三转账500", "张三", 500.0),
+    ("转一笔500元给赵六", "赵六", 500.0),
+    ("给王五转一点五万", "王五", 15000.0),
+    ("给赵六转1万5千", "赵六", 15000.0),
+]
+
+# 交给模型的请求
+NOT_CONFIDENT = [
+    "给张三和李四各转500元",            # 多个收款人
+    "给张三、李四转500元",
+    "给张三转500元，给李四转300元",      # 多笔
+    "张三那边转500吧",                 # 收款人前面没有 给/向
+    "张三转500",
+    "给张三转500元可以吗？",             # 疑问
+    "给张三转多少合适",
+    "不要给张三转500元",                # 否定
+    "别给张三转500了",
+    "让张三给我转500元",                # 方向相反
+    "给张三转一半",                    # 需要计算
+    "如果余额够的话给张三转500元",        # 有条件
+    "给王五转一点钱",                   # 没有金额
+    "给小明转500元",                   # 账户不存在
+    "张三500元",                       # 没有转账动词
+    "给张三转500美元",                  # 其他币种
+    "给张三转$500",
+    "给张三转500 USD",
+    "给张三转500usd",
+    "给张三转500刀",
+    "给张三转-500元",                   # 负数
+    "给张三转 - 500元",
+    "给张三转负五百元",
+    "给张三转50块5",                    # 元以下的金额
+    "给张三转五块五毛",
+    "给张三转5元5角",
+    "给张三转500分",
+    "给张三转5毛",
+    "我给张三转了500元",                # 已经发生的转账
+    "已经给张三转过500元",
+    "给张三转两次500元",                # 重复
+    "给张三转500元，转3次",
+]
+
+# (回答, 是否为肯定)
+ANSWERS = [
+    ("确认", True),
+    ("好的！", True),
+    ("是的。", True),
+    ("OK", True),
+    ("嗯", True),
+    ("不", False),
+    ("不确认", False),
+    ("改成300", False),
+    ("是否要改一下", False),
+    ("", False),
+]
+
+
+class NluTest(unittest.TestCase):
+    def setUp(self):
+        self.previous = ledger.get_ledger()
+        ledger.set_ledger(ledger.Ledger(ACCOUNTS))
+
+    def tearDown(self):
+        ledger.set_ledger(self.previous)
+
+    def test_parse_amount(self):
+        for text, expected in AMOUNTS:
+            with self.subTest(text=text):
+                self.assertEqual(nlu.parse_amount(text), expected)
+
+    def test_confident(self):
+        for text, to_account, amount in CONFIDENT:
+            with self.subTest(text=text):
+                slots = nlu.extract_transfer(text)
+                self.assertTrue(slots.confident, slots)
+                self.assertEqual(slots.to_account, to_account)
+                self.assertEqual(slots.amount, amount)
+
+    def test_not_confident(self):
+        for text in NOT_CONFIDENT:
+            with self.subTest(text=text):
+                self.assertFalse(nlu.extract_transfer(text).confident)
+
+    def test_names_containing_numerals(self):
+        # 王五、赵六 中的数字不能算进金额
+        slots = nlu.extract_transfer("转账给赵六两千块钱")
+        self.assertEqual((slots.to_account, slots.amount), ("赵六", 2000.0))
+
+    def test_is_affirmative(self):
+        for text, expected in ANSWERS:
+            with self.subTest(text=text):
+                self.assertEqual(nlu.is_affirmative(text), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
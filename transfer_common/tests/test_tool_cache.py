@@ -0,0 +1,67 @@
+"""
+transfer_common.tool_cache 的测试
+
+    PYTHONPATH=transfer_common/src python -m unittest discover -s transfer_common/tests
+"""
+import threading
+import unittest
+
+from transfer_common import ledger, tool_cache
+
+ACCOUNTS = {ledger.SELF_ACCOUNT: 1000.0, "张三": 0.0}
+
+
+class ToolCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.previous = ledger.get_ledger()
+        self.book = ledger.Ledger(ACCOUNTS)
+        ledger.set_ledger(self.book)
+        tool_cache.default_cache.clear()
+
+    def tearDown(self):
+        ledger.set_ledger(self.previous)
+        tool_cache.default_cache.clear()
+
+    def test_hit_and_invalidate_after_transfer(self):
+        with tool_cache.session_scope("s1"):
+            first = tool_cache.get_balance("张三")
+            self.assertEqual(tool_cache.get_balance("张三"), first)
+            ledger.execute_transfer("张三", 100)
+            self.assertIn("100.0", tool_cache.get_balance("张三"))
+
+    def test_lookup_overlapping_transfer_is_not_cached(self):
+        # 查询读到转账之前的余额，转账在查询返回之前提交并让缓存失效
+        cache = tool_cache.ToolResultCache()
+        started, committed = threading.Event(), threading.Event()
+
+        def slow_balance(user_name: str) -> str:
+            result = ledger.get_balance(user_name)
+            started.set()
+            committed.wait(5)
+            return result
+
+        get_balance = cache.wrap(slow_balance, lambda user_name: (user_name,))
+        results = []
+        reader = threading.Thread(target=lambda: results.append(get_balance("张三")))
+        reader.start()
+        started.wait(5)
+        # 与 execute_transfer 相同：转账提交后通知缓存
+        self.book.transfer(ledger.SELF_ACCOUNT, "张三", 100)
+        cache.invalidate_accounts([ledger.SELF_ACCOUNT, "张三"])
+        committed.set()
+        reader.join()
+        self.assertIn("0.0", results[0])
+        # 过时的结果没有写入缓存，再次查询读到转账之后的余额
+        self.assertIn("100.0", get_balance("张三"))
+
+    def test_missing_account_is_not_cached(self):
+        with tool_cache.session_scope("s1"):
+            self.assertIn("不存在", tool_cache.get_account("李四"))
+            self.book.add_account("李四")
+            self.assertIn("存在", tool_cache.get_account("李四"))
+            self.assertNotIn("不存在", tool_cache.get_account("李四"))
+            self.assertNotIn("不存在", tool_cache.get_accounts(["张三", "李四"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
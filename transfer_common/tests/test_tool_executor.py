@@ -0,0 +1,63 @@
+"""
+transfer_common.tool_executor 的测试
+
+    PYTHONPATH=transfer_common/src python -m unittest discover -s transfer_common/tests
+"""
+import asyncio
+import threading
+import time
+import unittest
+
+from transfer_common import tool_cache, tool_executor
+
+
+class RunToolTest(unittest.IsolatedAsyncioTestCase):
+    async def test_writes_in_one_session_run_in_order(self):
+        events = []
+
+        def write(name: str) -> str:
+            events.append(("start", name))
+            time.sleep(0.02)
+            events.append(("end", name))
+            return name
+
+        with tool_cache.session_scope("ordered"):
+            await asyncio.gather(*(tool_executor.run_tool(write, name, write=True) for name in "abc"))
+        self.assertEqual(events, [(kind, name) for name in "abc" for kind in ("start", "end")])
+
+    async def test_cancelled_write_still_blocks_next_write(self):
+        # 调用方被取消后，线程中的转账仍在执行，同一会话的下一笔写操作要等它结束
+        release_first = threading.Event()
+        events = []
+
+        def first() -> str:
+            events.append("first start")
+            release_first.wait(5)
+            events.append("first end")
+            return "first"
+
+        def second() -> str:
+            events.append("second start")
+            return "second"
+
+        with tool_cache.session_scope("cancelled"):
+            task = asyncio.create_task(tool_executor.run_tool(first, write=True))
+            while not events:
+                await asyncio.sleep(0.01)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+            following = asyncio.create_task(tool_executor.run_tool(second, write=True))
+            await asyncio.sleep(0.05)
+            self.assertEqual(events, ["first start"])
+            release_first.set()
+            self.assertEqual(await following, "second")
+        self.assertEqual(events, ["first start", "first end", "second start"])
+
+    async def test_tool_sees_caller_session(self):
+        with tool_cache.session_scope("caller"):
+            self.assertEqual(await tool_executor.run_tool(tool_cache.current_session), "caller")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,6 @@
+"""
+转账 agent 的 HTTP 会话服务
+
+把各框架的转账 agent（LangGraph / autogen / llama-index / pydantic-ai）以统一的会话接口暴露出去：
+创建会话、发送消息、以 server-sent events 流式返回模型输出。
+"""
@@ -0,0 +1,151 @@
+"""
+转账 agent 的 HTTP 服务
+
+接口:
+    POST   /sessions                       创建会话，返回 {"session_id": ...}
+    POST   /sessions/{session_id}/messages 发送消息 {"content": ...}，等本轮结束后返回 {"status": ..., "text": ...}
+    POST   /sessions/{session_id}/stream   发送消息，以 server-sent events 返回 token 事件和最后的 end 事件
+    DELETE /sessions/{session_id}          关闭会话
+    GET    /stats                          会话池、工具缓存与模型缓存统计
+
+会话池满、排队过多时返回 503 和 Retry-After，会话正在处理上一条消息时返回 409。
+
+用法:
+    python -m transfer_server.app --backend langgraph --port 8000
+"""
+import argparse
+import json
+
+from aiohttp import web
+
+from transfer_common import llm_cache, tool_cache
+from transfer_server.backends import BACKENDS, DONE, load_backend
+from transfer_server.sessions import ServerOverloadedError, SessionError, SessionManager
+
+MANAGER = web.AppKey("manager", SessionManager)
+
+
+def _empty_end() -> dict:
+    """后端没有产生任何事件时的 end 事件"""
+    return {"event": "end", "status": DONE, "text": ""}
+
+
+@web.middleware
+async def session_errors(request, handler):
+    """把会话错误转换成对应的 HTTP 状态码"""
+    try:
+        return await handler(request)
+    except SessionError as e:
+        headers = {}
+        if isinstance(e, ServerOverloadedError):
+            headers["Retry-After"] = str(max(1, round(e.retry_after)))
+        return web.json_response({"error": str(e)}, status=e.status, headers=headers)
+
+
+async def _read_content(request) -> str:
+    try:
+        body = await request.json()
+    except json.JSONDecodeError:
+        raise web.HTTPBadRequest(text="请求体必须是 JSON")
+    content = body.get("content") if isinstance(body, dict) else None
+    if not isinstance(content, str) or not content.strip():
+        raise web.HTTPBadRequest(text="缺少 content")
+    return content
+
+
+async def create_session(request):
+    session_id = await request.app[MANAGER].create()
+    return web.json_response({"session_id": session_id}, status=201)
+
+
+async def delete_session(request):
+    await request.app[MANAGER].close(request.match_info["session_id"])
+    return web.Response(status=204)
+
+
+async def send_message(request):
+    content = await _read_content(request)
+    end = _empty_end()
+    async for event in request.app[MANAGER].send(request.match_info["session_id"], content):
+        if event["event"] == "end":
+            end = event
+    return web.json_response({"status": end["status"], "text": end["text"]})
+
+
+async def stream_message(request):
+    content = await _read_content(request)
+    events = request.app[MANAGER].send(request.match_info["session_id"], content)
+    # 先取第一个事件：排队被拒、会话忙碌等错误在这里抛出，仍能以普通 HTTP 状态码返回
+    try:
+        first = await events.__anext__()
+    except StopAsyncIteration:
+        # 后端没有产生任何事件：请求已被接受，仍以 SSE 返回一个空的 end 事件，而不是 500
+        first = _empty_end()
+    response = web.StreamResponse(headers={"Content-Type": "text/event-stream", "Cache-Control": "no-cache"})
+    await response.prepare(request)
+    try:
+        await _write_event(response, first)
+        async for event in events:
+            await _write_event(response, event)
+    finally:
+        await events.aclose()
+    await response.write_eof()
+    return response
+
+
+async def _write_event(response, event: dict) -> None:
+    data = {key: value for key, value in event.items() if key != "event"}
+    await response.write(f"event: {event['event']}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n".encode())
+
+
+async def stats(request):
+    cache = llm_cache.get_cache()
+    return web.json_response({
+        **request.app[MANAGER].stats(),
+        "tool_cache": tool_cache.default_cache.stats(),
+        "llm_cache": cache.stats() if cache is not None else None,
+    })
+
+
+def create_app(backend: str = "langgraph", **manager_options) -> web.Application:
+    """
+    创建 HTTP 应用
+    Args:
+        backend: 转账 agent 后端，见 transfer_server.backends.BACKENDS
+        manager_options: 传给 SessionManager 的会话池参数
+    """
+    app = web.Application(middlewares=[session_errors])
+    app[MANAGER] = SessionManager(load_backend(backend), **manager_options)
+
+    async def close_sessions(app):
+        await app[MANAGER].close_all()
+
+    app.on_cleanup.append(close_sessions)
+    app.router.add_post("/sessions", create_session)
+    app.router.add_delete("/sessions/{session_id}", delete_session)
+    app.router.add_post("/sessions/{session_id}/messages", send_message)
+    app.router.add_post("/sessions/{session_id}/stream", stream_message)
+    app.router.add_get("/stats", stats)
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backend", choices=list(BACKENDS), default="langgraph")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--max-sessions", type=int, default=1000)
+    parser.add_argument("--max-concurrent-turns", type=int, default=64)
+    parser.add_argument("--max-pending-turns", type=int, default=256)
+    args = parser.parse_args()
+    app = create_app(
+        args.backend,
+        max_sessions=args.max_sessions,
+        max_concurrent_turns=args.max_concurrent_turns,
+        max_pending_turns=args.max_pending_turns,
+    )
+    web.run_app(app, host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+"""
+各框架转账 agent 的会话适配
+
+每个后端会话实现 `async send(text)`，逐个产出事件：
+- {"event": "token", "text": ...}: 模型输出的文本增量
+- {"event": "end", "status": ..., "text": ...}: 本轮结束；status 为
+  question（agent 通过 reply_to_user 提问，下一条消息即回答）、reply（普通回复）或 done（转账完成）
+
+控制台版本的 reply_to_user 用 input() 阻塞等待回复，服务端不能这样做：
+各后端把提问作为本轮的结束，并把用户的下一条消息作为回答交回给 agent。
+agent 模块在选中对应后端时才导入，只用到一个框架时不会加载其他框架。
+"""
+import importlib
+import os
+import sys
+
+QUESTION = "question"
+REPLY = "reply"
+DONE = "done"
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+
+def _import_agent(demo_dir: str, module_name: str):
+    """导入 <demo_dir>/src 下的转账 agent 脚本"""
+    src = os.path.join(_ROOT, demo_dir, "src")
+    if src not in sys.path:
+        sys.path.insert(0, src)
+    return importlib.import_module(module_name)
+
+
+def _status(text: str, asked: bool) -> str:
+    if asked:
+        return QUESTION
+    return DONE if "DONE" in text else REPLY
+
+
+def ask_user(content: str) -> str:
+    """
+    向用户提问
+    Args:
+        content: 提问内容
+    Returns:
+        提问内容；用户的回答会作为下一条消息发给 agent
+    """
+    return content
+
+
+class LangGraphSession:
+    """LangGraph 转账图：reply_to_user 和用户输入本来就是中断，每条消息对应一次 Command(resume=...)"""
+
+    def __init__(self, agent, session_id: str):
+        self.agent = agent
+        # 回复以 token 事件发给客户端，stream_tokens 让图中的节点不再把回复打印到服务端的控制台
+        self.config = {"configurable": {"thread_id": session_id, "stream_tokens": True}}
+        # 图是否停在某个中断上等待恢复
+        self.waiting = False
+
+    async def send(self, text: str):
+        from langgraph.types import Command
+
+        if not self.waiting:
+            # 新会话或上一笔转账已结束：从头运行到第一个用户输入中断
+            await self.agent.transfer_graph.ainvoke({"messages": []}, self.config)
+        self.waiting = False
+        reply, request = "", None
+        async for mode, chunk in self.agent.transfer_graph.astream(
+            Command(resume=text), self.config, stream_mode=["messages", "updates"]
+        ):
+            if mode == "messages":
+                message, metadata = chunk
+                # 模型回复，或快速通道（见 langgraph_transfer_agent.REPLY_NODES）的转账结果
+                if (metadata.get("langgraph_node") in self.agent.REPLY_NODES
+                        and message.type in ("ai", "AIMessageChunk") and message.content):
+                    yield {"event": "token", "text": message.content}
+            elif "__interrupt__" in chunk:
+                request = chunk["__interrupt__"][0].value
+            else:
+                for node in self.agent.REPLY_NODES:
+                    if chunk.get(node):
+                        reply = chunk[node]["messages"][-1].content
+        if request is None:
+            yield {"event": "end", "status": DONE, "text": reply}
+            return
+        self.waiting = True
+        if request["type"] == "reply_to_user":
+            yield {"event": "end", "status": QUESTION, "text": request["question"]}
+        else:
+            yield {"event": "end", "status": REPLY, "text": reply}
+
+
+class AutogenSession:
+    """autogen team：transfer_agent 每发言一次结束一轮，调用 reply_to_user 时该轮即为提问"""
+
+    def __init__(self, agent, session_id: str):
+        from autogen_agentchat.conditions import SourceMatchTermination, TextMentionTermination
+        from transfer_common.tool_registry import autogen_adapter, get_spec
+
+        reply_tool = autogen_adapter.create_tool(get_spec("reply_to_user"), ask_user)
+        self.team = agent.create_transfer_team(
+            reply_tool=reply_tool,
+            termination_condition=TextMentionTermination("DONE") | SourceMatchTermination(["transfer_agent"]),
+        )
+
+    async def send(self, text: str):
+        from autogen_agentchat.base import TaskResult
+        from autogen_agentchat.messages import BaseTextChatMessage, ModelClientStreamingChunkEvent, ToolCallExecutionEvent
+
+        reply, asked = "", False
+        async for item in self.team.run_stream(task=text):
+            if isinstance(item, ModelClientStreamingChunkEvent):
+                yield {"event": "token", "text": item.content}
+            elif isinstance(item, ToolCallExecutionEvent):
+                asked = asked or any(result.name == "reply_to_user" for result in item.content)
+            elif isinstance(item, BaseTextChatMessage) and item.source != "user":
+                reply = item.content
+            elif isinstance(item, TaskResult):
+                break
+        yield {"event": "end", "status": _status(reply, asked), "text": reply}
+
+
+class LlamaIndexSession:
+    """llama-index FunctionAgent：reply_to_user 设为 return_direct，调用后直接结束本轮"""
+
+    _agent = None
+
+    def __init__(self, agent, session_id: str):
+        from llama_index.core.workflow import Context
+
+        if LlamaIndexSession._agent is None:
+            from transfer_common.tool_registry import get_spec, llamaindex_adapter
+
+            reply_tool = llamaindex_adapter.create_tool(get_spec("reply_to_user"), ask_user, return_direct=True)
+            LlamaIndexSession._agent = agent.create_transfer_agent(reply_tool=reply_tool)
+        self.ctx = Context(LlamaIndexSession._agent)
+
+    async def send(self, text: str):
+        from llama_index.core.agent.workflow import AgentStream, ToolCallResult
+
+        asked = False
+        handler = LlamaIndexSession._agent.run(text, ctx=self.ctx)
+        async for event in handler.stream_events():
+            if isinstance(event, AgentStream) and event.delta:
+                yield {"event": "token", "text": event.delta}
+            elif isinstance(event, ToolCallResult) and event.tool_name == "reply_to_user":
+                asked = True
+        response = await handler
+        reply = str(response)
+        yield {"event": "end", "status": _status(reply, asked), "text": reply}
+
+
+class PydanticAISession:
+    """
+    pydantic-ai Agent：reply_to_user 注册为延迟工具，模型调用它时运行结束并返回 DeferredToolCalls；
+    用户的下一条消息作为该工具调用的返回值写回历史，再继续运行
+    """
+
+    _toolset = None
+
+    def __init__(self, agent, session_id: str):
+        if PydanticAISession._toolset is None:
+            from pydantic_ai.toolsets import DeferredToolset
+            from transfer_common.tool_registry import get_spec, pydantic_ai_adapter
+
+            PydanticAISession._toolset = DeferredToolset([pydantic_ai_adapter.tool_definition(get_spec("reply_to_user"))])
+        self.agent = agent.transfer_agent
+        self.history = []
+        # 等待用户回答的 reply_to_user 调用
+        self.pending_calls = []
+
+    async def send(self, text: str):
+        from pydantic_ai import Agent
+        from pydantic_ai.messages import (
+            ModelRequest, PartDeltaEvent, PartStartEvent, TextPart, TextPartDelta, ToolReturnPart,
+        )
+        from pydantic_ai.output import DeferredToolCalls
+
+        history, prompt = self.history, text
+        if self.pending_calls:
+            history = history + [ModelRequest(parts=[
+                ToolReturnPart(tool_name=call.tool_name, content=text, tool_call_id=call.tool_call_id)
+                for call in self.pending_calls
+            ])]
+            prompt = None
+        async with self.agent.iter(
+            prompt,
+            message_history=history,
+            output_type=[str, DeferredToolCalls],
+            toolsets=[self._toolset],
+        ) as run:
+            async for node in run:
+                if not Agent.is_model_request_node(node):
+                    continue
+                async with node.stream(run.ctx) as stream:
+                    async for event in stream:
+                        if isinstance(event, PartStartEvent) and isinstance(event.part, TextPart) and event.part.content:
+                            yield {"event": "token", "text": event.part.content}
+                        elif isinstance(event, PartDeltaEvent) and isinstance(event.delta, TextPartDelta):
+                            yield {"event": "token", "text": event.delta.content_delta}
+        self.history = run.result.all_messages()
+        output = run.result.output
+        if isinstance(output, DeferredToolCalls):
+            self.pending_calls = output.tool_calls
+            question = "\n".join(str(call.args_as_dict().get("content", "")) for call in output.tool_calls)
+            yield {"event": "end", "status": QUESTION, "text": question}
+        else:
+            self.pending_calls = []
+            yield {"event": "end", "status": _status(output, False), "text": output}
+
+
+# 后端名 -> (agent 目录, 模块名, 会话类)
+BACKENDS = {
+    "langgraph": ("longgraph_demo", "langgraph_transfer_agent", LangGraphSession),
+    "autogen": ("autogen_demo", "autogen_transfer_agent", AutogenSession),
+    "llamaindex": ("llamaindex_demo", "llamaindex_transfer_agent", LlamaIndexSession),
+    "pydantic_ai": ("pydantic_demo", "pydantic_transfer_agent", PydanticAISession),
+}
+
+
+def load_backend(name: str):
+    """
+    导入选中的后端，返回创建会话的函数（参数为会话 id）
+    """
+    if name not in BACKENDS:
+        raise ValueError(f"未知的后端 {name}，可选: {', '.join(BACKENDS)}")
+    demo_dir, module_name, session_cls = BACKENDS[name]
+    agent = _import_agent(demo_dir, module_name)
+    return lambda session_id: session_cls(agent, session_id)
@@ -0,0 +1,191 @@
+"""
+会话池与背压控制
+
+- 会话数有上限：满了先淘汰最久未使用的空闲会话，全部忙碌时拒绝创建
+- 空闲超过 idle_ttl 的会话会被回收
+- 同一会话同一时间只处理一条消息
+- 全局同时执行的轮次有上限，排队的请求也有上限，超出时立即拒绝，而不是无限堆积
+"""
+import asyncio
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Callable, Optional
+
+from transfer_common import tool_cache
+
+
+class SessionError(Exception):
+    """会话相关错误的基类"""
+
+    status = 400
+
+
+class SessionNotFoundError(SessionError):
+    status = 404
+
+    def __init__(self, session_id: str):
+        super().__init__(f"会话 {session_id} 不存在")
+        self.session_id = session_id
+
+
+class SessionBusyError(SessionError):
+    status = 409
+
+    def __init__(self, session_id: str):
+        super().__init__(f"会话 {session_id} 正在处理上一条消息")
+        self.session_id = session_id
+
+
+class ServerOverloadedError(SessionError):
+    """会话池已满或排队的请求过多，客户端应稍后重试"""
+
+    status = 503
+
+    def __init__(self, reason: str, retry_after: float = 1.0):
+        super().__init__(reason)
+        self.retry_after = retry_after
+
+
+class Session:
+    __slots__ = ("session_id", "backend_session", "lock", "last_used", "turns")
+
+    def __init__(self, session_id: str, backend_session):
+        self.session_id = session_id
+        self.backend_session = backend_session
+        self.lock = asyncio.Lock()
+        self.last_used = time.monotonic()
+        self.turns = 0
+
+
+class SessionManager:
+    """
+    会话池
+    Args:
+        factory: 创建后端会话的函数，参数为会话 id
+        max_sessions: 同时保留的会话数上限
+        idle_ttl: 空闲会话的回收时间（秒）
+        max_concurrent_turns: 同时执行的轮次上限（即同时在等模型的请求数）
+        max_pending_turns: 等待执行的轮次上限，超出时返回 503
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[str], object],
+        max_sessions: int = 1000,
+        idle_ttl: float = 1800.0,
+        max_concurrent_turns: int = 64,
+        max_pending_turns: int = 256,
+    ):
+        self.factory = factory
+        self.max_sessions = max_sessions
+        self.idle_ttl = idle_ttl
+        self.max_pending_turns = max_pending_turns
+        # 按最近使用顺序排列，最久未使用的在前面
+        self._sessions: "OrderedDict[str, Session]" = OrderedDict()
+        self._turn_slots = asyncio.Semaphore(max_concurrent_turns)
+        self._pending = 0
+        self.rejected = 0
+        self.evicted = 0
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    async def create(self) -> str:
+        """创建会话并返回会话 id"""
+        await self._reap_idle()
+        if len(self._sessions) >= self.max_sessions:
+            await self._evict_one()
+        session_id = uuid.uuid4().hex
+        backend_session = self.factory(session_id)
+        if asyncio.iscoroutine(backend_session):
+            backend_session = await backend_session
+        self._sessions[session_id] = Session(session_id, backend_session)
+        return session_id
+
+    def get(self, session_id: str) -> Session:
+        session = self._sessions.get(session_id)
+        if session is None:
+            raise SessionNotFoundError(session_id)
+        self._sessions.move_to_end(session_id)
+        session.last_used = time.monotonic()
+        return session
+
+    async def close(self, session_id: str) -> None:
+        session = self._sessions.pop(session_id, None)
+        if session is None:
+            raise SessionNotFoundError(session_id)
+        await self._close_session(session)
+
+    async def close_all(self) -> None:
+        while self._sessions:
+            _, session = self._sessions.popitem(last=False)
+            await self._close_session(session)
+
+    async def send(self, session_id: str, text: str) -> AsyncIterator[dict]:
+        """
+        把一条用户消息交给会话处理，逐个产出后端事件
+        排队、会话忙碌等错误在产出第一个事件之前抛出，调用方据此返回对应的 HTTP 状态码
+        """
+        session = self.get(session_id)
+        if session.lock.locked():
+            raise SessionBusyError(session_id)
+        async with session.lock, self._admit():
+            session.turns += 1
+            # 工具结果缓存按会话隔离
+            with tool_cache.session_scope(session_id):
+                async for event in session.backend_session.send(text):
+                    yield event
+            session.last_used = time.monotonic()
+
+    def stats(self) -> dict:
+        return {
+            "sessions": len(self._sessions),
+            "pending_turns": self._pending,
+            "rejected": self.rejected,
+            "evicted": self.evicted,
+        }
+
+    @asynccontextmanager
+    async def _admit(self):
+        """占用一个执行名额；名额用完且排队已满时立即拒绝"""
+        if self._turn_slots.locked() and self._pending >= self.max_pending_turns:
+            self.rejected += 1
+            raise ServerOverloadedError("排队的请求过多")
+        self._pending += 1
+        try:
+            await self._turn_slots.acquire()
+        finally:
+            self._pending -= 1
+        try:
+            yield
+        finally:
+            self._turn_slots.release()
+
+    async def _evict_one(self) -> None:
+        for session_id, session in self._sessions.items():
+            if not session.lock.locked():
+                del self._sessions[session_id]
+                self.evicted += 1
+                await self._close_session(session)
+                return
+        self.rejected += 1
+        raise ServerOverloadedError("会话数已达上限")
+
+    async def _reap_idle(self) -> None:
+        deadline = time.monotonic() - self.idle_ttl
+        while self._sessions:
+            session_id, session = next(iter(self._sessions.items()))
+            if session.last_used > deadline or session.lock.locked():
+                break
+            del self._sessions[session_id]
+            self.evicted += 1
+            await self._close_session(session)
+
+    @staticmethod
+    async def _close_session(session: Session) -> None:
+        tool_cache.default_cache.clear_session(session.session_id)
+        aclose: Optional[Callable] = getattr(session.backend_session, "aclose", None)
+        if aclose is not None:
+            await aclose()